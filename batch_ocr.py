@@ -0,0 +1,246 @@
+"""
+批量 OCR 命令行工具
+对目录中的截图进行识别，使用进程池并行处理，结果以 JSONL 流式输出
+
+每行一个 JSON 对象:
+    {"file": ..., "status": "ok" | "error", "width": ..., "height": ...,
+     "blocks": [{"text", "x", "y", "width", "height"}, ...],
+     "timings": {"load_ms", "ocr_ms", "total_ms"}, "error": ...}
+
+用法:
+    python batch_ocr.py screenshots/ -o results.jsonl
+    python batch_ocr.py screenshots/ -o results.jsonl --resume       # 中断后继续
+    python batch_ocr.py tickets/ --recursive --engine windows --workers 2
+    python batch_ocr.py screenshots/ -o results.jsonl --fake-wcocr   # Linux 上使用替身引擎
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import ocr_engines
+
+DEFAULT_PATTERNS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+
+# 子进程中的识别配置（由进程池初始化函数设置）
+_worker_engine = None
+_worker_preprocess = False
+
+
+def collect_images(inputs: List[str], recursive: bool = False,
+                   extensions: Iterable[str] = DEFAULT_PATTERNS) -> List[str]:
+    """收集待识别的图片路径（按路径排序，保证输出顺序稳定）"""
+    extensions = tuple(ext.lower() for ext in extensions)
+    files = []
+    for item in inputs:
+        if os.path.isfile(item):
+            files.append(os.path.abspath(item))
+            continue
+        if not os.path.isdir(item):
+            logging.warning(f"路径不存在: {item}")
+            continue
+        if recursive:
+            for root, _, names in os.walk(item):
+                files.extend(
+                    os.path.abspath(os.path.join(root, name))
+                    for name in names if name.lower().endswith(extensions)
+                )
+        else:
+            files.extend(
+                os.path.abspath(os.path.join(item, name))
+                for name in os.listdir(item)
+                if name.lower().endswith(extensions) and os.path.isfile(os.path.join(item, name))
+            )
+    return sorted(set(files))
+
+
+def load_completed(output_path: str, files: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    读取已有输出，返回识别成功的文件集合
+
+    中断时最后一行可能只写了一半，截断到最后一个完整行以便继续追加；
+    将要重新识别的失败记录（files 中未成功的文件，files 为 None 时为全部）从输出中删除，
+    继续后每个文件只保留一条记录
+
+    Args:
+        output_path: JSONL 输出文件
+        files: 本次要识别的文件
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'rb') as f:
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    lines = data[:end].decode('utf-8').splitlines(keepends=True)
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        records.append(record)
+        if record and record.get('status') == 'ok':
+            completed.add(record['file'])
+
+    retry = None if files is None else set(files)
+
+    def keep(record) -> bool:
+        if not record or record.get('status') == 'ok':
+            return True
+        path = record.get('file')
+        # 已有成功记录，或本次会重新识别
+        return path not in completed and retry is not None and path not in retry
+
+    kept = [line for line, record in zip(lines, records) if keep(record)]
+    if len(kept) != len(lines) or end < len(data):
+        # 写入临时文件后替换，中途中断也不会丢失原有结果
+        temp_path = output_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(kept)
+        os.replace(temp_path, output_path)
+    return completed
+
+
+def _init_worker(engine_name: str, preprocess: bool, plugins: List[str]):
+    """进程池初始化：每个子进程创建一次引擎"""
+    global _worker_engine, _worker_preprocess
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    ocr_engines.load_plugins(plugins)
+    _worker_engine = engine_name
+    _worker_preprocess = preprocess
+    engine = ocr_engines.get_engine(engine_name)
+    if engine is None or not engine.is_available():
+        ocr_engines.log_unavailable(engine_name, engine, level=logging.ERROR)
+
+
+def _ocr_file(path: str) -> Dict:
+    """识别单个文件（在子进程中执行）"""
+    from PIL import Image
+
+    record = {'file': path, 'status': 'ok', 'blocks': [], 'timings': {}}
+    start = time.perf_counter()
+    try:
+        with Image.open(path) as image:
+            image = image.convert('RGB')
+        loaded = time.perf_counter()
+        record['width'], record['height'] = image.size
+
+        engine = ocr_engines.get_engine(_worker_engine)
+        if engine is None or not engine.is_available():
+            raise RuntimeError(f"OCR 引擎不可用: {getattr(engine, 'error_message', None) or _worker_engine}")
+        blocks = ocr_engines.recognize(_worker_engine, image, preprocess=_worker_preprocess)
+        record['blocks'] = blocks.to_dicts()
+        done = time.perf_counter()
+        record['timings'] = {
+            'load_ms': round((loaded - start) * 1000, 2),
+            'ocr_ms': round((done - loaded) * 1000, 2),
+            'total_ms': round((done - start) * 1000, 2),
+        }
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)
+        record['timings'] = {'total_ms': round((time.perf_counter() - start) * 1000, 2)}
+    return record
+
+
+def run_batch(files: List[str], output, engine_name: str, workers: int, preprocess: bool = False,
+              plugins: Optional[List[str]] = None, chunksize: int = 1, progress_every: float = 2.0) -> Dict:
+    """
+    并行识别文件列表，结果逐行写入 output
+
+    Returns:
+        汇总统计
+    """
+    summary = {'files': len(files), 'ok': 0, 'error': 0, 'blocks': 0}
+    if not files:
+        return summary
+
+    start = time.perf_counter()
+    last_report = start
+    with multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(engine_name, preprocess, plugins or [])
+    ) as pool:
+        for done, record in enumerate(pool.imap_unordered(_ocr_file, files, chunksize=chunksize), 1):
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+            summary[record['status']] += 1
+            summary['blocks'] += len(record['blocks'])
+
+            now = time.perf_counter()
+            if now - last_report >= progress_every:
+                last_report = now
+                rate = done / (now - start)
+                print(f"[批量OCR] {done}/{len(files)}  {rate:.2f} 张/秒", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    summary['elapsed_s'] = round(elapsed, 3)
+    summary['images_per_second'] = round(len(files) / elapsed, 3) if elapsed > 0 else 0.0
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量 OCR：识别目录中的截图并输出 JSONL")
+    parser.add_argument("inputs", nargs="+", help="图片文件或目录")
+    parser.add_argument("-o", "--output", help="JSONL 输出文件（默认输出到标准输出）")
+    parser.add_argument("--resume", action="store_true", help="跳过输出文件中已成功识别的图片，重新识别失败的图片并替换其记录")
+    parser.add_argument("--recursive", action="store_true", help="递归扫描子目录")
+    parser.add_argument("--engine", default="wechat", help="OCR 引擎名称")
+    parser.add_argument("--workers", type=int, default=max(1, min(4, os.cpu_count() or 1)),
+                        help="进程数（每个进程各自初始化一个引擎实例）")
+    parser.add_argument("--chunksize", type=int, default=1, help="每次分发给子进程的图片数")
+    parser.add_argument("--preprocess", action="store_true", help="启用图像预处理")
+    parser.add_argument("--plugin", action="append", default=[], help="第三方引擎模块（可多次指定）")
+    parser.add_argument("--fake-wcocr", action="store_true", help="使用 wcocr 替身（无需微信，见 fake_wcocr.py）")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    if args.fake_wcocr:
+        # 通过环境变量传递给子进程
+        import fake_wcocr
+        fake_wcocr.install()
+
+    if args.resume and not args.output:
+        parser.error("--resume 需要指定 --output")
+
+    files = collect_images(args.inputs, args.recursive)
+    skipped = 0
+    if args.resume:
+        completed = load_completed(args.output, files)
+        remaining = [f for f in files if f not in completed]
+        skipped = len(files) - len(remaining)
+        files = remaining
+
+    print(f"[批量OCR] 待识别 {len(files)} 张图片（跳过 {skipped} 张），"
+          f"引擎 {args.engine}，{args.workers} 个进程", file=sys.stderr)
+
+    if args.output:
+        output = open(args.output, 'a' if args.resume else 'w', encoding='utf-8')
+    else:
+        output = sys.stdout
+    try:
+        summary = run_batch(files, output, args.engine, args.workers, args.preprocess,
+                            args.plugin, args.chunksize)
+    except KeyboardInterrupt:
+        print("\n[批量OCR] 已中断，使用 --resume 继续", file=sys.stderr)
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"[批量OCR] 完成 {summary['ok']} 张，失败 {summary['error']} 张，"
+          f"共 {summary['blocks']} 个文本块，耗时 {summary.get('elapsed_s', 0)} 秒，"
+          f"吞吐 {summary.get('images_per_second', 0)} 张/秒", file=sys.stderr)
+    return 0 if summary['error'] == 0 else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+覆盖层背景遮罩微基准测试
+对比原实现（copy + convert('RGBA') + 全屏遮罩 Image.new + alpha_composite）与 dim_image
+（每个通道一次查表 Image.point）生成等待状态/结果状态背景的耗时和整帧分配次数，并校验结果逐像素一致
+
+Pillow 内部 RGB/RGBA 图像每像素都占 4 字节，整帧分配量按 宽 x 高 x 4 计算
+
+用法:
+    python benchmarks/bench_dimming.py
+    python benchmarks/bench_dimming.py --size 2560x1440 --repeat 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image  # noqa: E402
+
+from overlay_window import RESULT_MASK, WAITING_MASK, dim_image  # noqa: E402
+
+
+def reference_dim(screenshot, color):
+    """原 show_overlay_text 的遮罩合成，返回 (结果, 整帧分配次数)"""
+    masked = screenshot.copy()
+    overlay = Image.new('RGBA', masked.size, color)
+    masked = masked.convert('RGBA')
+    return Image.alpha_composite(masked, overlay), 4
+
+
+def single_pass_dim(screenshot, color):
+    return dim_image(screenshot, color), 1
+
+
+def synthetic_screenshot(size, seed):
+    """合成截图：大面积纯色窗口 + 噪声区域，与 BGRX 截图一样为 RGB 模式"""
+    rng = random.Random(seed)
+    width, height = size
+    image = Image.new('RGB', size, (240, 240, 240))
+    noise = Image.frombytes('RGB', (width // 2, height // 2), rng.randbytes(width // 2 * (height // 2) * 3))
+    image.paste(noise, (width // 4, height // 4))
+    return image
+
+
+def timed(func, screenshot, repeat):
+    best, frames = None, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for color in (WAITING_MASK, RESULT_MASK):
+            _, count = func(screenshot, color)
+            frames += count
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, frames // repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="覆盖层背景遮罩微基准测试")
+    parser.add_argument("--size", default="3840x2160", help="屏幕尺寸")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+    screenshot = synthetic_screenshot(size, args.seed)
+    frame_mb = size[0] * size[1] * 4 / 1024 / 1024
+
+    for color in (WAITING_MASK, RESULT_MASK):
+        expected = reference_dim(screenshot, color)[0].convert('RGB')
+        if dim_image(screenshot, color).tobytes() != expected.tobytes():
+            print(f"❌ 遮罩 {color} 的结果与 alpha_composite 不一致")
+            return 1
+    print("✓ 两种遮罩的结果与 alpha_composite 逐像素一致")
+
+    # 预热查找表缓存
+    dim_image(screenshot, WAITING_MASK)
+    print(f"{size[0]}x{size[1]}，每次触发生成等待状态 + 结果状态两张背景")
+    print(f"{'实现':14}{'耗时(ms)':>10}{'整帧分配':>10}{'分配量(MB)':>12}")
+    results = []
+    for name, func in (("alpha_composite", reference_dim), ("point 查表", single_pass_dim)):
+        elapsed, frames = timed(func, screenshot, args.repeat)
+        results.append(elapsed)
+        print(f"{name:14}{elapsed:>10.1f}{frames:>10}{frames * frame_mb:>12.0f}")
+    print(f"加速: {results[0] / results[1]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+字形宽度估计精度测试
+用真实字体渲染合成文本行，以渲染后的墨迹范围作为 OCR 行框，比较几种估计方式得到的单词框与真实位置的偏差:
+    - 等比估计：全角 2 个单位、半角 1 个单位（原实现）
+    - 字宽表：glyph_metrics（内置 AFM 字宽 / 本机界面字体实测）
+    - 其他字体实测：用渲染字体以外的比例字体实测的字宽表（屏幕上的字体与实测字体不同的一般情况）；
+      "界面字体实测"包含渲染字体本身时标注"同一字体"，该行只是上限，不代表实际效果
+渲染字体包括比例字体和等宽字体（代码编辑器、终端）。等宽字体上字宽表反而比等比估计差（行尾偏差
+约 1.5 个字符，等比估计为 0），因此配置项 glyph_metrics 默认关闭
+同时统计每行拆分耗时，确认开销与字符数成正比
+
+用法:
+    python benchmarks/bench_glyph_metrics.py
+    python benchmarks/bench_glyph_metrics.py --font C:/Windows/Fonts/segoeui.ttf --size 14
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+from glyph_metrics import GlyphMetrics, builtin_widths, load_glyph_metrics, measure_fonts  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+from text_classify import segments  # noqa: E402
+import text_layout  # noqa: E402
+
+# 渲染用字体候选（比例字体）
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/segoeui.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "C:/Windows/Fonts/tahoma.ttf",
+    "C:/Windows/Fonts/times.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+]
+# 渲染用字体候选（等宽字体）
+MONO_FONT_CANDIDATES = [
+    "C:/Windows/Fonts/consola.ttf",
+    "C:/Windows/Fonts/cour.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
+]
+
+WORDS = [
+    "The", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "Screen", "OCR", "overlay", "will",
+    "illustrate", "minimum", "WWW", "millimetre", "iframe", "Lightweight", "Windows", "filled", "mmm",
+    "configuration", "HTTP", "latency", "11", "2024", "v4.1.0", "title", "jill", "MAXIMUM", "wave",
+]
+
+
+def available_fonts(extra):
+    """返回 [(路径, 标签, 是否等宽)]"""
+    fonts = []
+    for mono, candidates in ((False, list(extra) + FONT_CANDIDATES), (True, MONO_FONT_CANDIDATES)):
+        for path in candidates:
+            if path and os.path.exists(path) and path not in [p for p, _, _ in fonts]:
+                label = os.path.basename(path) + ("（等宽）" if mono else "")
+                fonts.append((path, label, mono))
+    fonts.append((None, "Pillow 内置字体", False))
+    return fonts
+
+
+def load_font(path, size):
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+def make_lines(count, seed):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 22))]
+        lines.append(' '.join(words))
+    return lines
+
+
+def measure(font, lines, metrics, draw):
+    """返回 (所有单词的起止偏差列表, 行尾 20% 单词的偏差列表, 平均字符宽度)"""
+    errors, tail_errors = [], []
+    advance_total = chars = 0
+    for text in lines:
+        left, _, right, _ = draw.textbbox((0, 0), text, font=font)
+        store = TextBlockStore()
+        text_layout.split_text_block(text, left, 0, right - left, 16, out=store, metrics=metrics)
+        # 真实单词位置：按前缀的排版宽度（与拆分使用相同的分段）
+        truth = [(font.getlength(text[:start]), font.getlength(text[:end])) for start, end, _ in segments(text)]
+        for i, (start, end) in enumerate(truth):
+            error = max(abs(store.xs[i] - start), abs(store.xs[i] + store.widths[i] - end))
+            errors.append(error)
+            if end > 0.8 * right:
+                tail_errors.append(error)
+        advance_total += font.getlength(text)
+        chars += len(text)
+    return errors, tail_errors, advance_total / chars
+
+
+def summary(values):
+    ordered = sorted(values)
+    return sum(values) / len(values), ordered[int(len(ordered) * 0.95)], ordered[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="字形宽度估计精度测试")
+    parser.add_argument("--font", action="append", default=[], help="额外的渲染字体")
+    parser.add_argument("--size", type=int, default=16, help="字号（像素）")
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    lines = make_lines(args.lines, args.seed)
+    draw = ImageDraw.Draw(Image.new('L', (1, 1)))
+    estimators = [
+        ("等比 2:1", None),
+        ("内置 AFM", GlyphMetrics(builtin_widths())),
+    ]
+    loaded = load_glyph_metrics()
+    if loaded.source != "builtin":
+        estimators.append(("界面字体实测", loaded))
+        print(f"界面字体字宽来源: {loaded.source}")
+
+    fonts = available_fonts(args.font)
+    proportional = [path for path, _, mono in fonts if path and not mono]
+    print(f"{len(lines)} 行，字号 {args.size}px；偏差为单词框起止位置与真实位置的最大差（像素）")
+    print(f"{'渲染字体':32}{'估计方式':22}{'平均':>8}{'p95':>8}{'最大':>8}{'行尾平均(字符)':>16}")
+    # 按类别汇总行尾偏差：{(等宽, 估计方式): [行尾平均]}
+    tails = {}
+    for path, label, mono in fonts:
+        font = load_font(path, args.size)
+        rows = list(estimators)
+        same_font = bool(path) and path in loaded.source.split(', ')
+        if same_font:
+            rows[-1] = (rows[-1][0] + "（同一字体）", rows[-1][1])
+        others = [other for other in proportional if other != path]
+        cross = measure_fonts(others) if others else None
+        if cross is not None:
+            rows.append(("其他字体实测", GlyphMetrics(cross, ', '.join(others))))
+        for name, metrics in rows:
+            errors, tail_errors, char_w = measure(font, lines, metrics, draw)
+            mean, p95, worst = summary(errors)
+            tail = sum(tail_errors) / len(tail_errors) / char_w
+            print(f"{label[-30:]:32}{name:22}{mean:>8.1f}{p95:>8.1f}{worst:>8.1f}{tail:>16.2f}")
+            if not same_font or metrics is not loaded:
+                tails.setdefault((mono, name), []).append(tail)
+
+    print("\n行尾平均偏差（字符，不含同一字体的实测）")
+    for (mono, name), values in sorted(tails.items()):
+        print(f"  {'等宽' if mono else '比例'}字体 {name:14}{sum(values) / len(values):>8.2f}")
+
+    # 每行开销：字宽表与等比估计只差一次查表
+    for name, metrics in estimators:
+        start = time.perf_counter()
+        for _ in range(5):
+            store = TextBlockStore()
+            for text in lines:
+                text_layout.split_text_block(text, 0, 0, len(text) * 8, 16, out=store, metrics=metrics)
+        per_line = (time.perf_counter() - start) / 5 / len(lines) * 1e6
+        print(f"拆分耗时 {name:14}{per_line:8.1f} µs/行")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+选择高亮渲染微基准测试
+在 10 / 1k / 10k 个文本块的布局上模拟从左上角拖到右下角的选择（最终全选），
+对比原实现（每帧合成整张 RGBA 图像并上传为 PhotoImage）与 HighlightRenderer
+（按行合并相邻文本块，画布项对象池 + 2 的幂宽度的缓存图块，只更新变化的行）的每帧耗时
+
+每帧耗时包含 update_idletasks()，即 Tk 完成画布重绘的时间
+需要图形环境（Windows 或带 DISPLAY 的 X11），否则跳过
+
+另有一项不需要图形环境的检查：用记录画布项的假画布驱动 HighlightRenderer，
+把显示中的图块合成到白色背景上，确认重叠的文本块不会因透明度叠加而变深，
+并与原实现的合成结果逐像素比较（只比较选中区域的颜色集合）；
+以及一项图块缓存检查：逐块拖长一行选择（段宽每帧都不同），新建的图块数只随段宽的位数增长
+（而不是每帧一个），缓存的图块数不超过上限，且显示中的画布项使用的图块不会被淘汰
+
+用法:
+    python benchmarks/bench_highlight.py
+    python benchmarks/bench_highlight.py --sizes 10,1000,10000 --frames 60
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_spatial_index import code_layout, percentile  # noqa: E402
+from highlight_renderer import HIGHLIGHT_COLOR, MAX_TILES, HighlightRenderer  # noqa: E402
+from PIL import Image, ImageDraw, ImageTk  # noqa: E402
+from selection import SelectionTracker  # noqa: E402
+from spatial_index import GridIndex  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 2560, 1440
+
+
+class ComposedHighlight:
+    """原 create_highlight_layer：每次按选择范围重新合成整张高亮图像"""
+
+    def __init__(self, canvas, store):
+        self.canvas = canvas
+        self.store = store
+        self.photo = None
+
+    def draw(self, selected):
+        if not selected:
+            return
+        store = self.store
+        min_x = min(store.xs[i] for i in selected)
+        min_y = min(store.ys[i] for i in selected)
+        max_x = max(store.xs[i] + store.widths[i] for i in selected)
+        max_y = max(store.ys[i] + store.heights[i] for i in selected)
+        highlight = Image.new('RGBA', (max_x - min_x + 4, max_y - min_y + 4), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(highlight)
+        for i in selected:
+            x1 = store.xs[i] - min_x
+            y1 = store.ys[i] - min_y
+            draw.rectangle([x1, y1, x1 + store.widths[i], y1 + store.heights[i]], fill=HIGHLIGHT_COLOR)
+        self.photo = ImageTk.PhotoImage(highlight)
+        self.canvas.delete('highlight')
+        self.canvas.create_image(min_x - 2, min_y - 2, image=self.photo, anchor='nw', tags='highlight')
+
+
+class RecordingCanvas:
+    """只记录图像项位置、图像和显示状态的假画布"""
+
+    def __init__(self):
+        self.items = {}
+        self._next = 1
+
+    def create_image(self, x, y, image=None, anchor='nw', tags=None):
+        item = self._next
+        self._next += 1
+        self.items[item] = {'coords': (x, y), 'image': image, 'state': 'normal'}
+        return item
+
+    def coords(self, item, x, y):
+        self.items[item]['coords'] = (x, y)
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def delete(self, tag):
+        self.items.clear()
+
+    def compose(self, width, height, background=(255, 255, 255, 255)):
+        """把显示中的图像项按创建顺序叠加到背景上"""
+        image = Image.new('RGBA', (width, height), background)
+        for item in sorted(self.items):
+            info = self.items[item]
+            if info['state'] != 'hidden':
+                x, y = info['coords']
+                image.alpha_composite(info['image'], (x, y))
+        return image
+
+
+class HeadlessRenderer(HighlightRenderer):
+    """图块使用 PIL 图像而不是 PhotoImage，不需要 Tk"""
+
+    def _make_tile(self, width, height):
+        return Image.new('RGBA', (width, height), self.color)
+
+
+def overlapping_line(count=40, x=20, y=40, height=24):
+    """一行互相重叠 2 像素或留 1 像素缝隙的文本块（逐字拆分的取整误差即是如此）"""
+    store = TextBlockStore()
+    for i in range(count):
+        store.append(chr(0x4E00 + i), x, y, 20, height)
+        x += 18 if i % 2 == 0 else 21
+    return store
+
+
+def check_overlap():
+    """
+    重叠文本块不应被画得更深：合成结果中选中区域只能有一种高亮颜色，
+    且与原实现（一张图像上画所有矩形）的颜色一致
+
+    Returns:
+        检查是否通过
+    """
+    store = overlapping_line()
+    width = max(x + w for x, w in zip(store.xs, store.widths)) + 10
+    height = max(y + h for y, h in zip(store.ys, store.heights)) + 10
+    selected = set(range(len(store)))
+
+    canvas = RecordingCanvas()
+    renderer = HeadlessRenderer(canvas, store)
+    # 分几步选中再取消一部分，覆盖复用画布项的路径
+    renderer.update(range(0, 10), ())
+    renderer.update(range(10, len(store)), ())
+    renderer.update((), range(5, 15))
+    renderer.update(range(5, 15), ())
+    colors = {color for _, color in canvas.compose(width, height).getcolors(width * height)}
+
+    original = Image.new('RGBA', (width, height), (255, 255, 255, 255))
+    min_x = min(store.xs[i] for i in selected)
+    min_y = min(store.ys[i] for i in selected)
+    layer = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    for i in selected:
+        x1, y1 = store.xs[i] - min_x, store.ys[i] - min_y
+        draw.rectangle([x1, y1, x1 + store.widths[i], y1 + store.heights[i]], fill=HIGHLIGHT_COLOR)
+    original.alpha_composite(layer, (min_x, min_y))
+    expected = {color for _, color in original.getcolors(width * height)}
+
+    per_block = RecordingCanvas()
+    for i in selected:
+        per_block.create_image(store.xs[i], store.ys[i],
+                               image=Image.new('RGBA', (store.widths[i], store.heights[i]), HIGHLIGHT_COLOR))
+    per_block_colors = {color for _, color in per_block.compose(width, height).getcolors(width * height)}
+
+    print(f"重叠文本块: {len(store)} 个，合并后画布项: {renderer.visible_count}")
+    print(f"合成颜色数: 逐块绘制 {len(per_block_colors)}，按行合并 {len(colors)}，原实现 {len(expected)}")
+    ok = len(colors) == 2 and colors == expected and renderer.selected == selected
+    print("✓ 重叠处没有变深，颜色与原实现一致" if ok else "❌ 重叠处颜色与原实现不一致")
+    return ok
+
+
+def check_tile_cache(count=400):
+    """
+    拖拽中段宽不断变化时图块应基本命中缓存，缓存保持有界，显示中的图块不被淘汰
+
+    Returns:
+        检查是否通过
+    """
+    store = TextBlockStore()
+    for i in range(count):
+        # 第一行间隔 3 像素，不合并，所有段同宽；第二行首尾相接，合并后的段宽每帧增长
+        store.append(chr(0x4E00 + i % 100), 10 + i * 6, 40, 3, 20)
+        store.append(chr(0x4E00 + i % 100), 10 + i * 3, 80, 3, 22)
+    canvas = RecordingCanvas()
+    renderer = HeadlessRenderer(canvas, store)
+    largest = 0
+    ok = True
+    for i in range(count):
+        renderer.update((2 * i, 2 * i + 1), ())
+        # 每种高度的图块宽度只有 2 的幂，最多为段宽的位数
+        widest = max(x + w for x, w in zip(store.xs[:2 * i + 2], store.widths[:2 * i + 2])) - 10
+        ok = ok and renderer.stats['tiles'] <= 2 * widest.bit_length()
+        largest = max(largest, len(renderer._tiles))
+        shown = [info['image'] for info in canvas.items.values() if info['state'] != 'hidden']
+        cached = {id(tile) for tile in renderer._tiles.values()}
+        in_use = len({id(image) for image in shown})
+        ok = ok and all(id(image) in cached for image in shown) and len(cached) <= max(MAX_TILES, in_use)
+    print(f"拖拽 {count} 帧: 新建图块 {renderer.stats['tiles']} 个，淘汰 {renderer.stats['evicted']} 个，"
+          f"缓存最多 {largest} 个（上限 {MAX_TILES}）")
+    print("✓ 图块基本命中缓存，缓存有界，显示中的图块未被淘汰" if ok
+          else "❌ 图块新建过多、缓存超出上限或淘汰了显示中的图块")
+    return ok
+
+
+def drag_frames(store, frames):
+    """从布局左上角拖到右下角的选择框序列，最后一帧覆盖全部文本块"""
+    max_x = max(x + w for x, w in zip(store.xs, store.widths))
+    max_y = max(y + h for y, h in zip(store.ys, store.heights))
+    return [(0, 0, max_x * i // frames, max_y * i // frames) for i in range(1, frames + 1)]
+
+
+def run_composed(root, canvas, store, index, rects):
+    layer = ComposedHighlight(canvas, store)
+    timings = []
+    for rect in rects:
+        start = time.perf_counter()
+        layer.draw(index.query_rect(*rect))
+        root.update_idletasks()
+        timings.append((time.perf_counter() - start) * 1000)
+    canvas.delete('highlight')
+    return timings
+
+
+def run_renderer(root, canvas, store, index, rects):
+    renderer = HighlightRenderer(canvas, store)
+    tracker = SelectionTracker(index)
+    timings = []
+    for rect in rects:
+        start = time.perf_counter()
+        added, removed = tracker.update(*rect)
+        if added or removed:
+            renderer.update(added, removed)
+        root.update_idletasks()
+        timings.append((time.perf_counter() - start) * 1000)
+    renderer.destroy()
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="选择高亮渲染微基准测试")
+    parser.add_argument("--sizes", default="10,1000,10000", help="文本块数量，逗号分隔")
+    parser.add_argument("--frames", type=int, default=60, help="每次拖拽的帧数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    ok = check_overlap()
+    print()
+    ok = check_tile_cache() and ok
+    print()
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"跳过：无法创建 Tk 窗口（{e}）")
+        return 0 if ok else 1
+    root.geometry(f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}+0+0")
+    canvas = tk.Canvas(root, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, highlightthickness=0)
+    canvas.pack()
+    root.update()
+
+    print(f"{'文本块':>8}{'实现':>10}{'平均(ms)':>12}{'p95(ms)':>12}{'最大(ms)':>12}")
+    try:
+        for size in (int(s) for s in args.sizes.split(',')):
+            store = code_layout(size, SCREEN_WIDTH, SCREEN_HEIGHT, seed=args.seed)
+            index = GridIndex.from_store(store)
+            rects = drag_frames(store, args.frames)
+            results = (("整图合成", run_composed(root, canvas, store, index, rects)),
+                       ("画布项池", run_renderer(root, canvas, store, index, rects)))
+            for name, timings in results:
+                print(f"{size:>8}{name:>10}{sum(timings) / len(timings):>12.2f}"
+                      f"{percentile(timings, 95):>12.2f}{max(timings):>12.2f}")
+            print(f"{'':8}加速: {sum(results[0][1]) / sum(results[1][1]):.1f}x")
+    finally:
+        root.destroy()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
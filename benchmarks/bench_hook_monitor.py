@@ -0,0 +1,113 @@
+"""
+键盘钩子延迟监控微基准测试
+用合成延迟序列测试 HookLatencyMonitor。处理耗时大部分亚毫秒，夹杂 GIL 竞争造成的长耗时；
+排队延迟按 GetTickCount 粒度跳变:
+    1. 每次 record() 的耗时（钩子回调中的额外开销）
+    2. 校验环形缓冲区回绕后两个序列的样本和直方图、按总延迟的告警/超时计数与直接按列表计算的结果一致
+    3. 校验 missed_input() 在 GetTickCount 回绕前后的判断
+
+用法:
+    python benchmarks/bench_hook_monitor.py
+    python benchmarks/bench_hook_monitor.py --calls 200000 --timeout 300
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hook_monitor import (  # noqa: E402
+    INPUT_GRACE_MS, LEVEL_OK, LEVEL_OVER, LEVEL_WARN, RING_CAPACITY, SERIES_PROCESS, SERIES_QUEUE,
+    HookLatencyMonitor
+)
+
+
+def latency_stream(count, timeout_ms, seed):
+    """
+    合成延迟 [(处理耗时, 排队延迟)]（毫秒）:
+        处理耗时：99.5% 为 0.02~0.3ms，其余为接近/超过预算的长耗时
+        排队延迟：GetTickCount 粒度（0、15.6、31.2... 的整数毫秒）
+    """
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        if rng.random() < 0.995:
+            process_ms = rng.uniform(0.02, 0.3)
+        else:
+            process_ms = rng.uniform(timeout_ms * 0.3, timeout_ms * 1.5)
+        roll = rng.random()
+        queued_ms = 0 if roll < 0.9 else int(rng.choice((15.6, 31.2, 46.8)) if roll < 0.999 else timeout_ms)
+        values.append((process_ms, queued_ms))
+    return values
+
+
+def reference_histogram(values, bounds):
+    counts = [0] * (len(bounds) + 1)
+    for value in values:
+        counts[next((i for i, bound in enumerate(bounds) if value < bound), len(bounds))] += 1
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="键盘钩子延迟监控微基准测试")
+    parser.add_argument("--calls", type=int, default=100000, help="回调次数")
+    parser.add_argument("--timeout", type=int, default=300, help="超时预算（毫秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    values = latency_stream(args.calls, args.timeout, args.seed)
+    monitor = HookLatencyMonitor(timeout_ms=args.timeout)
+    record = monitor.record
+    levels = []
+    start = time.perf_counter()
+    for tick, (process_ms, queued_ms) in enumerate(values):
+        levels.append(record(process_ms, queued_ms, tick))
+    record_ns = (time.perf_counter() - start) * 1e9 / len(values)
+
+    print(f"{len(values)} 次回调，超时预算 {args.timeout} ms，环形缓冲区 {RING_CAPACITY} 项")
+    print(f"record(): {record_ns:.0f} ns/次")
+    print(monitor.format_report())
+
+    failures = 0
+    recent = list(deque(values, maxlen=RING_CAPACITY))
+    for index, series in enumerate((SERIES_PROCESS, SERIES_QUEUE)):
+        expected_samples = [float(value[index]) for value in recent]
+        if monitor.samples(series) != expected_samples:
+            print(f"❌ {series}: 环形缓冲区样本与最近的回调不一致")
+            failures += 1
+        histogram = monitor.histogram(series)
+        bounds = [float(label.split()[1]) for label, _ in histogram[:-1]]
+        if [count for _, count in histogram] != reference_histogram(expected_samples, bounds):
+            print(f"❌ {series}: 直方图计数不一致")
+            failures += 1
+    totals = [process_ms + queued_ms for process_ms, queued_ms in values]
+    expected = [LEVEL_OK if v < args.timeout / 2 else LEVEL_WARN if v < args.timeout else LEVEL_OVER for v in totals]
+    if levels != expected or monitor.stats['warnings'] != expected.count(LEVEL_WARN) \
+            or monitor.stats['over_budget'] != expected.count(LEVEL_OVER):
+        print("❌ 告警/超时分级不一致")
+        failures += 1
+
+    # GetTickCount 回绕：最后一次回调在回绕前，最后一次输入在回绕后
+    wrap = HookLatencyMonitor(timeout_ms=args.timeout)
+    wrap.record(0.1, 0, 0xFFFFFF00)
+    cases = [
+        (0xFFFFFF00 + 10, False),                              # 输入与回调几乎同时
+        ((0xFFFFFF00 + INPUT_GRACE_MS + 500) & 0xFFFFFFFF, True),  # 回绕后仍有输入
+        (0xFFFFFF00 - 5000, False),                            # 输入早于回调
+    ]
+    if HookLatencyMonitor(timeout_ms=args.timeout).missed_input(12345) or \
+            any(wrap.missed_input(tick) != missed for tick, missed in cases):
+        print("❌ missed_input 判断不一致")
+        failures += 1
+
+    if failures:
+        return 1
+    print("✓ 两个序列的样本和直方图、分级和钩子移除判断与参考实现一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+快捷键匹配微基准测试
+用合成按键流（普通打字 + 快捷键，包含左右修饰键、按住自动重复和 ESC）对比原钩子回调
+（每次拆分快捷键字符串、重建虚拟键码集合、all(any(...)) 检查）与 HotkeyMatcher:
+    1. 校验两种实现产生的触发/松开事件序列完全一致
+    2. 统计每个按键事件的平均处理耗时（分别统计快捷键以外的按键和全部按键）
+
+不需要 Win32，钩子回调中的状态处理在这里用纯 Python 模拟
+
+用法:
+    python benchmarks/bench_hotkey_matcher.py
+    python benchmarks/bench_hotkey_matcher.py --events 200000 --hotkeys "alt,ctrl+shift+q"
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hotkey_matcher import KEY_MAPPING, HotkeyMatcher  # noqa: E402
+
+KEY_DOWN, KEY_UP = 0, 1
+VK_ESCAPE = 27
+DEFAULT_HOTKEYS = "alt,ctrl+shift,ctrl+alt+a,win+f1,unknown+ctrl"
+
+
+class ReferenceHook:
+    """原 keyboard_hook_proc 的状态处理"""
+
+    def __init__(self, hotkey):
+        self.hotkey = hotkey
+        self.key_mapping = KEY_MAPPING
+        self.pressed_keys = set()
+        self.key_press_time = 0
+        self.events = []
+
+    def __call__(self, seq, vk, action):
+        if vk == VK_ESCAPE and action == KEY_DOWN:
+            self.key_press_time = 0
+            self.events.append(('esc', seq))
+            return
+        hotkey_parts = self.hotkey.lower().split('+')
+        current_key_codes = set()
+        for key in hotkey_parts:
+            if key in self.key_mapping:
+                current_key_codes.update(self.key_mapping[key])
+        if vk in current_key_codes:
+            if action == KEY_DOWN:
+                if self.key_press_time > 0:
+                    return
+                self.pressed_keys.add(vk)
+                if all(any(code in self.pressed_keys for code in self.key_mapping.get(key, [])) for key in hotkey_parts):
+                    self.key_press_time = seq
+                    self.events.append(('trigger', seq))
+            else:
+                self.pressed_keys.discard(vk)
+                self.key_press_time = 0
+                self.events.append(('release', seq))
+
+
+class MatcherHook:
+    """使用 HotkeyMatcher 的状态处理（与 screen_ocr_overlay 中的回调相同）"""
+
+    def __init__(self, hotkey):
+        self.hotkey_matcher = HotkeyMatcher(hotkey)
+        self.key_press_time = 0
+        self.events = []
+
+    def __call__(self, seq, vk, action):
+        if vk == VK_ESCAPE and action == KEY_DOWN:
+            self.key_press_time = 0
+            self.events.append(('esc', seq))
+            return
+        matcher = self.hotkey_matcher
+        if matcher is not None and vk in matcher.vk_codes:
+            if action == KEY_DOWN:
+                if self.key_press_time > 0:
+                    return
+                if matcher.key_down(vk):
+                    self.key_press_time = seq
+                    self.events.append(('trigger', seq))
+            else:
+                matcher.key_up(vk)
+                self.key_press_time = 0
+                self.events.append(('release', seq))
+
+
+def key_stream(count, hotkey, seed):
+    """
+    合成按键流：以打字为主，穿插按下快捷键（随机选择左右修饰键、随机顺序、按住时自动重复、
+    随机顺序松开）、其他修饰键组合和 ESC
+    """
+    rng = random.Random(seed)
+    typing = [vk for name, codes in KEY_MAPPING.items() if len(name) == 1 or name in ('space', 'enter', 'backspace')
+              for vk in codes]
+    parts = [KEY_MAPPING.get(part, [rng.choice(typing)]) for part in hotkey.lower().split('+')]
+    modifiers = KEY_MAPPING['ctrl'] + KEY_MAPPING['shift'] + KEY_MAPPING['alt']
+    events = []
+    while len(events) < count:
+        roll = rng.random()
+        if roll < 0.85:
+            vk = rng.choice(typing)
+            events += [(vk, KEY_DOWN), (vk, KEY_UP)]
+        elif roll < 0.95:
+            keys = [rng.choice(codes) for codes in parts]
+            rng.shuffle(keys)
+            events += [(vk, KEY_DOWN) for vk in keys]
+            events += [(keys[-1], KEY_DOWN)] * rng.randint(0, 20)
+            if rng.random() < 0.2:
+                events.append((VK_ESCAPE, KEY_DOWN))
+            rng.shuffle(keys)
+            events += [(vk, KEY_UP) for vk in keys]
+        else:
+            mod, vk = rng.choice(modifiers), rng.choice(typing)
+            events += [(mod, KEY_DOWN), (vk, KEY_DOWN), (vk, KEY_UP), (mod, KEY_UP)]
+    return events[:count]
+
+
+def replay(hook, events):
+    start = time.perf_counter()
+    for seq, (vk, action) in enumerate(events, 1):
+        hook(seq, vk, action)
+    return (time.perf_counter() - start) * 1e9 / max(len(events), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="快捷键匹配微基准测试")
+    parser.add_argument("--events", type=int, default=100000, help="每个快捷键的按键事件数")
+    parser.add_argument("--hotkeys", default=DEFAULT_HOTKEYS, help="逗号分隔的快捷键")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    print(f"{'快捷键':16}{'事件数':>8}{'触发':>6}{'原实现(ns/键)':>15}{'匹配器(ns/键)':>15}"
+          f"{'非快捷键 原/匹配器(ns)':>24}")
+    for hotkey in args.hotkeys.split(','):
+        events = key_stream(args.events, hotkey, args.seed)
+        reference, matcher = ReferenceHook(hotkey), MatcherHook(hotkey)
+        ref_ns, new_ns = replay(reference, events), replay(matcher, events)
+        if matcher.events != reference.events:
+            print(f"❌ {hotkey}: 事件序列不一致（{len(matcher.events)} / {len(reference.events)} 个事件）")
+            failures += 1
+            continue
+        codes = matcher.hotkey_matcher.vk_codes | {VK_ESCAPE}
+        others = [event for event in events if event[0] not in codes]
+        other_ref, other_new = replay(ReferenceHook(hotkey), others), replay(MatcherHook(hotkey), others)
+        triggers = sum(1 for kind, _ in matcher.events if kind == 'trigger')
+        print(f"{hotkey:16}{len(events):>8}{triggers:>6}{ref_ns:>15.0f}{new_ns:>15.0f}"
+              f"{other_ref:>14.0f} / {other_new:<8.0f}")
+
+    if failures:
+        return 1
+    print("✓ 所有快捷键的触发/松开事件序列与原实现一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""
+键盘钩子线程测试与微基准
+不需要 Win32，用线程模拟钩子线程的消息循环和 Tk 主线程:
+    1. 状态机：合成按键流经 HotkeyStateMachine -> KeyEventChannel -> 主线程，校验主线程收到的
+       按下/松开/ESC 事件序列和最终状态与原钩子回调（bench_hotkey_matcher.ReferenceHook）一致
+    2. 通道：发送线程连续发送事件，接收线程被唤醒后取出，校验不丢失、不乱序，统计每次发送的耗时
+    3. 按键延迟：主线程反复执行较长的操作（构建覆盖层等），对比钩子回调在主线程中执行（原实现，
+       只能在两次操作之间处理）与在专用线程中执行时，从按键产生到回调处理的延迟。
+       主线程的操作分两种：Tk/Pillow 的 C 代码（释放 GIL，用 sleep 模拟）和纯 Python 计算（持有 GIL，
+       钩子线程最多等待一个 GIL 切换间隔）
+    4. 唤醒路径：钩子回调中 send() 的耗时。线程版 Tcl 中从其他线程调用 TkNotifier.notify
+       （event_generate）要等主线程执行完当前的 Tk 回调；对比 notify 直接在钩子线程调用与经
+       ThreadWaker 转交。先用"等待主线程当前操作结束"的 notify 模拟，有图形环境时再用真实的
+       Tk 根窗口和 TkNotifier 测量（无图形环境时跳过）
+
+用法:
+    python benchmarks/bench_keyboard_hook.py
+    python benchmarks/bench_keyboard_hook.py --busy-ms 200 --keys 100
+"""
+import argparse
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_hotkey_matcher import DEFAULT_HOTKEYS, KEY_DOWN, ReferenceHook, key_stream  # noqa: E402
+from event_loop import ThreadWaker, TkNotifier  # noqa: E402
+from hotkey_matcher import HotkeyMatcher  # noqa: E402
+from keyboard_hook import (  # noqa: E402
+    KEY_ESCAPE, KEY_PRESS, KEY_RELEASE, WM_KEYDOWN, WM_KEYUP, HotkeyStateMachine, KeyEventChannel
+)
+
+REFERENCE_KINDS = {'trigger': KEY_PRESS, 'release': KEY_RELEASE, 'esc': KEY_ESCAPE}
+
+
+class UiModel:
+    """主线程：被通知唤醒后取出事件并应用（与 ScreenOCRTool._handle_key_events 相同）"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.received = []
+        self.key_press_time = 0
+        self.wakeups = 0
+        self._wake = threading.Event()
+        self._stop = False
+        channel.notify = self._wake.set
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self.wakeups += 1
+            for kind, value in self.channel.drain():
+                self.received.append((kind, value))
+                self.key_press_time = value if kind == KEY_PRESS else 0
+            if self._stop and not len(self.channel):
+                return
+
+    def close(self):
+        self._stop = True
+        self._wake.set()
+        self.thread.join()
+
+
+def check_state_machine(hotkey, events):
+    """按键流经状态机和通道后与原钩子回调比较，返回错误信息或 None"""
+    reference = ReferenceHook(hotkey)
+    for seq, (vk, action) in enumerate(events, 1):
+        reference(seq, vk, action)
+    expected = [(REFERENCE_KINDS[kind], float(seq) if kind == 'trigger' else 0.0) for kind, seq in reference.events]
+
+    seq = [0]
+    state = HotkeyStateMachine(HotkeyMatcher(hotkey), clock=lambda: float(seq[0]))
+    channel = KeyEventChannel()
+    ui = UiModel(channel)
+    for seq[0], (vk, action) in enumerate(events, 1):
+        event = state.on_key(vk, WM_KEYDOWN if action == KEY_DOWN else WM_KEYUP)
+        if event is not None:
+            channel.send(*event)
+    ui.close()
+    if ui.received != expected:
+        return f"事件序列不一致（{len(ui.received)} / {len(expected)} 个事件）"
+    if ui.key_press_time != reference.key_press_time:
+        return f"最终状态不一致（{ui.key_press_time} / {reference.key_press_time}）"
+    return None
+
+
+def stress_channel(count):
+    """发送线程连续发送 count 个事件，返回 (错误信息或 None, ns/次, 接收方唤醒次数)"""
+    channel = KeyEventChannel()
+    ui = UiModel(channel)
+    start = time.perf_counter()
+    for i in range(count):
+        channel.send(KEY_PRESS, float(i))
+    send_ns = (time.perf_counter() - start) * 1e9 / count
+    ui.close()
+    values = [value for _, value in ui.received]
+    if values != [float(i) for i in range(count)]:
+        return f"收到 {len(values)} / {count} 个事件或顺序错误", send_ns, ui.wakeups
+    return None, send_ns, ui.wakeups
+
+
+def busy_python(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+def busy_native(seconds):
+    time.sleep(seconds)
+
+
+def measure_latency(dedicated, busy, busy_ms, keys, seed):
+    """
+    主线程反复执行 busy_ms 的操作，另一个线程模拟用户按键
+
+    Args:
+        dedicated: True 时钩子回调在专用线程执行，否则在主线程两次操作之间执行
+
+    Returns:
+        每次按键从产生到回调处理的延迟（毫秒）
+    """
+    rng = random.Random(seed)
+    messages = queue.Queue()  # 模拟钩子线程/主线程的消息队列（GetMessage）
+    latencies = []
+    state = HotkeyStateMachine(HotkeyMatcher("alt"))
+    done = threading.Event()
+
+    def hook_proc(posted):
+        state.on_key(65, WM_KEYDOWN)
+        latencies.append((time.perf_counter() - posted) * 1000)
+
+    def hook_thread():
+        while True:
+            posted = messages.get()
+            if posted is None:
+                return
+            hook_proc(posted)
+
+    def main_thread():
+        while not done.is_set():
+            busy(busy_ms / 1000)
+            if not dedicated:
+                while not messages.empty():
+                    hook_proc(messages.get_nowait())
+
+    threads = [threading.Thread(target=main_thread)]
+    if dedicated:
+        threads.append(threading.Thread(target=hook_thread))
+    for thread in threads:
+        thread.start()
+    for _ in range(keys):
+        time.sleep(rng.uniform(0.01, 0.04))
+        messages.put(time.perf_counter())
+    while len(latencies) < keys:
+        time.sleep(0.01)
+    done.set()
+    if dedicated:
+        messages.put(None)
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def measure_send(notify, busy_ms, keys, seed, start_busy=None):
+    """
+    发送线程在主线程忙碌期间调用 channel.send，返回每次 send 的耗时（毫秒）
+
+    Args:
+        notify: 通道的 notify（直接调用或 ThreadWaker.wake）
+        start_busy: 让主线程开始一次 busy_ms 的操作，返回操作结束的 Event
+    """
+    rng = random.Random(seed)
+    channel = KeyEventChannel(notify)
+    durations = []
+    for _ in range(keys):
+        finished = start_busy()
+        time.sleep(rng.uniform(0, busy_ms / 2000))
+        start = time.perf_counter()
+        channel.send(KEY_PRESS, 0.0)
+        durations.append((time.perf_counter() - start) * 1000)
+        finished.wait()
+    return durations
+
+
+class BusyMainModel:
+    """模拟线程版 Tcl：其他线程的 notify 要等主线程当前的操作结束才返回"""
+
+    def __init__(self, busy_ms):
+        self.busy_ms = busy_ms
+        self.lock = threading.Lock()
+        self.notified = 0
+
+    def start_busy(self):
+        finished = threading.Event()
+        started = threading.Event()
+
+        def run():
+            with self.lock:
+                started.set()
+                time.sleep(self.busy_ms / 1000)
+            finished.set()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+        return finished
+
+    def notify(self):
+        with self.lock:
+            self.notified += 1
+
+
+class TkMainModel:
+    """真实的 Tk 主线程：mainloop 中执行 busy_ms 的回调，TkNotifier 唤醒后计数"""
+
+    def __init__(self, busy_ms):
+        import tkinter as tk
+        self.busy_ms = busy_ms
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.notifier = TkNotifier(self.root, self._handle)
+        self.handled = 0
+        self._requests = queue.Queue()
+        self.threaded = bool(int(self.root.tk.eval('info exists tcl_platform(threaded)')))
+
+    def _handle(self):
+        self.handled += 1
+
+    def _poll(self):
+        # 主线程取出"开始忙碌"请求（测试控制用，不计入测量）
+        try:
+            started, finished = self._requests.get_nowait()
+        except queue.Empty:
+            self.root.after(1, self._poll)
+            return
+        started.set()
+        time.sleep(self.busy_ms / 1000)  # 模拟较长的 Tk 回调（构建覆盖层等）
+        finished.set()
+        self.root.after(1, self._poll)
+
+    def start_busy(self):
+        started, finished = threading.Event(), threading.Event()
+        self._requests.put((started, finished))
+        started.wait()
+        return finished
+
+    def run(self, work):
+        """在另一个线程中执行 work，主线程运行 mainloop 直到 work 结束"""
+        result = []
+
+        def worker():
+            try:
+                result.append(work())
+            finally:
+                self.root.after(0, self.root.quit)
+
+        self.root.after(1, self._poll)
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.mainloop()
+        self.root.update()
+        return result[0] if result else None
+
+    def close(self):
+        self.root.destroy()
+
+
+def print_send(name, durations):
+    values = sorted(durations)
+    print(f"{name:24}{sum(values) / len(values):>12.3f}{values[int(len(values) * 0.95)]:>10.3f}{values[-1]:>10.3f}")
+
+
+def compare_wakeup_paths(busy_ms, keys, seed):
+    """对比钩子线程直接 notify 与经 ThreadWaker，返回错误信息列表"""
+    errors = []
+    print(f"\n钩子回调中 send() 的耗时（主线程每次操作 {busy_ms:.0f} ms）")
+    print(f"{'唤醒路径':24}{'平均(ms)':>12}{'P95(ms)':>10}{'最大(ms)':>10}")
+    model = BusyMainModel(busy_ms)
+    direct = measure_send(model.notify, busy_ms, keys, seed, model.start_busy)
+    print_send("模拟: 直接 notify", direct)
+    waker = ThreadWaker(model.notify)
+    woken = measure_send(waker.wake, busy_ms, keys, seed, model.start_busy)
+    waker.stop()
+    print_send("模拟: ThreadWaker", woken)
+    if max(woken) > 5:
+        errors.append(f"模拟: ThreadWaker 的 send() 最长 {max(woken):.1f} ms")
+
+    try:
+        tk_model = TkMainModel(busy_ms)
+    except Exception:
+        print("跳过：无法创建 Tk 窗口")
+        return errors
+    try:
+        print(f"（Tcl {'线程版' if tk_model.threaded else '非线程版'}）")
+        direct = tk_model.run(lambda: measure_send(tk_model.notifier.notify, busy_ms, keys, seed,
+                                                   tk_model.start_busy))
+        print_send("Tk: 直接 notify", direct)
+        waker = ThreadWaker(tk_model.notifier.notify)
+        handled = tk_model.handled
+        woken = tk_model.run(lambda: measure_send(waker.wake, busy_ms, keys, seed, tk_model.start_busy))
+        waker.stop()
+        print_send("Tk: ThreadWaker", woken)
+        if max(woken) > 5:
+            errors.append(f"Tk: ThreadWaker 的 send() 最长 {max(woken):.1f} ms")
+        if tk_model.handled == handled:
+            errors.append("Tk: ThreadWaker 没有唤醒主线程")
+    finally:
+        tk_model.close()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="键盘钩子线程测试与微基准")
+    parser.add_argument("--events", type=int, default=50000, help="每个快捷键的按键事件数")
+    parser.add_argument("--hotkeys", default=DEFAULT_HOTKEYS, help="逗号分隔的快捷键")
+    parser.add_argument("--channel-events", type=int, default=200000, help="通道压力测试的事件数")
+    parser.add_argument("--busy-ms", type=float, default=120, help="主线程每次操作的耗时")
+    parser.add_argument("--keys", type=int, default=60, help="按键延迟测试的按键次数")
+    parser.add_argument("--wake-keys", type=int, default=20, help="唤醒路径测试的按键次数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for hotkey in args.hotkeys.split(','):
+        error = check_state_machine(hotkey, key_stream(args.events, hotkey, args.seed))
+        if error:
+            print(f"❌ {hotkey}: {error}")
+            failures += 1
+    if not failures:
+        print("✓ 状态机经通道送达主线程的事件序列与原钩子回调一致")
+
+    error, send_ns, wakeups = stress_channel(args.channel_events)
+    if error:
+        print(f"❌ 通道: {error}")
+        failures += 1
+    else:
+        print(f"✓ 通道 {args.channel_events} 个事件不丢失、不乱序，发送 {send_ns:.0f} ns/次，接收方唤醒 {wakeups} 次")
+
+    print(f"\n主线程每次操作 {args.busy_ms:.0f} ms，{args.keys} 次按键")
+    print(f"{'主线程操作':16}{'钩子所在线程':12}{'平均延迟(ms)':>14}{'P95(ms)':>10}{'最大(ms)':>10}")
+    for busy_name, busy in (("C 代码(释放GIL)", busy_native), ("Python(持有GIL)", busy_python)):
+        for dedicated in (False, True):
+            values = sorted(measure_latency(dedicated, busy, args.busy_ms, args.keys, args.seed))
+            print(f"{busy_name:16}{'专用线程' if dedicated else '主线程':12}{sum(values) / len(values):>14.2f}"
+                  f"{values[int(len(values) * 0.95)]:>10.2f}{values[-1]:>10.2f}")
+
+    for error in compare_wakeup_paths(args.busy_ms, args.wake_keys, args.seed):
+        print(f"❌ {error}")
+        failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
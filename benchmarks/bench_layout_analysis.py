@@ -0,0 +1,189 @@
+"""
+版面分析（阅读顺序重建）微基准测试
+1. 黄金用例：在合成的多栏页面（双栏、错位基线、侧边栏、通栏标题）上校验复制文本按栏输出，
+   表格按行输出
+2. 在全屏多栏页面（默认约 10k 个文本块）上对比只分行与 XY-cut 版面分析的耗时
+
+用法:
+    python benchmarks/bench_layout_analysis.py
+    python benchmarks/bench_layout_analysis.py --columns 4 --blocks 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_blocks import TextBlockStore  # noqa: E402
+import text_layout  # noqa: E402
+
+CHAR_W, GLYPH_H, LINE_PITCH, PARAGRAPH_GAP = 8, 12, 16, 12
+
+
+class Page:
+    """合成页面：记录文本块及其应有的阅读顺序文本"""
+
+    def __init__(self):
+        self.store = TextBlockStore()
+        self.expected_lines = []
+
+    def line(self, words, x, y, height=GLYPH_H, gap=CHAR_W):
+        for word in words:
+            width = len(word) * CHAR_W
+            self.store.append(word, x, y, width, height)
+            x += width + gap
+        self.expected_lines.append(' '.join(words))
+        return x
+
+    def column(self, x, y, paragraphs, width_chars, rng, tag):
+        """在 (x, y) 开始排一栏文字，返回栏底部的 y"""
+        for p in range(paragraphs):
+            for n in range(rng.randint(2, 5)):
+                words, used = [], 0
+                while True:
+                    word = f"{tag}{p}.{n}.{len(words)}"[:rng.randint(3, 9)] + str(len(words))
+                    if used + len(word) > width_chars and words:
+                        break
+                    words.append(word)
+                    used += len(word) + 1
+                self.line(words, x, y)
+                y += LINE_PITCH
+            y += PARAGRAPH_GAP
+        return y
+
+    @property
+    def expected(self):
+        return '\n'.join(self.expected_lines)
+
+
+def two_columns(offset=0):
+    rng = random.Random(1)
+    page = Page()
+    page.column(0, 0, 3, 40, rng, 'L')
+    page.column(40 * CHAR_W + 48, offset, 3, 40, rng, 'R')
+    return page
+
+
+def sidebar():
+    rng = random.Random(2)
+    page = Page()
+    page.column(0, 0, 4, 12, rng, 'S')
+    page.column(12 * CHAR_W + 64, 0, 3, 50, rng, 'M')
+    return page
+
+
+def heading_over_columns():
+    rng = random.Random(3)
+    page = Page()
+    page.line(["Quarterly", "Report", "Overview", "and", "Outlook"], 0, 0, height=24, gap=12)
+    top = 24 + 20
+    page.column(0, top, 2, 30, rng, 'A')
+    page.column(30 * CHAR_W + 48, top, 2, 30, rng, 'B')
+    return page
+
+
+def table():
+    page = Page()
+    rows = [("Name", "Qty", "Price"), ("apple", "3", "1.20"), ("banana", "12", "0.50"), ("cherry", "100", "9.99")]
+    col_x = (0, 160, 280)
+    for c, x in enumerate(col_x):
+        for r, row in enumerate(rows):
+            page.store.append(row[c], x, r * LINE_PITCH, len(row[c]) * CHAR_W, GLYPH_H)
+    # 表格按行复制，同一行的单元格留在一行
+    page.expected_lines.extend(' '.join(row) for row in rows)
+    return page
+
+
+def single_column():
+    rng = random.Random(4)
+    page = Page()
+    page.column(0, 0, 3, 60, rng, 'P')
+    return page
+
+
+def wide_words_single_line():
+    """单行中间距很大的单词不应被当成多栏"""
+    page = Page()
+    page.line(["Total", "42"], 0, 0, gap=120)
+    return page
+
+
+GOLDEN_CASES = [
+    ("双栏（基线对齐）", two_columns),
+    ("双栏（基线错位）", lambda: two_columns(offset=7)),
+    ("侧边栏 + 正文", sidebar),
+    ("通栏标题 + 双栏", heading_over_columns),
+    ("表格按行", table),
+    ("单栏与只分行一致", single_column),
+    ("单行宽间距", wide_words_single_line),
+]
+
+
+def check_golden():
+    failures = 0
+    for name, build in GOLDEN_CASES:
+        page = build()
+        ids = list(range(len(page.store)))
+        random.Random(0).shuffle(ids)
+        actual = text_layout.merge_text(page.store, ids, layout_analysis=True)
+        if actual != page.expected:
+            failures += 1
+            print(f"❌ {name}\n  期望: {page.expected!r}\n  实际: {actual!r}")
+    return failures
+
+
+def full_screen_page(columns, blocks, seed):
+    """全屏多栏页面，栏数固定，行数按块数增加"""
+    rng = random.Random(seed)
+    page = Page()
+    width_chars = 2560 // CHAR_W // columns - 8
+    per_column = blocks // columns
+    for c in range(columns):
+        x = c * (width_chars + 8) * CHAR_W
+        y = 0
+        start = len(page.store)
+        while len(page.store) - start < per_column:
+            y = page.column(x, y, 1, width_chars, rng, chr(ord('A') + c))
+    return page
+
+
+def timed(func, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="版面分析微基准测试")
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--blocks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = check_golden()
+    print(f"黄金用例: {len(GOLDEN_CASES)} 个合成页面，{failures} 个失败")
+
+    page = full_screen_page(args.columns, args.blocks, args.seed)
+    ids = set(range(len(page.store)))
+    lines_ms, _ = timed(lambda: text_layout.merge_text(page.store, ids), args.repeat)
+    layout_ms, text = timed(lambda: text_layout.merge_text(page.store, ids, layout_analysis=True), args.repeat)
+    print(f"{len(page.store)} 个文本块，{args.columns} 栏，{len(page.expected_lines)} 行")
+    print(f"只分行:       {lines_ms:9.1f} ms")
+    print(f"XY-cut 版面分析:{layout_ms:9.1f} ms（{layout_ms / lines_ms:.1f}x）")
+    if text != page.expected:
+        print("❌ 全屏多栏页面的阅读顺序不正确")
+        failures += 1
+    else:
+        print("✓ 全屏多栏页面按栏输出")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
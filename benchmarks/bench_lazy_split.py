@@ -0,0 +1,131 @@
+"""
+延迟拆分微基准测试
+对比覆盖层显示前拆分全部 OCR 行（原实现）与 LineSplitIndex 按需拆分的可交互前耗时，
+回放拖拽轨迹统计实际拆分的行数，并校验每次拖拽选中的可选单元一致（子块编号分配顺序不同，按文本和位置比较）
+
+用法:
+    python benchmarks/bench_lazy_split.py
+    python benchmarks/bench_lazy_split.py --lines 3000 --traces 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_spatial_index import synthetic_traces  # noqa: E402
+from selection import SelectionTracker  # noqa: E402
+from spatial_index import GridIndex, LineSplitIndex  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+from text_classify import width_units  # noqa: E402
+import text_layout  # noqa: E402
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 2560, 1440
+CJK = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性好应开它合还因由其些然前外天政四日"
+
+
+def ocr_lines(count, seed):
+    """合成全屏 OCR 行：中英混排，每行 10~60 个字符"""
+    rng = random.Random(seed)
+    store = TextBlockStore()
+    x, y = 8, 8
+    line_h, char_w = 18, 9
+    for _ in range(count):
+        parts = []
+        length = 0
+        target = rng.randint(10, 60)
+        while length < target:
+            if rng.random() < 0.5:
+                word = ''.join(rng.choice(CJK) for _ in range(rng.randint(2, 8)))
+            else:
+                word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9)))
+            parts.append(word)
+            length += len(word) + 1
+        text = rng.choice((' ', ', ', '')).join(parts)
+        units = width_units(text)
+        width = units * char_w
+        if x + width > SCREEN_WIDTH - 8:
+            x = 8
+            y += line_h + 4
+            if y + line_h > SCREEN_HEIGHT:
+                y = 8 + rng.randint(1, line_h)
+        store.append(text, x, y, width, line_h)
+        x += width + char_w * 6
+    return store
+
+
+def build_eager(lines):
+    """原实现：显示前拆分全部行，再对全部子块建网格索引"""
+    blocks = TextBlockStore()
+    for text, x, y, w, h in zip(lines.texts(), lines.xs, lines.ys, lines.widths, lines.heights):
+        text_layout.split_selectable(text, x, y, w, h, blocks)
+    return blocks, GridIndex.from_store(blocks)
+
+
+def build_lazy(lines):
+    blocks = TextBlockStore()
+    return blocks, LineSplitIndex(lines, blocks, text_layout.split_selectable)
+
+
+def replay(blocks, index, traces):
+    """回放拖拽，返回每次松开鼠标时选中的 (文本, x, y, 宽, 高) 列表和每个事件的耗时（毫秒）"""
+    tracker = SelectionTracker(index)
+    selections, timings = [], []
+    for events in traces:
+        sx, sy = events[0]
+        tracker.reset()
+        for x, y in events[1:]:
+            start = time.perf_counter()
+            tracker.update(min(sx, x), min(sy, y), max(sx, x), max(sy, y))
+            timings.append((time.perf_counter() - start) * 1000)
+        selections.append(sorted((blocks.text(i),) + blocks.rect(i) for i in tracker.selected))
+    return selections, timings
+
+
+def timed_build(build, lines, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = build(lines)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="延迟拆分微基准测试")
+    parser.add_argument("--lines", type=int, default=1500, help="OCR 行数")
+    parser.add_argument("--traces", type=int, default=10, help="模拟拖拽次数")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    lines = ocr_lines(args.lines, args.seed)
+    chars = sum(len(t) for t in lines.texts())
+    eager_ms, (eager_blocks, eager_index) = timed_build(build_eager, lines, args.repeat)
+    lazy_ms, (lazy_blocks, lazy_index) = timed_build(build_lazy, lines, args.repeat)
+    print(f"{len(lines)} 行，{chars} 个字符，全部拆分后 {len(eager_blocks)} 个可选单元")
+    print(f"可交互前耗时  全部拆分: {eager_ms:8.1f} ms    按需拆分: {lazy_ms:8.1f} ms"
+          f"（{eager_ms / lazy_ms:.0f}x）")
+
+    traces = synthetic_traces(args.traces, SCREEN_WIDTH, SCREEN_HEIGHT, args.seed)
+    eager_selections, eager_times = replay(eager_blocks, eager_index, traces)
+    lazy_selections, lazy_times = replay(lazy_blocks, lazy_index, traces)
+    events = len(eager_times)
+    print(f"拖拽 {len(traces)} 次，{events} 个事件，平均每事件  全部拆分: {sum(eager_times) / events:.3f} ms"
+          f"    按需拆分: {sum(lazy_times) / events:.3f} ms（含首次拆分）")
+    print(f"按需拆分的行: {lazy_index.split_lines}/{len(lines)}，子块 {len(lazy_blocks)}/{len(eager_blocks)}")
+
+    if eager_selections != lazy_selections:
+        mismatches = sum(a != b for a, b in zip(eager_selections, lazy_selections))
+        print(f"❌ {mismatches} 次拖拽的选择结果不一致")
+        return 1
+    print("✓ 选择结果一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+主循环微基准测试
+对比原主循环（root.update() + sleep(10ms) 忙等，check_state 每 50ms 轮询）与事件驱动主循环
+（mainloop() + TkNotifier 唤醒 + 一次性触发定时器）:
+    1. 空闲：统计若干秒内主线程被唤醒的次数和占用的 CPU 时间
+    2. 触发：后台线程模拟快捷键按下（设置按下时间并通知），统计从延迟到期到触发回调执行的额外延迟
+
+默认使用 Tk（需要图形环境：Windows 或带 DISPLAY 的 X11）；无法创建 Tk 窗口或指定 --headless 时，
+改用 HeadlessRoot 模型：按 Tk 的语义实现 after / after_idle / event_generate / update / mainloop，
+两种主循环的代码不变，结果反映的是循环结构本身的唤醒次数和延迟，不含 Tk 绘制和 Tcl 调用的开销
+
+用法:
+    python benchmarks/bench_main_loop.py
+    python benchmarks/bench_main_loop.py --idle 5 --triggers 20 --delay 300
+    python benchmarks/bench_main_loop.py --headless
+"""
+import argparse
+import heapq
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_loop import NotifyingQueue, TkNotifier  # noqa: E402
+
+
+class HeadlessRoot:
+    """不需要图形环境的 Tk 根窗口模型：定时器、空闲回调和跨线程事件，单线程执行回调"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._timers = []  # (到期时间, 序号, 回调)
+        self._cancelled = set()
+        self._idle = []
+        self._events = []
+        self._bindings = {}
+        self._ids = itertools.count()
+        self._quit = False
+
+    def bind(self, sequence, callback):
+        self._bindings[sequence] = callback
+
+    def event_generate(self, sequence, when='tail'):
+        """任意线程：把虚拟事件放入事件队列并唤醒主循环"""
+        with self._cond:
+            self._events.append(sequence)
+            self._cond.notify()
+
+    def after(self, ms, callback):
+        with self._cond:
+            timer_id = next(self._ids)
+            heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, timer_id, callback))
+            return timer_id
+
+    def after_idle(self, callback):
+        self._idle.append(callback)
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def _take_ready(self):
+        """取出已到期的定时器和已到达的事件（调用时持有锁）"""
+        now = time.perf_counter()
+        ready = []
+        while self._timers and self._timers[0][0] <= now:
+            _, timer_id, callback = heapq.heappop(self._timers)
+            if timer_id in self._cancelled:
+                self._cancelled.discard(timer_id)
+            else:
+                ready.append(callback)
+        for sequence in self._events:
+            callback = self._bindings.get(sequence)
+            if callback:
+                ready.append(callback)
+        self._events.clear()
+        ready.extend(self._idle)
+        self._idle.clear()
+        return ready
+
+    def update(self):
+        """处理所有已就绪的事件，不等待"""
+        with self._cond:
+            ready = self._take_ready()
+        for callback in ready:
+            callback()
+
+    def mainloop(self):
+        """等待并处理事件，直到 quit()"""
+        self._quit = False
+        while not self._quit:
+            with self._cond:
+                ready = self._take_ready()
+                if not ready:
+                    timeout = self._timers[0][0] - time.perf_counter() if self._timers else None
+                    self._cond.wait(timeout)
+                    continue
+            for callback in ready:
+                callback()
+
+    def quit(self):
+        self._quit = True
+
+    def withdraw(self):
+        pass
+
+    def destroy(self):
+        with self._cond:
+            self._timers.clear()
+            self._events.clear()
+            self._idle.clear()
+
+
+class PollingLoop:
+    """原实现：忙等循环 + 50ms 轮询"""
+
+    def __init__(self, root, delay_ms):
+        self.root = root
+        self.delay_ms = delay_ms
+        self.key_press_time = 0.0
+        self.running = True
+        self.wakeups = 0
+        self.latencies = []
+
+    def press(self):
+        """后台线程：模拟快捷键按下"""
+        self.key_press_time = time.time()
+
+    def check_state(self):
+        self.wakeups += 1
+        if self.key_press_time > 0 and (time.time() - self.key_press_time) * 1000 >= self.delay_ms:
+            self.latencies.append((time.time() - self.key_press_time) * 1000 - self.delay_ms)
+            self.key_press_time = 0
+        if self.running:
+            self.root.after(50, self.check_state)
+
+    def run(self, seconds):
+        self.root.after(50, self.check_state)
+        end = time.time() + seconds
+        while time.time() < end:
+            self.root.update()
+            self.wakeups += 1
+            time.sleep(0.01)
+        self.running = False
+
+
+class EventLoop:
+    """事件驱动：通知唤醒 + 一次性定时器"""
+
+    def __init__(self, root, delay_ms):
+        self.root = root
+        self.delay_ms = delay_ms
+        self.key_press_time = 0.0
+        self.latencies = []
+        self.timer_fires = 0
+        self._timer = None
+        self.notifier = TkNotifier(root, self.process)
+        self.tasks = NotifyingQueue(self.notifier.notify)
+
+    def press(self):
+        self.key_press_time = time.time()
+        self.notifier.notify()
+
+    def process(self):
+        while not self.tasks.empty():
+            self.tasks.get_nowait()()
+        if self.key_press_time > 0 and self._timer is None:
+            remaining = max(0, int(self.delay_ms - (time.time() - self.key_press_time) * 1000))
+            self._timer = self.root.after(remaining, self.fire)
+
+    def fire(self):
+        self.timer_fires += 1
+        self._timer = None
+        elapsed_ms = (time.time() - self.key_press_time) * 1000
+        if elapsed_ms >= self.delay_ms:
+            self.latencies.append(elapsed_ms - self.delay_ms)
+            self.key_press_time = 0
+        else:
+            self.process()
+
+    @property
+    def wakeups(self):
+        return self.notifier.stats['wakeups'] + self.timer_fires
+
+    def run(self, seconds):
+        self.root.after(int(seconds * 1000), lambda: self.tasks.put(self.root.quit))
+        self.root.mainloop()
+
+
+def simulate(loop, seconds, triggers, delay_ms, seed):
+    """在 seconds 秒内由后台线程按下 triggers 次快捷键，返回 (唤醒次数, CPU 毫秒)"""
+    rng = random.Random(seed)
+    interval = seconds / max(triggers, 1)
+
+    def presser():
+        for _ in range(triggers):
+            time.sleep(delay_ms / 1000 + rng.uniform(0.05, max(0.06, interval - delay_ms / 1000)))
+            loop.press()
+
+    if triggers:
+        threading.Thread(target=presser, daemon=True).start()
+    cpu = time.process_time()
+    loop.run(seconds)
+    return loop.wakeups, (time.process_time() - cpu) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="主循环微基准测试")
+    parser.add_argument("--idle", type=float, default=3.0, help="空闲测量秒数")
+    parser.add_argument("--triggers", type=int, default=10, help="模拟触发次数")
+    parser.add_argument("--delay", type=int, default=300, help="触发延迟（毫秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--headless", action="store_true", help="使用 HeadlessRoot 模型而不是 Tk")
+    args = parser.parse_args(argv)
+
+    root = None
+    if not args.headless:
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+        except Exception as e:
+            print(f"无法创建 Tk 窗口（{e}），改用 HeadlessRoot 模型")
+    if root is None:
+        root = HeadlessRoot()
+        print("HeadlessRoot 模型：不含 Tk 绘制和 Tcl 调用的开销")
+    root.withdraw()
+
+    trigger_seconds = args.triggers * (args.delay / 1000 + 0.3)
+    print(f"快捷键延迟 {args.delay}ms；额外延迟 = 按下到显示覆盖层的时间 - 快捷键延迟")
+    print(f"{'实现':10}{'空闲唤醒/秒':>12}{'空闲CPU(ms/秒)':>16}{'额外延迟平均(ms)':>18}"
+          f"{'最大(ms)':>10}{'按下到显示平均(ms)':>20}")
+    results = {}
+    try:
+        for name, cls in (("轮询", PollingLoop), ("事件驱动", EventLoop)):
+            wakeups, cpu_ms = simulate(cls(root, args.delay), args.idle, 0, args.delay, args.seed)
+            loop = cls(root, args.delay)
+            simulate(loop, trigger_seconds, args.triggers, args.delay, args.seed)
+            latencies = loop.latencies or [0.0]
+            mean = sum(latencies) / len(latencies)
+            results[name] = (wakeups / args.idle, mean)
+            print(f"{name:10}{wakeups / args.idle:>12.1f}{cpu_ms / args.idle:>16.2f}"
+                  f"{mean:>18.1f}{max(latencies):>10.1f}{args.delay + mean:>20.1f}")
+    finally:
+        root.destroy()
+    (old_wakeups, old_latency), (new_wakeups, new_latency) = results["轮询"], results["事件驱动"]
+    ok = new_wakeups < old_wakeups and new_latency <= old_latency
+    print("✓ 事件驱动主循环空闲唤醒更少，触发延迟不高于轮询" if ok
+          else "❌ 事件驱动主循环没有减少空闲唤醒或增加了触发延迟")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
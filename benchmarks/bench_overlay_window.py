@@ -0,0 +1,158 @@
+"""
+覆盖层窗口微基准测试
+模拟多次触发（显示等待状态 -> 切换为结果状态 -> 关闭），对比:
+    - 原实现：每个状态新建 Toplevel、Canvas、合成图和 PhotoImage，切换时销毁重建
+    - OverlayWindow：窗口在第一次触发时创建，之后切换状态时原地替换遮罩、边框颜色
+    - OverlayPool：启动时预先创建隐藏的覆盖层，第一次触发也只写入截图并显示
+分别统计首次触发和平均的等待状态显示耗时、切换为结果状态的耗时（含 update_idletasks），
+以及触发过程中新建窗口/Tk 图像的次数
+
+需要图形环境（Windows 或带 DISPLAY 的 X11），否则跳过
+
+用法:
+    python benchmarks/bench_overlay_window.py
+    python benchmarks/bench_overlay_window.py --size 3840x2160 --triggers 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageTk  # noqa: E402
+from overlay_window import (BORDER_WIDTH, RESULT_BORDER, RESULT_MASK, WAITING_BORDER,  # noqa: E402
+                            WAITING_MASK, OverlayPool, OverlayWindow)
+
+
+class RebuildOverlay:
+    """原 show_overlay_text：每个状态都销毁旧窗口并重新创建"""
+
+    def __init__(self, root):
+        self.root = root
+        self.window = None
+        self.stats = {'windows': 0, 'photos': 0}
+
+    def show(self, screenshot, geometry, waiting):
+        import tkinter as tk
+        if self.window:
+            self.window.destroy()
+        x, y, width, height = geometry
+        self.window = tk.Toplevel(self.root)
+        self.window.withdraw()
+        self.window.attributes('-topmost', True)
+        self.window.overrideredirect(True)
+        self.window.geometry(f"{width}x{height}+{x}+{y}")
+        canvas = tk.Canvas(self.window, highlightthickness=0, bg='black', width=width, height=height,
+                           cursor='wait' if waiting else 'arrow')
+        canvas.grid(row=0, column=0, sticky='nsew')
+        masked = screenshot.copy()
+        mask = Image.new('RGBA', masked.size, WAITING_MASK if waiting else RESULT_MASK)
+        masked = Image.alpha_composite(masked.convert('RGBA'), mask)
+        canvas.photo = ImageTk.PhotoImage(masked)
+        canvas.create_image(0, 0, image=canvas.photo, anchor='nw')
+        if waiting:
+            canvas.create_text(width / 2, height / 2, text="识别中，请稍后...", fill='white')
+        color = WAITING_BORDER if waiting else RESULT_BORDER
+        for rect in ((0, 0, width, BORDER_WIDTH), (0, height - BORDER_WIDTH, width, height),
+                     (0, 0, BORDER_WIDTH, height), (width - BORDER_WIDTH, 0, width, height)):
+            canvas.create_rectangle(*rect, fill=color, outline='')
+        self.window.deiconify()
+        self.window.lift()
+        self.stats['windows'] += 1
+        self.stats['photos'] += 1
+        self.window.update_idletasks()
+
+    def show_waiting(self, screenshot, geometry):
+        self.show(screenshot, geometry, True)
+
+    def show_result(self, screenshot, geometry):
+        self.show(screenshot, geometry, False)
+
+    def hide(self):
+        if self.window:
+            self.window.destroy()
+            self.window = None
+
+
+class ReusedOverlay:
+    """OverlayWindow；pooled 为 True 时由 OverlayPool 在启动时预先创建（不计入触发耗时）"""
+
+    def __init__(self, root, geometry, pooled=False):
+        if pooled:
+            pool = OverlayPool(root)
+            pool.refresh([geometry])
+            self.overlay = pool.get(geometry)
+        else:
+            self.overlay = OverlayWindow(root)
+        self._baseline = dict(self.overlay.stats)
+
+    @property
+    def stats(self):
+        """触发过程中的计数（不含预创建）"""
+        return {key: value - self._baseline[key] for key, value in self.overlay.stats.items()}
+
+    def show_waiting(self, screenshot, geometry):
+        self.overlay.show_waiting(screenshot, geometry)
+
+    def show_result(self, screenshot, geometry):
+        self.overlay.show_result()
+        self.overlay.window.update_idletasks()
+
+    def hide(self):
+        self.overlay.hide()
+
+
+def screenshots(count, size, seed):
+    """合成截图：每次触发一张不同的噪声图"""
+    rng = random.Random(seed)
+    return [Image.frombytes('RGB', size, rng.randbytes(size[0] * size[1] * 3)) for _ in range(count)]
+
+
+def run(impl, shots, geometry):
+    waiting, result = [], []
+    for shot in shots:
+        start = time.perf_counter()
+        impl.show_waiting(shot, geometry)
+        waiting.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        impl.show_result(shot, geometry)
+        result.append((time.perf_counter() - start) * 1000)
+        impl.hide()
+    return waiting, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="覆盖层窗口微基准测试")
+    parser.add_argument("--size", default="2560x1440", help="屏幕尺寸，如 3840x2160")
+    parser.add_argument("--triggers", type=int, default=5, help="模拟触发次数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"跳过：无法创建 Tk 窗口（{e}）")
+        return 0
+    root.withdraw()
+
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    geometry = (0, 0, width, height)
+    shots = screenshots(args.triggers, (width, height), args.seed)
+    print(f"{width}x{height}，触发 {args.triggers} 次")
+    print(f"{'实现':12}{'首次等待(ms)':>14}{'等待状态(ms)':>14}{'切换结果(ms)':>14}{'新建窗口':>10}{'新建图像':>10}")
+    try:
+        for name, impl in (("销毁重建", RebuildOverlay(root)), ("原地切换", ReusedOverlay(root, geometry)),
+                           ("预创建池", ReusedOverlay(root, geometry, pooled=True))):
+            waiting, result = run(impl, shots, geometry)
+            print(f"{name:12}{waiting[0]:>14.1f}{sum(waiting) / len(waiting):>14.1f}"
+                  f"{sum(result) / len(result):>14.1f}{impl.stats['windows']:>10}{impl.stats['photos']:>10}")
+    finally:
+        root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
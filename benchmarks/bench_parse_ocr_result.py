@@ -0,0 +1,184 @@
+"""
+_parse_ocr_result 微基准测试
+对比原始解析（为每个条目构建结果字典，返回字典列表）与按列解析（直接写入 TextBlockStore）
+的耗时，并校验输出完全一致
+
+按列解析不以解析速度为目标：两者都逐条判断坐标格式，耗时基本相当（合成结果上按列解析约慢一成）；
+它的作用是让结果直接以 TextBlockStore 交给覆盖层，不再为每个文本块保留一个字典
+
+默认使用 fake_wcocr 生成的各格式结果（每个 5000+ 条目）；
+也可以用 --fixtures 指定 fake_wcocr 录制的真实结果目录
+
+用法:
+    python benchmarks/bench_parse_ocr_result.py
+    python benchmarks/bench_parse_ocr_result.py --items 20000 --repeat 10
+    python benchmarks/bench_parse_ocr_result.py --fixtures wcocr_fixtures/
+"""
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_wcocr  # noqa: E402
+import wechat_ocr_wrapper  # noqa: E402
+
+
+def reference_parse(result):
+    """原始实现（返回字典列表），作为正确性和耗时的对照"""
+    parsed_results = []
+    if not result:
+        return parsed_results
+    try:
+        if isinstance(result, dict):
+            ocr_response = result.get('ocr_response', [])
+            if not ocr_response:
+                for key in ['result', 'results', 'data', 'text', 'texts']:
+                    if key in result:
+                        ocr_response = result[key]
+                        break
+        elif isinstance(result, list):
+            ocr_response = result
+        else:
+            return parsed_results
+        skipped_count = 0
+        for item in ocr_response:
+            try:
+                text = item.get('text', '') or item.get('word', '')
+                if not text:
+                    continue
+                if 'left' in item and 'right' in item:
+                    left = item.get('left', 0)
+                    top = item.get('top', 0)
+                    right = item.get('right', 0)
+                    bottom = item.get('bottom', 0)
+                    x = int(left)
+                    y = int(top)
+                    width = int(right - left)
+                    height = int(bottom - top)
+                elif 'pos' in item:
+                    pos = item['pos']
+                    x = pos.get('x', 0)
+                    y = pos.get('y', 0)
+                    width = pos.get('width', 0)
+                    height = pos.get('height', 0)
+                elif 'location' in item:
+                    loc = item['location']
+                    x = loc.get('left', 0)
+                    y = loc.get('top', 0)
+                    width = loc.get('width', 0)
+                    height = loc.get('height', 0)
+                else:
+                    x = item.get('x', 0)
+                    y = item.get('y', 0)
+                    width = item.get('width', 0) or item.get('w', 0)
+                    height = item.get('height', 0) or item.get('h', 0)
+                if len(text) > 0 and width > 0 and height > 0:
+                    parsed_results.append({
+                        'text': text,
+                        'x': int(x),
+                        'y': int(y),
+                        'width': int(width),
+                        'height': int(height)
+                    })
+                else:
+                    skipped_count += 1
+            except Exception as e:
+                logging.warning(f"解析 OCR 结果项失败: {str(e)}")
+                continue
+        if skipped_count > 0:
+            logging.warning(f"跳过了 {skipped_count} 个无效的OCR项")
+    except Exception as e:
+        logging.error(f"解析 OCR 结果失败: {str(e)}")
+    return parsed_results
+
+
+def build_cases(items: int):
+    """各条目格式 + 外层结构的组合，另加混合格式和含无效条目的结果"""
+    blocks = fake_wcocr.sample_blocks(items, seed=1)
+    cases = []
+    for fmt in fake_wcocr.ITEM_FORMATS:
+        cases.append((f"{fmt}/ocr_response", fake_wcocr.make_response(blocks, fmt, "ocr_response")))
+    cases.append(("ltrb/list", fake_wcocr.make_response(blocks, "ltrb", "list")))
+    cases.append(("pos/data", fake_wcocr.make_response(blocks, "pos", "data")))
+
+    # 混合格式：每 50 条插入一个其他格式的条目
+    mixed = [fake_wcocr.make_item(block, "ltrb") for block in blocks]
+    for i in range(0, len(mixed), 50):
+        mixed[i] = fake_wcocr.make_item(blocks[i], fake_wcocr.ITEM_FORMATS[(i // 50) % 6])
+    cases.append(("mixed", {'ocr_response': mixed}))
+
+    # 含无效条目：空文本、零宽高、非字典、缺字段
+    dirty = [fake_wcocr.make_item(block, "xywh") for block in blocks]
+    for i in range(0, len(dirty), 37):
+        dirty[i] = [None, {'text': ''}, {'text': 'a', 'x': 1, 'y': 1, 'width': 0, 'height': 5},
+                    "bad", {'text': 'b', 'x': 1}, {'text': 'c', 'x': 1, 'y': 2, 'w': 3, 'h': 4}][i % 6]
+    cases.append(("dirty", {'ocr_response': dirty}))
+    return cases
+
+
+def load_fixture_cases(directory: str):
+    return [(f"fixture/{sha1[:8]}", entry['response'])
+            for sha1, entry in sorted(fake_wcocr.load_fixtures(directory).items())]
+
+
+def timed(func, result, repeat: int) -> float:
+    """返回最快一次的耗时（毫秒），计时期间关闭垃圾回收以减少抖动"""
+    best = float('inf')
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(result)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="_parse_ocr_result 微基准测试")
+    parser.add_argument("--items", type=int, default=5000, help="每个合成结果的条目数")
+    parser.add_argument("--repeat", type=int, default=20, help="每个用例重复次数（取最快一次）")
+    parser.add_argument("--fixtures", help="fake_wcocr 录制的结果目录")
+    args = parser.parse_args(argv)
+
+    # 屏蔽解析过程中的汇总警告
+    logging.getLogger().setLevel(logging.ERROR)
+
+    wrapper = wechat_ocr_wrapper.WeChatOCRWrapper.__new__(wechat_ocr_wrapper.WeChatOCRWrapper)
+
+    def optimized(result):
+        return wrapper._parse_ocr_result(result)
+
+    cases = load_fixture_cases(args.fixtures) if args.fixtures else build_cases(args.items)
+    mismatches = 0
+    total_ref = total_new = 0.0
+    print(f"{'用例':<22}{'条目':>8}{'原始(ms)':>12}{'按列(ms)':>12}{'耗时比':>8}  一致")
+    for name, result in cases:
+        expected = reference_parse(result)
+        actual = optimized(result).to_dicts()
+        same = expected == actual
+        mismatches += not same
+        ref_ms = timed(reference_parse, result, args.repeat)
+        new_ms = timed(optimized, result, args.repeat)
+        total_ref += ref_ms
+        total_new += new_ms
+        ratio = new_ms / ref_ms if ref_ms > 0 else 0.0
+        print(f"{name:<22}{len(expected):>8}{ref_ms:>12.2f}{new_ms:>12.2f}{ratio:>7.2f}x  {'✓' if same else '✗'}")
+
+    if total_ref > 0:
+        print(f"{'合计':<22}{'':>8}{total_ref:>12.2f}{total_new:>12.2f}{total_new / total_ref:>7.2f}x")
+    if mismatches:
+        print(f"❌ {mismatches} 个用例输出不一致")
+        return 1
+    print("✓ 所有用例输出一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
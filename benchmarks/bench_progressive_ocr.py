@@ -0,0 +1,142 @@
+"""
+渐进识别微基准测试
+用合成引擎模拟整屏识别与按条带识别（ocr_engines.recognize_bands）:
+    1. 可交互时间：整屏识别要等全部完成；按条带识别在第一个条带（鼠标所在条带）完成后即可选择
+    2. 校验条带结果合并后与整屏识别一致（重叠区域不重复、不遗漏）
+    3. 把条带逐个追加到 LineSplitIndex，期间保持一个进行中的拖拽选择，
+       校验最终选择和拖拽回放结果与一次性建索引一致
+
+合成引擎的耗时按 固定开销 + 每百万像素耗时 计算（sleep），只返回完整落在输入图像内的文字行；
+输入图像为 'I' 模式，每行像素值即该行在整屏中的纵坐标，引擎据此得到条带位置
+
+用法:
+    python benchmarks/bench_progressive_ocr.py
+    python benchmarks/bench_progressive_ocr.py --bands 6 --ms-per-mp 200 --cursor-y 1200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image  # noqa: E402
+
+from bench_lazy_split import SCREEN_HEIGHT, SCREEN_WIDTH, ocr_lines, replay  # noqa: E402
+from bench_spatial_index import synthetic_traces  # noqa: E402
+import ocr_engines  # noqa: E402
+from selection import SelectionTracker  # noqa: E402
+from spatial_index import LineSplitIndex  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+import text_layout  # noqa: E402
+
+ENGINE_NAME = "bench_synthetic"
+
+
+class SyntheticEngine:
+    """按图像位置返回合成页面中的文字行，并模拟识别耗时"""
+
+    def __init__(self, page, call_ms, ms_per_mp):
+        self.page = page
+        self.call_ms = call_ms
+        self.ms_per_mp = ms_per_mp
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    def ocr_pil_image(self, image, preprocess=False):
+        self.calls += 1
+        top = image.getpixel((0, 0))
+        bottom = top + image.height
+        time.sleep((self.call_ms + self.ms_per_mp * image.width * image.height / 1e6) / 1000)
+        page = self.page
+        result = TextBlockStore()
+        for text, x, y, w, h in zip(page.texts(), page.xs, page.ys, page.widths, page.heights):
+            if top <= y and y + h < bottom:
+                result.append(text, x, y - top, w, h)
+        return result
+
+
+def row_coded_screenshot(width, height):
+    """每行像素值为行号的 'I' 模式图像"""
+    column = Image.frombytes('I', (1, height), b''.join(y.to_bytes(4, sys.byteorder) for y in range(height)))
+    return column.resize((width, height), Image.NEAREST)
+
+
+def as_tuples(store):
+    return sorted(zip(store.texts(), store.xs, store.ys, store.widths, store.heights))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="渐进识别微基准测试")
+    parser.add_argument("--lines", type=int, default=1500, help="OCR 行数")
+    parser.add_argument("--bands", type=int, default=ocr_engines.PROGRESSIVE_BANDS)
+    parser.add_argument("--call-ms", type=float, default=20, help="每次识别调用的固定开销")
+    parser.add_argument("--ms-per-mp", type=float, default=100, help="每百万像素的识别耗时")
+    parser.add_argument("--cursor-y", type=int, default=SCREEN_HEIGHT * 2 // 3, help="鼠标纵坐标（最先识别的条带）")
+    parser.add_argument("--traces", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    page = ocr_lines(args.lines, args.seed)
+    engine = SyntheticEngine(page, args.call_ms, args.ms_per_mp)
+    ocr_engines.register_engine(ENGINE_NAME, lambda: engine, display_name="合成引擎")
+    screenshot = row_coded_screenshot(SCREEN_WIDTH, SCREEN_HEIGHT)
+    split = text_layout.split_selectable
+
+    # 整屏识别
+    start = time.perf_counter()
+    full = ocr_engines.recognize(ENGINE_NAME, screenshot)
+    full_ms = (time.perf_counter() - start) * 1000
+
+    # 按条带识别，边识别边追加到索引，同时保持一个覆盖下半屏的拖拽选择
+    blocks = TextBlockStore()
+    index = LineSplitIndex(TextBlockStore(), blocks, split)
+    tracker = SelectionTracker(index)
+    drag = (0, SCREEN_HEIGHT // 2, SCREEN_WIDTH, SCREEN_HEIGHT)
+    tracker.update(*drag)
+    arrivals = []
+    start = time.perf_counter()
+    for band in ocr_engines.recognize_bands(ENGINE_NAME, screenshot, bands=args.bands, first_y=args.cursor_y):
+        new_lines = index.add_lines(band)
+        tracker.add_candidates(index.query_rect(*drag, lines=new_lines))
+        arrivals.append(((time.perf_counter() - start) * 1000, len(band)))
+    progressive_ms = arrivals[-1][0]
+
+    print(f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}，{len(page)} 行，{args.bands} 个条带，"
+          f"合成引擎 {args.call_ms:.0f} ms/次 + {args.ms_per_mp:.0f} ms/百万像素")
+    print(f"整屏识别:   可交互 {full_ms:7.0f} ms")
+    print(f"按条带识别: 可交互 {arrivals[0][0]:7.0f} ms（鼠标所在条带，{arrivals[0][1]} 行），"
+          f"全部完成 {progressive_ms:7.0f} ms")
+    print("  条带完成时间: " + "  ".join(f"{ms:.0f} ms/{count} 行" for ms, count in arrivals))
+
+    failures = 0
+    if as_tuples(index.lines) != as_tuples(full):
+        print(f"❌ 条带结果合并后与整屏识别不一致（{len(index.lines)} / {len(full)} 行）")
+        failures += 1
+    else:
+        print("✓ 条带结果合并后与整屏识别一致")
+
+    eager_blocks = TextBlockStore()
+    eager_index = LineSplitIndex(full, eager_blocks, split)
+    expected_drag = sorted((eager_blocks.text(i),) + eager_blocks.rect(i) for i in eager_index.query_rect(*drag))
+    actual_drag = sorted((blocks.text(i),) + blocks.rect(i) for i in tracker.selected)
+    if actual_drag != expected_drag:
+        print(f"❌ 识别过程中的拖拽选择不一致（{len(actual_drag)} / {len(expected_drag)} 个单元）")
+        failures += 1
+    else:
+        print(f"✓ 识别过程中的拖拽选择随条带到达更新（{len(actual_drag)} 个单元）")
+
+    traces = synthetic_traces(args.traces, SCREEN_WIDTH, SCREEN_HEIGHT, args.seed)
+    if replay(blocks, index, traces)[0] != replay(eager_blocks, eager_index, traces)[0]:
+        print("❌ 拖拽回放结果与一次性建索引不一致")
+        failures += 1
+    else:
+        print("✓ 拖拽回放结果与一次性建索引一致")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
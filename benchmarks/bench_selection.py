@@ -0,0 +1,122 @@
+"""
+增量选择微基准测试
+回放拖拽轨迹，对比每个鼠标事件重新计算整个选择与 SelectionTracker 增量更新的耗时，
+并统计选择不变（跳过重绘）的事件比例和需要更新的高亮画布项数；
+另按事件时的选中文本块数分档，比较每档的平均耗时，检查增量更新的耗时是否随选择规模增长
+
+用法:
+    python benchmarks/bench_selection.py
+    python benchmarks/bench_selection.py --blocks 20000 --traces 50
+    python benchmarks/bench_selection.py --trace traces/drag_20240601_120000_85.json
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_spatial_index import code_layout, percentile, synthetic_traces  # noqa: E402
+from selection import SelectionTracker  # noqa: E402
+from spatial_index import GridIndex, load_drag_trace  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 2560, 1440
+
+
+def replay_full(index, traces):
+    """原实现：每个事件重新查询整个选择框，与上次结果比较"""
+    timings, selections = [], []
+    for events in traces:
+        sx, sy = events[0]
+        previous = set()
+        for x, y in events[1:]:
+            start = time.perf_counter()
+            selected = index.query_rect(min(sx, x), min(sy, y), max(sx, x), max(sy, y))
+            changed = selected != previous
+            previous = selected
+            timings.append((time.perf_counter() - start) * 1000)
+            selections.append((frozenset(selected), changed))
+    return timings, selections
+
+
+def replay_incremental(index, traces):
+    """SelectionTracker：只处理新旧选择框差集中的文本块"""
+    timings, selections, item_updates = [], [], []
+    tracker = SelectionTracker(index)
+    for events in traces:
+        sx, sy = events[0]
+        tracker.reset()
+        for x, y in events[1:]:
+            start = time.perf_counter()
+            added, removed = tracker.update(min(sx, x), min(sy, y), max(sx, x), max(sy, y))
+            timings.append((time.perf_counter() - start) * 1000)
+            changed = bool(added or removed)
+            selections.append((frozenset(tracker.selected), changed))
+            item_updates.append((len(added) + len(removed), len(tracker.selected)))
+    return timings, selections, item_updates
+
+
+def by_selection_size(timings, sizes, buckets=4):
+    """按选中文本块数的分位点分档，返回 [(档位上限, 该档平均耗时)]"""
+    order = sorted(range(len(sizes)), key=sizes.__getitem__)
+    result = []
+    for i in range(buckets):
+        part = order[len(order) * i // buckets:len(order) * (i + 1) // buckets]
+        if part:
+            result.append((sizes[part[-1]], sum(timings[j] for j in part) / len(part)))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="增量选择微基准测试")
+    parser.add_argument("--blocks", type=int, default=10000, help="合成布局的文本块数量")
+    parser.add_argument("--traces", type=int, default=20, help="模拟拖拽次数")
+    parser.add_argument("--trace", action="append", default=[], help="覆盖层录制的轨迹文件（可多次指定）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        store, traces = None, []
+        for path in args.trace:
+            blocks, events = load_drag_trace(path)
+            store = store or TextBlockStore(blocks)
+            traces.append(events)
+    else:
+        store = code_layout(args.blocks, SCREEN_WIDTH, SCREEN_HEIGHT, seed=args.seed)
+        traces = synthetic_traces(args.traces, SCREEN_WIDTH, SCREEN_HEIGHT, args.seed)
+    index = GridIndex.from_store(store)
+
+    full_times, full_selections = replay_full(index, traces)
+    inc_times, inc_selections, item_updates = replay_incremental(index, traces)
+
+    events = len(full_times)
+    unchanged = sum(1 for _, changed in inc_selections if not changed)
+    print(f"{len(store)} 个文本块，{len(traces)} 条拖拽，{events} 个鼠标事件")
+    print(f"{'':10}{'平均(ms)':>12}{'p50(ms)':>12}{'p95(ms)':>12}{'最大(ms)':>12}")
+    for name, timings in (("整体重算", full_times), ("增量更新", inc_times)):
+        print(f"{name:10}{sum(timings) / events:>12.3f}{percentile(timings, 50):>12.3f}"
+              f"{percentile(timings, 95):>12.3f}{max(timings):>12.3f}")
+    print(f"加速: {sum(full_times) / sum(inc_times):.1f}x")
+    sizes = [len(selected) for selected, _ in full_selections]
+    print(f"{'选中数≤':>10}{'整体重算(ms)':>14}{'增量更新(ms)':>14}")
+    for (limit, full_ms), (_, inc_ms) in zip(by_selection_size(full_times, sizes),
+                                            by_selection_size(inc_times, sizes)):
+        print(f"{limit:>10}{full_ms:>14.3f}{inc_ms:>14.3f}")
+    print(f"选择不变（跳过重绘）的事件: {unchanged}/{events} ({unchanged / events:.0%})")
+    changed = [(updates, selected) for updates, selected in item_updates if updates]
+    if changed:
+        print(f"选择变化时平均更新高亮项: {sum(u for u, _ in changed) / len(changed):.1f} 个"
+              f"（平均选中 {sum(n for _, n in changed) / len(changed):.0f} 个，原实现每次重绘全部选中块）")
+
+    if full_selections != inc_selections:
+        mismatches = sum(a != b for a, b in zip(full_selections, inc_selections))
+        print(f"❌ {mismatches} 个事件的选择结果不一致")
+        return 1
+    print("✓ 选择结果一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
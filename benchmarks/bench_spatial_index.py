@@ -0,0 +1,152 @@
+"""
+空间索引微基准测试
+在合成的密集布局（默认 10k 个单字/单词块）上回放拖拽轨迹，
+对比覆盖层原来的线性扫描与 GridIndex 的每次鼠标事件耗时，并校验结果一致
+
+轨迹来源:
+    默认生成若干条模拟拖拽（按下后沿平滑路径移动）
+    --trace 指定覆盖层录制的轨迹文件（设置 SCREEN_OCR_DRAG_TRACE_DIR 后拖拽即可录制）
+
+用法:
+    python benchmarks/bench_spatial_index.py
+    python benchmarks/bench_spatial_index.py --blocks 20000
+    python benchmarks/bench_spatial_index.py --trace traces/drag_20240601_120000_85.json
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial_index import GridIndex, load_drag_trace  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+
+
+def code_layout(count: int, width: int = 2560, height: int = 1440, seed: int = 0) -> TextBlockStore:
+    """生成代码编辑器式的密集布局：等宽小字号，每行若干单词和单字块"""
+    rng = random.Random(seed)
+    store = TextBlockStore()
+    char_w, line_h, glyph_h = 8, 15, 12
+    y = 4
+    while len(store) < count:
+        x = 4 + rng.randint(0, 8) * char_w  # 缩进
+        while x < width - 40 and len(store) < count:
+            length = rng.choice((1, 1, 1, 2, 3, 4, 6, 8))
+            w = length * char_w
+            store.append('w' * length, x, y, w, glyph_h)
+            x += w + char_w * rng.choice((0, 1, 1, 2))
+        y += line_h
+        if y + line_h > height:
+            # 屏幕放满后在行间错开继续放置，模拟更小的字号
+            y = 4 + rng.randint(1, line_h - 1)
+    return store
+
+
+def synthetic_traces(count: int, width: int, height: int, seed: int):
+    """模拟拖拽：按下点 + 沿贝塞尔曲线移动的事件序列"""
+    rng = random.Random(seed)
+    traces = []
+    for _ in range(count):
+        x0, y0 = rng.randint(0, width), rng.randint(0, height)
+        x3, y3 = rng.randint(0, width), rng.randint(0, height)
+        x1, y1 = rng.randint(0, width), rng.randint(0, height)
+        x2, y2 = rng.randint(0, width), rng.randint(0, height)
+        steps = rng.randint(30, 120)
+        events = []
+        for i in range(steps + 1):
+            t = i / steps
+            mt = 1 - t
+            x = mt ** 3 * x0 + 3 * mt * mt * t * x1 + 3 * mt * t * t * x2 + t ** 3 * x3
+            y = mt ** 3 * y0 + 3 * mt * mt * t * y1 + 3 * mt * t * t * y2 + t ** 3 * y3
+            events.append((int(x), int(y)))
+        traces.append(events)
+    return traces
+
+
+def linear_rect(store, min_x, min_y, max_x, max_y):
+    """原 on_mouse_drag 的线性扫描"""
+    selected = set()
+    for block_id, (bx1, by1, bw, bh) in enumerate(zip(store.xs, store.ys, store.widths, store.heights)):
+        if not (max_x < bx1 or min_x > bx1 + bw or max_y < by1 or min_y > by1 + bh):
+            selected.add(block_id)
+    return selected
+
+
+def linear_point(store, x, y):
+    """原 on_mouse_move 的线性扫描"""
+    for bx, by, bw, bh in zip(store.xs, store.ys, store.widths, store.heights):
+        if bx <= x <= bx + bw and by <= y <= by + bh:
+            return True
+    return False
+
+
+def replay(traces, rect_query, point_query):
+    """回放轨迹，返回每个鼠标事件的耗时列表（毫秒）和查询结果"""
+    timings = []
+    results = []
+    for events in traces:
+        sx, sy = events[0]
+        for x, y in events[1:]:
+            start = time.perf_counter()
+            selected = rect_query(min(sx, x), min(sy, y), max(sx, x), max(sy, y))
+            on_text = point_query(x, y)
+            timings.append((time.perf_counter() - start) * 1000)
+            results.append((len(selected), hash(frozenset(selected)), on_text))
+    return timings, results
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="空间索引微基准测试")
+    parser.add_argument("--blocks", type=int, default=10000, help="合成布局的文本块数量")
+    parser.add_argument("--traces", type=int, default=20, help="模拟拖拽次数")
+    parser.add_argument("--trace", action="append", default=[], help="覆盖层录制的轨迹文件（可多次指定）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        store = None
+        traces = []
+        for path in args.trace:
+            blocks, events = load_drag_trace(path)
+            if store is None:
+                store = TextBlockStore(blocks)
+            traces.append(events)
+        print(f"回放 {len(traces)} 条录制轨迹，{len(store)} 个文本块")
+    else:
+        store = code_layout(args.blocks, seed=args.seed)
+        traces = synthetic_traces(args.traces, 2560, 1440, args.seed)
+        print(f"合成布局 {len(store)} 个文本块，{len(traces)} 条模拟拖拽")
+
+    start = time.perf_counter()
+    index = GridIndex.from_store(store)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"索引构建: {build_ms:.1f} ms（单元 {index.cell_size}px，{index.cols}x{index.rows}）")
+
+    linear_times, linear_results = replay(
+        traces, lambda *r: linear_rect(store, *r), lambda x, y: linear_point(store, x, y))
+    index_times, index_results = replay(traces, index.query_rect, index.hit_point)
+
+    events = len(linear_times)
+    print(f"{'':8}{'事件':>8}{'平均(ms)':>12}{'p50(ms)':>12}{'p95(ms)':>12}")
+    for name, timings in (("线性扫描", linear_times), ("网格索引", index_times)):
+        print(f"{name:8}{events:>8}{sum(timings) / events:>12.3f}"
+              f"{percentile(timings, 50):>12.3f}{percentile(timings, 95):>12.3f}")
+    print(f"加速: {sum(linear_times) / sum(index_times):.1f}x")
+
+    if linear_results != index_results:
+        mismatches = sum(a != b for a, b in zip(linear_results, index_results))
+        print(f"❌ {mismatches} 个事件的查询结果不一致")
+        return 1
+    print("✓ 查询结果一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+后台任务执行器微基准测试
+模拟快速连续触发（每次触发一个 OCR 任务和一个翻译请求），对比原来每个任务新建线程与
+TaskExecutor 固定线程池的峰值线程数和任务完成时间，并校验:
+    1. 线程池中的线程数不随任务数增长
+    2. 按优先级执行，同优先级按提交顺序
+    3. 队列满时拒绝提交，统计的完成/拒绝次数与实际一致
+
+合成任务用 sleep 模拟识别和网络耗时；识别任务与 ocr_engines.recognize 一样持有引擎锁（同一引擎串行）
+
+用法:
+    python benchmarks/bench_task_executor.py
+    python benchmarks/bench_task_executor.py --triggers 100 --interval 5 --ocr-ms 40
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_executor import (  # noqa: E402
+    DEFAULT_POOLS, POOL_ENGINE, POOL_NETWORK, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, TaskExecutor
+)
+
+
+class PeakThreads:
+    """后台采样峰值线程数"""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.001):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def simulate(submit, triggers, interval_ms, ocr_ms, net_ms):
+    """每 interval_ms 提交一个 OCR 任务和一个翻译任务，返回 (峰值线程数, 全部完成耗时 ms, 完成数)"""
+    done = []
+    lock = threading.Lock()
+    engine_lock = threading.Lock()
+
+    def job(ms):
+        time.sleep(ms / 1000)
+        with lock:
+            done.append(ms)
+
+    def ocr_job(ms):
+        with engine_lock:
+            job(ms)
+
+    base = threading.active_count()
+    start = time.perf_counter()
+    with PeakThreads() as peak:
+        for _ in range(triggers):
+            submit(POOL_ENGINE, ocr_job, ocr_ms)
+            submit(POOL_NETWORK, job, net_ms)
+            time.sleep(interval_ms / 1000)
+        while True:
+            with lock:
+                if len(done) >= 2 * triggers:
+                    break
+            time.sleep(0.005)
+    # 扣除主线程和采样线程
+    return peak.peak - base - 1, (time.perf_counter() - start) * 1000, len(done)
+
+
+def thread_per_task(pool, func, *args):
+    threading.Thread(target=func, args=args, daemon=True).start()
+
+
+def check_priorities():
+    """单线程池被占用时提交不同优先级的任务，返回执行顺序是否正确"""
+    executor = TaskExecutor({POOL_ENGINE: (1, 16)})
+    gate = threading.Event()
+    order = []
+    executor.submit(POOL_ENGINE, gate.wait)
+    submitted = [(PRIORITY_LOW, 'low-1'), (PRIORITY_NORMAL, 'normal-1'), (PRIORITY_HIGH, 'high-1'),
+                 (PRIORITY_LOW, 'low-2'), (PRIORITY_HIGH, 'high-2'), (PRIORITY_NORMAL, 'normal-2')]
+    futures = [executor.submit(POOL_ENGINE, order.append, name, priority=priority) for priority, name in submitted]
+    gate.set()
+    for future in futures:
+        future.result(timeout=5)
+    executor.shutdown(wait=True)
+    return order == ['high-1', 'high-2', 'normal-1', 'normal-2', 'low-1', 'low-2'], order
+
+
+def check_bounded(max_queue):
+    """队列满时拒绝提交，返回 (是否正确, 统计)"""
+    executor = TaskExecutor({POOL_ENGINE: (1, max_queue)})
+    gate = threading.Event()
+    executor.submit(POOL_ENGINE, gate.wait)
+    time.sleep(0.05)  # 等第一个任务开始执行（不再占用队列）
+    accepted = [executor.submit(POOL_ENGINE, time.sleep, 0) for _ in range(max_queue + 5)]
+    rejected = sum(1 for future in accepted if future is None)
+    gate.set()
+    for future in accepted:
+        if future is not None:
+            future.result(timeout=5)
+    executor.shutdown(wait=True)
+    stats = executor.pools[POOL_ENGINE].stats
+    ok = (rejected == 5 and stats['rejected'] == 5 and stats['completed'] == max_queue + 1
+          and stats['max_depth'] == max_queue and executor.pools[POOL_ENGINE].threads == 1)
+    return ok, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="后台任务执行器微基准测试")
+    parser.add_argument("--triggers", type=int, default=60, help="连续触发次数")
+    parser.add_argument("--interval", type=float, default=10, help="触发间隔（毫秒）")
+    parser.add_argument("--ocr-ms", type=float, default=30, help="每次识别耗时")
+    parser.add_argument("--net-ms", type=float, default=80, help="每次翻译耗时")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    pools = {POOL_ENGINE: (1, args.triggers), POOL_NETWORK: (DEFAULT_POOLS[POOL_NETWORK][0], args.triggers)}
+    executor = TaskExecutor(pools)
+    print(f"{args.triggers} 次触发，间隔 {args.interval:.0f} ms，识别 {args.ocr_ms:.0f} ms，翻译 {args.net_ms:.0f} ms")
+    print(f"{'实现':14}{'峰值线程':>8}{'全部完成(ms)':>14}")
+    for name, submit in (("每任务一个线程", thread_per_task), ("TaskExecutor", executor.submit)):
+        threads, elapsed, count = simulate(submit, args.triggers, args.interval, args.ocr_ms, args.net_ms)
+        print(f"{name:14}{threads:>8}{elapsed:>14.0f}")
+        if count != 2 * args.triggers:
+            print(f"❌ {name}: 完成 {count} / {2 * args.triggers} 个任务")
+            failures += 1
+    print(executor.format_report())
+    expected_threads = sum(workers for workers, _ in pools.values())
+    if sum(pool.threads for pool in executor.pools.values()) != expected_threads:
+        print("❌ 线程池线程数随任务增长")
+        failures += 1
+    executor.shutdown(wait=True)
+
+    ok, order = check_priorities()
+    if not ok:
+        print(f"❌ 优先级顺序错误: {order}")
+        failures += 1
+    ok, stats = check_bounded(8)
+    if not ok:
+        print(f"❌ 有界队列统计不一致: {stats}")
+        failures += 1
+    if failures:
+        return 1
+    print("✓ 线程数固定，按优先级执行，队列满时拒绝提交且统计一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
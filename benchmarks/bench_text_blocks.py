@@ -0,0 +1,134 @@
+"""
+TextBlockStore 微基准测试
+对比原来的 {block_id: dict} 存储与列式 TextBlockStore 的内存占用和命中测试耗时
+
+用法:
+    python benchmarks/bench_text_blocks.py
+    python benchmarks/bench_text_blocks.py --blocks 50000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_wcocr  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+
+
+def build_dict_blocks(source):
+    """原覆盖层的存储方式：每个文本块一个字典"""
+    return {
+        block_id: {
+            'text': block['text'],
+            'x': block['x'],
+            'y': block['y'],
+            'width': block['width'],
+            'height': block['height'],
+            'selected': False
+        }
+        for block_id, block in enumerate(source)
+    }
+
+
+def build_store(source):
+    store = TextBlockStore()
+    for block in source:
+        store.append(block['text'], block['x'], block['y'], block['width'], block['height'])
+    return store
+
+
+def measure_memory(builder, source) -> int:
+    """构造过程中新分配且保留的字节数"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = builder(source)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def hit_test_dicts(blocks, rect):
+    """原 on_mouse_drag 的矩形相交扫描"""
+    min_x, min_y, max_x, max_y = rect
+    selected = set()
+    for block_id, block in blocks.items():
+        bx1, by1, bx2, by2 = block['x'], block['y'], block['x'] + block['width'], block['y'] + block['height']
+        if not (max_x < bx1 or min_x > bx2 or max_y < by1 or min_y > by2):
+            selected.add(block_id)
+    return selected
+
+
+def hit_test_store(store, rect):
+    """基于几何列的矩形相交扫描"""
+    min_x, min_y, max_x, max_y = rect
+    selected = set()
+    for block_id, (bx1, by1, bw, bh) in enumerate(zip(store.xs, store.ys, store.widths, store.heights)):
+        if not (max_x < bx1 or min_x > bx1 + bw or max_y < by1 or min_y > by1 + bh):
+            selected.add(block_id)
+    return selected
+
+
+def random_rects(count, width, height, seed):
+    rng = random.Random(seed)
+    rects = []
+    for _ in range(count):
+        x1, x2 = sorted(rng.randint(0, width) for _ in range(2))
+        y1, y2 = sorted(rng.randint(0, height) for _ in range(2))
+        rects.append((x1, y1, x2, y2))
+    return rects
+
+
+def timed(func, *args, repeat=5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TextBlockStore 微基准测试")
+    parser.add_argument("--blocks", type=int, default=10000, help="文本块数量")
+    parser.add_argument("--queries", type=int, default=50, help="命中测试次数")
+    args = parser.parse_args(argv)
+
+    source = fake_wcocr.sample_blocks(args.blocks, seed=2)
+    dict_blocks = build_dict_blocks(source)
+    store = build_store(source)
+
+    dict_bytes = measure_memory(build_dict_blocks, source)
+    store_bytes = measure_memory(build_store, source)
+    print(f"文本块: {args.blocks}")
+    print(f"内存     dict: {dict_bytes / args.blocks:8.1f} B/块   "
+          f"TextBlockStore: {store_bytes / args.blocks:8.1f} B/块   "
+          f"({dict_bytes / max(store_bytes, 1):.1f}x)")
+
+    rects = random_rects(args.queries, 1920, 1080, seed=3)
+    mismatches = sum(hit_test_dicts(dict_blocks, rect) != hit_test_store(store, rect) for rect in rects)
+
+    def run(func, blocks):
+        for rect in rects:
+            func(blocks, rect)
+
+    dict_ms = timed(run, hit_test_dicts, dict_blocks) / len(rects)
+    store_ms = timed(run, hit_test_store, store) / len(rects)
+    print(f"命中测试 dict: {dict_ms:8.3f} ms/次   "
+          f"TextBlockStore: {store_ms:8.3f} ms/次   ({dict_ms / store_ms:.2f}x)")
+
+    if mismatches:
+        print(f"❌ {mismatches} 次命中测试结果不一致")
+        return 1
+    print("✓ 命中测试结果一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
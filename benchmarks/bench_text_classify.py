@@ -0,0 +1,244 @@
+"""
+字符分类微基准测试
+在中文、英文、中英混排、日文、韩文语料上对比原实现（每次调用定义嵌套函数、逐字符区间比较）与 text_classify 查找表:
+    - 宽度单位统计
+    - 可选单元拆分（split_text_block）
+并校验原实现覆盖的字符范围内（中文、ASCII、CJK 标点）拆分结果完全一致；
+日文、韩文的差异来自新增的假名逐字拆分和谚文全角宽度，只统计不算失败
+
+用法:
+    python benchmarks/bench_text_classify.py
+    python benchmarks/bench_text_classify.py --lines 5000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_blocks import TextBlockStore  # noqa: E402
+import text_classify  # noqa: E402
+import text_layout  # noqa: E402
+
+HAN = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制"
+KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをんアイウエオカキクケコサシスセソタチツテト"
+HANGUL = "가나다라마바사아자차카타파하한국어문장입니다습니까에서으로"
+LATIN = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+CJK_PUNCT = "，。、：；？！（）【】"
+ASCII_PUNCT = ",.:;?!()[]-_/'\""
+
+
+def make_line(rng, kinds):
+    """按给定的文字种类随机生成一行（10~60 个字符）"""
+    parts = []
+    length = 0
+    target = rng.randint(10, 60)
+    while length < target:
+        kind = rng.choice(kinds)
+        if kind == 'han':
+            word = ''.join(rng.choice(HAN) for _ in range(rng.randint(1, 8))) + rng.choice(CJK_PUNCT + '  ')
+        elif kind == 'kana':
+            word = ''.join(rng.choice(KANA + HAN) for _ in range(rng.randint(2, 8)))
+        elif kind == 'hangul':
+            word = ''.join(rng.choice(HANGUL) for _ in range(rng.randint(2, 5))) + ' '
+        else:
+            word = ''.join(rng.choice(LATIN) for _ in range(rng.randint(1, 10))) + rng.choice(ASCII_PUNCT + '   ')
+        parts.append(word)
+        length += len(word)
+    return ''.join(parts)
+
+
+# 语料名 -> (文字种类, 是否在原实现覆盖的范围内)
+CORPORA = {
+    'zh': (('han',), True),
+    'en': (('latin',), True),
+    'mixed': (('han', 'latin'), True),
+    'ja': (('kana', 'latin'), False),
+    'ko': (('hangul', 'latin'), False),
+}
+
+
+def reference_split(text, x, y, width, height, out):
+    """原 _split_text_block（每次调用定义嵌套函数，逐字符区间比较）"""
+    result = out
+
+    if len(text) == 0 or width <= 0:
+        return result
+
+    def is_chinese(char):
+        return '\u4e00' <= char <= '\u9fff'
+
+    def is_fullwidth(char):
+        return (
+            '\u4e00' <= char <= '\u9fff' or  # CJK 统一汉字
+            '\u3000' <= char <= '\u303f' or  # CJK 标点
+            '\uff00' <= char <= '\uffef' or  # 全角字符
+            '\u3040' <= char <= '\u309f' or  # 平假名
+            '\u30a0' <= char <= '\u30ff'     # 片假名
+        )
+
+    # 计算加权字符宽度（全角字符算2个单位，半角算1个）
+    total_units = sum(2 if is_fullwidth(c) else 1 for c in text)
+    unit_width = width / total_units if total_units > 0 else width
+
+    # 计算每个字符的起始位置（基于加权宽度）
+    char_positions = []  # [(start_x, width), ...]
+    current_x = 0
+    for char in text:
+        char_units = 2 if is_fullwidth(char) else 1
+        char_w = char_units * unit_width
+        char_positions.append((current_x, char_w))
+        current_x += char_w
+
+    # 分段处理：将文本分成中文段和英文单词段
+    # 英文中非字母数字的字符（标点等）也作为分隔符
+    segments = []  # [(text, start_idx, is_chinese), ...]
+    current_segment = ""
+    current_start = 0
+    current_is_chinese = None
+
+    for i, char in enumerate(text):
+        char_is_chinese = is_chinese(char)
+        is_separator = char == ' ' or (not char_is_chinese and not char.isalnum())
+
+        if is_separator:
+            # 分隔符结束当前段
+            if current_segment:
+                segments.append((current_segment, current_start, current_is_chinese))
+                current_segment = ""
+            current_is_chinese = None
+        elif current_is_chinese is None:
+            # 开始新段
+            current_segment = char
+            current_start = i
+            current_is_chinese = char_is_chinese
+        elif char_is_chinese == current_is_chinese:
+            # 继续当前段
+            current_segment += char
+        else:
+            # 中英文切换，结束当前段
+            if current_segment:
+                segments.append((current_segment, current_start, current_is_chinese))
+            current_segment = char
+            current_start = i
+            current_is_chinese = char_is_chinese
+
+    # 添加最后一段
+    if current_segment:
+        segments.append((current_segment, current_start, current_is_chinese))
+
+    # 处理每个段
+    text_offset = result.intern(text)
+    for segment_text, start_idx, is_chn in segments:
+        if is_chn:
+            # 中文：按单个字符拆分
+            for i in range(len(segment_text)):
+                idx = start_idx + i
+                char_start_x, char_w = char_positions[idx]
+                result.append_span(text_offset + idx, 1,
+                                   x + int(char_start_x), y, max(int(char_w), 1), height)
+        else:
+            # 英文：整个单词作为一个块
+            word_start_x = char_positions[start_idx][0]
+            word_end_idx = start_idx + len(segment_text) - 1
+            word_end_x = char_positions[word_end_idx][0] + char_positions[word_end_idx][1]
+            word_width = word_end_x - word_start_x
+            result.append_span(text_offset + start_idx, len(segment_text),
+                               x + int(word_start_x), y, max(int(word_width), 1), height)
+
+    return result
+
+
+
+def reference_units(text):
+    """原实现的宽度单位统计"""
+    def is_fullwidth(char):
+        return (
+            '\u4e00' <= char <= '\u9fff' or
+            '\u3000' <= char <= '\u303f' or
+            '\uff00' <= char <= '\uffef' or
+            '\u3040' <= char <= '\u309f' or
+            '\u30a0' <= char <= '\u30ff'
+        )
+    return sum(2 if is_fullwidth(c) else 1 for c in text)
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def split_all(split, lines):
+    store = TextBlockStore()
+    for text in lines:
+        split(text, 0, 0, len(text) * 16, 16, store)
+    return store
+
+
+def describe_differences(ref_units, new_units, ref_store, new_store):
+    """说明两种实现结果的实际差异（宽度单位、子块数、子块文本或位置），一致时返回空字符串"""
+    parts = []
+    changed_lines = sum(1 for old, new in zip(ref_units, new_units) if old != new)
+    if changed_lines:
+        parts.append(f"宽度单位 {changed_lines} 行不同")
+    if len(ref_store) != len(new_store):
+        parts.append(f"子块 {len(ref_store)} -> {len(new_store)}")
+    else:
+        ref_blocks, new_blocks = ref_store.to_dicts(), new_store.to_dicts()
+        changed_text = sum(1 for old, new in zip(ref_blocks, new_blocks) if old['text'] != new['text'])
+        changed_span = sum(1 for old, new in zip(ref_blocks, new_blocks)
+                           if (old['x'], old['width']) != (new['x'], new['width']))
+        if changed_text:
+            parts.append(f"子块文本 {changed_text} 个不同")
+        if changed_span:
+            parts.append(f"子块位置 {changed_span} / {len(ref_blocks)} 个不同")
+        if not parts and ref_blocks != new_blocks:
+            parts.append("子块其他字段不同")
+    return "，".join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="字符分类微基准测试")
+    parser.add_argument("--lines", type=int, default=2000, help="每种语料的行数")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    text_classify.classify("")
+    print(f"查找表构建: {(time.perf_counter() - start) * 1000:.1f} ms（首次使用时一次）")
+
+    failures = 0
+    print(f"{'语料':8}{'字符':>8}{'宽度 原(ms)':>14}{'新(ms)':>10}{'拆分 原(ms)':>14}{'新(ms)':>10}{'加速':>8}  结果")
+    for name, (kinds, covered) in CORPORA.items():
+        rng = random.Random(f"{args.seed}-{name}")
+        lines = [make_line(rng, kinds) for _ in range(args.lines)]
+        chars = sum(map(len, lines))
+
+        ref_units_ms, ref_units = best_of(lambda: [reference_units(t) for t in lines], args.repeat)
+        new_units_ms, new_units = best_of(lambda: [text_classify.width_units(t) for t in lines], args.repeat)
+        ref_split_ms, ref_store = best_of(lambda: split_all(reference_split, lines), args.repeat)
+        new_split_ms, new_store = best_of(lambda: split_all(text_layout.split_text_block, lines), args.repeat)
+
+        differences = describe_differences(ref_units, new_units, ref_store, new_store)
+        if not differences:
+            verdict = "一致"
+        elif covered:
+            verdict = f"❌ 不一致：{differences}"
+            failures += 1
+        else:
+            verdict = f"差异（预期）：{differences}"
+        print(f"{name:8}{chars:>8}{ref_units_ms:>14.1f}{new_units_ms:>10.1f}{ref_split_ms:>14.1f}{new_split_ms:>10.1f}"
+              f"{ref_split_ms / new_split_ms:>7.1f}x  {verdict}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
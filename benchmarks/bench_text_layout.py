@@ -0,0 +1,194 @@
+"""
+行聚类微基准测试
+1. 黄金用例：校验行归属、行内顺序和空格规则（与原 should_add_space 规则一致）
+2. 在 10k+ 文本块的合成选择上对比原 merge_text_blocks（逐个扫描已有行）与 text_layout.merge_text 的耗时，
+   并校验单一字号布局下两者输出一致
+
+用法:
+    python benchmarks/bench_text_layout.py
+    python benchmarks/bench_text_layout.py --blocks 20000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_spatial_index import code_layout  # noqa: E402
+from text_blocks import TextBlockStore  # noqa: E402
+import text_layout  # noqa: E402
+
+
+def reference_should_add_space(prev_block, next_block):
+    """原 ScreenOCRTool.should_add_space"""
+    if not prev_block or not next_block:
+        return False
+    prev_text = prev_block['text'].strip()
+    next_text = next_block['text'].strip()
+    if not prev_text or not next_text:
+        return False
+    punctuation = set(',.:;?!，。：；？！、（）()[]【】{}""\'\'')
+    prev_char = prev_text[-1]
+    next_char = next_text[0]
+    if prev_char in punctuation or next_char in punctuation:
+        return False
+
+    def is_chinese(char):
+        return '\u4e00' <= char <= '\u9fff'
+
+    if is_chinese(prev_char) and is_chinese(next_char):
+        return False
+    if is_chinese(prev_char) != is_chinese(next_char):
+        return True
+    if prev_char.isalnum() and next_char.isalnum():
+        return True
+    return False
+
+
+def reference_merge(store, selected_blocks):
+    """原 ScreenOCRTool.merge_text_blocks"""
+    if not selected_blocks:
+        return ""
+    blocks = [store[block_id] for block_id in selected_blocks]
+    lines = {}
+    for block in blocks:
+        center_y = (block['y'] + block['height']) / 2
+        matched_line = None
+        for line_y in lines.keys():
+            if abs(center_y - line_y) <= 5:
+                matched_line = line_y
+                break
+        if matched_line is None:
+            lines[center_y] = []
+        else:
+            center_y = matched_line
+        lines[center_y].append(block)
+    result = []
+    for y in sorted(lines.keys()):
+        line_blocks = lines[y]
+        line_blocks.sort(key=lambda b: b['x'])
+        line_text = ''
+        for i, block in enumerate(line_blocks):
+            if i > 0 and reference_should_add_space(line_blocks[i - 1], block):
+                line_text += ' '
+            line_text += block['text'].strip()
+        result.append(line_text)
+    return '\n'.join(result)
+
+
+# (说明, [(文本, x, y, 宽, 高), ...], 期望输出)
+GOLDEN_CASES = [
+    ("中文不加空格",
+     [("你", 0, 0, 12, 12), ("好", 12, 0, 12, 12), ("世", 24, 0, 12, 12), ("界", 36, 0, 12, 12)],
+     "你好世界"),
+    ("英文单词加空格",
+     [("Hello", 0, 0, 40, 12), ("world", 48, 0, 40, 12)],
+     "Hello world"),
+    ("中英混排加空格",
+     [("使", 0, 0, 12, 12), ("用", 12, 0, 12, 12), ("Python", 28, 0, 48, 12), ("编", 80, 0, 12, 12)],
+     "使用 Python 编"),
+    ("标点前后不加空格",
+     [("Hi", 0, 0, 16, 12), (",", 16, 0, 4, 12), ("you", 24, 0, 24, 12), ("。", 48, 0, 12, 12), ("好", 60, 0, 12, 12)],
+     "Hi,you。好"),
+    ("乱序输入按 x 排序",
+     [("c", 40, 0, 8, 12), ("a", 0, 0, 8, 12), ("b", 20, 0, 8, 12)],
+     "a b c"),
+    ("多行自上而下",
+     [("second", 0, 20, 48, 12), ("first", 0, 0, 40, 12), ("third", 0, 40, 40, 12)],
+     "first\nsecond\nthird"),
+    ("基线不齐的同一行",
+     [("alpha", 0, 10, 40, 12), ("beta", 48, 13, 32, 12), ("gamma", 88, 8, 40, 12)],
+     "alpha beta gamma"),
+    ("混排字号：大标题与小字同一行",
+     [("Title", 0, 0, 80, 30), ("v2", 84, 16, 16, 12), ("小", 104, 14, 12, 12)],
+     "Title v2 小"),
+    ("混排字号：大标题与下一行小字分开",
+     [("Title", 0, 0, 80, 30), ("body", 0, 36, 32, 12), ("text", 40, 36, 32, 12)],
+     "Title\nbody text"),
+    ("下标仍在同一行（字母数字之间按规则加空格）",
+     [("H", 0, 0, 10, 16), ("2", 10, 8, 6, 10), ("O", 16, 0, 10, 16)],
+     "H 2 O"),
+    ("紧密行距的小字号",
+     [("one", 0, 0, 24, 8), ("two", 0, 10, 24, 8), ("three", 0, 20, 40, 8)],
+     "one\ntwo\nthree"),
+    ("假名逐字不加空格，与英文之间加空格",
+     [("カタ", 0, 0, 24, 12), ("カナ", 24, 0, 24, 12), ("OK", 52, 0, 16, 12)],
+     "カタカナ OK"),
+    ("扩展 A 汉字按中文处理",
+     [("㐀", 0, 0, 12, 12), ("中", 12, 0, 12, 12), ("x", 28, 0, 8, 12)],
+     "㐀中 x"),
+    ("行内空白块",
+     [("a", 0, 0, 8, 12), ("  ", 10, 0, 8, 12), ("b", 20, 0, 8, 12)],
+     "ab"),
+]
+
+
+def check_golden():
+    failures = 0
+    for name, blocks, expected in GOLDEN_CASES:
+        store = TextBlockStore()
+        for text, x, y, w, h in blocks:
+            store.append(text, x, y, w, h)
+        # 打乱选择集合的顺序，结果不应受影响
+        ids = list(range(len(store)))
+        random.Random(len(name)).shuffle(ids)
+        actual = text_layout.merge_text(store, ids)
+        if actual != expected:
+            failures += 1
+            print(f"❌ {name}: 期望 {expected!r}，实际 {actual!r}")
+
+    # 空格规则与原实现逐对一致（原实现只把 U+4E00~U+9FFF 当作中文，假名和扩展区见上面的版面用例）
+    samples = ["a", "Z", "9", "中", "文", ",", "。", "（", "'", '"', " x ", "", " ", "é", "한", "-"]
+    for prev in samples:
+        for nxt in samples:
+            expected = reference_should_add_space({'text': prev}, {'text': nxt})
+            if text_layout.should_add_space(prev, nxt) != expected:
+                failures += 1
+                print(f"❌ should_add_space({prev!r}, {nxt!r}) 应为 {expected}")
+    return failures
+
+
+def timed(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="行聚类微基准测试")
+    parser.add_argument("--blocks", type=int, default=12000, help="选中的文本块数量")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = check_golden()
+    print(f"黄金用例: {len(GOLDEN_CASES)} 个版面用例 + 空格规则逐对比较，{failures} 个失败")
+
+    # 页面足够高，保证单一字号、不错行，原实现在这种布局下结果正确
+    store = code_layout(args.blocks, 2560, 1 << 20, seed=args.seed)
+    selected = set(range(len(store)))
+    ref_ms, ref_text = timed(lambda: reference_merge(store, selected), args.repeat)
+    new_ms, new_text = timed(lambda: text_layout.merge_text(store, selected), args.repeat)
+    lines = new_text.count('\n') + 1
+    print(f"{len(store)} 个文本块，{lines} 行")
+    print(f"原实现:     {ref_ms:9.1f} ms")
+    print(f"text_layout:{new_ms:9.1f} ms")
+    print(f"加速: {ref_ms / new_ms:.1f}x")
+    if ref_text != new_text:
+        print("❌ 输出与原实现不一致")
+        failures += 1
+    else:
+        print("✓ 输出与原实现一致")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -115,6 +115,9 @@ def build_exe():
         '--hidden-import=ttkbootstrap.constants',
         '--hidden-import=ttkbootstrap.themes',
         '--hidden-import=ttkbootstrap.style',
+        # OCR 引擎由 ocr_engines 注册表延迟导入，需显式声明
+        '--hidden-import=wechat_ocr_wrapper',
+        '--hidden-import=windows_ocr_wrapper',
         '--hidden-import=winrt',
         '--hidden-import=winrt.windows.media.ocr',
         '--hidden-import=winrt.windows.globalization',
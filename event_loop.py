@@ -0,0 +1,118 @@
+"""
+主循环唤醒
+原主循环每 10ms 调用一次 root.update()，另有每 50ms 一次的 check_state 轮询各队列和按键状态，
+空闲时每秒唤醒 CPU 约 120 次，每个阶段还会多等最多 50ms。这里改为事件驱动:
+    - 后台线程（托盘、OCR）把任务放入 NotifyingQueue，put 之后通过 TkNotifier 唤醒主线程
+    - TkNotifier 用 event_generate('<<Wake>>', when='tail') 把虚拟事件排入 Tk 事件队列，
+      主线程在 mainloop() 中处理；多次通知在处理前合并为一次
+    - 主线程没有事件时阻塞在 mainloop() 中，不再定时唤醒
+    - 线程版 Tcl 中其他线程调用 event_generate 要等主线程执行完当前的 Tk 回调（mainloop 之前
+      还会先等待最多 1 秒后抛出异常），键盘钩子等对延迟敏感的线程改用 ThreadWaker：
+      只设置一个 Event，由唤醒线程代为调用 notify
+
+用法:
+    notifier = TkNotifier(root, handler)
+    tasks = NotifyingQueue(notifier.notify)
+    tasks.put(callback)          # 任意线程
+    waker = ThreadWaker(notifier.notify)
+    waker.wake()                 # 不调用 Tcl，立即返回
+"""
+import logging
+import queue
+import threading
+from typing import Callable, Optional
+
+WAKE_EVENT = '<<Wake>>'
+
+
+class TkNotifier:
+    """线程安全地唤醒 Tk 主循环并在主线程中调用 handler"""
+
+    def __init__(self, root, handler: Callable[[], None]):
+        """
+        Args:
+            root: Tk 根窗口
+            handler: 主线程中的处理函数（处理所有待处理的任务）
+        """
+        self.root = root
+        self.handler = handler
+        self._pending = False
+        self._lock = threading.Lock()
+        self.stats = {'notifications': 0, 'wakeups': 0}
+        root.bind(WAKE_EVENT, self._on_wake)
+
+    def notify(self):
+        """请求在主线程中调用 handler（可在任意线程调用，处理前的多次通知只唤醒一次）"""
+        with self._lock:
+            self.stats['notifications'] += 1
+            if self._pending:
+                return
+            self._pending = True
+        try:
+            self.root.event_generate(WAKE_EVENT, when='tail')
+        except Exception as e:
+            # 主线程尚未进入 mainloop 或窗口已销毁：任务留在队列中，由 drain_soon 或下一次通知处理
+            with self._lock:
+                self._pending = False
+            logging.debug(f"唤醒主循环失败: {e}")
+
+    def drain_soon(self):
+        """主线程中调用：在空闲时处理一次（例如进入 mainloop 前已有的任务）"""
+        self.root.after_idle(self._on_wake)
+
+    def _on_wake(self, event=None):
+        with self._lock:
+            self._pending = False
+            self.stats['wakeups'] += 1
+        self.handler()
+
+
+class ThreadWaker:
+    """在唤醒线程中调用 notify，调用 wake() 的线程不会等待 Tk 主线程"""
+
+    def __init__(self, notify: Callable[[], None], name: str = "Waker"):
+        """
+        Args:
+            notify: 唤醒线程中调用（通常是 TkNotifier.notify）
+            name: 唤醒线程名称
+        """
+        self.notify = notify
+        self._event = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """请求调用一次 notify（任意线程，notify 执行前的多次请求合并为一次）"""
+        self._event.set()
+
+    def _run(self):
+        # 没有请求时阻塞在 Event 上，不会定时唤醒
+        while True:
+            self._event.wait()
+            self._event.clear()
+            if self._stopped:
+                return
+            try:
+                self.notify()
+            except Exception as e:
+                logging.debug(f"唤醒通知失败: {e}")
+
+    def stop(self, timeout: float = 1.0):
+        self._stopped = True
+        self._event.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+
+class NotifyingQueue(queue.Queue):
+    """put 之后通知主循环的队列"""
+
+    def __init__(self, notify: Optional[Callable[[], None]] = None, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.notify = notify
+
+    def put(self, item, block: bool = True, timeout: Optional[float] = None):
+        super().put(item, block, timeout)
+        if self.notify:
+            self.notify()
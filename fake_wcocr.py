@@ -0,0 +1,416 @@
+"""
+wcocr 替身模块
+在没有 wcocr.pyd 和微信客户端的环境（CI、Linux）中回放 WeChatOCR 的识别结果，
+用于测试 WeChatOCRWrapper、_parse_ocr_result 和覆盖层流程
+
+提供与 wcocr 相同的接口: init(ocr_exe, wechat_dir)、ocr(image_path)
+
+启用方式:
+    1. 代码中: fake_wcocr.install(fixtures_dir="recordings/", latency_ms=300)
+       之后的 import wcocr 会得到替身模块
+    2. 环境变量: SCREEN_OCR_FAKE_WCOCR=1
+       可选 SCREEN_OCR_WCOCR_FIXTURES=目录、SCREEN_OCR_FAKE_LATENCY_MS、
+       SCREEN_OCR_FAKE_FAILURE_RATE、SCREEN_OCR_FAKE_FAILURE_MODE、SCREEN_OCR_FAKE_SHAPE
+
+录制真实结果:
+    设置环境变量 SCREEN_OCR_WCOCR_RECORD=目录 后正常运行程序，
+    每次识别的原始结果会按图片 SHA1 保存为 <sha1>.json，可直接作为回放数据
+
+回放规则:
+    按识别图片文件的 SHA1 查找录制数据；找不到时根据图片尺寸生成确定性的合成结果
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# 让 WeChatOCRWrapper 跳过等待异步初始化的固定延时
+SYNC_INIT = True
+
+# WeChatOCRWrapper._parse_ocr_result 支持的所有结果格式
+ITEM_FORMATS = ["ltrb", "pos", "location", "xywh", "wh", "word"]
+CONTAINERS = ["ocr_response", "result", "results", "data", "text", "texts", "list"]
+
+FAILURE_MODES = ["exception", "none", "empty", "malformed"]
+
+ENV_ENABLE = "SCREEN_OCR_FAKE_WCOCR"
+ENV_FIXTURES = "SCREEN_OCR_WCOCR_FIXTURES"
+ENV_RECORD = "SCREEN_OCR_WCOCR_RECORD"
+ENV_LATENCY = "SCREEN_OCR_FAKE_LATENCY_MS"
+ENV_FAILURE_RATE = "SCREEN_OCR_FAKE_FAILURE_RATE"
+ENV_FAILURE_MODE = "SCREEN_OCR_FAKE_FAILURE_MODE"
+ENV_SHAPE = "SCREEN_OCR_FAKE_SHAPE"
+
+# WeChatOCRWrapper 在这两个环境变量存在时跳过路径查找
+ENV_OCR_EXE = "WECHAT_OCR_EXE"
+ENV_WECHAT_DIR = "WECHAT_OCR_DIR"
+
+
+class FakeOCRError(RuntimeError):
+    """注入的识别失败"""
+
+
+class _State:
+    """替身模块的运行状态"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.initialized = False
+        self.init_args = None
+        self.fixtures: Dict[str, Dict] = {}
+        self.responder: Optional[Callable[[str], object]] = None
+        self.latency_ms = 0.0
+        self.jitter_ms = 0.0
+        self.replay_latency = False
+        self.init_latency_ms = 0.0
+        self.failure_rate = 0.0
+        self.failure_mode = "exception"
+        self.item_format = "ltrb"
+        self.container = "ocr_response"
+        self.rng = random.Random(0)
+        self.calls = 0
+        self.failures = 0
+        self.fixture_hits = 0
+
+
+_state = _State()
+
+
+def configure(
+    fixtures_dir: Optional[str] = None,
+    latency_ms: Optional[float] = None,
+    jitter_ms: Optional[float] = None,
+    replay_latency: Optional[bool] = None,
+    init_latency_ms: Optional[float] = None,
+    failure_rate: Optional[float] = None,
+    failure_mode: Optional[str] = None,
+    item_format: Optional[str] = None,
+    container: Optional[str] = None,
+    responder: Optional[Callable[[str], object]] = None,
+    seed: Optional[int] = None
+):
+    """
+    配置替身行为（只修改传入的参数）
+
+    Args:
+        fixtures_dir: 录制数据目录
+        latency_ms: 每次识别的固定延迟
+        jitter_ms: 延迟随机抖动范围
+        replay_latency: 使用录制数据中记录的真实耗时
+        init_latency_ms: init() 的延迟
+        failure_rate: 识别失败概率 (0~1)
+        failure_mode: 失败方式 exception / none / empty / malformed
+        item_format: 合成结果的条目格式，见 ITEM_FORMATS
+        container: 合成结果的外层结构，见 CONTAINERS
+        responder: 自定义响应函数 responder(image_path) -> 原始结果
+        seed: 随机种子（抖动和失败注入）
+    """
+    with _state.lock:
+        if fixtures_dir is not None:
+            _state.fixtures.update(load_fixtures(fixtures_dir))
+        if latency_ms is not None:
+            _state.latency_ms = float(latency_ms)
+        if jitter_ms is not None:
+            _state.jitter_ms = float(jitter_ms)
+        if replay_latency is not None:
+            _state.replay_latency = replay_latency
+        if init_latency_ms is not None:
+            _state.init_latency_ms = float(init_latency_ms)
+        if failure_rate is not None:
+            _state.failure_rate = float(failure_rate)
+        if failure_mode is not None:
+            if failure_mode not in FAILURE_MODES:
+                raise ValueError(f"未知的失败方式: {failure_mode}")
+            _state.failure_mode = failure_mode
+        if item_format is not None:
+            if item_format not in ITEM_FORMATS:
+                raise ValueError(f"未知的结果格式: {item_format}")
+            _state.item_format = item_format
+        if container is not None:
+            if container not in CONTAINERS:
+                raise ValueError(f"未知的结果结构: {container}")
+            _state.container = container
+        if responder is not None:
+            _state.responder = responder
+        if seed is not None:
+            _state.rng = random.Random(seed)
+
+
+def configure_from_env():
+    """从环境变量读取配置（进程池子进程通过环境变量继承配置）"""
+    kwargs = {}
+    if os.environ.get(ENV_FIXTURES):
+        kwargs['fixtures_dir'] = os.environ[ENV_FIXTURES]
+    if os.environ.get(ENV_LATENCY):
+        kwargs['latency_ms'] = float(os.environ[ENV_LATENCY])
+    if os.environ.get(ENV_FAILURE_RATE):
+        kwargs['failure_rate'] = float(os.environ[ENV_FAILURE_RATE])
+    if os.environ.get(ENV_FAILURE_MODE):
+        kwargs['failure_mode'] = os.environ[ENV_FAILURE_MODE]
+    if os.environ.get(ENV_SHAPE):
+        item_format, _, container = os.environ[ENV_SHAPE].partition(':')
+        kwargs['item_format'] = item_format
+        if container:
+            kwargs['container'] = container
+    configure(**kwargs)
+
+
+def install(**kwargs):
+    """
+    将替身注册为 wcocr 模块
+
+    必须在导入 wechat_ocr_wrapper 之前调用；参数同 configure()。
+    同时设置环境变量，使子进程中的 WeChatOCRWrapper 也使用替身
+    """
+    module = sys.modules[__name__]
+    sys.modules['wcocr'] = module
+    os.environ[ENV_ENABLE] = "1"
+    os.environ.setdefault(ENV_OCR_EXE, "fake://WeChatOCR.exe")
+    os.environ.setdefault(ENV_WECHAT_DIR, "fake://WeChat")
+    if kwargs.get('fixtures_dir'):
+        os.environ[ENV_FIXTURES] = kwargs['fixtures_dir']
+    configure(**kwargs)
+    return module
+
+
+def stats() -> Dict:
+    """返回调用统计"""
+    with _state.lock:
+        return {
+            'calls': _state.calls,
+            'failures': _state.failures,
+            'fixture_hits': _state.fixture_hits,
+            'fixtures': len(_state.fixtures),
+        }
+
+
+def reset():
+    """清空录制数据、统计和所有配置"""
+    global _state
+    _state = _State()
+
+
+# ---------------------------------------------------------------------------
+# wcocr 接口
+# ---------------------------------------------------------------------------
+
+def init(ocr_exe, wechat_dir):
+    """模拟 wcocr.init"""
+    if _state.init_latency_ms:
+        time.sleep(_state.init_latency_ms / 1000)
+    with _state.lock:
+        _state.initialized = True
+        _state.init_args = (ocr_exe, wechat_dir)
+    return True
+
+
+def ocr(image_path):
+    """模拟 wcocr.ocr，返回录制的原始结果"""
+    with _state.lock:
+        _state.calls += 1
+        rng_value = _state.rng.random()
+        jitter = _state.rng.uniform(-_state.jitter_ms, _state.jitter_ms) if _state.jitter_ms else 0.0
+        failing = rng_value < _state.failure_rate
+        if failing:
+            _state.failures += 1
+
+    with open(image_path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    fixture = _state.fixtures.get(digest)
+
+    delay = _state.latency_ms + jitter
+    if fixture is not None and _state.replay_latency:
+        delay = fixture.get('elapsed_ms', delay)
+    if delay > 0:
+        time.sleep(delay / 1000)
+
+    if failing:
+        return _failure_response(_state.failure_mode)
+
+    if fixture is not None:
+        with _state.lock:
+            _state.fixture_hits += 1
+        return json.loads(json.dumps(fixture['response']))
+    if _state.responder is not None:
+        return _state.responder(image_path)
+    return synthesize_response(image_path, _state.item_format, _state.container, digest)
+
+
+def _failure_response(mode: str):
+    if mode == "exception":
+        raise FakeOCRError("注入的 WeChatOCR 识别失败")
+    if mode == "none":
+        return None
+    if mode == "empty":
+        return {}
+    # malformed: 坐标缺失、类型错误、非字典条目
+    return {'ocr_response': [
+        {'text': '坐标缺失'},
+        {'text': 'bad', 'left': 'a', 'right': 'b', 'top': 0, 'bottom': 1},
+        "not-a-dict",
+        {'text': '', 'left': 0, 'top': 0, 'right': 10, 'bottom': 10},
+    ]}
+
+
+# ---------------------------------------------------------------------------
+# 结果格式
+# ---------------------------------------------------------------------------
+
+def make_item(block: Dict, item_format: str = "ltrb") -> Dict:
+    """将标准文本块 (text, x, y, width, height) 转换为指定格式的原始条目"""
+    text, x, y = block['text'], block['x'], block['y']
+    w, h = block['width'], block['height']
+    if item_format == "ltrb":
+        return {'text': text, 'left': float(x), 'top': float(y),
+                'right': float(x + w), 'bottom': float(y + h), 'rate': 0.98}
+    if item_format == "pos":
+        return {'text': text, 'pos': {'x': x, 'y': y, 'width': w, 'height': h}}
+    if item_format == "location":
+        return {'text': text, 'location': {'left': x, 'top': y, 'width': w, 'height': h}}
+    if item_format == "xywh":
+        return {'text': text, 'x': x, 'y': y, 'width': w, 'height': h}
+    if item_format == "wh":
+        return {'text': text, 'x': x, 'y': y, 'w': w, 'h': h}
+    if item_format == "word":
+        return {'word': text, 'x': x, 'y': y, 'width': w, 'height': h}
+    raise ValueError(f"未知的结果格式: {item_format}")
+
+
+def make_response(blocks: List[Dict], item_format: str = "ltrb", container: str = "ocr_response"):
+    """按指定格式和外层结构构造 wcocr 原始结果"""
+    items = [make_item(block, item_format) for block in blocks]
+    if container == "list":
+        return items
+    response = {container: items}
+    if container == "ocr_response":
+        response.update({'errcode': 0, 'width': 0, 'height': 0})
+    return response
+
+
+def sample_blocks(count: int, width: int = 1920, height: int = 1080, seed: int = 0) -> List[Dict]:
+    """生成确定性的文本块布局（按行排列的中英文混合文本）"""
+    rng = random.Random(seed)
+    words = ["屏幕识别", "文字", "screen", "overlay", "OCR", "设置", "select", "复制到剪贴板",
+             "def", "return", "self.text_blocks", "2024-06-01", "翻译", "engine"]
+    blocks = []
+    line_height = 22
+    x, y = 10, 10
+    while len(blocks) < count:
+        text = rng.choice(words)
+        w = max(len(text) * 9, 8)
+        if x + w > width - 10:
+            x = 10
+            y += line_height
+            if y + line_height > height:
+                y = 10
+        blocks.append({'text': text, 'x': x, 'y': y, 'width': w, 'height': 16})
+        x += w + rng.randint(6, 24)
+    return blocks
+
+
+def synthesize_response(image_path: str, item_format: str = "ltrb", container: str = "ocr_response",
+                        digest: Optional[str] = None):
+    """没有录制数据时，按图片尺寸生成确定性的合成结果"""
+    try:
+        from PIL import Image
+        with Image.open(image_path) as image:
+            width, height = image.size
+    except Exception:
+        width, height = 1920, 1080
+    seed = int(digest[:8], 16) if digest else 0
+    count = max(1, (width * height) // 20000)
+    return make_response(sample_blocks(count, width, height, seed), item_format, container)
+
+
+# ---------------------------------------------------------------------------
+# 录制
+# ---------------------------------------------------------------------------
+
+def load_fixtures(directory: str) -> Dict[str, Dict]:
+    """加载目录中的录制数据，返回 {sha1: 录制内容}"""
+    fixtures = {}
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            fixtures[record['image_sha1']] = record
+        except Exception as e:
+            logging.warning(f"加载录制数据失败 {path}: {e}")
+    return fixtures
+
+
+def save_fixture(directory: str, image_sha1: str, response, elapsed_ms: float = 0.0,
+                 image_path: Optional[str] = None) -> str:
+    """保存一条录制数据，返回文件路径"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{image_sha1}.json")
+    record = {
+        'image_sha1': image_sha1,
+        'image_path': image_path,
+        'elapsed_ms': round(elapsed_ms, 2),
+        'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'response': response,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=1, default=str)
+    return path
+
+
+def start_recording(wcocr_module, directory: str):
+    """
+    包装真实 wcocr 模块的 ocr 函数，将每次识别的原始结果保存到目录
+
+    Args:
+        wcocr_module: 真实的 wcocr 模块
+        directory: 录制数据目录
+    """
+    if getattr(wcocr_module, '_fake_recording', False):
+        return wcocr_module
+    original_ocr = wcocr_module.ocr
+
+    def recording_ocr(image_path):
+        with open(image_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        start = time.perf_counter()
+        response = original_ocr(image_path)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        try:
+            save_fixture(directory, digest, response, elapsed_ms, image_path)
+        except Exception as e:
+            logging.warning(f"保存 OCR 录制数据失败: {e}")
+        return response
+
+    wcocr_module.ocr = recording_ocr
+    wcocr_module._fake_recording = True
+    logging.info(f"WeChatOCR 结果录制已开启: {directory}")
+    return wcocr_module
+
+
+if __name__ == "__main__":
+    # 自检：用替身驱动 WeChatOCRWrapper，覆盖所有结果格式
+    # 以脚本运行时本文件是 __main__，需要重新导入 fake_wcocr 作为 wcocr
+    logging.basicConfig(level=logging.WARNING)
+    import fake_wcocr
+    fake_wcocr.install()
+    from PIL import Image
+    from wechat_ocr_wrapper import WeChatOCRWrapper
+
+    wrapper = WeChatOCRWrapper()
+    assert wrapper.is_available(), wrapper.error_message
+    image = Image.new('RGB', (800, 600), 'white')
+    for item_format in ITEM_FORMATS:
+        for container in CONTAINERS:
+            fake_wcocr.configure(item_format=item_format, container=container)
+            blocks = wrapper.ocr_pil_image(image)
+            print(f"{item_format:9s} {container:13s} -> {len(blocks)} 个文本块")
+    for failure_mode in FAILURE_MODES:
+        fake_wcocr.configure(failure_rate=1.0, failure_mode=failure_mode)
+        print(f"失败注入 {failure_mode:9s} -> {len(wrapper.ocr_pil_image(image))} 个文本块")
+    print(fake_wcocr.stats())
@@ -0,0 +1,173 @@
+"""
+字形宽度估计
+OCR 只给出整行的矩形，覆盖层需要估计每个字符/单词在行内的位置。原来假设全角字符是半角的两倍宽、
+半角字符等宽，比例字体的长行选到行尾时会偏移好几个字符。这里按字符查表得到相对字宽（1/64 em），
+再按行宽缩放:
+    - 拉丁、希腊、西里尔字母（U+0000~U+04FF）：从常见界面字体实测，缓存到磁盘；
+      没有可用字体时使用内置的 Helvetica/Arial AFM 字宽
+    - 全角字符（汉字、假名、全角标点等）：1 em
+    - 其他字符：数字宽度（0.556 em）
+
+查表表与字符分类表一样用 str.translate 一次完成，每行的开销只与字符数成正比，不涉及字体渲染
+等宽字体（代码编辑器、终端）的字宽与比例字体相差很大，字宽表在这类文本上比 2:1 估计更差，
+因此配置项 glyph_metrics 默认关闭（见 benchmarks/bench_glyph_metrics.py）
+
+用法:
+    metrics = get_glyph_metrics()
+    advances = metrics.advances(text)   # bytes，每个字符的宽度单位
+"""
+import json
+import logging
+import os
+import re
+from typing import List, Optional, Sequence
+
+from text_classify import WIDE, class_table
+
+try:
+    from PIL import ImageFont
+    IMAGEFONT_AVAILABLE = True
+except ImportError:
+    IMAGEFONT_AVAILABLE = False
+
+# 宽度单位：1/64 em，全角字符 = EM_UNITS
+EM_UNITS = 64
+# 实测/内置字宽覆盖的码位范围（拉丁、希腊、西里尔）
+MEASURED_LIMIT = 0x500
+# 表外半角字符的默认字宽（数字宽度 0.556 em）
+DEFAULT_NARROW_UNITS = 36
+# 实测字体字号（像素）
+MEASURE_SIZE = 128
+CACHE_VERSION = 1
+
+# 常见界面字体（存在的都参与实测，字宽取平均）
+UI_FONT_CANDIDATES = [
+    "C:/Windows/Fonts/segoeui.ttf",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+]
+
+# Helvetica 的 AFM 字宽（1/1000 em，U+0020~U+007E），与 Arial、Liberation Sans 度量兼容
+_AFM_ASCII_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,  # !"#$%&'()*+,-./
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,  # 0-9 :;<=>?
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,  # @A-O
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,  # P-Z [\]^_
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,  # `a-o
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,       # p-z {|}~
+)
+
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+
+def builtin_widths() -> List[int]:
+    """内置字宽表（MEASURED_LIMIT 项，0 表示未知）"""
+    widths = [0] * MEASURED_LIMIT
+    for offset, width in enumerate(_AFM_ASCII_WIDTHS):
+        widths[0x20 + offset] = round(width * EM_UNITS / 1000)
+    return widths
+
+
+def measure_fonts(paths: Sequence[str]) -> Optional[List[int]]:
+    """用给定字体实测字宽并取平均，没有可用字体时返回 None"""
+    if not IMAGEFONT_AVAILABLE:
+        return None
+    fonts = []
+    for path in paths:
+        try:
+            fonts.append(ImageFont.truetype(path, MEASURE_SIZE))
+        except OSError:
+            continue
+    if not fonts:
+        return None
+    widths = [0] * MEASURED_LIMIT
+    for cp in range(0x20, MEASURED_LIMIT):
+        char = chr(cp)
+        if not char.isprintable():
+            continue
+        total = sum(font.getlength(char) for font in fonts)
+        widths[cp] = max(1, min(127, round(total / len(fonts) * EM_UNITS / MEASURE_SIZE)))
+    return widths
+
+
+class GlyphMetrics:
+    """按字符查表的相对字宽"""
+
+    def __init__(self, widths: Sequence[int], source: str = "builtin"):
+        """
+        Args:
+            widths: U+0000~MEASURED_LIMIT 的字宽（1/64 em），0 表示按字符类别取默认值
+            source: 字宽来源说明（字体路径或 builtin）
+        """
+        self.source = source
+        defaults = ''.join(chr(EM_UNITS if flags & WIDE else DEFAULT_NARROW_UNITS) for flags in range(16))
+        table = class_table().translate(defaults)
+        measured = ''.join(chr(w) if w else table[cp] for cp, w in enumerate(widths[:MEASURED_LIMIT]))
+        self._table = measured + table[len(measured):]
+
+    def advances(self, text: str) -> bytes:
+        """每个字符的宽度单位"""
+        advances = text.translate(self._table)
+        if not advances.isascii():
+            # 超出查找表范围的字符保持原样，按默认半角宽度处理
+            advances = _NON_ASCII_RE.sub(chr(DEFAULT_NARROW_UNITS), advances)
+        return advances.encode('latin-1')
+
+    def width(self, text: str) -> int:
+        """文本的宽度单位总数"""
+        return sum(self.advances(text))
+
+
+def _cache_path() -> str:
+    base = os.getenv('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ScreenOCR', 'glyph_metrics.json')
+
+
+def load_glyph_metrics(font_paths: Optional[Sequence[str]] = None, cache_path: Optional[str] = None) -> GlyphMetrics:
+    """
+    加载字宽表：优先读磁盘缓存，否则实测界面字体并写入缓存，都不可用时使用内置表
+
+    Args:
+        font_paths: 参与实测的字体（默认 UI_FONT_CANDIDATES 中存在的字体）
+        cache_path: 缓存文件路径
+    """
+    if font_paths is None:
+        font_paths = [path for path in UI_FONT_CANDIDATES if os.path.exists(path)]
+    font_paths = list(font_paths)
+    if not font_paths:
+        return GlyphMetrics(builtin_widths())
+
+    cache_path = cache_path or _cache_path()
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('version') == CACHE_VERSION and cached.get('fonts') == font_paths:
+            return GlyphMetrics(cached['widths'], ', '.join(font_paths))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    widths = measure_fonts(font_paths)
+    if widths is None:
+        return GlyphMetrics(builtin_widths())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'fonts': font_paths, 'widths': widths}, f)
+    except OSError as e:
+        logging.debug(f"保存字宽缓存失败: {e}")
+    return GlyphMetrics(widths, ', '.join(font_paths))
+
+
+# 全局实例
+_glyph_metrics: Optional[GlyphMetrics] = None
+
+
+def get_glyph_metrics() -> GlyphMetrics:
+    """获取全局字宽表"""
+    global _glyph_metrics
+    if _glyph_metrics is None:
+        _glyph_metrics = load_glyph_metrics()
+    return _glyph_metrics
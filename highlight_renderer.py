@@ -0,0 +1,245 @@
+"""
+选择高亮渲染
+同一行（y 与高度相同）中相邻的选中文本块合并为一段，每段由几个宽度为 2 的幂的
+半透明纯色图块首尾相接拼成，每个图块对应一个画布图像项:
+    - 逐字拆分后的文本块互相重叠或留有 1 像素缝隙，逐块绘制会在重叠处叠加两次透明度而变深；
+      合并后一行里的一段选择只绘制一次（图块互不重叠），颜色均匀
+    - 拖拽时段宽几乎每帧都在变化，按段宽缓存图块几乎每帧都要新建和上传 PhotoImage；
+      按 2 的幂拆分后每种高度最多只有十几种图块宽度，拖拽中基本都命中缓存。
+      缓存按最近使用淘汰，只保留显示中的图块和最多 MAX_TILES 个空闲图块
+    - 画布项放在对象池中复用，取消选中时隐藏而不是删除，再次选中时只改图像和坐标
+拖拽时只重新合并新增和移除的文本块所在的行，不再在每个鼠标事件中合成和上传整张 PIL 图像
+
+颜色与原高亮图层一致：#4D94FF，30% 不透明度
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from PIL import Image, ImageTk
+
+HIGHLIGHT_COLOR = (77, 148, 255, 77)  # #4D94FF with 30% opacity
+# 同一行中间隔不超过该像素数的文本块合并为一段（原图层按含端点的矩形绘制，会填上 1 像素缝隙）
+MERGE_GAP = 1
+# 图块缓存上限（超出时淘汰最久未使用、且没有画布项在显示的图块）
+MAX_TILES = 64
+
+
+def split_tiles(x: int, width: int) -> List[Tuple[int, int]]:
+    """
+    把一段拆分为宽度为 2 的幂、首尾相接的图块（从宽到窄）
+
+    Returns:
+        (x, 宽度) 列表，宽度之和等于 width
+    """
+    pieces = []
+    while width > 0:
+        piece = 1 << (width.bit_length() - 1)
+        pieces.append((x, piece))
+        x += piece
+        width -= piece
+    return pieces
+
+
+def merge_runs(spans: Iterable[Tuple[int, int]], gap: int = MERGE_GAP) -> List[Tuple[int, int]]:
+    """
+    合并同一行中相邻或重叠的区间
+
+    Args:
+        spans: (x, 宽度) 序列
+        gap: 允许合并的最大间隔（像素）
+
+    Returns:
+        按 x 排序的 (x, 宽度) 列表，互不重叠
+    """
+    runs: List[Tuple[int, int]] = []
+    run_x = run_end = None
+    for x, width in sorted(spans):
+        end = x + max(width, 1)
+        if run_end is not None and x - run_end <= gap:
+            if end > run_end:
+                run_end = end
+            continue
+        if run_end is not None:
+            runs.append((run_x, run_end - run_x))
+        run_x, run_end = x, end
+    if run_end is not None:
+        runs.append((run_x, run_end - run_x))
+    return runs
+
+
+class HighlightRenderer:
+    """基于画布图像项对象池的高亮渲染器，按行合并相邻文本块，每段由 2 的幂宽度的图块拼成"""
+
+    def __init__(self, canvas, store, tag: str = 'highlight', color: Tuple[int, int, int, int] = HIGHLIGHT_COLOR):
+        """
+        Args:
+            canvas: 覆盖层画布
+            store: TextBlockStore
+            tag: 画布项标签
+            color: RGBA 填充颜色
+        """
+        self.canvas = canvas
+        self.store = store
+        self.tag = tag
+        self.color = color
+        # (宽, 高) -> PhotoImage，按最近使用排序
+        self._tiles: "OrderedDict[Tuple[int, int], object]" = OrderedDict()
+        # (宽, 高) -> 显示该图块的画布项数；画布项 -> 图块尺寸
+        self._tile_users: Dict[Tuple[int, int], int] = {}
+        self._item_tiles: Dict[int, Tuple[int, int]] = {}
+        # 行 (y, 高度) -> 该行选中的文本块编号
+        self._rows: Dict[Tuple[int, int], Set[int]] = {}
+        # 行 (y, 高度) -> 该行各图块的画布项
+        self._row_items: Dict[Tuple[int, int], List[int]] = {}
+        # 已隐藏、可复用的画布项
+        self._free: List[int] = []
+        self.stats = {'created': 0, 'reused': 0, 'hidden': 0, 'tiles': 0, 'evicted': 0}
+
+    def _make_tile(self, width: int, height: int):
+        return ImageTk.PhotoImage(Image.new('RGBA', (width, height), self.color))
+
+    def _tile(self, width: int, height: int):
+        """获取指定尺寸的半透明图块（按尺寸缓存，最近使用的排在最后）"""
+        key = (width, height)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile = self._make_tile(width, height)
+            self._tiles[key] = tile
+            self.stats['tiles'] += 1
+        else:
+            self._tiles.move_to_end(key)
+        return tile
+
+    def _use_tile(self, item: int, key: Tuple[int, int]):
+        """记录画布项改为显示 key 尺寸的图块"""
+        old = self._item_tiles.get(item)
+        if old == key:
+            return
+        if old is not None:
+            self._tile_users[old] -= 1
+        self._item_tiles[item] = key
+        self._tile_users[key] = self._tile_users.get(key, 0) + 1
+
+    def _unuse_tile(self, item: int):
+        key = self._item_tiles.pop(item, None)
+        if key is not None:
+            self._tile_users[key] -= 1
+
+    def _trim_tiles(self):
+        """缓存超过 MAX_TILES 时淘汰最久未使用的空闲图块（显示中的图块不淘汰）"""
+        excess = len(self._tiles) - MAX_TILES
+        if excess <= 0:
+            return
+        users = self._tile_users
+        for key in [key for key in self._tiles if not users.get(key)][:excess]:
+            del self._tiles[key]
+            users.pop(key, None)
+            self.stats['evicted'] += 1
+
+    def _place(self, item, x: int, y: int, width: int, height: int) -> int:
+        """把一个图块显示在 (x, y)；item 为 None 时从对象池取出或新建画布项"""
+        tile = self._tile(width, height)
+        canvas = self.canvas
+        if item is None and self._free:
+            item = self._free.pop()
+            self.stats['reused'] += 1
+        elif item is None:
+            self.stats['created'] += 1
+            item = canvas.create_image(x, y, image=tile, anchor='nw', tags=self.tag)
+            self._use_tile(item, (width, height))
+            return item
+        canvas.coords(item, x, y)
+        canvas.itemconfigure(item, image=tile, state='normal')
+        self._use_tile(item, (width, height))
+        return item
+
+    def _release(self, item: int):
+        self.canvas.itemconfigure(item, state='hidden')
+        self._unuse_tile(item)
+        self._free.append(item)
+        self.stats['hidden'] += 1
+
+    def _redraw_row(self, row: Tuple[int, int]):
+        """重新合并一行的选中文本块，复用该行已有的画布项"""
+        y, height = row
+        items = self._row_items.pop(row, [])
+        blocks = self._rows.get(row)
+        if not blocks:
+            self._rows.pop(row, None)
+            for item in items:
+                self._release(item)
+            return
+        store = self.store
+        xs, widths = store.xs, store.widths
+        runs = merge_runs((xs[i], widths[i]) for i in blocks)
+        pieces = [piece for run in runs for piece in split_tiles(*run)]
+        placed = []
+        for n, (x, width) in enumerate(pieces):
+            placed.append(self._place(items[n] if n < len(items) else None, x, y, width, max(height, 1)))
+        for item in items[len(pieces):]:
+            self._release(item)
+        self._row_items[row] = placed
+
+    def update(self, added: Iterable[int], removed: Iterable[int]):
+        """
+        更新高亮
+
+        Args:
+            added: 新选中的文本块编号
+            removed: 取消选中的文本块编号
+        """
+        store = self.store
+        ys, heights = store.ys, store.heights
+        dirty = set()
+        # 先回收再分配，尽量复用刚隐藏的画布项
+        for block_id in removed:
+            row = (ys[block_id], heights[block_id])
+            blocks = self._rows.get(row)
+            if blocks and block_id in blocks:
+                blocks.discard(block_id)
+                dirty.add(row)
+        for row in [row for row in dirty if not self._rows.get(row)]:
+            self._redraw_row(row)
+            dirty.discard(row)
+        for block_id in added:
+            row = (ys[block_id], heights[block_id])
+            blocks = self._rows.setdefault(row, set())
+            if block_id not in blocks:
+                blocks.add(block_id)
+                dirty.add(row)
+        for row in dirty:
+            self._redraw_row(row)
+        self._trim_tiles()
+
+    def clear(self):
+        """隐藏所有高亮（画布项保留在池中）"""
+        for items in self._row_items.values():
+            for item in items:
+                self._release(item)
+        self._rows.clear()
+        self._row_items.clear()
+        self._trim_tiles()
+
+    def destroy(self):
+        """删除所有画布项并释放缓存的图块"""
+        self.canvas.delete(self.tag)
+        self._rows.clear()
+        self._row_items.clear()
+        self._free.clear()
+        self._tiles.clear()
+        self._tile_users.clear()
+        self._item_tiles.clear()
+
+    @property
+    def selected(self) -> Set[int]:
+        """当前高亮的文本块编号"""
+        return set().union(*self._rows.values())
+
+    @property
+    def visible_count(self) -> int:
+        """显示中的画布项（图块）数"""
+        return sum(len(items) for items in self._row_items.values())
+
+    @property
+    def pool_size(self) -> int:
+        return self.visible_count + len(self._free)
@@ -0,0 +1,223 @@
+"""
+键盘钩子延迟监控
+低级键盘钩子回调超过 LowLevelHooksTimeout（注册表 HKCU\\Control Panel\\Desktop）时，系统把按键直接交给
+下一个钩子；Windows 7 之后还会静默移除超时的钩子，之后快捷键不再有任何响应。
+回调被延迟的常见原因是 OCR 等线程长时间持有 GIL（钩子在主线程时还包括构建覆盖层等 Tk 操作）。
+
+这里分两个序列记录每次回调的延迟:
+    - 处理耗时：回调开始到处理完成（perf_counter，微秒精度）
+    - 排队延迟：按键事件产生到回调开始（GetTickCount，按 10~16ms 跳变），两者精度不同，分开统计，
+      否则排队延迟的跳变会淹没亚毫秒的处理耗时
+    - 写入固定容量的环形缓冲区（只有钩子线程写入，读取方复制快照，不加锁）
+    - 两者之和超过预算的一半时返回 LEVEL_WARN，超过预算时返回 LEVEL_OVER（钩子可能已被移除）
+    - 慢回调之后用 missed_input() 比较系统最后一次输入时间（GetLastInputInfo）与最后一次回调的
+      按键时间，有新的输入而钩子没有被调用时认为钩子已被移除。鼠标输入也会更新最后输入时间，
+      因此只在慢回调之后检查，误判的代价只是多重新安装一次钩子
+    - format_report() 输出两个序列的直方图，在配置窗口的调试日志中查看
+
+用法:
+    monitor = get_hook_monitor()
+    level = monitor.record(process_ms, queued_ms, event_tick)   # 钩子回调中
+    print(monitor.format_report())
+"""
+import logging
+import time
+from array import array
+from typing import List, Optional, Tuple
+
+try:
+    import winreg
+    WINREG_AVAILABLE = True
+except ImportError:
+    WINREG_AVAILABLE = False
+
+# 注册表未设置 LowLevelHooksTimeout 时按此预算估计（毫秒）
+DEFAULT_HOOK_TIMEOUT_MS = 300
+# Windows 10 1709 之后超过 1000ms 的设置按 1000ms 处理
+MAX_HOOK_TIMEOUT_MS = 1000
+# 延迟达到预算的该比例时告警
+WARN_RATIO = 0.5
+# 环形缓冲区容量（最近的回调次数）
+RING_CAPACITY = 2048
+# 同级别告警日志的最小间隔（秒）
+WARN_LOG_INTERVAL = 10.0
+# 慢回调之后检查钩子是否仍在工作的延迟（毫秒）
+HOOK_CHECK_DELAY_MS = 2000
+# 最后一次输入晚于最后一次回调超过该时间（毫秒）时认为钩子已被移除
+INPUT_GRACE_MS = 1000
+
+LEVEL_OK = 0
+LEVEL_WARN = 1
+LEVEL_OVER = 2
+
+# 样本序列
+SERIES_PROCESS = 'process'  # 处理耗时（perf_counter）
+SERIES_QUEUE = 'queue'      # 排队延迟（GetTickCount）
+
+# 直方图区间上界（毫秒），最后两个区间按预算计算
+HISTOGRAM_BOUNDS = {
+    SERIES_PROCESS: (0.1, 0.5, 1, 5, 16, 50, 100),
+    # GetTickCount 精度约 15.6ms，< 16ms 即"一个计时周期内"
+    SERIES_QUEUE: (16, 32, 50, 100),
+}
+SERIES_LABELS = {SERIES_PROCESS: "处理耗时", SERIES_QUEUE: "排队延迟"}
+
+
+def get_hook_timeout_ms() -> int:
+    """读取系统的低级钩子超时时间（毫秒）"""
+    if WINREG_AVAILABLE:
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Control Panel\Desktop") as key:
+                value, _ = winreg.QueryValueEx(key, "LowLevelHooksTimeout")
+            value = int(value)
+            if value > 0:
+                return min(value, MAX_HOOK_TIMEOUT_MS)
+        except (OSError, ValueError):
+            pass
+    return DEFAULT_HOOK_TIMEOUT_MS
+
+
+class HookLatencyMonitor:
+    """记录钩子回调延迟并按超时预算分级"""
+
+    def __init__(self, timeout_ms: Optional[int] = None, capacity: int = RING_CAPACITY,
+                 warn_ratio: float = WARN_RATIO):
+        """
+        Args:
+            timeout_ms: 钩子超时预算，默认读取系统设置
+            capacity: 环形缓冲区容量
+            warn_ratio: 延迟达到预算的该比例时告警
+        """
+        self.timeout_ms = timeout_ms if timeout_ms is not None else get_hook_timeout_ms()
+        self.warn_ms = self.timeout_ms * warn_ratio
+        self._rings = {series: array('d', bytes(8 * capacity)) for series in HISTOGRAM_BOUNDS}
+        self._process_ring = self._rings[SERIES_PROCESS]
+        self._queue_ring = self._rings[SERIES_QUEUE]
+        self._capacity = capacity
+        # 写入次数（只由钩子线程递增）；位置 = _count % 容量
+        self._count = 0
+        self.last_event_tick = 0  # 最后一次回调的按键事件时间（GetTickCount）
+        # 统计只由钩子线程写入（record / record_reinstall），其他线程（设置对话框）只读取；
+        # 每项是单个数值，读到的最多是稍旧的值，不加锁
+        self.stats = {'warnings': 0, 'over_budget': 0, 'reinstalls': 0, 'max_ms': 0.0}
+        self._last_log = {LEVEL_WARN: 0.0, LEVEL_OVER: 0.0}
+
+    def record(self, process_ms: float, queued_ms: float = 0.0, event_tick: int = 0) -> int:
+        """
+        记录一次回调（钩子线程中调用）
+
+        Args:
+            process_ms: 回调处理耗时（perf_counter）
+            queued_ms: 按键事件产生到回调开始的毫秒数（GetTickCount）
+            event_tick: 按键事件时间（KBDLLHOOKSTRUCT.time）
+
+        Returns:
+            按两者之和分级：LEVEL_OK / LEVEL_WARN / LEVEL_OVER
+        """
+        count = self._count
+        index = count % self._capacity
+        self._process_ring[index] = process_ms
+        self._queue_ring[index] = queued_ms
+        self._count = count + 1
+        latency_ms = process_ms + queued_ms
+        self.last_event_tick = event_tick
+        if latency_ms < self.warn_ms:
+            return LEVEL_OK
+        stats = self.stats
+        if latency_ms > stats['max_ms']:
+            stats['max_ms'] = latency_ms
+        if latency_ms < self.timeout_ms:
+            stats['warnings'] += 1
+            return LEVEL_WARN
+        stats['over_budget'] += 1
+        return LEVEL_OVER
+
+    def record_reinstall(self):
+        """记录一次钩子重新安装（钩子线程中调用）"""
+        self.stats['reinstalls'] += 1
+
+    def missed_input(self, last_input_tick: int, grace_ms: int = INPUT_GRACE_MS) -> bool:
+        """
+        系统最后一次输入是否明显晚于最后一次回调（钩子可能已被移除）
+
+        Args:
+            last_input_tick: GetLastInputInfo 返回的时间（GetTickCount，约 49.7 天回绕）
+        """
+        if not self._count:
+            return False
+        elapsed = (last_input_tick - self.last_event_tick) & 0xFFFFFFFF
+        return grace_ms < elapsed < 0x80000000
+
+    @property
+    def calls(self) -> int:
+        return self._count
+
+    def samples(self, series: str = SERIES_PROCESS) -> List[float]:
+        """最近的样本（复制快照，可在任意线程调用）"""
+        count = self._count
+        ring = self._rings[series].tolist()
+        if count <= self._capacity:
+            return ring[:count]
+        start = count % self._capacity
+        return ring[start:] + ring[:start]
+
+    def histogram(self, series: str = SERIES_PROCESS) -> List[Tuple[str, int]]:
+        """返回 [(区间标签, 次数)]"""
+        bounds = [b for b in HISTOGRAM_BOUNDS[series] if b < self.warn_ms] + [self.warn_ms, self.timeout_ms]
+        counts = [0] * (len(bounds) + 1)
+        for value in self.samples(series):
+            for i, bound in enumerate(bounds):
+                if value < bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        labels = [f"< {bound:g} ms" for bound in bounds] + [f">= {self.timeout_ms:g} ms"]
+        return list(zip(labels, counts))
+
+    def percentile(self, ratio: float, series: str = SERIES_PROCESS) -> float:
+        values = sorted(self.samples(series))
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * ratio))]
+
+    def should_log(self, level: int) -> bool:
+        """同级别告警按 WARN_LOG_INTERVAL 限流"""
+        now = time.monotonic()
+        if now - self._last_log.get(level, 0.0) < WARN_LOG_INTERVAL:
+            return False
+        self._last_log[level] = now
+        return True
+
+    def format_report(self) -> str:
+        """处理耗时和排队延迟的直方图（用于调试日志）"""
+        lines = [
+            f"=== 键盘钩子延迟（最近 {min(self.calls, self._capacity)} 次 / 共 {self.calls} 次，"
+            f"超时预算 {self.timeout_ms} ms）===",
+            f"最大总延迟 {self.stats['max_ms']:.1f} ms  告警 {self.stats['warnings']}  "
+            f"超时 {self.stats['over_budget']}  重新安装 {self.stats['reinstalls']}",
+        ]
+        for series, name in SERIES_LABELS.items():
+            samples = self.samples(series)
+            lines.append(
+                f"--- {name}: P50 {self.percentile(0.5, series):.2f} ms  P99 {self.percentile(0.99, series):.2f} ms  "
+                f"最大 {max(samples, default=0.0):.2f} ms"
+            )
+            histogram = self.histogram(series)
+            peak = max(count for _, count in histogram) or 1
+            for label, count in histogram:
+                lines.append(f"{label:>12} {count:>7}  {'#' * round(count * 40 / peak)}")
+        return "\n".join(lines)
+
+
+# 全局单例
+_hook_monitor: Optional[HookLatencyMonitor] = None
+
+
+def get_hook_monitor() -> HookLatencyMonitor:
+    """获取全局钩子延迟监控"""
+    global _hook_monitor
+    if _hook_monitor is None:
+        _hook_monitor = HookLatencyMonitor()
+        logging.debug(f"键盘钩子超时预算: {_hook_monitor.timeout_ms} ms")
+    return _hook_monitor
@@ -0,0 +1,152 @@
+"""
+快捷键匹配
+低级键盘钩子对系统中的每次按键都会回调，回调超时 Windows 会直接丢弃钩子。原回调每次都重新拆分
+快捷键字符串、按 KEY_MAPPING 重建虚拟键码集合，再逐个按键检查 all(any(...))。
+这里在配置变化时编译一次:
+    - vk_codes：快捷键涉及的全部虚拟键码（frozenset），其他按键只需一次集合判断
+    - 每个虚拟键码对应一个位，按下状态是一个整数位掩码
+    - complete 表：位掩码 -> 快捷键的每个部分（如 ctrl 的左右两个键之一）是否都已按下，状态转换为 O(1)
+
+匹配语义与原实现一致:
+    - 快捷键的每个部分只要按下其中任一键码即满足（左右 CTRL 等）
+    - 包含未知键名的快捷键永远不会匹配
+    - 快捷键中任一键松开即视为松开
+
+用法:
+    matcher = HotkeyMatcher("ctrl+alt")
+    if vk in matcher.vk_codes:
+        if matcher.key_down(vk): ...   # 所有部分都已按下
+        matcher.key_up(vk)
+"""
+from typing import Dict, List, Optional, Sequence
+
+# 键名 -> 虚拟键码
+KEY_MAPPING: Dict[str, List[int]] = {
+    # 控制键
+    'ctrl': [162, 163],     # 左右CTRL键
+    'alt': [164, 165],      # 左右ALT键
+    'shift': [160, 161],    # 左右SHIFT键
+    'win': [91, 92],        # 左右WIN键
+
+    # 功能键
+    'f1': [112], 'f2': [113], 'f3': [114], 'f4': [115],
+    'f5': [116], 'f6': [117], 'f7': [118], 'f8': [119],
+    'f9': [120], 'f10': [121], 'f11': [122], 'f12': [123],
+
+    # 数字键
+    '0': [48], '1': [49], '2': [50], '3': [51], '4': [52],
+    '5': [53], '6': [54], '7': [55], '8': [56], '9': [57],
+
+    # 字母键
+    'a': [65], 'b': [66], 'c': [67], 'd': [68], 'e': [69],
+    'f': [70], 'g': [71], 'h': [72], 'i': [73], 'j': [74],
+    'k': [75], 'l': [76], 'm': [77], 'n': [78], 'o': [79],
+    'p': [80], 'q': [81], 'r': [82], 's': [83], 't': [84],
+    'u': [85], 'v': [86], 'w': [87], 'x': [88], 'y': [89],
+    'z': [90],
+
+    # 特殊键
+    'space': [32],          # 空格键
+    'tab': [9],            # Tab键
+    'enter': [13],         # 回车键
+    'backspace': [8],      # 退格键
+    'delete': [46],        # 删除键
+    'esc': [27],           # ESC键
+    'capslock': [20],      # 大写锁定键
+
+    # 方向键
+    'up': [38],            # 上箭头
+    'down': [40],          # 下箭头
+    'left': [37],          # 左箭头
+    'right': [39],         # 右箭头
+
+    # 其他常用键
+    'home': [36],          # Home键
+    'end': [35],           # End键
+    'pageup': [33],        # PageUp键
+    'pagedown': [34],      # PageDown键
+    'insert': [45],        # Insert键
+    'printscreen': [44],   # PrintScreen键
+    'scrolllock': [145],   # ScrollLock键
+    'pause': [19],         # Pause键
+}
+
+# 超过该位数时不预先计算 complete 表（2^位数 项），改为逐个部分检查
+MAX_TABLE_BITS = 12
+
+
+class HotkeyMatcher:
+    """编译后的快捷键匹配器（钩子回调中使用，只做整数和集合运算）"""
+
+    __slots__ = ('hotkey', 'vk_codes', 'required_mask', '_bits', '_part_masks', '_complete', 'pressed')
+
+    def __init__(self, hotkey: str, key_mapping: Optional[Dict[str, Sequence[int]]] = None):
+        """
+        Args:
+            hotkey: 快捷键配置，如 "alt"、"ctrl+shift"
+            key_mapping: 键名 -> 虚拟键码，默认 KEY_MAPPING
+        """
+        if key_mapping is None:
+            key_mapping = KEY_MAPPING
+        self.hotkey = hotkey
+        parts = hotkey.lower().split('+')
+        # 每个虚拟键码一个位
+        self._bits: Dict[int, int] = {}
+        for part in parts:
+            for code in key_mapping.get(part, ()):
+                if code not in self._bits:
+                    self._bits[code] = 1 << len(self._bits)
+        self.vk_codes = frozenset(self._bits)
+        # 每个部分满足的条件：按下状态与该部分的掩码有交集；未知键名的掩码为 0，永远不满足
+        self._part_masks = tuple(
+            sum(self._bits[code] for code in set(key_mapping.get(part, ()))) for part in parts
+        )
+        self.required_mask = 0
+        for mask in self._part_masks:
+            self.required_mask |= mask
+        width = len(self._bits)
+        if width <= MAX_TABLE_BITS:
+            self._complete = bytes(
+                all(state & mask for mask in self._part_masks) for state in range(1 << width)
+            )
+        else:
+            self._complete = None
+        self.pressed = 0
+
+    def key_down(self, vk: int) -> bool:
+        """
+        快捷键中的键按下
+
+        Returns:
+            按下后快捷键的所有部分是否都已按下
+        """
+        bit = self._bits.get(vk)
+        if bit is None:
+            return False
+        self.pressed |= bit
+        return self.is_complete()
+
+    def key_up(self, vk: int) -> bool:
+        """
+        快捷键中的键松开
+
+        Returns:
+            vk 是否属于该快捷键
+        """
+        bit = self._bits.get(vk)
+        if bit is None:
+            return False
+        self.pressed &= ~bit
+        return True
+
+    def is_complete(self) -> bool:
+        if self._complete is not None:
+            return bool(self._complete[self.pressed])
+        pressed = self.pressed
+        return all(pressed & mask for mask in self._part_masks)
+
+    def reset(self):
+        self.pressed = 0
+
+    def __repr__(self) -> str:
+        return f"HotkeyMatcher({self.hotkey!r}, vk_codes={sorted(self.vk_codes)})"
@@ -0,0 +1,325 @@
+"""
+空闲资源占用基准测试
+程序常驻在每台工作站上，空闲时的 CPU 唤醒、内存和线程数与触发延迟同样重要。
+这里用替身后端（截图、OCR 引擎、键盘钩子、系统托盘）启动完整的 ScreenOCRTool，
+可选先模拟几次快捷键触发，然后空闲 N 分钟，记录:
+
+指标:
+    wakeups_per_s   进程每秒的自愿上下文切换次数（线程阻塞后被唤醒的次数）
+    loop_wakeups_per_s  Tk 主循环每秒被 TkNotifier 唤醒的次数
+    cpu_ms_per_s    每秒占用的 CPU 时间 (ms)
+    rss_mb          空闲结束时的常驻内存 (MB)
+    threads         空闲结束时的系统线程数
+    handles         空闲结束时打开的句柄数（Windows 为句柄，Linux 为文件描述符）
+
+内置阈值只是估计值，尚未在 Linux/Windows 上实测，默认只提示超出的指标，不影响退出码。
+用 --thresholds 指定实测生成的阈值（或加 --strict）时，超过阈值返回 1，可作为回归门禁。
+没有 Win32 也可以运行，Linux 上需要图形环境（xvfb-run）。
+
+用法:
+    xvfb-run python idle_benchmark.py --minutes 5
+    python idle_benchmark.py --minutes 1 --triggers 3 --output idle.json
+    xvfb-run python idle_benchmark.py --save-thresholds idle_thresholds.json   # 以本次结果（留余量）作为新阈值
+    xvfb-run python idle_benchmark.py --thresholds idle_thresholds.json        # 门禁：超过阈值返回 1
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from PIL import Image
+
+import ocr_engines
+from keyboard_hook import WM_KEYDOWN, WM_KEYUP
+from text_blocks import TextBlockStore
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+FAKE_ENGINE = "idle_fake"
+
+# 参考阈值（按平台）：未经实测的估计值，只用于提示，不作为门禁；
+# 门禁请用 --save-thresholds 在目标环境实测生成，再通过 --thresholds 传入
+DEFAULT_THRESHOLDS: Dict[str, Dict[str, float]] = {
+    "linux": {"wakeups_per_s": 20, "loop_wakeups_per_s": 1, "cpu_ms_per_s": 10,
+              "rss_mb": 300, "threads": 10, "handles": 64},
+    "win32": {"wakeups_per_s": 20, "loop_wakeups_per_s": 1, "cpu_ms_per_s": 10,
+              "rss_mb": 300, "threads": 16, "handles": 800},
+}
+# --save-thresholds 时在测量值上留的余量
+THRESHOLD_HEADROOM = 1.5
+
+
+class FakeEngine:
+    """替身 OCR 引擎：返回固定的文本块"""
+
+    def __init__(self, latency_ms: float = 50.0):
+        self.latency_ms = latency_ms
+
+    def is_available(self) -> bool:
+        return True
+
+    def ocr_pil_image(self, image, preprocess: bool = False) -> TextBlockStore:
+        time.sleep(self.latency_ms / 1000)
+        blocks = TextBlockStore()
+        for row in range(20):
+            blocks.append(f"空闲基准测试 line {row}", 40, 40 + row * 30, 240, 20)
+        return blocks
+
+
+class FakeKeyboardHook:
+    """替身键盘钩子：不安装系统钩子，由 key() 模拟按键"""
+
+    def __init__(self, state, channel):
+        self.state = state
+        self.channel = channel
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def reinstall(self):
+        pass
+
+    def key(self, vk: int, message: int):
+        """与钩子线程相同：经状态机转换后发送到主线程"""
+        event = self.state.on_key(vk, message)
+        if event is not None:
+            self.channel.send(*event)
+
+
+class FakeTray:
+    """替身系统托盘：只提供配置"""
+
+    class _Icon:
+        def stop(self):
+            pass
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.icon = self._Icon()
+
+    def load_config(self) -> dict:
+        return self.config
+
+    def save_config(self):
+        pass
+
+    def show_config(self, icon, item):
+        pass
+
+    def run(self):
+        pass
+
+
+class FakeBackend:
+    """替身平台后端（见 platform_backend.Win32Backend）"""
+
+    def __init__(self, size=(1920, 1080), config: Optional[dict] = None):
+        self.size = size
+        self.config = config or {}
+        self.hook: Optional[FakeKeyboardHook] = None
+        self._screenshot = None
+
+    def set_dpi_awareness(self):
+        pass
+
+    def dpi_scale(self) -> float:
+        return 1.0
+
+    def monitor_area(self):
+        return (0, 0) + tuple(self.size)
+
+    def frame_interval_ms(self) -> float:
+        return 1000.0 / 60
+
+    def cursor_pos(self):
+        return (self.size[0] // 2, self.size[1] // 2)
+
+    def capture(self):
+        if self._screenshot is None:
+            self._screenshot = Image.new('RGB', self.size, (240, 240, 240))
+        return self._screenshot.copy()
+
+    def create_keyboard_hook(self, state, channel):
+        self.hook = FakeKeyboardHook(state, channel)
+        return self.hook
+
+    def last_input_tick(self):
+        return None
+
+    def install_console_handler(self, on_interrupt):
+        pass
+
+    def create_tray(self, tool):
+        return FakeTray(self.config)
+
+
+def snapshot(tool) -> Dict[str, float]:
+    """当前进程的资源计数"""
+    result = {
+        'time': time.perf_counter(),
+        'cpu_s': time.process_time(),
+        'loop_wakeups': tool._notifier.stats['wakeups'],
+        'voluntary_switches': None,
+        'rss_mb': None,
+        'threads': threading.active_count(),
+        'handles': None,
+    }
+    if PSUTIL_AVAILABLE:
+        process = psutil.Process()
+        result['voluntary_switches'] = process.num_ctx_switches().voluntary
+        result['rss_mb'] = process.memory_info().rss / 1024 / 1024
+        result['threads'] = process.num_threads()
+        result['handles'] = process.num_handles() if hasattr(process, 'num_handles') else process.num_fds()
+        return result
+    if resource is not None:
+        result['voluntary_switches'] = resource.getrusage(resource.RUSAGE_SELF).ru_nvcsw
+    if os.path.isdir('/proc/self'):
+        with open('/proc/self/statm') as f:
+            result['rss_mb'] = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+        result['threads'] = len(os.listdir('/proc/self/task'))
+        result['handles'] = len(os.listdir('/proc/self/fd'))
+    return result
+
+
+def idle_metrics(start: Dict, end: Dict) -> Dict[str, Optional[float]]:
+    seconds = end['time'] - start['time']
+    switches = None
+    if start['voluntary_switches'] is not None:
+        switches = round((end['voluntary_switches'] - start['voluntary_switches']) / seconds, 2)
+    return {
+        'seconds': round(seconds, 1),
+        'wakeups_per_s': switches,
+        'loop_wakeups_per_s': round((end['loop_wakeups'] - start['loop_wakeups']) / seconds, 3),
+        'cpu_ms_per_s': round((end['cpu_s'] - start['cpu_s']) * 1000 / seconds, 3),
+        'rss_mb': None if end['rss_mb'] is None else round(end['rss_mb'], 1),
+        'threads': end['threads'],
+        'handles': end['handles'],
+    }
+
+
+def check_thresholds(metrics: Dict, thresholds: Dict) -> list:
+    """返回超过阈值的指标说明"""
+    failures = []
+    for name, limit in thresholds.items():
+        value = metrics.get(name)
+        if value is not None and value > limit:
+            failures.append(f"{name}: {value} > {limit}")
+    return failures
+
+
+def run_idle(minutes: float, settle_s: float, triggers: int, size) -> Dict:
+    """启动 ScreenOCRTool，模拟 triggers 次快捷键后空闲 minutes 分钟，返回指标"""
+    from screen_ocr_overlay import ScreenOCRTool
+
+    ocr_engines.register_engine(FAKE_ENGINE, FakeEngine, display_name="替身引擎", replace=True)
+    config = dict(ScreenOCRTool.DEFAULT_CONFIG)
+    config.update({
+        "ocr_engine": FAKE_ENGINE,
+        "auto_copy": False,
+        "enable_translation": False,
+        "first_run": False,
+        "show_welcome": False,
+        "show_startup_notification": False,
+    })
+    backend = FakeBackend(size=size, config=config)
+    tool = ScreenOCRTool(backend=backend)
+    result = {}
+
+    def controller():
+        try:
+            vk = next(iter(tool.hotkey_state.matcher.vk_codes))
+            for _ in range(triggers):
+                time.sleep(1.0)
+                backend.hook.key(vk, WM_KEYDOWN)
+                time.sleep((tool.trigger_delay_ms + 500) / 1000)
+                backend.hook.key(vk, WM_KEYUP)
+            time.sleep(settle_s)
+            start = snapshot(tool)
+            time.sleep(minutes * 60)
+            result.update(idle_metrics(start, snapshot(tool)))
+            result['first_paint'] = dict(tool.paint_stats)
+        except Exception as e:
+            logging.error(f"空闲基准测试失败: {e}")
+        finally:
+            # 让主循环退出（run 结束时清理资源）
+            tool._running = False
+            tool._wake()
+
+    threading.Thread(target=controller, name="idle-benchmark", daemon=True).start()
+    tool.run()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="空闲资源占用基准测试")
+    parser.add_argument("--minutes", type=float, default=1.0, help="空闲测量时长（分钟）")
+    parser.add_argument("--settle", type=float, default=5.0, help="开始测量前等待启动完成的秒数")
+    parser.add_argument("--triggers", type=int, default=1, help="测量前模拟的快捷键触发次数")
+    parser.add_argument("--size", default="1920x1080", help="替身屏幕尺寸")
+    parser.add_argument("--thresholds", help="实测阈值 JSON，超过时返回 1（默认使用内置参考阈值，只提示）")
+    parser.add_argument("--strict", action="store_true", help="使用内置参考阈值时也在超过阈值时返回 1")
+    parser.add_argument("--save-thresholds", help="以本次结果乘以余量保存为阈值 JSON")
+    parser.add_argument("--output", help="JSON 报告输出路径（默认输出到标准输出）")
+    args = parser.parse_args(argv)
+
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+    metrics = run_idle(args.minutes, args.settle, args.triggers, size)
+    if not metrics.get('seconds'):
+        print("空闲基准测试未完成", file=sys.stderr)
+        return 1
+
+    platform = "win32" if sys.platform == "win32" else "linux"
+    thresholds = DEFAULT_THRESHOLDS[platform]
+    gate = bool(args.thresholds) or args.strict
+    if args.thresholds:
+        with open(args.thresholds, 'r', encoding='utf-8') as f:
+            thresholds = json.load(f)
+
+    report = {'platform': platform, 'metrics': metrics, 'thresholds': thresholds, 'gate': gate}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.save_thresholds:
+        # 计数类指标（如主循环唤醒）可能为 0，至少留 1 的余量
+        saved = {name: round(max(metrics[name] * THRESHOLD_HEADROOM, metrics[name] + 1), 3)
+                 for name in thresholds if metrics.get(name) is not None}
+        with open(args.save_thresholds, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, ensure_ascii=False, indent=2)
+        print(f"已保存阈值到 {args.save_thresholds}", file=sys.stderr)
+        return 0
+
+    failures = check_thresholds(metrics, thresholds)
+    for failure in failures:
+        print(f"❌ {failure}" if gate else f"⚠ {failure}", file=sys.stderr)
+    if failures:
+        if not gate:
+            print("内置参考阈值未经实测，仅作提示；门禁请用 --thresholds 指定实测阈值", file=sys.stderr)
+            return 0
+        return 1
+    print("✓ 空闲资源占用在阈值内", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
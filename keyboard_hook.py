@@ -0,0 +1,272 @@
+"""
+键盘钩子线程
+WH_KEYBOARD_LL 钩子的回调在安装钩子的线程的消息循环中执行。原来钩子安装在 Tk 主线程，
+构建覆盖层、合成截图等较长的 Tk 操作期间按键回调得不到处理，系统中所有按键都会被延迟。
+这里把钩子放到专用线程:
+    - KeyboardHookThread：安装钩子并运行 GetMessage 消息循环，钩子回调只在该线程执行
+    - HotkeyStateMachine：钩子线程中的快捷键状态（原 key_press_time > 0 的判断和 HotkeyMatcher），
+      每个按键事件转换为 KEY_PRESS / KEY_RELEASE / KEY_ESCAPE 或 None
+    - KeyEventChannel：钩子线程发送、主线程接收的事件通道（deque 的 append/popleft 是原子操作，
+      发送方不加锁），发送后通过 notify 唤醒主循环。钩子线程不能调用 Tcl（线程版 Tcl 会等待主线程），
+      notify 应当是 event_loop.ThreadWaker.wake
+
+HotkeyStateMachine 和 KeyEventChannel 不依赖 Win32，可以在任何平台上测试
+
+用法:
+    channel = KeyEventChannel(ThreadWaker(notifier.notify).wake)
+    state = HotkeyStateMachine()
+    hook = KeyboardHookThread(state, channel)
+    hook.start()
+    for kind, value in channel.drain(): ...    # 主线程
+    state.matcher = HotkeyMatcher("alt")        # 配置变化时整体替换
+    hook.stop()
+"""
+import ctypes
+import logging
+import threading
+import time
+from collections import deque
+from ctypes import wintypes
+from typing import Callable, List, Optional, Tuple
+
+from hook_monitor import LEVEL_OK, get_hook_monitor
+
+# 窗口消息
+WM_QUIT = 0x0012
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
+WM_APP = 0x8000
+WM_REINSTALL_HOOK = WM_APP + 1
+WH_KEYBOARD_LL = 13
+VK_ESCAPE = 27
+
+# 通道事件
+KEY_PRESS = 'press'      # 快捷键的所有部分都已按下，值为按下时间（time.time()）
+KEY_RELEASE = 'release'  # 快捷键中的键松开
+KEY_ESCAPE = 'escape'    # 按下 ESC
+HOOK_SLOW = 'slow'       # 钩子回调延迟接近或超过超时预算，值为 (级别, 延迟毫秒)
+
+
+class KeyEventChannel:
+    """钩子线程 -> 主线程的事件通道（单发送方、单接收方，不加锁）"""
+
+    def __init__(self, notify: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            notify: 发送后在发送线程中调用（唤醒主循环，不能阻塞）
+        """
+        self._events = deque()
+        self.notify = notify
+        self.sent = 0
+
+    def send(self, kind: str, value=0.0):
+        """发送事件（钩子线程）"""
+        self._events.append((kind, value))
+        self.sent += 1
+        if self.notify:
+            self.notify()
+
+    def drain(self) -> List[Tuple[str, object]]:
+        """按发送顺序取出所有事件（主线程）"""
+        events = []
+        pop = self._events.popleft
+        while self._events:
+            events.append(pop())
+        return events
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+class HotkeyStateMachine:
+    """钩子线程中的快捷键状态"""
+
+    __slots__ = ('matcher', 'active', 'clock')
+
+    def __init__(self, matcher=None, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            matcher: HotkeyMatcher，加载配置前为 None（只处理 ESC）
+            clock: 按下时间的时钟
+        """
+        self.matcher = matcher
+        self.active = False  # 快捷键已按下，等待松开（原 key_press_time > 0）
+        self.clock = clock
+
+    def on_key(self, vk: int, message: int) -> Optional[Tuple[str, float]]:
+        """
+        处理一次按键事件
+
+        Args:
+            vk: 虚拟键码
+            message: WM_KEYDOWN / WM_KEYUP / WM_SYSKEYDOWN / WM_SYSKEYUP
+
+        Returns:
+            需要通知主线程的事件 (类型, 值)，否则 None
+        """
+        if vk == VK_ESCAPE and message == WM_KEYDOWN:
+            self.active = False
+            return (KEY_ESCAPE, 0.0)
+
+        # 非快捷键的按键只做一次集合判断；配置变化时 matcher 被整体替换，这里只读取一次
+        matcher = self.matcher
+        if matcher is None or vk not in matcher.vk_codes:
+            return None
+        if message == WM_KEYDOWN or message == WM_SYSKEYDOWN:
+            # 快捷键已按下时忽略自动重复，直到松开
+            if self.active:
+                return None
+            if matcher.key_down(vk):
+                self.active = True
+                return (KEY_PRESS, self.clock())
+        elif message == WM_KEYUP or message == WM_SYSKEYUP:
+            matcher.key_up(vk)
+            self.active = False
+            return (KEY_RELEASE, 0.0)
+        return None
+
+    def reset(self):
+        self.active = False
+        if self.matcher is not None:
+            self.matcher.reset()
+
+
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ('vkCode', wintypes.DWORD),
+        ('scanCode', wintypes.DWORD),
+        ('flags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', wintypes.PULONG)
+    ]
+
+
+class KeyboardHookThread:
+    """在专用线程中安装低级键盘钩子并运行消息循环（仅 Windows）"""
+
+    def __init__(self, state: HotkeyStateMachine, channel: KeyEventChannel):
+        """
+        Args:
+            state: 快捷键状态（只在钩子线程中修改）
+            channel: 事件通道（按键事件和 HOOK_SLOW 都经通道交给主线程）
+        """
+        self.state = state
+        self.channel = channel
+        self.hook_id = None
+        self.thread_id = 0
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[str] = None
+
+    def start(self, timeout: float = 5.0):
+        """启动钩子线程，等待钩子安装完成；安装失败时抛出异常"""
+        self._thread = threading.Thread(target=self._run, name="KeyboardHook", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise Exception("键盘钩子线程启动超时")
+        if self._error:
+            raise Exception(self._error)
+
+    def reinstall(self):
+        """请求钩子线程重新安装钩子（可在任意线程调用）"""
+        if self.thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self.thread_id, WM_REINSTALL_HOOK, 0, 0)
+
+    def stop(self, timeout: float = 2.0):
+        """结束消息循环并卸载钩子"""
+        if self.thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self.thread_id, WM_QUIT, 0, 0)
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        user32 = ctypes.WinDLL('user32', use_last_error=True)
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.GetTickCount.restype = wintypes.DWORD
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+        kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+        get_tick = kernel32.GetTickCount
+        perf_counter = time.perf_counter
+        monitor = get_hook_monitor()
+        state = self.state
+        send = self.channel.send
+        call_next = user32.CallNextHookEx
+
+        def keyboard_hook_proc(nCode, wParam, lParam):
+            """统一的键盘钩子处理函数"""
+            try:
+                if nCode >= 0:
+                    start = perf_counter()
+                    start_tick = get_tick()
+                    kb = lParam.contents
+                    event = state.on_key(kb.vkCode, wParam)
+                    if event is not None:
+                        send(*event)
+
+                    # 处理耗时（perf_counter）和排队延迟（按键事件产生到回调开始，GetTickCount 精度）分开记录
+                    process_ms = (perf_counter() - start) * 1000
+                    event_tick = kb.time
+                    queued_ms = (start_tick - event_tick) & 0xFFFFFFFF
+                    if queued_ms >= 0x80000000:
+                        queued_ms = 0
+                    level = monitor.record(process_ms, queued_ms, event_tick)
+                    if level != LEVEL_OK:
+                        send(HOOK_SLOW, (level, process_ms + queued_ms))
+            except Exception as e:
+                print(f"键盘钩子处理错误: {str(e)}")
+            return call_next(None, nCode, wParam, lParam)
+
+        HOOKPROC = ctypes.CFUNCTYPE(
+            ctypes.c_long,
+            ctypes.c_int,
+            wintypes.WPARAM,
+            ctypes.POINTER(KBDLLHOOKSTRUCT)
+        )
+        user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD]
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        user32.UnhookWindowsHookEx.argtypes = [wintypes.HHOOK]
+        # 保存回调对象以防止被垃圾回收
+        self.keyboard_proc = HOOKPROC(keyboard_hook_proc)
+        module_handle = kernel32.GetModuleHandleW(None)
+
+        def install():
+            hook_id = user32.SetWindowsHookExW(WH_KEYBOARD_LL, self.keyboard_proc, module_handle, 0)
+            if not hook_id:
+                raise Exception(f"无法设置键盘钩子，错误码: {ctypes.get_last_error()}")
+            return hook_id
+
+        try:
+            self.thread_id = kernel32.GetCurrentThreadId()
+            # 确保线程有消息队列，之后 PostThreadMessage 才能送达
+            msg = wintypes.MSG()
+            user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, 0)
+            self.hook_id = install()
+        except Exception as e:
+            self._error = str(e)
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.hwnd is None and msg.message == WM_REINSTALL_HOOK:
+                    # 先安装新钩子再卸载旧钩子，避免中间漏掉按键；旧钩子已被系统移除时卸载失败可忽略
+                    try:
+                        old_hook_id = self.hook_id
+                        self.hook_id = install()
+                        user32.UnhookWindowsHookEx(old_hook_id)
+                        state.reset()
+                        monitor.record_reinstall()
+                        logging.info("键盘钩子已重新安装")
+                    except Exception as e:
+                        logging.error(f"重新安装键盘钩子失败: {str(e)}")
+                    continue
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            if self.hook_id and not user32.UnhookWindowsHookEx(self.hook_id):
+                logging.error("卸载键盘钩子失败")
+            self.hook_id = None
+            self.thread_id = 0
@@ -0,0 +1,541 @@
+"""
+OCR 离线基准测试
+渲染一组确定性的合成截图（中英混排、多种字号、深色/浅色主题、密集表格），
+使用已知的真值评估 OCR 引擎的准确度和延迟
+
+指标:
+    cer          字符错误率（按 IoU 匹配后的文本块计算编辑距离）
+    box_iou      真值文本块与最佳匹配识别框的平均 IoU
+    latency_p50  单张图片识别延迟中位数 (ms)
+    latency_p95  单张图片识别延迟 95 分位 (ms)
+    peak_traced_kb / peak_rss_kb  识别过程的内存峰值
+
+用法:
+    python ocr_benchmark.py --engine fake                      # Linux 上使用替身引擎
+    python ocr_benchmark.py --engine wechat --downscale 1,0.75 --output wechat.json
+    python ocr_benchmark.py --engine windows --baseline wechat.json
+    python ocr_benchmark.py --save-corpus corpus/              # 导出语料图片和真值
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+import ocr_engines
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# 字体候选（按优先级），第一个可用的 CJK 字体用于渲染
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+    "C:/Windows/Fonts/simsun.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+THEMES = {
+    "light": {"background": (255, 255, 255), "text": (30, 30, 30), "grid": (210, 210, 210)},
+    "dark": {"background": (30, 30, 30), "text": (220, 220, 220), "grid": (70, 70, 70)},
+}
+
+FONT_SIZES = [12, 14, 16, 20, 28]
+
+LATIN_WORDS = [
+    "screen", "capture", "overlay", "select", "text", "engine", "result", "config",
+    "Python", "Windows", "latency", "buffer", "pixel", "window", "hotkey", "OCR",
+    "version", "2024", "v4.1.0", "error", "timeout", "queue", "thread", "cache",
+]
+CJK_WORDS = [
+    "屏幕", "识别", "文字", "选择", "复制", "翻译", "设置", "引擎", "截图", "快捷键",
+    "微信", "系统", "延迟", "配置", "结果", "窗口", "高亮", "剪贴板", "中文", "测试",
+]
+TABLE_HEADERS = ["编号", "Name", "状态", "Time(ms)", "备注", "Owner", "版本", "Size"]
+
+
+def load_font(size: int, font_path: Optional[str] = None):
+    """加载渲染字体，找不到 TrueType 字体时退回 Pillow 内置字体"""
+    candidates = [font_path] if font_path else FONT_CANDIDATES
+    for path in candidates:
+        if path and os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError:
+                continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1 的内置字体不支持指定字号
+        return ImageFont.load_default()
+
+
+class BenchmarkSample:
+    """一张合成截图及其真值"""
+
+    def __init__(self, sample_id: str, category: str, image: Image.Image, truth: List[Dict]):
+        self.sample_id = sample_id
+        self.category = category
+        self.image = image
+        self.truth = truth
+
+
+class CorpusBuilder:
+    """确定性合成语料生成器（相同 seed 生成完全相同的语料）"""
+
+    def __init__(self, seed: int = 20240601, width: int = 1280, height: int = 720,
+                 font_path: Optional[str] = None):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.font_path = font_path
+        self._fonts = {}
+
+    def _font(self, size: int):
+        if size not in self._fonts:
+            self._fonts[size] = load_font(size, self.font_path)
+        return self._fonts[size]
+
+    def _draw_text(self, draw, truth, x: int, y: int, text: str, size: int, color) -> int:
+        """绘制一个文本块并记录真值，返回文本块宽度"""
+        font = self._font(size)
+        draw.text((x, y), text, font=font, fill=color)
+        left, top, right, bottom = draw.textbbox((x, y), text, font=font)
+        truth.append({
+            'text': text,
+            'x': int(left),
+            'y': int(top),
+            'width': int(right - left),
+            'height': int(bottom - top)
+        })
+        return int(right - left)
+
+    def _phrase(self, rng: random.Random, mixed: bool) -> str:
+        words = []
+        for _ in range(rng.randint(2, 6)):
+            if mixed and rng.random() < 0.5:
+                words.append(rng.choice(CJK_WORDS) + rng.choice(CJK_WORDS))
+            else:
+                words.append(rng.choice(LATIN_WORDS))
+        # 中文之间不加空格，英文之间加空格
+        text = words[0]
+        for word in words[1:]:
+            sep = "" if (ord(word[0]) > 0x2e80 and ord(text[-1]) > 0x2e80) else " "
+            text += sep + word
+        return text
+
+    def _render_lines(self, rng: random.Random, theme: str, sizes: List[int], mixed: bool):
+        colors = THEMES[theme]
+        image = Image.new('RGB', (self.width, self.height), colors["background"])
+        draw = ImageDraw.Draw(image)
+        truth = []
+        y = 20
+        while True:
+            size = rng.choice(sizes)
+            if y + size * 2 > self.height - 20:
+                break
+            x = 20 + rng.randint(0, 40)
+            # 一行内放 1~3 个文本块，块间留出足够间距
+            for _ in range(rng.randint(1, 3)):
+                text = self._phrase(rng, mixed)
+                if x + len(text) * size > self.width - 20:
+                    break
+                x += self._draw_text(draw, truth, x, y, text, size, colors["text"]) + size * 3
+            y += int(size * 1.8)
+        return image, truth
+
+    def _render_table(self, rng: random.Random, theme: str):
+        colors = THEMES[theme]
+        image = Image.new('RGB', (self.width, self.height), colors["background"])
+        draw = ImageDraw.Draw(image)
+        truth = []
+        size = 13
+        cols = len(TABLE_HEADERS)
+        col_width = (self.width - 40) // cols
+        row_height = 24
+        rows = (self.height - 40) // row_height
+        for row in range(rows):
+            y = 20 + row * row_height
+            draw.line([(20, y), (self.width - 20, y)], fill=colors["grid"])
+            for col in range(cols):
+                x = 20 + col * col_width
+                if row == 0:
+                    text = TABLE_HEADERS[col]
+                elif col == 0:
+                    text = f"{row:04d}"
+                elif col in (2, 4, 6):
+                    text = rng.choice(CJK_WORDS)
+                elif col == 3:
+                    text = str(rng.randint(1, 9999))
+                else:
+                    text = rng.choice(LATIN_WORDS)
+                self._draw_text(draw, truth, x + 4, y + 5, text, size, colors["text"])
+        for col in range(cols + 1):
+            x = 20 + col * col_width
+            draw.line([(x, 20), (x, 20 + rows * row_height)], fill=colors["grid"])
+        return image, truth
+
+    def build(self) -> List[BenchmarkSample]:
+        """生成完整语料"""
+        samples = []
+        for theme in THEMES:
+            for category, sizes, mixed in [
+                ("latin", FONT_SIZES, False),
+                ("mixed", FONT_SIZES, True),
+                ("small", [12, 13, 14], True),
+                ("large", [24, 28, 32], True),
+            ]:
+                rng = random.Random(f"{self.seed}-{theme}-{category}")
+                image, truth = self._render_lines(rng, theme, sizes, mixed)
+                samples.append(BenchmarkSample(f"{category}-{theme}", category, image, truth))
+            rng = random.Random(f"{self.seed}-{theme}-table")
+            image, truth = self._render_table(rng, theme)
+            samples.append(BenchmarkSample(f"table-{theme}", "table", image, truth))
+        return samples
+
+    def save(self, samples: List[BenchmarkSample], directory: str):
+        """导出语料（PNG + 真值 JSON）"""
+        os.makedirs(directory, exist_ok=True)
+        for sample in samples:
+            sample.image.save(os.path.join(directory, f"{sample.sample_id}.png"), 'PNG')
+            with open(os.path.join(directory, f"{sample.sample_id}.json"), 'w', encoding='utf-8') as f:
+                json.dump(sample.truth, f, ensure_ascii=False, indent=1)
+
+
+class GroundTruthEngine:
+    """
+    替身 OCR 引擎：返回带确定性扰动的真值
+    用于在没有 WeChatOCR / Windows OCR 的环境中验证基准测试流程
+    """
+
+    def __init__(self, box_jitter: int = 2, char_error_rate: float = 0.02,
+                 latency_ms: float = 5.0, latency_per_mpx_ms: float = 20.0, seed: int = 0):
+        self.box_jitter = box_jitter
+        self.char_error_rate = char_error_rate
+        self.latency_ms = latency_ms
+        self.latency_per_mpx_ms = latency_per_mpx_ms
+        self.seed = seed
+        self.error_message = None
+        self._truth: Dict[int, Tuple[List[Dict], float]] = {}
+
+    def is_available(self) -> bool:
+        return True
+
+    def attach_truth(self, image: Image.Image, truth: List[Dict], scale: float = 1.0):
+        """登记图像对应的真值（scale 为图像相对真值坐标的缩放比例）"""
+        self._truth[id(image)] = (truth, scale)
+
+    def ocr_pil_image(self, image: Image.Image, preprocess: bool = False) -> List[Dict]:
+        truth, scale = self._truth.get(id(image), ([], 1.0))
+        rng = random.Random(f"{self.seed}-{len(truth)}-{scale}")
+        megapixels = image.width * image.height / 1_000_000
+        time.sleep((self.latency_ms + self.latency_per_mpx_ms * megapixels) / 1000)
+        results = []
+        for block in truth:
+            text = ''.join(
+                rng.choice("abcdefghijklmnopqrstuvwxyz") if rng.random() < self.char_error_rate else c
+                for c in block['text']
+            )
+            jitter = lambda: rng.randint(-self.box_jitter, self.box_jitter)
+            results.append({
+                'text': text,
+                'x': int(block['x'] * scale) + jitter(),
+                'y': int(block['y'] * scale) + jitter(),
+                'width': max(int(block['width'] * scale) + jitter(), 1),
+                'height': max(int(block['height'] * scale) + jitter(), 1)
+            })
+        return results
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein 编辑距离"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        previous = current
+    return previous[-1]
+
+
+def box_iou(a: Dict, b: Dict) -> float:
+    """两个文本块的交并比"""
+    ix = min(a['x'] + a['width'], b['x'] + b['width']) - max(a['x'], b['x'])
+    iy = min(a['y'] + a['height'], b['y'] + b['height']) - max(a['y'], b['y'])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    inter = ix * iy
+    union = a['width'] * a['height'] + b['width'] * b['height'] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def score_sample(truth: List[Dict], predicted: List[Dict]) -> Dict:
+    """
+    按 IoU 贪心匹配真值与识别结果，计算编辑距离和 IoU
+
+    未匹配的真值按整块删除计入错误，未匹配的识别结果按整块插入计入错误
+    """
+    pairs = []
+    for ti, t in enumerate(truth):
+        for pi, p in enumerate(predicted):
+            iou = box_iou(t, p)
+            if iou > 0:
+                pairs.append((iou, ti, pi))
+    pairs.sort(reverse=True)
+
+    matched_truth = {}
+    used_predicted = set()
+    for iou, ti, pi in pairs:
+        if ti in matched_truth or pi in used_predicted:
+            continue
+        matched_truth[ti] = (pi, iou)
+        used_predicted.add(pi)
+
+    errors = 0
+    iou_sum = 0.0
+    chars = 0
+    for ti, t in enumerate(truth):
+        chars += len(t['text'])
+        if ti in matched_truth:
+            pi, iou = matched_truth[ti]
+            errors += edit_distance(t['text'], predicted[pi]['text'])
+            iou_sum += iou
+        else:
+            errors += len(t['text'])
+    for pi, p in enumerate(predicted):
+        if pi not in used_predicted:
+            errors += len(p['text'])
+
+    return {
+        'errors': errors,
+        'chars': chars,
+        'iou_sum': iou_sum,
+        'boxes': len(truth),
+        'matched': len(matched_truth),
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """线性插值分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def _peak_rss_kb() -> Optional[float]:
+    """进程内存峰值（KB），无法获取时返回 None"""
+    if resource is not None:
+        # ru_maxrss 在 Linux 上单位为 KB，在 macOS 上为字节
+        maxrss = float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        return maxrss / 1024 if sys.platform == 'darwin' else maxrss
+    if PSUTIL_AVAILABLE:
+        memory = psutil.Process().memory_info()
+        # Windows 上提供峰值工作集
+        return getattr(memory, 'peak_wset', memory.rss) / 1024
+    return None
+
+
+def run_benchmark(engine_name: str, samples: List[BenchmarkSample], preprocess: bool = False,
+                  downscale: float = 1.0, repeat: int = 3) -> Dict:
+    """
+    对语料运行一次指定配置的基准测试
+
+    Args:
+        engine_name: 已注册的引擎名称
+        samples: 语料
+        preprocess: 是否启用图像预处理
+        downscale: 识别前的缩放比例，结果坐标会映射回原图
+        repeat: 每张图片重复识别次数（用于统计延迟）
+
+    Returns:
+        指标字典
+    """
+    engine = ocr_engines.get_engine(engine_name)
+    if engine is None or not engine.is_available():
+        ocr_engines.log_unavailable(engine_name, engine, level=logging.ERROR)
+        raise SystemExit(1)
+
+    latencies = []
+    totals = {'errors': 0, 'chars': 0, 'iou_sum': 0.0, 'boxes': 0, 'matched': 0}
+    by_category: Dict[str, Dict] = {}
+    peak_traced = 0
+
+    for sample in samples:
+        image = sample.image
+        if downscale != 1.0:
+            image = image.resize(
+                (max(int(image.width * downscale), 1), max(int(image.height * downscale), 1)),
+                Image.Resampling.LANCZOS
+            )
+        if isinstance(engine, GroundTruthEngine):
+            engine.attach_truth(image, sample.truth, downscale)
+
+        predicted = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            # 与 ScreenOCRTool.get_text_positions 使用相同的识别入口
+            predicted = ocr_engines.recognize(engine_name, image, preprocess=preprocess)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        # 内存峰值单独识别一次（tracemalloc 会拖慢分配，不计入延迟）
+        tracemalloc.start()
+        ocr_engines.recognize(engine_name, image, preprocess=preprocess)
+        peak_traced = max(peak_traced, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        if downscale != 1.0:
+            predicted = [
+                {
+                    'text': b['text'],
+                    'x': int(b['x'] / downscale),
+                    'y': int(b['y'] / downscale),
+                    'width': int(b['width'] / downscale),
+                    'height': int(b['height'] / downscale)
+                }
+                for b in predicted
+            ]
+
+        score = score_sample(sample.truth, predicted)
+        for key in totals:
+            totals[key] += score[key]
+        category = by_category.setdefault(sample.category, {'errors': 0, 'chars': 0, 'iou_sum': 0.0, 'boxes': 0})
+        for key in category:
+            category[key] += score[key]
+
+    peak_rss = _peak_rss_kb()
+    return {
+        'cer': round(totals['errors'] / max(totals['chars'], 1), 4),
+        'box_iou': round(totals['iou_sum'] / max(totals['boxes'], 1), 4),
+        'recall': round(totals['matched'] / max(totals['boxes'], 1), 4),
+        'latency_p50': round(percentile(latencies, 0.5), 2),
+        'latency_p95': round(percentile(latencies, 0.95), 2),
+        'peak_traced_kb': round(peak_traced / 1024, 1),
+        'peak_rss_kb': round(peak_rss, 1) if peak_rss is not None else None,
+        'by_category': {
+            name: {
+                'cer': round(c['errors'] / max(c['chars'], 1), 4),
+                'box_iou': round(c['iou_sum'] / max(c['boxes'], 1), 4),
+            }
+            for name, c in sorted(by_category.items())
+        },
+    }
+
+
+# 数值越小越好的指标（其余越大越好）
+LOWER_IS_BETTER = {'cer', 'latency_p50', 'latency_p95', 'peak_traced_kb', 'peak_rss_kb'}
+
+
+def diff_reports(baseline: Dict, current: Dict) -> List[str]:
+    """生成与基线报告的对比文本"""
+    lines = []
+    base_runs = {run['key']: run['metrics'] for run in baseline.get('runs', [])}
+    for run in current.get('runs', []):
+        base = base_runs.get(run['key'])
+        if base is None:
+            lines.append(f"{run['key']}: 基线中无对应配置")
+            continue
+        lines.append(f"{run['key']}:")
+        for metric, value in run['metrics'].items():
+            old = base.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            delta = value - old
+            if delta == 0:
+                mark = "="
+            elif (delta < 0) == (metric in LOWER_IS_BETTER):
+                mark = "+"  # 变好
+            else:
+                mark = "-"  # 变差
+            pct = f" ({delta / old * 100:+.1f}%)" if old else ""
+            lines.append(f"  [{mark}] {metric}: {old} -> {value}{pct}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OCR 离线准确度和延迟基准测试")
+    parser.add_argument("--engine", default="fake", help="引擎名称（fake 为替身引擎）")
+    parser.add_argument("--preprocess", default="off", choices=["on", "off", "both"],
+                        help="图像预处理: on, off 或 both")
+    parser.add_argument("--downscale", default="1.0", help="缩放比例列表，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=3, help="每张图片重复识别次数")
+    parser.add_argument("--seed", type=int, default=20240601, help="语料随机种子")
+    parser.add_argument("--font", help="渲染字体路径")
+    parser.add_argument("--output", help="JSON 报告输出路径（默认输出到标准输出）")
+    parser.add_argument("--baseline", help="对比的基线报告")
+    parser.add_argument("--save-corpus", help="导出语料到目录后退出")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    builder = CorpusBuilder(seed=args.seed, font_path=args.font)
+    samples = builder.build()
+    if args.save_corpus:
+        builder.save(samples, args.save_corpus)
+        print(f"已导出 {len(samples)} 张语料图片到 {args.save_corpus}", file=sys.stderr)
+        return 0
+
+    if args.engine == "fake" and ocr_engines.get_spec("fake") is None:
+        ocr_engines.register_engine("fake", GroundTruthEngine, display_name="替身引擎")
+
+    preprocess_options = {"on": [True], "off": [False], "both": [False, True]}[args.preprocess]
+    scales = [float(s) for s in args.downscale.split(',') if s.strip()]
+
+    report = {
+        'engine': args.engine,
+        'seed': args.seed,
+        'samples': len(samples),
+        'truth_boxes': sum(len(s.truth) for s in samples),
+        'runs': [],
+    }
+    for preprocess in preprocess_options:
+        for scale in scales:
+            key = f"preprocess={'on' if preprocess else 'off'},downscale={scale}"
+            print(f"运行 {args.engine} {key}...", file=sys.stderr)
+            metrics = run_benchmark(args.engine, samples, preprocess, scale, args.repeat)
+            report['runs'].append({'key': key, 'metrics': metrics})
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print("\n".join(diff_reports(baseline, report)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
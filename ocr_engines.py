@@ -0,0 +1,317 @@
+"""
+OCR 引擎注册表
+按名称声明 OCR 引擎，延迟导入模块并按需构造实例
+
+内置引擎:
+    wechat  - WeChatOCR（wechat_ocr_wrapper）
+    windows - Windows 系统 OCR（windows_ocr_wrapper）
+
+第三方引擎只需实现以下接口，并通过 register_engine 注册:
+    is_available() -> bool
+    ocr_pil_image(image, preprocess=False) -> TextBlockStore 或 List[Dict]   # text, x, y, width, height
+    error_message                                          # 可选，不可用原因
+    close()                                                # 可选，释放资源
+
+示例:
+    import ocr_engines
+    ocr_engines.register_engine("paddle", "my_paddle_engine:PaddleOCRWrapper",
+                                display_name="PaddleOCR")
+"""
+import importlib
+import logging
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from text_blocks import TextBlockStore, as_store
+
+
+class EngineSpec:
+    """引擎声明（只保存导入路径，不导入模块）"""
+
+    def __init__(
+        self,
+        name: str,
+        target: Union[str, Callable],
+        display_name: Optional[str] = None,
+        install_hints: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            name: 引擎名称（对应配置项 ocr_engine）
+            target: "模块:属性" 形式的导入路径，或直接传入工厂函数/类
+            display_name: 显示名称
+            install_hints: 引擎不可用时的提示信息
+        """
+        self.name = name
+        self.target = target
+        self.display_name = display_name or name
+        self.install_hints = install_hints or []
+
+    def load_factory(self) -> Callable:
+        """导入并返回引擎工厂（首次调用时才导入模块）"""
+        if callable(self.target):
+            return self.target
+        module_name, _, attr = self.target.partition(':')
+        module = importlib.import_module(module_name)
+        return getattr(module, attr)
+
+
+_specs: Dict[str, EngineSpec] = {}
+_instances: Dict[str, object] = {}
+_engine_locks: Dict[str, threading.Lock] = {}
+# 关闭引擎时等待进行中的识别结束的最长时间（秒）
+CLOSE_WAIT_TIMEOUT = 2.0
+_registry_lock = threading.RLock()
+
+
+def register_engine(
+    name: str,
+    target: Union[str, Callable],
+    display_name: Optional[str] = None,
+    install_hints: Optional[List[str]] = None,
+    replace: bool = False
+) -> EngineSpec:
+    """
+    注册 OCR 引擎
+
+    Args:
+        name: 引擎名称
+        target: "模块:属性" 导入路径或工厂函数/类
+        display_name: 显示名称
+        install_hints: 不可用时的提示信息
+        replace: 是否允许覆盖同名引擎
+
+    Returns:
+        引擎声明
+    """
+    with _registry_lock:
+        if name in _specs and not replace:
+            raise ValueError(f"OCR 引擎已注册: {name}")
+        spec = EngineSpec(name, target, display_name, install_hints)
+        _specs[name] = spec
+        _engine_locks.setdefault(name, threading.Lock())
+        # 覆盖注册时丢弃旧实例
+        old = _instances.pop(name, None)
+    if old is not None:
+        _close_instance(old)
+    return spec
+
+
+def unregister_engine(name: str):
+    """注销 OCR 引擎（同时关闭已创建的实例）"""
+    close_engine(name)
+    with _registry_lock:
+        _specs.pop(name, None)
+
+
+def list_engines() -> List[str]:
+    """返回所有已注册的引擎名称"""
+    with _registry_lock:
+        return list(_specs.keys())
+
+
+def get_spec(name: str) -> Optional[EngineSpec]:
+    """获取引擎声明"""
+    with _registry_lock:
+        return _specs.get(name)
+
+
+def load_plugins(module_names: List[str]):
+    """
+    导入第三方引擎模块（模块在导入时调用 register_engine 完成注册）
+
+    Args:
+        module_names: 模块名列表
+    """
+    for module_name in module_names or []:
+        try:
+            importlib.import_module(module_name)
+            logging.info(f"✓ 已加载 OCR 引擎插件: {module_name}")
+        except Exception as e:
+            logging.error(f"❌ 加载 OCR 引擎插件失败 {module_name}: {e}")
+
+
+def peek_engine(name: str):
+    """返回已创建的引擎实例，不触发导入和初始化"""
+    with _registry_lock:
+        return _instances.get(name)
+
+
+def get_engine(name: str):
+    """
+    获取引擎实例，首次调用时导入模块并构造
+
+    Args:
+        name: 引擎名称
+
+    Returns:
+        引擎实例；未注册或构造失败时返回 None
+    """
+    with _registry_lock:
+        instance = _instances.get(name)
+        if instance is not None:
+            return instance
+        spec = _specs.get(name)
+        lock = _engine_locks.get(name)
+    if spec is None:
+        logging.error(f"未注册的 OCR 引擎: {name}")
+        return None
+
+    # 按引擎加锁构造，避免后台初始化和识别请求重复创建实例
+    with lock:
+        with _registry_lock:
+            instance = _instances.get(name)
+        if instance is not None:
+            return instance
+        try:
+            factory = spec.load_factory()
+            instance = factory()
+        except Exception as e:
+            logging.error(f"创建 OCR 引擎 {spec.display_name} 失败: {e}")
+            return None
+        with _registry_lock:
+            _instances[name] = instance
+        return instance
+
+
+def is_engine_available(name: str) -> bool:
+    """检查已创建的引擎是否可用（不会触发初始化）"""
+    instance = peek_engine(name)
+    return instance is not None and instance.is_available()
+
+
+def recognize(name: str, image, preprocess: bool = False) -> TextBlockStore:
+    """
+    使用指定引擎识别图像
+
+    同一引擎的识别请求串行执行（WeChatOCR 等引擎不支持并发调用）
+
+    Args:
+        name: 引擎名称
+        image: PIL Image 对象
+        preprocess: 是否进行图像预处理
+
+    Returns:
+        识别结果（TextBlockStore），每项包含 text, x, y, width, height；
+        引擎返回字典列表时自动转换
+    """
+    engine = get_engine(name)
+    if engine is None or not engine.is_available():
+        log_unavailable(name, engine, level=logging.ERROR)
+        return TextBlockStore()
+    with _engine_locks[name]:
+        return as_store(engine.ocr_pil_image(image, preprocess=preprocess))
+
+
+# 渐进识别：截图按水平条带逐条识别
+PROGRESSIVE_BANDS = 4
+# 条带上下各多识别的像素，跨条带边界的文字行（高度小于 2 倍重叠）仍能完整识别
+BAND_OVERLAP = 48
+
+
+def band_order(height: int, bands: int = PROGRESSIVE_BANDS, first_y: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    把 [0, height) 分成 bands 个条带，返回识别顺序
+
+    Args:
+        first_y: 优先识别包含该纵坐标的条带（例如鼠标所在位置），其余按距离由近到远
+    """
+    bands = max(1, min(bands, height))
+    edges = [height * i // bands for i in range(bands + 1)]
+    order = list(zip(edges[:-1], edges[1:]))
+    if first_y is not None:
+        order.sort(key=lambda band: 0 if band[0] <= first_y < band[1] else
+                   min(abs(band[0] - first_y), abs(band[1] - 1 - first_y)))
+    return order
+
+
+def recognize_bands(name: str, image, bands: int = PROGRESSIVE_BANDS, overlap: int = BAND_OVERLAP,
+                    preprocess: bool = False, first_y: Optional[int] = None) -> Iterator[TextBlockStore]:
+    """
+    按水平条带分块识别，每识别完一个条带产出该条带的结果（坐标为整张图像坐标）
+
+    每个条带连同上下 overlap 像素一起识别，只保留中心落在条带内的文字行，
+    相邻条带重叠部分识别出的同一行不会重复
+
+    Args:
+        name: 引擎名称
+        image: PIL Image 对象
+        bands: 条带数
+        overlap: 条带上下扩展的像素
+        preprocess: 是否进行图像预处理
+        first_y: 优先识别包含该纵坐标的条带
+    """
+    width, height = image.size
+    for top, bottom in band_order(height, bands, first_y):
+        crop_top = max(0, top - overlap)
+        crop = image.crop((0, crop_top, width, min(height, bottom + overlap)))
+        result = recognize(name, crop, preprocess=preprocess)
+        ys = [y + crop_top for y in result.ys]
+        keep = [top <= y + h // 2 < bottom for y, h in zip(ys, result.heights)]
+        band = TextBlockStore()
+        band.extend_columns(result.texts(), result.xs, ys, result.widths, result.heights, keep=keep)
+        yield band
+
+
+def log_unavailable(name: str, engine=None, level: int = logging.WARNING):
+    """输出引擎不可用的原因和解决方案"""
+    spec = get_spec(name)
+    display_name = spec.display_name if spec else name
+    logging.log(level, f"❌ {display_name} 不可用")
+    error_message = getattr(engine, 'error_message', None) if engine else None
+    if error_message:
+        logging.log(level, f"   原因: {error_message}")
+    if spec and spec.install_hints:
+        logging.info("   💡 解决方案:")
+        for hint in spec.install_hints:
+            logging.info(f"   {hint}")
+
+
+def _close_instance(instance):
+    close = getattr(instance, 'close', None)
+    if close:
+        try:
+            close()
+        except Exception as e:
+            logging.debug(f"关闭 OCR 引擎失败: {e}")
+
+
+def close_engine(name: str, timeout: float = CLOSE_WAIT_TIMEOUT):
+    """关闭并移除引擎实例，下次使用时重新构造（等待进行中的识别结束，最多 timeout 秒）"""
+    with _registry_lock:
+        instance = _instances.pop(name, None)
+        lock = _engine_locks.get(name)
+    if instance is None:
+        return
+    acquired = lock.acquire(timeout=timeout) if lock else False
+    try:
+        _close_instance(instance)
+    finally:
+        if acquired:
+            lock.release()
+
+
+def close_all():
+    """关闭所有已创建的引擎实例"""
+    for name in list_engines():
+        close_engine(name)
+
+
+# 内置引擎（仅声明，不导入）
+register_engine(
+    "wechat",
+    "wechat_ocr_wrapper:get_wechat_ocr",
+    display_name="WeChatOCR",
+    install_hints=[
+        "1. 安装微信客户端 (https://weixin.qq.com/)",
+        "2. 在微信中使用一次'提取图中文字'功能以下载OCR插件",
+    ]
+)
+register_engine(
+    "windows",
+    "windows_ocr_wrapper:WindowsOCRWrapper",
+    display_name="Windows OCR",
+    install_hints=[
+        "请安装: pip install winrt-Windows.Media.Ocr",
+    ]
+)
@@ -0,0 +1,670 @@
+"""
+本地 OCR 服务
+保持 OCR 引擎常驻，其他程序通过本地套接字提交图片，省去引擎的初始化时间
+
+协议（TCP 或 Unix 套接字，长度前缀帧）:
+    帧 = 4 字节大端长度 + 内容
+    请求: JSON 帧 {"op": "ocr", "path": "..."}
+          或 JSON 帧 {"op": "ocr", "image": true} + 图片字节帧
+          可选字段 "preprocess": true/false
+          {"op": "ping"} / {"op": "stats"}
+          每个请求都带 "token": "..."
+    响应: JSON 帧 {"status": "ok", "blocks": [...], "timings": {"queue_ms", "ocr_ms"}}
+          {"status": "busy", "retry_after_ms": ...}   请求队列已满（背压），或连接数已达上限（随后关闭连接）
+          {"status": "error", "error": "..."}
+          {"status": "unauthorized"}                  令牌错误（随后关闭连接）
+
+信任模型:
+    - 只监听本机地址，但本机的任何进程（包括其他用户）都能连接 TCP 端口，因此每个请求都要带令牌。
+      令牌在服务启动时随机生成，写入只有当前用户可读的令牌文件（默认 ~/.screen_ocr_service_token），
+      能读取该文件的进程（即以当前用户身份运行的程序）视为可信
+    - Unix 套接字文件权限设为 0600
+    - 按路径识别（"path"）默认关闭：服务端以当前用户身份打开文件，只允许 allowed_dirs 中的目录
+      （解析符号链接后比较），其他情况请发送图片字节
+
+用法:
+    python ocr_service.py serve --engine wechat --port 47811
+    python ocr_service.py serve --unix /tmp/screen_ocr.sock --fake-wcocr --allow-dir ~/Pictures
+    python ocr_service.py bench --port 47811 --clients 8 --requests 50 --image shot.png
+
+也可以在配置文件中设置 ocr_service_port，由 ScreenOCRTool 共享已初始化的引擎提供服务
+"""
+import argparse
+import hmac
+import io
+import json
+import logging
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence
+
+import ocr_engines
+
+DEFAULT_PORT = 47811
+MAX_FRAME_SIZE = 64 * 1024 * 1024  # 单帧上限 64MB
+DEFAULT_TOKEN_FILE = os.path.join(os.path.expanduser("~"), ".screen_ocr_service_token")
+# 停止服务时等待工作线程收到停止标记的最长时间（秒）
+STOP_TIMEOUT = 2.0
+# 同时处理的连接数上限（每个连接一个线程）
+MAX_CONNECTIONS = 32
+
+_HEADER = struct.Struct('>I')
+
+
+def send_frame(sock: socket.socket, payload: bytes):
+    """发送一帧"""
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """读取指定长度，连接关闭时返回 None"""
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_frame(sock: socket.socket) -> Optional[bytes]:
+    """读取一帧，连接关闭时返回 None"""
+    header = recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"帧过大: {size} 字节")
+    return recv_exact(sock, size)
+
+
+def discard_frame(sock: socket.socket) -> bool:
+    """读取并丢弃一帧（不保留内容），连接关闭时返回 False"""
+    header = recv_exact(sock, _HEADER.size)
+    if header is None:
+        return False
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"帧过大: {size} 字节")
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return False
+        size -= len(chunk)
+    return True
+
+
+def send_json(sock: socket.socket, obj: Dict):
+    send_frame(sock, json.dumps(obj, ensure_ascii=False).encode('utf-8'))
+
+
+def recv_json(sock: socket.socket) -> Optional[Dict]:
+    frame = recv_frame(sock)
+    return None if frame is None else json.loads(frame.decode('utf-8'))
+
+
+def write_token(path: str, token: str):
+    """写入令牌文件（只有当前用户可读写；Windows 上由用户目录的权限保护）"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    if hasattr(os, 'chmod'):
+        os.chmod(path, 0o600)
+
+
+def read_token(path: str = DEFAULT_TOKEN_FILE) -> Optional[str]:
+    """读取令牌文件，不存在时返回 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def is_within(path: str, directories: Sequence[str]) -> bool:
+    """path（解析符号链接后）是否位于 directories 之一中"""
+    real = os.path.realpath(path)
+    for directory in directories:
+        root = os.path.realpath(directory)
+        if os.path.commonpath([real, root]) == root:
+            return True
+    return False
+
+
+class _BoundedThreadingMixIn(socketserver.ThreadingMixIn):
+    """每个连接一个守护线程，连接数超过上限时直接回复 busy 并关闭连接（不创建线程）"""
+
+    daemon_threads = True
+
+    def __init__(self, *args, max_connections: int = MAX_CONNECTIONS, **kwargs):
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.refused = 0
+        super().__init__(*args, **kwargs)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self.refused += 1
+            try:
+                send_json(request, {'status': 'busy', 'retry_after_ms': 100})
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+
+class _TCPServer(_BoundedThreadingMixIn, socketserver.TCPServer):
+    # Windows 上 SO_REUSEADDR 允许其他进程绑定同一端口并接收客户端的令牌和图片，
+    # 因此只在其他平台启用，Windows 上改用 SO_EXCLUSIVEADDRUSE 独占端口
+    allow_reuse_address = sys.platform != 'win32'
+
+    def server_bind(self):
+        if sys.platform == 'win32' and hasattr(socket, 'SO_EXCLUSIVEADDRUSE'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        super().server_bind()
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(_BoundedThreadingMixIn, socketserver.UnixStreamServer):
+        pass
+else:
+    _UnixServer = None
+
+
+class _Job:
+    """排队中的识别请求"""
+
+    __slots__ = ('image', 'preprocess', 'future', 'enqueued')
+
+    def __init__(self, image, preprocess: bool):
+        self.image = image
+        self.preprocess = preprocess
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class OCRService:
+    """常驻 OCR 服务：有界请求队列 + 单个引擎工作线程"""
+
+    def __init__(
+        self,
+        engine_name: str = "wechat",
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_path: Optional[str] = None,
+        queue_size: int = 16,
+        preprocess: bool = False,
+        request_timeout: float = 60.0,
+        token: Optional[str] = None,
+        token_file: Optional[str] = DEFAULT_TOKEN_FILE,
+        allowed_dirs: Sequence[str] = (),
+        max_connections: int = MAX_CONNECTIONS
+    ):
+        """
+        Args:
+            engine_name: OCR 引擎名称（与 ScreenOCRTool 共享同一个引擎实例）
+            host, port: TCP 监听地址（只应绑定本机地址）
+            unix_path: Unix 套接字路径，指定后不监听 TCP
+            queue_size: 请求队列长度，队列满时立即返回 busy
+            preprocess: 默认是否启用图像预处理
+            request_timeout: 单个请求的最长等待时间（秒）
+            token: 客户端令牌，默认启动时随机生成
+            token_file: 启动时写入令牌的文件（供客户端读取），None 表示不写入
+            allowed_dirs: 允许按路径识别的目录，为空时只接受图片字节
+            max_connections: 同时处理的连接数上限，超出时回复 busy 并关闭连接
+        """
+        self.engine_name = engine_name
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.preprocess = preprocess
+        self.request_timeout = request_timeout
+        self.token = token or secrets.token_urlsafe(32)
+        self.token_file = token_file
+        self.allowed_dirs = [os.path.expanduser(directory) for directory in allowed_dirs]
+        self.max_connections = max_connections
+        self._jobs: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._server = None
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'processed': 0, 'rejected': 0, 'errors': 0, 'clients': 0, 'unauthorized': 0,
+            'queue_ms_total': 0.0, 'ocr_ms_total': 0.0,
+        }
+        self._ocr_ms_avg = 0.0
+
+    @property
+    def address(self) -> str:
+        return self.unix_path if self.unix_path else f"{self.host}:{self.port}"
+
+    def start(self):
+        """启动服务（非阻塞）"""
+        service = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                service._handle_connection(self.request)
+
+        if self.unix_path:
+            if _UnixServer is None:
+                raise RuntimeError("当前平台不支持 Unix 套接字，请使用 TCP 端口")
+            if os.path.exists(self.unix_path):
+                os.remove(self.unix_path)
+            server_cls = _UnixServer
+            address = self.unix_path
+        else:
+            server_cls = _TCPServer
+            address = (self.host, self.port)
+
+        self._server = server_cls(address, Handler, max_connections=self.max_connections)
+        if self.unix_path:
+            os.chmod(self.unix_path, 0o600)
+        else:
+            # 端口为 0 时使用系统分配的端口
+            self.port = self._server.server_address[1]
+
+        if self.token_file:
+            write_token(self.token_file, self.token)
+
+        self._running = True
+        worker = threading.Thread(target=self._engine_worker, name="ocr-service-engine", daemon=True)
+        listener = threading.Thread(target=self._server.serve_forever, name="ocr-service-listener", daemon=True)
+        self._threads = [worker, listener]
+        worker.start()
+        listener.start()
+        logging.info(f"✓ OCR 服务已启动: {self.address} (引擎 {self.engine_name})")
+
+    def stop(self):
+        """停止服务"""
+        self._running = False
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        # 取消排队中的请求（腾出队列位置），再放入停止标记唤醒工作线程
+        self._cancel_pending()
+        try:
+            self._jobs.put(None, timeout=STOP_TIMEOUT)
+        except queue.Full:
+            logging.warning("OCR 服务工作线程未收到停止标记")
+        logging.info("OCR 服务已停止")
+
+    def _cancel_pending(self):
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None:
+                job.future.cancel()
+
+    def serve_forever(self):
+        """启动服务并阻塞当前线程"""
+        self.start()
+        try:
+            while self._running:
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stats(self) -> Dict:
+        """服务统计"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        processed = max(stats['processed'], 1)
+        return {
+            'engine': self.engine_name,
+            'queue_depth': self._jobs.qsize(),
+            'queue_size': self._jobs.maxsize,
+            'processed': stats['processed'],
+            'rejected': stats['rejected'],
+            'errors': stats['errors'],
+            'unauthorized': stats['unauthorized'],
+            'clients': stats['clients'],
+            'refused_connections': self._server.refused if self._server else 0,
+            'avg_queue_ms': round(stats['queue_ms_total'] / processed, 2),
+            'avg_ocr_ms': round(stats['ocr_ms_total'] / processed, 2),
+        }
+
+    def _count(self, key: str, value=1):
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def _engine_worker(self):
+        """引擎工作线程：按顺序处理队列中的请求"""
+        while self._running:
+            job = self._jobs.get()
+            if job is None or not self._running:
+                if job is not None:
+                    job.future.cancel()
+                break
+            # 标记为执行中；已超时取消的请求直接丢弃
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            try:
+                blocks = ocr_engines.recognize(self.engine_name, job.image, preprocess=job.preprocess)
+                finished = time.perf_counter()
+                queue_ms = (started - job.enqueued) * 1000
+                ocr_ms = (finished - started) * 1000
+                self._count('processed')
+                self._count('queue_ms_total', queue_ms)
+                self._count('ocr_ms_total', ocr_ms)
+                self._ocr_ms_avg = self._ocr_ms_avg * 0.8 + ocr_ms * 0.2 if self._ocr_ms_avg else ocr_ms
+                job.future.set_result({
+                    'status': 'ok',
+                    'blocks': blocks.to_dicts(),
+                    'timings': {'queue_ms': round(queue_ms, 2), 'ocr_ms': round(ocr_ms, 2)},
+                })
+            except Exception as e:
+                self._count('errors')
+                job.future.set_result({'status': 'error', 'error': str(e)})
+        self._cancel_pending()
+
+    def _load_image(self, request: Dict, sock: socket.socket):
+        if request.get('image'):
+            # 先读出图片帧，解码失败时连接上的帧仍保持同步
+            data = recv_frame(sock)
+            if data is None:
+                raise ConnectionError("读取图片数据时连接已关闭")
+            from PIL import Image
+            image = Image.open(io.BytesIO(data))
+        elif request.get('path'):
+            path = request['path']
+            if not self.allowed_dirs:
+                raise PermissionError("服务未允许按路径识别，请发送图片字节")
+            if not is_within(path, self.allowed_dirs):
+                raise PermissionError(f"路径不在允许的目录中: {path}")
+            from PIL import Image
+            image = Image.open(path)
+        else:
+            raise ValueError("请求缺少 path 或 image")
+        image.load()
+        return image.convert('RGB')
+
+    def _handle_connection(self, sock: socket.socket):
+        """处理一个客户端连接（同一连接上可以发送多个请求）"""
+        self._count('clients')
+        try:
+            while self._running:
+                request = recv_json(sock)
+                if request is None:
+                    break
+                if not hmac.compare_digest(str(request.get('token', '')), self.token):
+                    # 令牌错误：不读取后续的图片帧，直接关闭连接
+                    self._count('unauthorized')
+                    send_json(sock, {'status': 'unauthorized'})
+                    break
+                op = request.get('op', 'ocr')
+                if op == 'ping':
+                    send_json(sock, {'status': 'ok', 'engine': self.engine_name})
+                elif op == 'stats':
+                    send_json(sock, {'status': 'ok', 'stats': self.stats()})
+                elif op == 'ocr':
+                    send_json(sock, self._handle_ocr(request, sock))
+                else:
+                    send_json(sock, {'status': 'error', 'error': f"未知操作: {op}"})
+        except (ConnectionError, OSError):
+            pass
+        except Exception as e:
+            logging.error(f"OCR 服务处理请求失败: {e}")
+            try:
+                send_json(sock, {'status': 'error', 'error': str(e)})
+            except OSError:
+                pass
+
+    def _busy(self) -> Dict:
+        """背压：队列已满时不排队，提示客户端稍后重试"""
+        self._count('rejected')
+        retry_after = int(self._ocr_ms_avg * max(self._jobs.qsize(), 1)) or 100
+        return {'status': 'busy', 'retry_after_ms': retry_after}
+
+    def _handle_ocr(self, request: Dict, sock: socket.socket) -> Dict:
+        if self._jobs.full():
+            # 先检查队列再解码图片；图片帧仍需读出（不保留）以保持连接上的帧同步
+            if request.get('image') and not discard_frame(sock):
+                raise ConnectionError("读取图片数据时连接已关闭")
+            return self._busy()
+        try:
+            image = self._load_image(request, sock)
+        except ConnectionError:
+            raise
+        except Exception as e:
+            return {'status': 'error', 'error': f"无法读取图片: {e}"}
+
+        if not self._running:
+            return {'status': 'error', 'error': "服务已停止"}
+        job = _Job(image, request.get('preprocess', self.preprocess))
+        try:
+            self._jobs.put_nowait(job)
+        except queue.Full:
+            # 解码期间队列被其他连接占满
+            return self._busy()
+        try:
+            return job.future.result(timeout=self.request_timeout)
+        except Exception:
+            job.future.cancel()
+            self._count('errors')
+            return {'status': 'error', 'error': "识别超时"}
+
+
+class OCRServiceClient:
+    """OCR 服务客户端（一个实例对应一个连接，非线程安全）"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 unix_path: Optional[str] = None, timeout: float = 60.0,
+                 token: Optional[str] = None, token_file: str = DEFAULT_TOKEN_FILE):
+        """
+        Args:
+            token: 服务令牌，默认从 token_file 读取
+        """
+        self.token = token or read_token(token_file) or ''
+        if unix_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(unix_path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+
+    def _request(self, request: Dict, payload: Optional[bytes] = None) -> Dict:
+        send_json(self.sock, dict(request, token=self.token))
+        if payload is not None:
+            send_frame(self.sock, payload)
+        response = recv_json(self.sock)
+        if response is None:
+            raise ConnectionError("服务端已关闭连接")
+        return response
+
+    def ping(self) -> Dict:
+        return self._request({'op': 'ping'})
+
+    def stats(self) -> Dict:
+        return self._request({'op': 'stats'})
+
+    def ocr_file(self, path: str, preprocess: Optional[bool] = None) -> Dict:
+        """识别服务端可访问的图片文件"""
+        request = {'op': 'ocr', 'path': path}
+        if preprocess is not None:
+            request['preprocess'] = preprocess
+        return self._request(request)
+
+    def ocr_bytes(self, data: bytes, preprocess: Optional[bool] = None) -> Dict:
+        """识别图片字节（PNG/JPEG 等编码格式）"""
+        request = {'op': 'ocr', 'image': True}
+        if preprocess is not None:
+            request['preprocess'] = preprocess
+        return self._request(request, data)
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_load_test(host: str, port: int, unix_path: Optional[str], image_path: str,
+                  clients: int, requests_per_client: int, send_bytes: bool = True,
+                  token_file: str = DEFAULT_TOKEN_FILE) -> Dict:
+    """
+    负载测试：N 个并发客户端各发送 M 个请求
+
+    Returns:
+        吞吐量和延迟统计
+    """
+    with open(image_path, 'rb') as f:
+        data = f.read()
+
+    latencies: List[float] = []
+    counts = {'ok': 0, 'busy': 0, 'error': 0, 'rejected': 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def connect() -> Optional[OCRServiceClient]:
+        try:
+            return OCRServiceClient(host, port, unix_path, token_file=token_file)
+        except OSError:
+            return None
+
+    def client_worker():
+        client = connect()
+        barrier.wait()
+        try:
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                try:
+                    if client is None:
+                        raise ConnectionError("无法连接服务")
+                    if send_bytes:
+                        response = client.ocr_bytes(data)
+                    else:
+                        response = client.ocr_file(image_path)
+                except OSError:
+                    # 连接数已满时服务端回复 busy 后关闭连接：计为被拒绝，稍后重新连接
+                    with lock:
+                        counts['rejected'] += 1
+                    if client is not None:
+                        client.close()
+                    time.sleep(0.1)
+                    client = connect()
+                    continue
+                elapsed = (time.perf_counter() - start) * 1000
+                status = response.get('status', 'error')
+                with lock:
+                    counts[status] = counts.get(status, 0) + 1
+                    if status == 'ok':
+                        latencies.append(elapsed)
+                if status == 'busy':
+                    time.sleep(response.get('retry_after_ms', 100) / 1000)
+        finally:
+            if client is not None:
+                client.close()
+
+    threads = [threading.Thread(target=client_worker) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def pct(q):
+        return round(latencies[min(int(len(latencies) * q), len(latencies) - 1)], 2) if latencies else 0.0
+
+    return {
+        'clients': clients,
+        'requests': clients * requests_per_client,
+        'ok': counts['ok'],
+        'busy': counts['busy'],
+        'error': counts['error'],
+        'rejected': counts['rejected'],
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(counts['ok'] / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_p50_ms': pct(0.5),
+        'latency_p95_ms': pct(0.95),
+        'latency_p99_ms': pct(0.99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地 OCR 服务")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="启动服务")
+    serve.add_argument("--engine", default="wechat", help="OCR 引擎名称")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--unix", help="Unix 套接字路径")
+    serve.add_argument("--queue-size", type=int, default=16, help="请求队列长度")
+    serve.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS, help="同时处理的连接数上限")
+    serve.add_argument("--preprocess", action="store_true", help="默认启用图像预处理")
+    serve.add_argument("--fake-wcocr", action="store_true", help="使用 wcocr 替身")
+    serve.add_argument("--token-file", default=DEFAULT_TOKEN_FILE, help="写入客户端令牌的文件")
+    serve.add_argument("--allow-dir", action="append", default=[], help="允许按路径识别的目录（可重复）")
+
+    bench = sub.add_parser("bench", help="负载测试")
+    bench.add_argument("--host", default="127.0.0.1")
+    bench.add_argument("--port", type=int, default=DEFAULT_PORT)
+    bench.add_argument("--unix", help="Unix 套接字路径")
+    bench.add_argument("--image", required=True, help="测试图片")
+    bench.add_argument("--clients", type=int, default=4, help="并发客户端数")
+    bench.add_argument("--requests", type=int, default=20, help="每个客户端的请求数")
+    bench.add_argument("--by-path", action="store_true", help="发送文件路径而不是图片字节（服务端需 --allow-dir）")
+    bench.add_argument("--token-file", default=DEFAULT_TOKEN_FILE, help="服务令牌文件")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == "serve":
+        if args.fake_wcocr:
+            import fake_wcocr
+            fake_wcocr.install()
+        engine = ocr_engines.get_engine(args.engine)
+        if engine is None or not engine.is_available():
+            ocr_engines.log_unavailable(args.engine, engine, level=logging.ERROR)
+            return 1
+        service = OCRService(args.engine, args.host, args.port, args.unix,
+                             args.queue_size, args.preprocess,
+                             token_file=args.token_file, allowed_dirs=args.allow_dir,
+                             max_connections=args.max_connections)
+        service.serve_forever()
+        return 0
+
+    result = run_load_test(args.host, args.port, args.unix, args.image,
+                           args.clients, args.requests, not args.by_path, args.token_file)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+覆盖层窗口
+一次触发中覆盖层先显示"识别中"的等待状态，OCR 完成后切换为结果状态。原实现每个状态都新建
+Toplevel、Canvas、全屏合成图和 PhotoImage，切换时整窗销毁重建，会闪一下。这里窗口只创建一次，
+切换状态时原地修改:
+    - 背景：按遮罩颜色对截图做一次查表（Image.point），结果写入同一个 PhotoImage（不新建 Tk 图像和画布项）
+    - 边框：改颜色
+    - 等待文字：显示/隐藏
+    - 文本块图层（高亮渲染器和鼠标事件）：结果状态挂上，回到等待状态或隐藏时卸下
+关闭覆盖层时只隐藏窗口，下一次触发继续复用
+
+OverlayPool 在启动时为每个显示器预先创建好隐藏的覆盖层（窗口、画布项和显示器尺寸的 PhotoImage），
+触发时只需写入截图并显示窗口；显示器配置变化时按新的显示器区域重建
+
+用法:
+    pool = OverlayPool(root, on_escape=callback)
+    pool.refresh([(x, y, width, height), ...])
+    overlay = pool.get((x, y, width, height))
+    overlay.show_waiting(screenshot, (x, y, width, height))
+    canvas = overlay.show_result()
+    overlay.attach_blocks(renderer, {'<Button-1>': on_down, ...})
+    overlay.hide()
+"""
+import functools
+import logging
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import tkinter as tk
+from PIL import Image, ImageTk
+
+WAITING = 'waiting'
+RESULT = 'result'
+HIDDEN = 'hidden'
+
+# 等待状态：黑色半透明遮罩、蓝色边框；识别完成：白色半透明遮罩、绿色边框
+WAITING_MASK = (0, 0, 0, 180)
+RESULT_MASK = (255, 255, 255, 100)
+WAITING_BORDER = "#3498db"
+RESULT_BORDER = "#00FF00"
+BORDER_WIDTH = 6
+WAITING_TEXT = "识别中，请稍后..."
+WAITING_FONT = ('Microsoft YaHei UI', 16)
+
+
+@functools.lru_cache(maxsize=8)
+def dim_lut(color: Tuple[int, int, int, int]) -> Tuple[int, ...]:
+    """
+    纯色半透明遮罩的查找表：RGB 三个通道各 256 项，值与 Image.alpha_composite 的结果逐像素一致
+
+    Args:
+        color: 遮罩颜色 (R, G, B, A)
+    """
+    # 用 256 级灰阶让 alpha_composite 算出每个输入值的结果，舍入方式与原实现完全相同
+    gradient = Image.frombytes('L', (256, 1), bytes(range(256))).convert('RGBA')
+    blended = Image.alpha_composite(gradient, Image.new('RGBA', (256, 1), color))
+    return tuple(v for band in blended.split()[:3] for v in band.getdata())
+
+
+def dim_image(image: Image.Image, color: Tuple[int, int, int, int]) -> Image.Image:
+    """
+    把纯色半透明遮罩叠加到截图上：一次 point() 直接从截图生成 RGB 结果，
+    代替 copy + convert('RGBA') + 全屏遮罩 + alpha_composite 的四次整帧分配
+    """
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image.point(dim_lut(tuple(color)))
+
+
+class OverlayWindow:
+    """可复用的全屏覆盖层窗口"""
+
+    def __init__(self, master, on_escape: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            master: Tk 根窗口
+            on_escape: 在覆盖层上按下 ESC 时的回调
+        """
+        self.master = master
+        self.on_escape = on_escape
+        self.window = None
+        self.canvas = None
+        self.state = HIDDEN
+        self.geometry: Optional[Tuple[int, int, int, int]] = None
+        self._photo = None
+        self._background_item = None
+        self._waiting_item = None
+        self._border_items = []
+        # 当前截图（两种状态都直接从它生成背景）
+        self._source = None
+        self._renderer = None
+        self._bindings = []
+        self.stats = {'windows': 0, 'photos': 0, 'pastes': 0}
+
+    # ---------- 窗口 ----------
+
+    def _create_window(self):
+        self.window = tk.Toplevel(self.master)
+        self.window.withdraw()
+        self.window.attributes('-topmost', True)
+        self.window.overrideredirect(True)  # 移除窗口边框
+        self.window.grid_rowconfigure(0, weight=1)
+        self.window.grid_columnconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(self.window, highlightthickness=0, bg='black')
+        self.canvas.grid(row=0, column=0, sticky='nsew')
+
+        self._background_item = self.canvas.create_image(0, 0, anchor='nw', tags='screenshot')
+        self._waiting_item = self.canvas.create_text(
+            0, 0, text=WAITING_TEXT, font=WAITING_FONT, fill='white', tags='waiting_text', state='hidden')
+        self._border_items = [
+            self.canvas.create_rectangle(0, 0, 0, 0, outline='', tags='border') for _ in range(4)
+        ]
+
+        def on_escape(event=None):
+            if self.on_escape:
+                self.on_escape()
+
+        self.window.bind('<Escape>', on_escape)
+        self.canvas.bind('<Escape>', on_escape)
+        self.geometry = None
+        self.stats['windows'] += 1
+
+    def _ensure_window(self, geometry: Tuple[int, int, int, int]):
+        """创建窗口（只在第一次或窗口被销毁后），屏幕区域变化时调整大小和位置"""
+        if self.window is None or not self.window.winfo_exists():
+            self._create_window()
+        if geometry == self.geometry:
+            return
+        x, y, width, height = geometry
+        self.window.geometry(f"{width}x{height}+{x}+{y}")
+        self.canvas.configure(width=width, height=height)
+        self.canvas.coords(self._waiting_item, width / 2, height / 2)
+        # 上、下、左、右边框
+        b = BORDER_WIDTH
+        for item, rect in zip(self._border_items, (
+                (0, 0, width, b), (0, height - b, width, height),
+                (0, 0, b, height), (width - b, 0, width, height))):
+            self.canvas.coords(item, *rect)
+        self.geometry = geometry
+
+    def prepare(self, geometry: Tuple[int, int, int, int]):
+        """
+        预先创建窗口、画布项和显示器尺寸的 PhotoImage，并让窗口完成一次映射，保持隐藏
+
+        Args:
+            geometry: 覆盖的屏幕区域 (x, y, 宽, 高)
+        """
+        self._ensure_window(geometry)
+        size = geometry[2:]
+        if self._photo is None or (self._photo.width(), self._photo.height()) != size:
+            self._photo = ImageTk.PhotoImage('RGBA', size)
+            self.stats['photos'] += 1
+            self.canvas.itemconfigure(self._background_item, image=self._photo)
+        # 以全透明映射一次，第一次显示时不必再创建原生窗口
+        try:
+            self.window.attributes('-alpha', 0.0)
+            self.window.deiconify()
+            self.window.update_idletasks()
+            self.window.withdraw()
+            self.window.attributes('-alpha', 1.0)
+        except tk.TclError as e:
+            logging.debug(f"预映射覆盖层窗口失败: {e}")
+
+    def _present(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+
+    # ---------- 背景 ----------
+
+    def _set_background(self, mask_color: Tuple[int, int, int, int]):
+        """把遮罩叠加到截图上，写入已有的 PhotoImage"""
+        if self._source is None:
+            self.canvas.itemconfigure(self._background_item, image='')
+            return
+        composite = dim_image(self._source, mask_color)
+        if self._photo is not None and (self._photo.width(), self._photo.height()) == composite.size:
+            self._photo.paste(composite)
+            self.stats['pastes'] += 1
+        else:
+            self._photo = ImageTk.PhotoImage(composite)
+            self.stats['photos'] += 1
+        self.canvas.itemconfigure(self._background_item, image=self._photo)
+
+    # ---------- 状态 ----------
+
+    def show_waiting(self, screenshot, geometry: Tuple[int, int, int, int]):
+        """
+        显示等待状态
+
+        Args:
+            screenshot: 本次触发的截图（PIL.Image）
+            geometry: 覆盖的屏幕区域 (x, y, 宽, 高)
+        """
+        self.detach_blocks()
+        self._ensure_window(geometry)
+        self._source = screenshot
+        self._set_background(WAITING_MASK)
+        self.canvas.itemconfigure('border', fill=WAITING_BORDER)
+        self.canvas.itemconfigure(self._waiting_item, state='normal' if screenshot else 'hidden')
+        self.canvas.configure(cursor='wait')
+        self.state = WAITING
+        self._present()
+        self.window.update_idletasks()
+
+    def show_result(self, complete: bool = True):
+        """
+        原地切换为识别完成状态
+
+        Args:
+            complete: 识别是否已全部完成；渐进识别的部分结果先切换背景，边框保持等待颜色，
+                      全部完成后再次调用改为完成颜色
+
+        Returns:
+            覆盖层画布（用于挂载文本块图层），窗口不存在时返回 None
+        """
+        if self.window is None or not self.window.winfo_exists():
+            return None
+        self.canvas.itemconfigure('border', fill=RESULT_BORDER if complete else WAITING_BORDER)
+        if self.state != RESULT:
+            self._set_background(RESULT_MASK)
+            self.canvas.itemconfigure(self._waiting_item, state='hidden')
+            self.canvas.configure(cursor='arrow')
+            self.state = RESULT
+            self._present()
+        return self.canvas
+
+    def set_cursor(self, cursor: str):
+        if self.canvas is not None:
+            self.canvas.configure(cursor=cursor)
+
+    def attach_blocks(self, renderer, bindings: Dict[str, Callable]):
+        """
+        挂上文本块图层
+
+        Args:
+            renderer: 高亮渲染器（卸下时调用其 destroy）
+            bindings: 画布事件序列 -> 回调
+        """
+        self.detach_blocks()
+        self._renderer = renderer
+        for sequence, callback in bindings.items():
+            self.canvas.bind(sequence, callback)
+            self._bindings.append(sequence)
+
+    def detach_blocks(self):
+        """卸下文本块图层：解除鼠标事件，删除高亮画布项"""
+        if self.canvas is not None:
+            for sequence in self._bindings:
+                self.canvas.unbind(sequence)
+        self._bindings = []
+        if self._renderer is not None:
+            try:
+                self._renderer.destroy()
+            except tk.TclError as e:
+                logging.debug(f"删除高亮画布项失败: {e}")
+            self._renderer = None
+
+    @property
+    def visible(self) -> bool:
+        return self.state != HIDDEN
+
+    def hide(self):
+        """隐藏覆盖层（窗口保留给下一次触发），释放截图"""
+        self.detach_blocks()
+        self._source = None
+        self.state = HIDDEN
+        if self.window is not None:
+            try:
+                self.window.withdraw()
+            except tk.TclError:
+                self.window = None
+
+    def destroy(self):
+        """销毁窗口和所有缓存"""
+        self.hide()
+        if self.window is not None:
+            try:
+                self.window.destroy()
+            except tk.TclError:
+                pass
+        self.window = None
+        self.canvas = None
+        self._photo = None
+
+
+class OverlayPool:
+    """按显示器区域预先创建的隐藏覆盖层"""
+
+    def __init__(self, master, on_escape: Optional[Callable[[], None]] = None):
+        self.master = master
+        self.on_escape = on_escape
+        # (x, y, 宽, 高) -> OverlayWindow
+        self._overlays: Dict[Tuple[int, int, int, int], OverlayWindow] = {}
+
+    def _create(self, geometry: Tuple[int, int, int, int]) -> OverlayWindow:
+        overlay = OverlayWindow(self.master, on_escape=self.on_escape)
+        overlay.prepare(geometry)
+        self._overlays[geometry] = overlay
+        return overlay
+
+    def refresh(self, geometries: Iterable[Tuple[int, int, int, int]]) -> bool:
+        """
+        按当前的显示器区域更新池：新区域预先创建覆盖层，已不存在的区域销毁
+
+        Returns:
+            池是否发生变化
+        """
+        geometries = [tuple(g) for g in geometries]
+        changed = False
+        for geometry in list(self._overlays):
+            if geometry not in geometries:
+                self._overlays.pop(geometry).destroy()
+                changed = True
+        for geometry in geometries:
+            if geometry not in self._overlays:
+                self._create(geometry)
+                changed = True
+        return changed
+
+    def get(self, geometry: Tuple[int, int, int, int]) -> OverlayWindow:
+        """获取覆盖指定区域的覆盖层（池中没有时立即创建）"""
+        geometry = tuple(geometry)
+        overlay = self._overlays.get(geometry)
+        if overlay is None:
+            overlay = self._create(geometry)
+        return overlay
+
+    def __len__(self) -> int:
+        return len(self._overlays)
+
+    def hide_all(self):
+        for overlay in self._overlays.values():
+            overlay.hide()
+
+    def destroy(self):
+        for overlay in self._overlays.values():
+            overlay.destroy()
+        self._overlays.clear()
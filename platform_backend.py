@@ -0,0 +1,161 @@
+"""
+平台后端
+ScreenOCRTool 通过后端访问 DPI、显示器、截图、鼠标位置、键盘钩子、控制台中断和系统托盘，
+便于在没有 Win32 的环境中用替身后端启动完整程序（见 idle_benchmark.py）:
+    - Win32Backend：实际运行使用（pywin32 + ctypes）
+    - 替身后端实现相同的方法即可
+
+用法:
+    tool = ScreenOCRTool()                  # 默认 Win32Backend
+    tool = ScreenOCRTool(backend=backend)   # 替身后端
+"""
+import ctypes
+import logging
+from ctypes import wintypes
+from typing import Callable, Optional, Tuple
+
+from PIL import Image
+
+from keyboard_hook import KeyboardHookThread
+
+try:
+    import win32api
+    import win32con
+    import win32gui
+    import win32ui
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+
+class Win32Backend:
+    """Windows 系统接口"""
+
+    def __init__(self):
+        if not WIN32_AVAILABLE:
+            raise RuntimeError("pywin32 未安装，无法使用 Win32 后端")
+        self._console_handler = None
+
+    def set_dpi_awareness(self):
+        """设置高DPI支持"""
+        try:
+            ctypes.windll.shcore.SetProcessDpiAwareness(2)
+        except:
+            try:
+                ctypes.windll.user32.SetProcessDPIAware()
+            except:
+                pass
+
+    def dpi_scale(self) -> float:
+        """系统DPI缩放"""
+        return ctypes.windll.shcore.GetScaleFactorForDevice(0) / 100
+
+    def monitor_area(self) -> Tuple[int, int, int, int]:
+        """主显示器区域 (x, y, 宽, 高)（物理像素，与截图一致）"""
+        monitor_info = win32api.GetMonitorInfo(win32api.MonitorFromPoint((0,0)))
+        left, top, right, bottom = monitor_info["Monitor"]
+        return (left, top, right - left, bottom - top)
+
+    def frame_interval_ms(self) -> float:
+        """显示器刷新周期（毫秒），获取失败时按 60Hz 计算"""
+        try:
+            settings = win32api.EnumDisplaySettings(None, win32con.ENUM_CURRENT_SETTINGS)
+            frequency = settings.DisplayFrequency
+            if frequency and frequency > 1:
+                return 1000.0 / frequency
+        except Exception as e:
+            logging.debug(f"获取显示器刷新率失败: {e}")
+        return 1000.0 / 60
+
+    def cursor_pos(self) -> Tuple[int, int]:
+        return win32api.GetCursorPos()
+
+    def capture(self) -> Optional[Image.Image]:
+        """捕获主显示器的完整区域（包括任务栏），失败时返回 None"""
+        hwnd = None
+        hwndDC = None
+        mfcDC = None
+        saveDC = None
+        saveBitMap = None
+        try:
+            # 获取当前屏幕的完整区域
+            left, top, real_width, real_height = self.monitor_area()
+
+            # 获取整个桌面窗口
+            hwnd = win32gui.GetDesktopWindow()
+            hwndDC = win32gui.GetWindowDC(hwnd)
+            mfcDC = win32ui.CreateDCFromHandle(hwndDC)
+            saveDC = mfcDC.CreateCompatibleDC()
+
+            saveBitMap = win32ui.CreateBitmap()
+            saveBitMap.CreateCompatibleBitmap(mfcDC, real_width, real_height)
+            saveDC.SelectObject(saveBitMap)
+
+            # 捕获整个屏幕区域，包括任务栏
+            saveDC.BitBlt(
+                (0, 0),
+                (real_width, real_height),
+                mfcDC,
+                (left, top),
+                win32con.SRCCOPY
+            )
+
+            bmpinfo = saveBitMap.GetInfo()
+            bmpstr = saveBitMap.GetBitmapBits(True)
+            image = Image.frombuffer(
+                'RGB',
+                (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
+                bmpstr, 'raw', 'BGRX', 0, 1
+            )
+
+            return image
+        except Exception as e:
+            logging.error(f"屏幕捕获失败: {str(e)}")
+            return None
+        finally:
+            # 确保所有资源都被清理
+            if saveDC:
+                saveDC.DeleteDC()
+            if mfcDC:
+                mfcDC.DeleteDC()
+            if hwndDC and hwnd:
+                win32gui.ReleaseDC(hwnd, hwndDC)
+            if saveBitMap:
+                win32gui.DeleteObject(saveBitMap.GetHandle())
+
+    def create_keyboard_hook(self, state, channel):
+        """创建键盘钩子线程（调用方负责 start/stop）"""
+        return KeyboardHookThread(state, channel)
+
+    def last_input_tick(self) -> Optional[int]:
+        """系统最后一次输入的时间（GetTickCount），获取失败时返回 None"""
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [('cbSize', wintypes.UINT), ('dwTime', wintypes.DWORD)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        return info.dwTime
+
+    def install_console_handler(self, on_interrupt: Callable[[], None]):
+        """控制台 Ctrl+C / Ctrl+Break 时调用 on_interrupt（在控制台线程中）"""
+        try:
+            HANDLER_ROUTINE = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.DWORD)
+
+            def console_handler(ctrl_type):
+                if ctrl_type in (0, 1):  # CTRL_C_EVENT, CTRL_BREAK_EVENT
+                    on_interrupt()
+                    return True
+                return False
+
+            # 保存回调防止被垃圾回收
+            self._console_handler = HANDLER_ROUTINE(console_handler)
+            ctypes.windll.kernel32.SetConsoleCtrlHandler(self._console_handler, True)
+        except Exception as e:
+            logging.debug(f"设置控制台中断处理失败: {e}")
+
+    def create_tray(self, tool):
+        """创建系统托盘（同时负责加载和保存配置）"""
+        from system_tray import SystemTray
+        return SystemTray(tool)
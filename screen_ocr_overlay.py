@@ -1,10 +1,3 @@
-import win32api
-import win32gui
-import win32con
-import win32ui
-import ctypes
-from ctypes import wintypes
-from PIL import Image, ImageTk, ImageDraw
 import tkinter as tk
 import logging
 import traceback
@@ -12,8 +5,22 @@ import time
 import queue
 import threading
 import sys
-from wechat_ocr_wrapper import get_wechat_ocr
-from windows_ocr_wrapper import WindowsOCRWrapper
+import os
+import functools
+import ocr_engines
+from text_blocks import TextBlockStore, as_store
+from spatial_index import LineSplitIndex, ENV_DRAG_TRACE_DIR, save_drag_trace
+from selection import SelectionTracker
+from highlight_renderer import HighlightRenderer
+from overlay_window import OverlayPool
+import text_layout
+from event_loop import NotifyingQueue, ThreadWaker, TkNotifier
+from glyph_metrics import get_glyph_metrics
+from hotkey_matcher import KEY_MAPPING, HotkeyMatcher
+from hook_monitor import HOOK_CHECK_DELAY_MS, LEVEL_OVER, get_hook_monitor
+from task_executor import POOL_ENGINE, POOL_UI_AUX, PRIORITY_HIGH, PRIORITY_LOW, get_executor
+from platform_backend import Win32Backend
+from keyboard_hook import HOOK_SLOW, KEY_PRESS, HotkeyStateMachine, KeyEventChannel
 from splash_screen import SplashScreen, WelcomePage, StartupToast
 from translation_popup import get_translation_manager
 
@@ -42,6 +49,13 @@ class ScreenOCRTool:
         "show_debug": False,
         "debug_log": "",
         "image_preprocess": False,  # 图像预处理（对比度增强+锐化）
+        "layout_analysis": False,  # 复制时按栏和段落重建阅读顺序
+        "glyph_metrics": False,  # 按界面字体字宽估计字符位置（等宽字体上更差，默认关闭）
+        "progressive_ocr": False,  # 按条带渐进识别，识别完的部分先可选择
+        "ocr_engine": "wechat",
+        "ocr_plugins": [],  # 第三方 OCR 引擎模块
+        "ocr_service_port": 0,  # 本地 OCR 服务端口，0 表示不启动
+        "ocr_service_allowed_dirs": [],  # 本地 OCR 服务允许按路径识别的目录，为空时只接受图片字节
         # 翻译配置
         "enable_translation": True,
         "translation_source": "auto",
@@ -50,27 +64,33 @@ class ScreenOCRTool:
         "tencent_secret_key": ""
     }
     
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: 平台后端（截图、显示器、键盘钩子、系统托盘等），默认 Win32Backend
+        """
         print("初始化程序...")
+        self.backend = backend if backend is not None else Win32Backend()
         
         # 设置高DPI支持
-        try:
-            ctypes.windll.shcore.SetProcessDpiAwareness(2)
-        except:
-            try:
-                ctypes.windll.user32.SetProcessDPIAware()
-            except:
-                pass
+        self.backend.set_dpi_awareness()
         
         # 添加配置队列和状态标志
-        self.config_queue: queue.Queue = queue.Queue()
-        self.ocr_result_queue: queue.Queue = queue.Queue()  # OCR结果队列
+        # 放入任务后唤醒主循环（通知函数在创建主窗口后设置）
+        self.config_queue: queue.Queue = NotifyingQueue()
+        self.ocr_result_queue: queue.Queue = NotifyingQueue()  # OCR结果队列
         self.enabled: bool = True  # 默认启用服务
         
         # 初始化主窗口
         self.root = tk.Tk()
         self.root.withdraw()
         
+        # 主循环唤醒：后台线程放入任务或按键状态变化时在主线程中处理
+        self._notifier = TkNotifier(self.root, self._process_events)
+        self.config_queue.notify = self._notifier.notify
+        self.ocr_result_queue.notify = self._notifier.notify
+        self._trigger_after_id = None
+        
         # 显示启动画面（传入主窗口）
         self.splash = SplashScreen(parent=self.root)
         self.splash.show()
@@ -82,25 +102,34 @@ class ScreenOCRTool:
         self._running: bool = True
         self.key_press_time: float = 0
         self.cleanup_pending: bool = False
+        self.overlay_pool = None  # 按显示器预先创建的隐藏覆盖层（OverlayPool）
+        self.overlay = None  # 当前使用的覆盖层（OverlayWindow，跨触发复用）
+        # 渐进识别：每次触发递增，丢弃过期的条带结果
+        self._ocr_generation: int = 0
+        self._ocr_partial_shown: bool = False
+        # 首帧耗时：从快捷键按下到覆盖层显示（毫秒）
+        self.paint_stats = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0}
         
         self.splash.update_progress(0.2, "获取屏幕信息...")
         
         # 获取系统DPI缩放和屏幕尺寸
-        self.dpi_scale: float = ctypes.windll.shcore.GetScaleFactorForDevice(0) / 100
+        self.dpi_scale: float = self.backend.dpi_scale()
         
-        # 使用 Win32 API 获取物理屏幕尺寸（与截图保持一致）
-        monitor_info = win32api.GetMonitorInfo(win32api.MonitorFromPoint((0,0)))
-        monitor_area = monitor_info["Monitor"]
-        self.screen_width = monitor_area[2] - monitor_area[0]
-        self.screen_height = monitor_area[3] - monitor_area[1]
+        # 获取物理屏幕尺寸（与截图保持一致）
+        _, _, self.screen_width, self.screen_height = self.backend.monitor_area()
         
         print(f"系统DPI缩放: {self.dpi_scale}")
         print(f"屏幕尺寸（物理像素）: {self.screen_width}x{self.screen_height}")
         
         self.splash.update_progress(0.4, "设置键盘钩子...")
         
-        # 设置键盘钩子
-        self.keyboard_hook_id = None
+        # 设置键盘钩子（专用线程，按键状态变化通过 key_events 通知主线程）
+        # 钩子线程不调用 Tcl：只唤醒 hook_waker，由它调用 notify（线程版 Tcl 会等待主线程）
+        self.keyboard_hook = None
+        self.hotkey_state = HotkeyStateMachine()  # 编译后的快捷键在加载配置后设置
+        self.hook_waker = ThreadWaker(self._notifier.notify, name="HookWaker")
+        self.key_events = KeyEventChannel(self.hook_waker.wake)
+        self._hook_check_pending: bool = False  # 慢回调检查已排队
         print("开始设置键盘钩子...")
         self.setup_keyboard_hook()
         print("键盘钩子设置完成")
@@ -115,8 +144,7 @@ class ScreenOCRTool:
         
         # 从配置文件加载配置
         try:
-            from system_tray import SystemTray
-            self.tray = SystemTray(self)
+            self.tray = self.backend.create_tray(self)
             self.config = self.tray.load_config()
         except Exception as e:
             print(f"加载配置失败，使用默认配置: {str(e)}")
@@ -125,78 +153,32 @@ class ScreenOCRTool:
         self.splash.update_progress(0.6, "初始化OCR引擎...")
         
         # 初始化OCR相关属性
-        self._wechat_ocr = None
-        self._windows_ocr = None
         self.trigger_delay_ms: int = self.config.get("trigger_delay_ms", self.DEFAULT_CONFIG["trigger_delay_ms"])
         self.hotkey: str = self.config.get("hotkey", self.DEFAULT_CONFIG["hotkey"])
-        self.pressed_keys: set = set()
+        self.key_mapping = KEY_MAPPING  # 虚拟键码映射
+        self.hotkey_state.matcher = HotkeyMatcher(self.hotkey, self.key_mapping)
         self._ocr_initialized: bool = False  # OCR 初始化标志
+        self.ocr_service = None  # 本地 OCR 服务（共享已初始化的引擎）
         
-        # 延迟初始化 OCR 引擎 - 在后台线程中初始化
-        import threading
+        # 延迟初始化 OCR 引擎 - 在引擎线程池中初始化
         def init_ocr_background():
             self.init_ocr_engine()
             self._ocr_initialized = True
+            # 预先构建字宽表，第一次显示覆盖层时不必等待
+            try:
+                if self.config.get("glyph_metrics", False):
+                    get_glyph_metrics()
+            except Exception as e:
+                logging.warning(f"加载字宽表失败: {e}")
             self.splash.update_progress(0.9, "OCR引擎加载完成...")
+            self.start_ocr_service()
         
-        ocr_thread = threading.Thread(target=init_ocr_background, daemon=True)
-        ocr_thread.start()
+        get_executor().submit(POOL_ENGINE, init_ocr_background, priority=PRIORITY_HIGH)
 
-        # 定义虚拟键码映射
-        self.key_mapping = {
-            # 控制键
-            'ctrl': [162, 163],     # 左右CTRL键
-            'alt': [164, 165],      # 左右ALT键
-            'shift': [160, 161],    # 左右SHIFT键
-            'win': [91, 92],        # 左右WIN键
-            
-            # 功能键
-            'f1': [112], 'f2': [113], 'f3': [114], 'f4': [115],
-            'f5': [116], 'f6': [117], 'f7': [118], 'f8': [119],
-            'f9': [120], 'f10': [121], 'f11': [122], 'f12': [123],
-            
-            # 数字键
-            '0': [48], '1': [49], '2': [50], '3': [51], '4': [52],
-            '5': [53], '6': [54], '7': [55], '8': [56], '9': [57],
-            
-            # 字母键
-            'a': [65], 'b': [66], 'c': [67], 'd': [68], 'e': [69],
-            'f': [70], 'g': [71], 'h': [72], 'i': [73], 'j': [74],
-            'k': [75], 'l': [76], 'm': [77], 'n': [78], 'o': [79],
-            'p': [80], 'q': [81], 'r': [82], 's': [83], 't': [84],
-            'u': [85], 'v': [86], 'w': [87], 'x': [88], 'y': [89],
-            'z': [90],
-            
-            # 特殊键
-            'space': [32],          # 空格键
-            'tab': [9],            # Tab键
-            'enter': [13],         # 回车键
-            'backspace': [8],      # 退格键
-            'delete': [46],        # 删除键
-            'esc': [27],           # ESC键
-            'capslock': [20],      # 大写锁定键
-            
-            # 方向键
-            'up': [38],            # 上箭头
-            'down': [40],          # 下箭头
-            'left': [37],          # 左箭头
-            'right': [39],         # 右箭头
-            
-            # 其他常用键
-            'home': [36],          # Home键
-            'end': [35],           # End键
-            'pageup': [33],        # PageUp键
-            'pagedown': [34],      # PageDown键
-            'insert': [45],        # Insert键
-            'printscreen': [44],   # PrintScreen键
-            'scrolllock': [145],   # ScrollLock键
-            'pause': [19],         # Pause键
-        }
-        
     @property
     def wechat_ocr(self):
-        """获取WeChatOCR实例（已在启动时初始化）"""
-        return self._wechat_ocr
+        """获取WeChatOCR实例（未加载时返回 None）"""
+        return ocr_engines.peek_engine("wechat")
 
     def validate_config(self, config: dict) -> bool:
         """验证配置值的合法性"""
@@ -213,568 +195,249 @@ class ScreenOCRTool:
             return False
 
     def init_ocr_engine(self):
-        """初始化OCR引擎"""
+        """初始化OCR引擎（只加载配置选中的引擎，其他引擎在使用时再加载）"""
         try:
-            # 清理现有的OCR引擎
-            if hasattr(self, '_wechat_ocr') and self._wechat_ocr:
-                try:
-                    self._wechat_ocr.close()
-                except:
-                    pass
-                self._wechat_ocr = None
+            ocr_engines.load_plugins(self.config.get("ocr_plugins", []))
+            self._load_ocr_engine(self._selected_engine_name())
+        except Exception as e:
+            print(f"初始化OCR引擎失败: {str(e)}")
 
-            if hasattr(self, '_windows_ocr') and self._windows_ocr:
-                self._windows_ocr = None
+    def _selected_engine_name(self) -> str:
+        """返回配置选中的引擎名称，未注册时回退到 WeChatOCR"""
+        engine_name = self.config.get("ocr_engine", "wechat")
+        if ocr_engines.get_spec(engine_name) is None:
+            logging.warning(f"未知的 OCR 引擎 {engine_name}，使用 WeChatOCR")
+            engine_name = "wechat"
+        return engine_name
 
-            # 初始化 WeChatOCR
-            print("正在初始化 WeChatOCR...")
-            self._wechat_ocr = get_wechat_ocr()
-            if self._wechat_ocr and self._wechat_ocr.is_available():
-                print("✓ WeChatOCR 初始化完成")
-            else:
-                logging.warning("❌ WeChatOCR 不可用")
-                if self._wechat_ocr and hasattr(self._wechat_ocr, 'error_message'):
-                    if self._wechat_ocr.error_message:
-                        logging.warning(f"   原因: {self._wechat_ocr.error_message}")
-                logging.info("   💡 解决方案:")
-                logging.info("   1. 安装微信客户端 (https://weixin.qq.com/)")
-                logging.info("   2. 在微信中使用一次'提取图中文字'功能以下载OCR插件")
-            
-            # 初始化 Windows OCR
-            print("正在初始化 Windows OCR...")
-            self._windows_ocr = WindowsOCRWrapper()
-            if self._windows_ocr and self._windows_ocr.is_available():
-                print("✓ Windows OCR 初始化完成")
-            else:
-                logging.warning("❌ Windows OCR 不可用")
-                if self._windows_ocr and hasattr(self._windows_ocr, 'error_message'):
-                    if self._windows_ocr.error_message:
-                        logging.warning(f"   原因: {self._windows_ocr.error_message}")
+    def _load_ocr_engine(self, engine_name: str):
+        """加载指定引擎并输出初始化结果"""
+        spec = ocr_engines.get_spec(engine_name)
+        print(f"正在初始化 {spec.display_name}...")
+        engine = ocr_engines.get_engine(engine_name)
+        if engine and engine.is_available():
+            print(f"✓ {spec.display_name} 初始化完成")
+        else:
+            ocr_engines.log_unavailable(engine_name, engine)
+
+    def start_ocr_service(self):
+        """按配置启动本地 OCR 服务，供其他程序复用已初始化的引擎"""
+        port = self.config.get("ocr_service_port", 0)
+        if not port or self.ocr_service:
+            return
+        try:
+            from ocr_service import OCRService
+            self.ocr_service = OCRService(
+                self._selected_engine_name(),
+                port=port,
+                preprocess=self.config.get("image_preprocess", False),
+                allowed_dirs=self.config.get("ocr_service_allowed_dirs", [])
+            )
+            self.ocr_service.start()
         except Exception as e:
-            print(f"初始化OCR引擎失败: {str(e)}")
+            logging.error(f"启动 OCR 服务失败: {str(e)}")
+            self.ocr_service = None
 
     def setup_keyboard_hook(self):
-        """设置全局键盘钩子"""
+        """在专用线程中设置全局键盘钩子（Tk 主线程忙碌时按键回调不受影响）"""
         try:
-            user32 = ctypes.WinDLL('user32', use_last_error=True)
-            
-            # 定义键盘钩子结构
-            class KBDLLHOOKSTRUCT(ctypes.Structure):
-                _fields_ = [
-                    ('vkCode', wintypes.DWORD),
-                    ('scanCode', wintypes.DWORD),
-                    ('flags', wintypes.DWORD),
-                    ('time', wintypes.DWORD),
-                    ('dwExtraInfo', wintypes.PULONG)
-                ]
-            
-            def keyboard_hook_proc(nCode, wParam, lParam):
-                """统一的键盘钩子处理函数"""
-                try:
-                    if nCode >= 0:
-                        kb = ctypes.cast(lParam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
-                        
-                        # 检查是否按下ESC键 (VK_ESCAPE = 27)
-                        if kb.vkCode == 27 and wParam == win32con.WM_KEYDOWN:
-                            # 清理窗口和状态
-                            self.key_press_time = 0
-                            self.is_processing = False
-                            self.cleanup_pending = True
-                            return user32.CallNextHookEx(None, nCode, wParam, lParam)
-                        
-                        hotkey_parts = self.hotkey.lower().split('+')
-                        
-                        # 获取当前按键的虚拟键码集合
-                        current_key_codes = set()
-                        for key in hotkey_parts:
-                            if key in self.key_mapping:
-                                current_key_codes.update(self.key_mapping[key])
-                        
-                        # 检查是否是配置的快捷键
-                        if kb.vkCode in current_key_codes:
-                            # 按键按下 (WM_KEYDOWN 或 WM_SYSKEYDOWN)
-                            if wParam in (win32con.WM_KEYDOWN, win32con.WM_SYSKEYDOWN):
-                                # 移除对 is_processing 的检查，只保留事件周期检查
-                                if self.key_press_time > 0:
-                                    return user32.CallNextHookEx(None, nCode, wParam, lParam)
-                                # 将按键添加到已按下的按键集合中
-                                self.pressed_keys.add(kb.vkCode)
-
-                                # 只有当所有配置的按键都被按下时才开始计时
-                                if all(any(code in self.pressed_keys for code in self.key_mapping.get(key, [])) for key in hotkey_parts):
-                                    self.key_press_time = time.time()
-                            
-                            # 按键松开 (WM_KEYUP 或 WM_SYSKEYUP)
-                            elif wParam in (win32con.WM_KEYUP, win32con.WM_SYSKEYUP):
-                                # 从已按下的按键集合中移除
-                                self.pressed_keys.discard(kb.vkCode)
-                                
-                                # 重置计时器和状态
-                                self.key_press_time = 0                   
-                                self.is_processing = False
-                                self.cleanup_pending = True
-                except Exception as e:
-                    print(f"键盘钩子处理错误: {str(e)}")
-                    if hasattr(e, '__traceback__'):
-                        traceback.print_tb(e.__traceback__)
-                
-                # 正确调用CallNextHookEx
-                return user32.CallNextHookEx(None, nCode, wParam, lParam)
-            
-            # 保存keyboard_proc作为实例属性以防止被垃圾回收
-            HOOKPROC = ctypes.CFUNCTYPE(
-                ctypes.c_long,
-                ctypes.c_int,
-                wintypes.WPARAM,
-                ctypes.POINTER(KBDLLHOOKSTRUCT)
-            )
-            
-            self.keyboard_proc = HOOKPROC(keyboard_hook_proc)
-            
-            # 修改这里：正确处理模块句柄
-            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-            kernel32.GetModuleHandleW.restype = wintypes.HMODULE
-            kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
-            module_handle = kernel32.GetModuleHandleW(None)
-            
-            # 设置钩子
-            user32.SetWindowsHookExW.argtypes = [
-                ctypes.c_int,
-                HOOKPROC,
-                wintypes.HINSTANCE,
-                wintypes.DWORD
-            ]
-            user32.SetWindowsHookExW.restype = wintypes.HHOOK
-            
-            # 使用正确转换的模块句柄
-            self.keyboard_hook_id = user32.SetWindowsHookExW(
-                win32con.WH_KEYBOARD_LL,
-                self.keyboard_proc,
-                module_handle,
-                0
-            )
-            
-            if not self.keyboard_hook_id:
-                error = ctypes.get_last_error()
-                print(f"设置键盘钩子失败，错误码: {error}")
-                raise Exception(f"无法设置键盘钩子，错误码: {error}")
-            else:
-                print("键盘钩子设置成功")
-                
+            self.keyboard_hook = self.backend.create_keyboard_hook(self.hotkey_state, self.key_events)
+            self.keyboard_hook.start()
+            print("键盘钩子设置成功")
         except Exception as e:
             logging.error(f"设置键盘钩子失败: {str(e)}")
             raise
 
-    def capture_screen_region(self, width, height):
-        """捕获屏幕区域"""
-        hwnd = None
-        hwndDC = None
-        mfcDC = None
-        saveDC = None
-        saveBitMap = None
-        try:
-            # 获取当前屏幕的完整区域
-            monitor_info = win32api.GetMonitorInfo(win32api.MonitorFromPoint((0,0)))
-            monitor_area = monitor_info["Monitor"]
-            real_width = monitor_area[2] - monitor_area[0]
-            real_height = monitor_area[3] - monitor_area[1]
-            
-            # 获取整个桌面窗口
-            hwnd = win32gui.GetDesktopWindow()
-            hwndDC = win32gui.GetWindowDC(hwnd)
-            mfcDC = win32ui.CreateDCFromHandle(hwndDC)
-            saveDC = mfcDC.CreateCompatibleDC()
-            
-            saveBitMap = win32ui.CreateBitmap()
-            saveBitMap.CreateCompatibleBitmap(mfcDC, real_width, real_height)
-            saveDC.SelectObject(saveBitMap)
-            
-            # 捕获整个屏幕区域，包括任务栏
-            saveDC.BitBlt(
-                (0, 0), 
-                (real_width, real_height), 
-                mfcDC, 
-                (monitor_area[0], monitor_area[1]), 
-                win32con.SRCCOPY
-            )
-            
-            bmpinfo = saveBitMap.GetInfo()
-            bmpstr = saveBitMap.GetBitmapBits(True)
-            image = Image.frombuffer(
-                'RGB',
-                (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-                bmpstr, 'raw', 'BGRX', 0, 1
-            )
-            
-            return image
-        except Exception as e:
-            logging.error(f"屏幕捕获失败: {str(e)}")
-            return None
-        finally:
-            # 确保所有资源都被清理
-            if saveDC:
-                saveDC.DeleteDC()
-            if mfcDC:
-                mfcDC.DeleteDC()
-            if hwndDC and hwnd:
-                win32gui.ReleaseDC(hwnd, hwndDC)
-            if saveBitMap:
-                win32gui.DeleteObject(saveBitMap.GetHandle())
+    def reinstall_keyboard_hook(self):
+        """重新安装键盘钩子（系统静默移除超时的钩子后恢复快捷键）"""
+        if self.keyboard_hook:
+            self.keyboard_hook.reinstall()
 
-    def get_text_positions(self, image):
-        """获取文字位置信息"""
-        try:
-            # 根据配置选择 OCR 引擎
-            ocr_engine = self.config.get("ocr_engine", "wechat")
-            
-            if ocr_engine == "windows":
-                return self._get_text_positions_windows(image)
+    def _handle_key_events(self):
+        """主线程中应用钩子线程发来的按键事件"""
+        for kind, value in self.key_events.drain():
+            if kind == KEY_PRESS:
+                self.key_press_time = value
+            elif kind == HOOK_SLOW:
+                self._report_slow_hook(*value)
             else:
-                return self._get_text_positions_wechat(image)
-        except Exception as e:
-            logging.error(f"OCR处理失败: {str(e)}")
-            return []
+                # 快捷键松开或按下 ESC：重置计时器和状态，清理窗口
+                self.key_press_time = 0
+                self.is_processing = False
+                self.cleanup_pending = True
 
-    def _get_text_positions_wechat(self, image):
-        """使用WeChatOCR获取文字位置"""
+    def _report_slow_hook(self, level: int, latency_ms: float):
+        """钩子回调延迟接近或超过超时预算（主线程，检查完成前只处理第一次）"""
+        if self._hook_check_pending:
+            return
+        self._hook_check_pending = True
+        self._on_slow_hook(level, latency_ms)
+
+    def _on_slow_hook(self, level: int, latency_ms: float):
+        """主线程中处理慢回调：超时则立即重新安装，否则稍后检查钩子是否仍在工作"""
+        monitor = get_hook_monitor()
+        if monitor.should_log(level):
+            logging.warning(
+                f"键盘钩子回调延迟 {latency_ms:.0f} ms（超时预算 {monitor.timeout_ms} ms，"
+                f"告警 {monitor.stats['warnings']} 次，超时 {monitor.stats['over_budget']} 次）"
+            )
+        if level == LEVEL_OVER:
+            # Windows 7 之后超时的钩子会被静默移除
+            self._hook_check_pending = False
+            self.reinstall_keyboard_hook()
+        else:
+            self.root.after(HOOK_CHECK_DELAY_MS, self._check_keyboard_hook)
+
+    def _check_keyboard_hook(self):
+        """慢回调之后确认钩子仍在接收按键：有新的输入而钩子没有被调用时重新安装"""
+        self._hook_check_pending = False
         try:
-            ocr = self._wechat_ocr
-            if ocr is None or not ocr.is_available():
-                logging.error("❌ WeChatOCR 不可用，无法进行识别")
-                if ocr and hasattr(ocr, 'error_message') and ocr.error_message:
-                    logging.error(f"   原因: {ocr.error_message}")
-                logging.info("   💡 请安装微信客户端并使用一次OCR功能")
-                return []
-            
-            # WeChatOCR 直接接受 PIL Image，可选预处理
-            preprocess = self.config.get("image_preprocess", False)
-            result = ocr.ocr_pil_image(image, preprocess=preprocess)
-            return result
-            
+            last_input_tick = self.backend.last_input_tick()
+            if last_input_tick is None:
+                return
+            if get_hook_monitor().missed_input(last_input_tick):
+                logging.warning("检测到键盘钩子已停止接收按键，可能已被系统移除")
+                self.reinstall_keyboard_hook()
         except Exception as e:
-            logging.error(f"WeChatOCR处理失败: {str(e)}")
-            return []
-    
-    def _get_text_positions_windows(self, image):
-        """使用Windows OCR获取文字位置"""
+            logging.error(f"检查键盘钩子失败: {str(e)}")
+
+    def capture_screen_region(self, width, height):
+        """捕获屏幕区域（主显示器的完整区域，包括任务栏）"""
+        return self.backend.capture()
+
+    def get_text_positions(self, image):
+        """获取文字位置信息"""
         try:
-            ocr = self._windows_ocr
-            if ocr is None or not ocr.is_available():
-                logging.error("❌ Windows OCR 不可用，无法进行识别")
-                if ocr and hasattr(ocr, 'error_message') and ocr.error_message:
-                    logging.error(f"   原因: {ocr.error_message}")
-                logging.info("   💡 请安装: pip install winrt-Windows.Media.Ocr")
-                return []
-            
-            # Windows OCR 直接接受 PIL Image，可选预处理
+            # 根据配置选择 OCR 引擎（未加载的引擎在此时按需加载）
+            engine_name = self._selected_engine_name()
             preprocess = self.config.get("image_preprocess", False)
-            result = ocr.ocr_pil_image(image, preprocess=preprocess)
-            return result
-            
+            return ocr_engines.recognize(engine_name, image, preprocess=preprocess)
         except Exception as e:
-            logging.error(f"Windows OCR处理失败: {str(e)}")
+            logging.error(f"OCR处理失败: {str(e)}")
             return []
 
     def should_add_space(self, prev_block, next_block):
         """判断两个文本块之间是否需要添加空格"""
         if not prev_block or not next_block:
             return False
-        
-        prev_text = prev_block['text'].strip()
-        next_text = next_block['text'].strip()
-        if not prev_text or not next_text:
-            return False
-        
-        # 定义标点符号集合
-        punctuation = set(',.:;?!，。：；？！、（）()[]【】{}""\'\'')
-        
-        # 获取前后字符
-        prev_char = prev_text[-1]
-        next_char = next_text[0]
-        
-        # 如果任一字符是标点不添加空格
-        if prev_char in punctuation or next_char in punctuation:
-            return False
-        
-        # 检查是否是中文字符
-        def is_chinese(char):
-            return '\u4e00' <= char <= '\u9fff'
-        
-        # 如果前后都是中文，不添加空格
-        if is_chinese(prev_char) and is_chinese(next_char):
-            return False
-        
-        # 如果一个是中文一个是英文/数字，添加空格
-        prev_is_chinese = is_chinese(prev_char)
-        next_is_chinese = is_chinese(next_char)
-        if prev_is_chinese != next_is_chinese:
-            return True
-        
-        # 英文单词之间添加空格
-        if prev_char.isalnum() and next_char.isalnum():
-            return True
-        
-        return False
+        return text_layout.should_add_space(prev_block['text'], next_block['text'])
 
     def merge_text_blocks(self, selected_blocks):
+        """按行合并选中的文本块（行聚类见 text_layout）"""
         if not selected_blocks:
             return ""
-        
-        # 获取选中的文本块
-        blocks = [self.text_blocks[block_id] for block_id in selected_blocks]
-        
-        # 按垂直位置分组
-        lines = {}
-        for block in blocks:
-            # 计算文本块的垂直中心点
-            center_y = (block['y'] + block['height']) / 2
-            
-            # 查找匹配的行（允许5像素的垂直偏差）
-            matched_line = None
-            for line_y in lines.keys():
-                if abs(center_y - line_y) <= 5:
-                    matched_line = line_y
-                    break
-            
-            # 如果没有匹配的行，创建新行
-            if matched_line is None:
-                lines[center_y] = []
-            else:
-                center_y = matched_line
-            
-            lines[center_y].append(block)
-        
-        # 对每一行的文本块按x坐标排序
-        result = []
-        for y in sorted(lines.keys()):
-            line_blocks = lines[y]
-            line_blocks.sort(key=lambda b: b['x'])  # 按x坐标排序
-            
-            # 合并同一行的文本，用空格分隔
-            line_text = ''
-            for i, block in enumerate(line_blocks):
-                if i > 0:
-                    prev_block = line_blocks[i-1]
-                    if self.should_add_space(prev_block, block):
-                        line_text += ' '
-                line_text += block['text'].strip()
-            
-            result.append(line_text)
-        
-        # 用换行符连接不同行
-        return '\n'.join(result)
+        return text_layout.merge_text(self.text_blocks, selected_blocks,
+                                      layout_analysis=self.config.get("layout_analysis", False))
 
-    def create_highlight_layer(self, canvas, selected_blocks):
-        """创建统一的高亮图层"""
-        if not selected_blocks:
+    def _get_frame_interval_ms(self) -> float:
+        """显示器刷新周期（毫秒）"""
+        return self.backend.frame_interval_ms()
+
+    def _monitor_area(self):
+        """覆盖层所在显示器的区域 (x, y, 宽, 高)，与截图一致取主显示器"""
+        return self.backend.monitor_area()
+
+    def _get_overlay_pool(self) -> OverlayPool:
+        """获取覆盖层池（第一次使用时创建）"""
+        if self.overlay_pool is None:
+            def on_escape():
+                self.cleanup_windows()
+                self.is_processing = False
+            self.overlay_pool = OverlayPool(self.root, on_escape=on_escape)
+        return self.overlay_pool
+
+    def prepare_overlays(self):
+        """预先创建隐藏的覆盖层，触发时只需写入截图并显示"""
+        try:
+            start = time.perf_counter()
+            self._get_overlay_pool().refresh([self._monitor_area()])
+            logging.info(f"覆盖层预创建完成: {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            logging.warning(f"预创建覆盖层失败: {e}")
+
+    def _record_first_paint(self, hotkey_time: float, capture_ms: float, show_ms: float):
+        """记录从快捷键按下到覆盖层显示的耗时"""
+        if hotkey_time <= 0:
             return
-        
-        # 获取所有选中块的边界
-        min_x = float('inf')
-        min_y = float('inf')
-        max_x = float('-inf')
-        max_y = float('-inf')
-        
-        for block_id in selected_blocks:
-            block = self.text_blocks[block_id]
-            x1, y1, x2, y2 = block['x'], block['y'], block['x'] + block['width'], block['y'] + block['height']
-            min_x = min(min_x, x1)
-            min_y = min(min_y, y1)
-            max_x = max(max_x, x2)
-            max_y = max(max_y, y2)
-        
-        # 创建一个空白图像作为高亮层
-        width = int(max_x - min_x + 4)  # 额外的2像素边距
-        height = int(max_y - min_y + 4)
-        highlight = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(highlight)
-        
-        # 在高亮层上绘制所有选中区域
-        for block_id in selected_blocks:
-            block = self.text_blocks[block_id]
-            x1, y1, x2, y2 = block['x'], block['y'], block['x'] + block['width'], block['y'] + block['height']
-            # 调整坐标到相对位置
-            rect_x1 = int(x1 - min_x)
-            rect_y1 = int(y1 - min_y)
-            rect_x2 = int(x2 - min_x)
-            rect_y2 = int(y2 - min_y)
-            # 使用统一的颜色和透明度
-            draw.rectangle([rect_x1, rect_y1, rect_x2, rect_y2],
-                         fill=(77, 148, 255, 77))  # #4D94FF with 30% opacity
-        
-        # 转换为PhotoImage并显示
-        highlight_photo = ImageTk.PhotoImage(highlight)
-        # 保存引用防止被垃圾回收
-        if hasattr(self, 'highlight_photo'):
-            del self.highlight_photo
-        self.highlight_photo = highlight_photo
-        
-        # 清除之前的高亮
-        canvas.delete('highlight')
-        
-        # 创建新的高亮层
-        canvas.create_image(
-            int(min_x - 2), int(min_y - 2),  # 考虑边距
-            image=highlight_photo,
-            anchor='nw',
-            tags='highlight'
-        )
+        elapsed_ms = (time.time() - hotkey_time) * 1000
+        stats = self.paint_stats
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        stats['last_ms'] = elapsed_ms
+        logging.info(f"覆盖层首帧: {elapsed_ms:.0f} ms（触发延迟 {self.trigger_delay_ms} ms，"
+                     f"截图 {capture_ms:.0f} ms，显示 {show_ms:.0f} ms，"
+                     f"平均 {stats['total_ms'] / stats['count']:.0f} ms）")
 
-    def show_overlay_text(self, text_blocks):
-        """显示文本覆盖层"""
+    def show_overlay_text(self, text_blocks, complete: bool = True):
+        """
+        显示文本覆盖层（空列表为等待状态，否则在同一窗口中原地切换为结果状态）
+
+        Args:
+            text_blocks: OCR 识别结果
+            complete: 识别是否已全部完成（渐进识别的第一批结果为 False，之后的批次用 append_overlay_text 追加）
+        """
         try:
-            if hasattr(self, 'overlay_window') and self.overlay_window:
-                try:
-                    self.overlay_window.destroy()
-                except:
-                    pass
-            
-            # 获取当前屏幕的完整区域
-            monitor_info = win32api.GetMonitorInfo(win32api.MonitorFromPoint((0,0)))
-            monitor_area = monitor_info["Monitor"]
-            self.screen_x = monitor_area[0]  # 保存为实例变量
-            self.screen_y = monitor_area[1]  # 保存为实例变量
-            screen_width = monitor_area[2] - monitor_area[0]
-            screen_height = monitor_area[3] - monitor_area[1]
-            
-            # 创建新窗口
-            self.overlay_window = tk.Toplevel()
-            self.overlay_window.withdraw()  # 先隐藏窗口，等设置完成后再显示
-            
-            # 设置窗口属性
-            self.overlay_window.attributes('-topmost', True)
-            self.overlay_window.overrideredirect(True)  # 移除窗口边框
-            
-            # 设置窗口大小和位置以覆盖整个屏幕
-            self.overlay_window.geometry(f"{screen_width}x{screen_height}+{self.screen_x}+{self.screen_y}")
-            
-            # 配置grid布局
-            self.overlay_window.grid_rowconfigure(0, weight=1)
-            self.overlay_window.grid_columnconfigure(0, weight=1)
-            
-            # 创建画布
-            canvas = tk.Canvas(
-                self.overlay_window,
-                highlightthickness=0,
-                bg='black',
-                width=screen_width,
-                height=screen_height,
-                cursor='wait' if not text_blocks else 'arrow'
-            )
-            canvas.grid(row=0, column=0, sticky='nsew')
-            
-            # 显示截图作为背景
-            if self.current_screenshot:
-                # 创建带遮罩的图像
-                if not text_blocks:
-                    # 等待状态：黑色半透明遮罩
-                    masked_img = self.current_screenshot.copy()
-                    # 创建黑色半透明遮罩层
-                    overlay = Image.new('RGBA', masked_img.size, (0, 0, 0, 180))  # 黑色，透明度180/255
-                    masked_img = masked_img.convert('RGBA')
-                    masked_img = Image.alpha_composite(masked_img, overlay)
-                    
-                    photo = ImageTk.PhotoImage(masked_img)
-                    canvas.photo = photo
-                    canvas.create_image(0, 0, image=photo, anchor='nw', tags='screenshot')
-                    
-                    # 计算屏幕中心位置
-                    center_x = screen_width / 2
-                    center_y = screen_height / 2
-                    
-                    # 显示等待文本
-                    canvas.create_text(
-                        center_x, center_y,
-                        text="识别中，请稍后...",
-                        font=('Microsoft YaHei UI', 16),
-                        fill='white',
-                        tags='waiting_text'
-                    )
-                else:
-                    # 识别完成状态：浅色半透明遮罩
-                    masked_img = self.current_screenshot.copy()
-                    # 创建白色半透明遮罩层，透明度更低
-                    overlay = Image.new('RGBA', masked_img.size, (255, 255, 255, 100))  # 白色，透明度100/255
-                    masked_img = masked_img.convert('RGBA')
-                    masked_img = Image.alpha_composite(masked_img, overlay)
-                    
-                    photo = ImageTk.PhotoImage(masked_img)
-                    canvas.photo = photo
-                    canvas.create_image(0, 0, image=photo, anchor='nw', tags='screenshot')
-            
-            # 绘制边框（在截图之上） - 根据是否有文本块决定边框颜色
-            border_color = "#3498db" if not text_blocks else "#00FF00"  # 等待时蓝色，完成时绿色
-            border_width = 6  # 边框宽度
-            
-            # 绘制四条边框线（在最上层）
-            # 上边框
-            canvas.create_rectangle(0, 0, screen_width, border_width, 
-                                   fill=border_color, outline='', tags='border')
-            # 下边框
-            canvas.create_rectangle(0, screen_height - border_width, screen_width, screen_height, 
-                                   fill=border_color, outline='', tags='border')
-            # 左边框
-            canvas.create_rectangle(0, 0, border_width, screen_height, 
-                                   fill=border_color, outline='', tags='border')
-            # 右边框
-            canvas.create_rectangle(screen_width - border_width, 0, screen_width, screen_height, 
-                                   fill=border_color, outline='', tags='border')
-            
-            # 显示窗口
-            self.overlay_window.deiconify()
-            self.overlay_window.lift()
-            self.overlay_window.focus_force()
-            
-            # 如果没有文本块，说明是等待状态，直接返回
             if not text_blocks:
+                # 获取当前屏幕的完整区域，显示器配置变化时按新区域重建覆盖层
+                geometry = self._monitor_area()
+                self.screen_x, self.screen_y = geometry[:2]  # 保存为实例变量
+                pool = self._get_overlay_pool()
+                if pool.refresh([geometry]):
+                    logging.info(f"显示器区域变化，重建覆盖层: {geometry}")
+                self.overlay = pool.get(geometry)
+                self.overlay.show_waiting(self.current_screenshot, geometry)
+                return
+            
+            overlay = self.overlay
+            if overlay is None or not overlay.visible:
+                # 等待期间覆盖层已被关闭（ESC），丢弃结果
+                return
+            canvas = overlay.show_result(complete)
+            if canvas is None:
                 return
             
             # 初始化选择相关的变量
             self.selection_start = None
-            self.text_blocks = {}
+            self.text_blocks = TextBlockStore()
             self.selected_blocks = set()
             
-            # 存储文本块信息（智能拆分长文本块）
-            block_id = 0
-            for block in text_blocks:
-                text = block['text']
-                x = block['x']
-                y = block['y']
-                width = block['width']
-                height = block['height']
-                
-                # 如果文本较长，按单词/字符拆分
-                if len(text) > 1 and width > 0:
-                    sub_blocks = self._split_text_block(text, x, y, width, height)
-                    for sub in sub_blocks:
-                        self.text_blocks[block_id] = sub
-                        block_id += 1
-                else:
-                    self.text_blocks[block_id] = {
-                        'text': text,
-                        'x': x,
-                        'y': y,
-                        'width': width,
-                        'height': height,
-                        'selected': False
-                    }
-                    block_id += 1
-            
-            # OCR识别完成后，将光标设置为默认箭头
-            canvas.configure(cursor='arrow')
+            # 存储文本块信息：OCR 行只建行索引，行内的可选单元（中文单字/英文单词）
+            # 在该行第一次被拖拽或悬停命中时才拆分，编号即在 self.text_blocks 中的下标
+            self.ocr_lines = as_store(text_blocks)
+            # 字符位置默认按全角/半角 2:1 估计（等宽字体上准确）；开启 glyph_metrics 时按界面字体的字宽估计
+            metrics = get_glyph_metrics() if self.config.get("glyph_metrics", False) else None
+            self.text_index = LineSplitIndex(self.ocr_lines, self.text_blocks,
+                                             functools.partial(text_layout.split_selectable, metrics=metrics))
+            trace_dir = os.environ.get(ENV_DRAG_TRACE_DIR)
+            self._drag_trace = None
+            
+            # 增量选择：每次只处理新旧选择框差集中的文本块，高亮只更新变化的画布项
+            self.selection_tracker = SelectionTracker(self.text_index)
+            self.highlight_renderer = HighlightRenderer(canvas, self.text_blocks)
+            frame_interval_ms = self._get_frame_interval_ms()
+            self._drag_pending = None
+            self._drag_after_id = None
+            self._drag_last_flush = 0.0
+            
+            def cancel_pending_drag():
+                if self._drag_after_id is not None:
+                    canvas.after_cancel(self._drag_after_id)
+                    self._drag_after_id = None
+                self._drag_pending = None
             
             def on_mouse_down(event):
                 self.selection_start = (event.x, event.y)
+                if trace_dir:
+                    self._drag_trace = [(event.x, event.y)]
                 # 清除之前的选择
-                self.selected_blocks.clear()
-                canvas.delete('highlight')
+                cancel_pending_drag()
+                self.selection_tracker.reset()
+                self.selected_blocks = self.selection_tracker.selected
+                self.highlight_renderer.clear()
             
-            def on_mouse_drag(event):
-                if not self.selection_start:
-                    return
-                
+            def apply_drag(x2, y2):
                 x1, y1 = self.selection_start
-                x2, y2 = event.x, event.y
                 
                 # 确定选择区域
                 min_x = min(x1, x2)
@@ -782,21 +445,46 @@ class ScreenOCRTool:
                 min_y = min(y1, y2)
                 max_y = max(y1, y2)
                 
-                # 清除之前的选中状态
-                self.selected_blocks.clear()
+                added, removed = self.selection_tracker.update(min_x, min_y, max_x, max_y)
+                self.selected_blocks = self.selection_tracker.selected
+                if not added and not removed:
+                    # 选择没有变化，跳过重绘
+                    return
                 
-                # 检查每个文本块
-                for block_id, block in self.text_blocks.items():
-                    bx1, by1, bx2, by2 = block['x'], block['y'], block['x'] + block['width'], block['y'] + block['height']
-                    
-                    # 检查是否与选择区域相交
-                    if not (max_x < bx1 or min_x > bx2 or max_y < by1 or min_y > by2):
-                        self.selected_blocks.add(block_id)
+                # 只更新变化的高亮
+                self.highlight_renderer.update(added, removed)
+            
+            def flush_drag():
+                self._drag_after_id = None
+                pending = self._drag_pending
+                self._drag_pending = None
+                if pending and self.selection_start:
+                    self._drag_last_flush = time.perf_counter()
+                    apply_drag(*pending)
+            
+            def on_mouse_drag(event):
+                if not self.selection_start:
+                    return
+                
+                if self._drag_trace is not None:
+                    self._drag_trace.append((event.x, event.y))
                 
-                # 创建新的高亮层
-                self.create_highlight_layer(canvas, self.selected_blocks)
+                # 合并鼠标移动事件：每个显示刷新周期最多处理一次，只处理最新位置
+                self._drag_pending = (event.x, event.y)
+                if self._drag_after_id is None:
+                    elapsed_ms = (time.perf_counter() - self._drag_last_flush) * 1000
+                    if elapsed_ms >= frame_interval_ms:
+                        flush_drag()
+                    else:
+                        self._drag_after_id = canvas.after(
+                            max(1, int(frame_interval_ms - elapsed_ms)), flush_drag)
             
             def on_mouse_up(event):
+                # 先处理尚未应用的最后一次移动
+                if self._drag_after_id is not None:
+                    canvas.after_cancel(self._drag_after_id)
+                    flush_drag()
+                
                 if self.selection_start and self.selected_blocks:
                     # 使用新的文本合并逻辑
                     text = self.merge_text_blocks(self.selected_blocks)
@@ -809,15 +497,20 @@ class ScreenOCRTool:
                             self._start_translation(text, event.x_root, event.y_root)
             
                 self.selection_start = None
+                
+                if self._drag_trace and len(self._drag_trace) > 1:
+                    try:
+                        # 轨迹需要完整的子块列表
+                        self.text_index.split_all()
+                        path = save_drag_trace(trace_dir, self.text_blocks, self._drag_trace)
+                        logging.info(f"拖拽轨迹已保存: {path}")
+                    except Exception as e:
+                        logging.warning(f"保存拖拽轨迹失败: {e}")
+                self._drag_trace = None
             
             def on_mouse_move(event):
                 # 检查鼠标是否在任何文本块上
-                cursor_on_text = False
-                for block in self.text_blocks.values():
-                    if (block['x'] <= event.x <= block['x'] + block['width'] and
-                        block['y'] <= event.y <= block['y'] + block['height']):
-                        cursor_on_text = True
-                        break
+                cursor_on_text = self.text_index.hit_point(event.x, event.y)
                 
                 # 根据鼠标位置设置光标样式
                 if cursor_on_text:
@@ -825,138 +518,69 @@ class ScreenOCRTool:
                 else:
                     canvas.configure(cursor='arrow')  # 使用默认箭头光标
         
-            # 绑定事件
-            canvas.bind('<Button-1>', on_mouse_down)
-            canvas.bind('<B1-Motion>', on_mouse_drag)
-            canvas.bind('<ButtonRelease-1>', on_mouse_up)
-            canvas.bind('<Motion>', on_mouse_move)  # 添加鼠标移动事件
-            canvas.bind('<Escape>', lambda e: self.cleanup_windows())
-        
-            # 添加ESC键绑定
-            def on_escape(event=None):
-                self.cleanup_windows()
-                self.is_processing = False
-            
-            self.overlay_window.bind('<Escape>', on_escape)
+            # 挂上文本块图层（回到等待状态或关闭覆盖层时卸下）
+            overlay.attach_blocks(self.highlight_renderer, {
+                '<Button-1>': on_mouse_down,
+                '<B1-Motion>': on_mouse_drag,
+                '<ButtonRelease-1>': on_mouse_up,
+                '<Motion>': on_mouse_move,
+            })
         
         except Exception as e:
             logging.error(f"显示覆盖层失败: {str(e)}")
             traceback.print_exc()
     
-    def _split_text_block(self, text: str, x: int, y: int, width: int, height: int) -> list:
+    def append_overlay_text(self, text_blocks):
         """
-        智能拆分长文本块为更小的可选单元
-        - 中文：按单个字符
-        - 英文：按单词
-        
-        Args:
-            text: 文本内容
-            x, y: 文本块起始位置
-            width, height: 文本块尺寸
-            
-        Returns:
-            拆分后的文本块列表
+        渐进识别：把新识别的行追加到已显示的结果覆盖层，不重建索引和画布
+
+        新行立即可以悬停和拖选；正在拖拽时，落在当前选择框内的部分直接加入选择
         """
-        result = []
-        
-        if len(text) == 0 or width <= 0:
-            return result
-        
-        def is_chinese(char):
-            return '\u4e00' <= char <= '\u9fff'
-        
-        def is_fullwidth(char):
-            """检查是否是全角字符（中文、日文、全角标点等）"""
-            code = ord(char)
-            return (
-                '\u4e00' <= char <= '\u9fff' or  # CJK 统一汉字
-                '\u3000' <= char <= '\u303f' or  # CJK 标点
-                '\uff00' <= char <= '\uffef' or  # 全角字符
-                '\u3040' <= char <= '\u309f' or  # 平假名
-                '\u30a0' <= char <= '\u30ff'     # 片假名
-            )
-        
-        # 计算加权字符宽度（全角字符算2个单位，半角算1个）
-        total_units = sum(2 if is_fullwidth(c) else 1 for c in text)
-        unit_width = width / total_units if total_units > 0 else width
-        
-        # 计算每个字符的起始位置（基于加权宽度）
-        char_positions = []  # [(start_x, width), ...]
-        current_x = 0
-        for char in text:
-            char_units = 2 if is_fullwidth(char) else 1
-            char_w = char_units * unit_width
-            char_positions.append((current_x, char_w))
-            current_x += char_w
-        
-        # 分段处理：将文本分成中文段和英文单词段
-        # 英文中非字母数字的字符（标点等）也作为分隔符
-        segments = []  # [(text, start_idx, is_chinese), ...]
-        current_segment = ""
-        current_start = 0
-        current_is_chinese = None
-        
-        for i, char in enumerate(text):
-            char_is_chinese = is_chinese(char)
-            is_separator = char == ' ' or (not char_is_chinese and not char.isalnum())
-            
-            if is_separator:
-                # 分隔符结束当前段
-                if current_segment:
-                    segments.append((current_segment, current_start, current_is_chinese))
-                    current_segment = ""
-                current_is_chinese = None
-            elif current_is_chinese is None:
-                # 开始新段
-                current_segment = char
-                current_start = i
-                current_is_chinese = char_is_chinese
-            elif char_is_chinese == current_is_chinese:
-                # 继续当前段
-                current_segment += char
-            else:
-                # 中英文切换，结束当前段
-                if current_segment:
-                    segments.append((current_segment, current_start, current_is_chinese))
-                current_segment = char
-                current_start = i
-                current_is_chinese = char_is_chinese
-        
-        # 添加最后一段
-        if current_segment:
-            segments.append((current_segment, current_start, current_is_chinese))
-        
-        # 处理每个段
-        for segment_text, start_idx, is_chn in segments:
-            if is_chn:
-                # 中文：按单个字符拆分
-                for i, char in enumerate(segment_text):
-                    idx = start_idx + i
-                    char_start_x, char_w = char_positions[idx]
-                    result.append({
-                        'text': char,
-                        'x': x + int(char_start_x),
-                        'y': y,
-                        'width': max(int(char_w), 1),
-                        'height': height,
-                        'selected': False
-                    })
-            else:
-                # 英文：整个单词作为一个块
-                word_start_x = char_positions[start_idx][0]
-                word_end_idx = start_idx + len(segment_text) - 1
-                word_end_x = char_positions[word_end_idx][0] + char_positions[word_end_idx][1]
-                word_width = word_end_x - word_start_x
-                result.append({
-                    'text': segment_text,
-                    'x': x + int(word_start_x),
-                    'y': y,
-                    'width': max(int(word_width), 1),
-                    'height': height,
-                    'selected': False
-                })
-        
-        return result
+        if not text_blocks or not self.overlay or not self.overlay.visible:
+            return
+        new_lines = self.text_index.add_lines(as_store(text_blocks))
+        tracker = self.selection_tracker
+        if self.selection_start and tracker.rect:
+            added = tracker.add_candidates(self.text_index.query_rect(*tracker.rect, lines=new_lines))
+            self.selected_blocks = tracker.selected
+            if added:
+                self.highlight_renderer.update(added, ())
+
+    def _handle_ocr_success(self, generation: int, text_blocks):
+        """处理整屏识别结果（忽略已被新的触发或 ESC 取代的识别）"""
+        if generation != self._ocr_generation:
+            return
+        # OCR识别完成后在等待窗口中原地切换为结果状态
+        if text_blocks:
+            self.show_overlay_text(text_blocks)
+        elif self.overlay:
+            # 即使没有识别到文本，也更新覆盖层状态
+            self.overlay.set_cursor('arrow')
+
+    def _handle_ocr_band(self, generation: int, text_blocks):
+        """处理渐进识别的一个条带结果（忽略已被新的触发或 ESC 取代的识别）"""
+        if generation != self._ocr_generation or not text_blocks:
+            return
+        if self._ocr_partial_shown:
+            self.append_overlay_text(text_blocks)
+        else:
+            self.show_overlay_text(text_blocks, complete=False)
+            self._ocr_partial_shown = True
+
+    def _handle_ocr_done(self, generation: int):
+        """渐进识别全部完成"""
+        if generation != self._ocr_generation or not self.overlay:
+            return
+        if self._ocr_partial_shown:
+            self.overlay.show_result(complete=True)
+        else:
+            # 没有识别到文本
+            self.overlay.set_cursor('arrow')
+
+    def _split_text_block(self, text: str, x: int, y: int, width: int, height: int,
+                          out: TextBlockStore = None) -> TextBlockStore:
+        """智能拆分长文本块为更小的可选单元（中文按单字、英文按单词，见 text_layout.split_text_block）"""
+        return text_layout.split_text_block(text, x, y, width, height, out=out)
     
     def _start_translation(self, text: str, mouse_x: int, mouse_y: int):
         """
@@ -1012,139 +636,209 @@ class ScreenOCRTool:
             width = self.screen_width
             height = self.screen_height
             
-            # 如果已经有窗口，先清理掉
-            if hasattr(self, 'overlay_window') and self.overlay_window:
-                self.overlay_window.destroy()
-                self.overlay_window = None
-            
+            hotkey_time = self.key_press_time
+            start = time.perf_counter()
             self.current_screenshot = self.capture_screen_region(width, height)
             if not self.current_screenshot:
                 self.is_processing = False
                 return
+            capture_done = time.perf_counter()
             
-            # 创建新窗口并显示等待光标
-            self.show_overlay_text([])  # 传入空的文本块列表，创建初始窗口
+            # 显示等待状态（预先创建的覆盖层，只写入截图并显示窗口）
+            self.show_overlay_text([])  # 传入空的文本块列表
+            self._record_first_paint(hotkey_time, (capture_done - start) * 1000,
+                                     (time.perf_counter() - capture_done) * 1000)
             
-            # 确保窗口创建后立即设置等待光标
-            if hasattr(self, 'overlay_window') and self.overlay_window:
-                for widget in self.overlay_window.winfo_children():
-                    if isinstance(widget, tk.Canvas):
-                        widget.configure(cursor='wait')
-                self.overlay_window.update_idletasks()
+            self._ocr_generation += 1
+            self._ocr_partial_shown = False
+            if self.config.get("progressive_ocr", False):
+                self._start_progressive_ocr(self._ocr_generation, self.current_screenshot)
+                return
             
-            # 在后台线程中执行OCR识别，避免阻塞UI
+            # 在引擎线程池中执行OCR识别，避免阻塞UI
+            generation = self._ocr_generation
+            screenshot = self.current_screenshot
             def ocr_worker():
+                if generation != self._ocr_generation:
+                    # 排队期间覆盖层已关闭或重新触发
+                    return
                 try:
-                    text_blocks = self.get_text_positions(self.current_screenshot)
-                    # 将结果放入队列，由主循环处理
-                    self.ocr_result_queue.put(('success', text_blocks))
+                    text_blocks = self.get_text_positions(screenshot)
+                    # 将结果放入队列，由主循环处理（带上识别序号，过期的结果不再显示）
+                    self.ocr_result_queue.put(('success', (generation, text_blocks)))
                 except Exception as e:
                     logging.error(f"OCR识别失败: {str(e)}")
                     import traceback
                     traceback.print_exc()
                     # 将错误放入队列
-                    self.ocr_result_queue.put(('error', None))
+                    self.ocr_result_queue.put(('error', generation))
             
-            # 启动后台线程执行OCR
-            ocr_thread = threading.Thread(target=ocr_worker, daemon=True)
-            ocr_thread.start()
+            if get_executor().submit(POOL_ENGINE, ocr_worker, priority=PRIORITY_HIGH) is None:
+                # 引擎线程池拒绝任务：与识别失败相同，关闭等待中的覆盖层
+                self.ocr_result_queue.put(('error', generation))
         
         except Exception as e:
             logging.error(f"处理失败: {str(e)}")
             self.is_processing = False
 
 
+    def _start_progressive_ocr(self, generation: int, screenshot):
+        """后台按条带识别，每个条带完成后放入结果队列（鼠标所在的条带最先识别）"""
+        try:
+            first_y = self.backend.cursor_pos()[1] - self.screen_y
+        except Exception:
+            first_y = None
+        
+        def ocr_worker():
+            if generation != self._ocr_generation:
+                return
+            try:
+                engine_name = self._selected_engine_name()
+                preprocess = self.config.get("image_preprocess", False)
+                for band in ocr_engines.recognize_bands(engine_name, screenshot, preprocess=preprocess,
+                                                        first_y=first_y):
+                    if generation != self._ocr_generation:
+                        # 覆盖层已关闭或重新触发，剩余条带不再识别
+                        return
+                    self.ocr_result_queue.put(('band', (generation, band)))
+                self.ocr_result_queue.put(('done', (generation, None)))
+            except Exception as e:
+                logging.error(f"OCR识别失败: {str(e)}")
+                traceback.print_exc()
+                self.ocr_result_queue.put(('error', generation))
+        
+        if get_executor().submit(POOL_ENGINE, ocr_worker, priority=PRIORITY_HIGH) is None:
+            self.ocr_result_queue.put(('error', generation))
+
     def cleanup_windows(self):
         """清理窗口"""
         try:
             # 取消翻译
             self._cancel_translation()
             
-            if hasattr(self, 'overlay_window') and self.overlay_window:
-                self.overlay_window.destroy()
-                self.overlay_window = None
+            # 结束拖拽，尚未执行的合并移动事件不再处理
+            self.selection_start = None
+            # 进行中的渐进识别结果不再显示
+            self._ocr_generation += 1
+            
+            if self.overlay_pool:
+                self.overlay_pool.hide_all()
             if self.current_screenshot:
                 self.current_screenshot = None
         except Exception as e:
             logging.error(f"清理窗口失败: {str(e)}")
 
     def cleanup_hook(self):
-        """清理键盘钩子"""
+        """清理键盘钩子（结束钩子线程的消息循环）"""
         try:
-            if self.keyboard_hook_id:
-                user32 = ctypes.WinDLL('user32', use_last_error=True)
-                if not user32.UnhookWindowsHookEx(self.keyboard_hook_id):
-                    logging.error("卸载键盘钩子失败")
-                self.keyboard_hook_id = None
+            if self.keyboard_hook:
+                self.keyboard_hook.stop()
+                self.keyboard_hook = None
+            self.hook_waker.stop()
         except Exception as e:
             logging.error(f"清理键盘钩子异常: {str(e)}")
 
+    def _wake(self):
+        """唤醒主循环处理状态变化（可在任意线程调用）"""
+        if self._notifier:
+            self._notifier.notify()
+
+    def _process_events(self):
+        """主线程中处理队列任务、OCR 结果、窗口清理和按键触发（由 TkNotifier 唤醒，不再轮询）"""
+        try:
+            if not self._running:
+                self.root.quit()
+                return
+            
+            # 处理钩子线程发来的按键事件
+            self._handle_key_events()
+            
+            # 处理配置队列
+            while not self.config_queue.empty():
+                task = self.config_queue.get_nowait()
+                if callable(task):
+                    task()
+            
+            # 处理OCR结果队列
+            while not self.ocr_result_queue.empty():
+                status, text_blocks = self.ocr_result_queue.get_nowait()
+                if status == 'success':
+                    try:
+                        self._handle_ocr_success(*text_blocks)
+                    except Exception as e:
+                        logging.error(f"更新UI失败: {str(e)}")
+                elif status == 'band':
+                    try:
+                        self._handle_ocr_band(*text_blocks)
+                    except Exception as e:
+                        logging.error(f"更新UI失败: {str(e)}")
+                elif status == 'done':
+                    self._handle_ocr_done(text_blocks[0])
+                elif status == 'error':
+                    # 重置处理状态；仍在等待该次识别时关闭覆盖层，不停留在"识别中"
+                    self.is_processing = False
+                    if text_blocks == self._ocr_generation:
+                        if self._ocr_partial_shown:
+                            # 渐进识别已显示部分条带：保留已识别的部分
+                            self._handle_ocr_done(text_blocks)
+                        else:
+                            self.cleanup_windows()
+            
+            # 检查是否需要清理窗口
+            if self.cleanup_pending:
+                self.cleanup_windows()
+                self.cleanup_pending = False
+            
+            # 按键延迟触发：按下时启动一次性定时器，松开时取消
+            self._schedule_trigger()
+        except Exception as e:
+            logging.error(f"状态检查错误: {str(e)}")
+
+    def _schedule_trigger(self):
+        """快捷键按下后在 trigger_delay_ms 到期时触发一次（一次性定时器）"""
+        if self.key_press_time > 0 and not self.is_processing:
+            if self._trigger_after_id is None:
+                elapsed_ms = (time.time() - self.key_press_time) * 1000
+                delay_ms = max(0, int(self.trigger_delay_ms - elapsed_ms))
+                self._trigger_after_id = self.root.after(delay_ms, self._on_trigger_timer)
+        elif self._trigger_after_id is not None:
+            self.root.after_cancel(self._trigger_after_id)
+            self._trigger_after_id = None
+
+    def _on_trigger_timer(self):
+        self._trigger_after_id = None
+        if not self._running or self.is_processing or self.key_press_time <= 0:
+            return
+        if (time.time() - self.key_press_time) * 1000 >= self.trigger_delay_ms:
+            self.capture_and_process(self.screen_width, self.screen_height)
+        else:
+            # 定时器提前到期（系统时间调整等），重新计时
+            self._schedule_trigger()
+
+    def _install_console_handler(self, on_closing):
+        """控制台 Ctrl+C：主线程阻塞在 mainloop 中收不到 KeyboardInterrupt，由控制台回调投递退出任务"""
+        def on_interrupt():
+            print("\n收到中断信号 (Ctrl+C)，正在退出...")
+            self.config_queue.put(on_closing)
+        
+        self.backend.install_console_handler(on_interrupt)
+
     def run(self):
         """运行程序"""
         print("程序开始运行...")
         try:
-            def check_state():
-                try:
-                    if not self._running:
-                        self.root.quit()
-                        return
-                    
-                    # 检查配置队列
-                    while not self.config_queue.empty():
-                        task = self.config_queue.get_nowait()
-                        if callable(task):
-                            task()
-                    
-                    # 检查OCR结果队列
-                    while not self.ocr_result_queue.empty():
-                        status, text_blocks = self.ocr_result_queue.get_nowait()
-                        if status == 'success':
-                            try:
-                                # OCR识别完成后显示结果
-                                if text_blocks:
-                                    # 销毁当前的等待窗口
-                                    if hasattr(self, 'overlay_window') and self.overlay_window:
-                                        self.overlay_window.destroy()
-                                        self.overlay_window = None
-                                    # 创建新的结果显示窗口
-                                    self.show_overlay_text(text_blocks)
-                                else:
-                                    # 即使没有识别到文本，也更新覆盖层状态
-                                    if hasattr(self, 'overlay_window') and self.overlay_window:
-                                        for widget in self.overlay_window.winfo_children():
-                                            if isinstance(widget, tk.Canvas):
-                                                widget.configure(cursor='arrow')
-                            except Exception as e:
-                                logging.error(f"更新UI失败: {str(e)}")
-                        elif status == 'error':
-                            # 重置处理状态
-                            self.is_processing = False
-                    
-                    # 检查是否需要清理窗口
-                    if self.cleanup_pending:
-                        self.cleanup_windows()
-                        self.cleanup_pending = False
-
-                    # 检查按键延迟触发
-                    if not self.is_processing and self.key_press_time > 0:
-                        current_time = time.time()
-                        if (current_time - self.key_press_time) * 1000 >= self.trigger_delay_ms:
-                            self.capture_and_process(self.screen_width, self.screen_height)
-                except Exception as e:
-                    logging.error(f"状态检查错误: {str(e)}")
-                finally:
-                    if self._running:
-                        self.root.after(50, check_state)
-        
-            # 启动状态检查
-            self.root.after(50, check_state)
+            # 进入主循环前已放入队列的任务
+            self._notifier.drain_soon()
+            
+            # 预先创建隐藏的覆盖层
+            self.splash.update_progress(0.92, "准备覆盖层...")
+            self.prepare_overlays()
             
             # 更新启动进度
             self.splash.update_progress(0.95, "创建系统托盘...")
             
             # 创建系统托盘
-            from system_tray import SystemTray
-            self.tray = SystemTray(self)
+            self.tray = self.backend.create_tray(self)
         
             # 在新线程中运行系统托盘
             tray_thread = threading.Thread(target=self.tray.run)
@@ -1166,22 +860,15 @@ class ScreenOCRTool:
             # 设置窗口关闭协议
             self.root.protocol("WM_DELETE_WINDOW", on_closing)
             
-            # 使用Tkinter的主循环
+            self._install_console_handler(on_closing)
+            
+            # 事件驱动的主循环：空闲时阻塞等待事件，后台线程通过 TkNotifier 唤醒
             # 注意：不绑定 GUI 中的 Ctrl+C，让它在 GUI 中保持默认行为（复制等）
-            # 控制台中的 Ctrl+C 会触发 KeyboardInterrupt，在下面捕获
-            while self._running:
-                try:
-                    self.root.update()
-                    time.sleep(0.01)
-                except KeyboardInterrupt:
-                    # 控制台中的 Ctrl+C 会触发这里
-                    print("\n收到中断信号 (Ctrl+C)，正在退出...")
-                    on_closing()
-                    break
-                except Exception as e:
-                    if str(e).startswith("invalid command name"):  # Tkinter窗口已关闭
-                        break
-                    logging.error(f"主循环错误: {str(e)}")
+            try:
+                self.root.mainloop()
+            except KeyboardInterrupt:
+                print("\n收到中断信号 (Ctrl+C)，正在退出...")
+                on_closing()
         
         except Exception as e:
             logging.error(f"运行错误: {str(e)}")
@@ -1229,7 +916,7 @@ class ScreenOCRTool:
                     toast = StartupToast(hotkey=self.hotkey)
                     toast.show(duration_ms=3000)
                 
-                threading.Thread(target=show_toast_delayed, daemon=True).start()
+                get_executor().submit(POOL_UI_AUX, show_toast_delayed)
     
     def reload_config(self):
         """重新加载配置"""
@@ -1240,8 +927,16 @@ class ScreenOCRTool:
                 # 更新触发延时
                 self.trigger_delay_ms = self.config.get('trigger_delay_ms', 300)
                 
-                # 更新快捷键配置
+                # 更新快捷键配置（重新编译后整体替换，钩子回调只读取一次该属性）
                 self.hotkey = self.config.get('hotkey', 'alt')
+                matcher = self.hotkey_state.matcher
+                if matcher is None or matcher.hotkey != self.hotkey:
+                    self.hotkey_state.matcher = HotkeyMatcher(self.hotkey, self.key_mapping)
+                
+                # 切换引擎时在后台预加载新引擎，避免首次识别时等待初始化
+                engine_name = self._selected_engine_name()
+                if self._ocr_initialized and ocr_engines.peek_engine(engine_name) is None:
+                    get_executor().submit(POOL_ENGINE, self._load_ocr_engine, engine_name, priority=PRIORITY_LOW)
         except Exception as e:
             logging.error(f"重新加载配置失败: {str(e)}")
     
@@ -1254,8 +949,23 @@ class ScreenOCRTool:
     def cleanup(self):
         """清理所有资源"""
         self._running = False
+        # 从其他线程调用时让主循环退出
+        self._wake()
         self.cleanup_windows()
+        if self.overlay_pool:
+            self.overlay_pool.destroy()
+            self.overlay_pool = None
+            self.overlay = None
         self.cleanup_hook()
+        get_executor().shutdown()
+        if self.ocr_service:
+            try:
+                self.ocr_service.stop()
+            except Exception:
+                pass
+            self.ocr_service = None
+        # 释放已加载的 OCR 引擎（进行中的识别结束后关闭）
+        ocr_engines.close_all()
         if hasattr(self, 'tray'):
             try:
                 self.tray.icon.stop()
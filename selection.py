@@ -0,0 +1,112 @@
+"""
+拖拽选择的增量更新
+拖拽时选择框每次只移动几个像素，只有新旧选择框的差集区域内的文本块可能改变选中状态，
+因此每个鼠标事件只需查询差集区域，而不必重新计算整个选择
+
+坐标均为包含边界的整数矩形 (min_x, min_y, max_x, max_y)，与 GridIndex 的相交判断一致
+"""
+from typing import List, Optional, Set, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+def rect_difference(a: Rect, b: Optional[Rect]) -> List[Rect]:
+    """
+    返回 a 中不属于 b 的区域，拆分为最多 4 个矩形（整数像素，包含边界）
+
+    左右两条取 a 的整个高度，上下两条只取与 b 水平重叠的部分，互不重叠
+    """
+    ax1, ay1, ax2, ay2 = a
+    if b is None:
+        return [a]
+    bx1, by1, bx2, by2 = b
+    if bx1 > ax2 or bx2 < ax1 or by1 > ay2 or by2 < ay1:
+        return [a]
+    parts = []
+    if ax1 < bx1:
+        parts.append((ax1, ay1, bx1 - 1, ay2))
+    if ax2 > bx2:
+        parts.append((bx2 + 1, ay1, ax2, ay2))
+    mid_x1 = max(ax1, bx1)
+    mid_x2 = min(ax2, bx2)
+    if ay1 < by1:
+        parts.append((mid_x1, ay1, mid_x2, by1 - 1))
+    if ay2 > by2:
+        parts.append((mid_x1, by2 + 1, mid_x2, ay2))
+    return parts
+
+
+class SelectionTracker:
+    """
+    跟踪拖拽选择框覆盖的文本块
+
+    update() 返回本次新增和移除的文本块编号；两者都为空时说明选择没有变化，调用方可以跳过重绘
+    """
+
+    def __init__(self, index):
+        """
+        Args:
+            index: GridIndex 空间索引
+        """
+        self.index = index
+        self.rect: Optional[Rect] = None
+        self.selected: Set[int] = set()
+
+    def reset(self):
+        self.rect = None
+        self.selected = set()
+
+    def update(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Tuple[Set[int], Set[int]]:
+        """
+        更新选择框
+
+        Returns:
+            (新增的文本块编号, 移除的文本块编号)
+        """
+        new_rect = (min_x, min_y, max_x, max_y)
+        old_rect = self.rect
+        if new_rect == old_rect:
+            return set(), set()
+        self.rect = new_rect
+
+        if old_rect is None:
+            self.selected = self.index.query_rect(*new_rect)
+            return set(self.selected), set()
+
+        # 状态可能改变的文本块必然与新旧选择框的差集相交
+        candidates = set()
+        for part in rect_difference(new_rect, old_rect):
+            candidates |= self.index.query_rect(*part)
+        for part in rect_difference(old_rect, new_rect):
+            candidates |= self.index.query_rect(*part)
+
+        added = set()
+        removed = set()
+        selected = self.selected
+        intersects = self.index.intersects
+        for block_id in candidates:
+            inside = intersects(block_id, min_x, min_y, max_x, max_y)
+            if inside:
+                if block_id not in selected:
+                    added.add(block_id)
+            elif block_id in selected:
+                removed.add(block_id)
+        selected |= added
+        selected -= removed
+        return added, removed
+
+    def add_candidates(self, block_ids) -> Set[int]:
+        """
+        新出现的文本块（例如渐进识别追加的行）：与当前选择框相交的加入选择
+
+        Returns:
+            新增的文本块编号
+        """
+        if self.rect is None:
+            return set()
+        intersects = self.index.intersects
+        rect = self.rect
+        added = {block_id for block_id in block_ids
+                 if block_id not in self.selected and intersects(block_id, *rect)}
+        self.selected |= added
+        return added
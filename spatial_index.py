@@ -0,0 +1,342 @@
+"""
+文本块空间索引
+均匀网格：每个文本块登记到它覆盖的所有网格单元，查询时只检查相关单元中的候选块
+
+相交/包含判断与覆盖层原来的线性扫描一致（边界包含在内）:
+    矩形相交: not (max_x < x1 or min_x > x2 or max_y < y1 or min_y > y2)
+    点命中:   x1 <= x <= x2 and y1 <= y <= y2
+
+用法:
+    index = GridIndex.from_store(store)
+    selected = index.query_rect(min_x, min_y, max_x, max_y)
+    on_text = index.hit_point(x, y)
+
+LineSplitIndex 是按 OCR 行的两级索引：网格只登记行，行内的可选子块在该行第一次被查询时才拆分并缓存，
+覆盖层显示前不必拆分全部文本；渐进识别时可以用 add_lines 追加新识别的行（新行单独建一个网格，已有网格不重建）
+"""
+import json
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# 网格单元边长的上下限（像素）
+MIN_CELL_SIZE = 16
+MAX_CELL_SIZE = 512
+
+
+class GridIndex:
+    """文本块均匀网格索引（构造后只读）"""
+
+    __slots__ = ('xs', 'ys', 'x2s', 'y2s', 'cell_size', 'origin_x', 'origin_y',
+                 'cols', 'rows', 'cells', 'count')
+
+    def __init__(self, xs: Sequence[int], ys: Sequence[int], widths: Sequence[int],
+                 heights: Sequence[int], cell_size: Optional[int] = None):
+        """
+        Args:
+            xs, ys, widths, heights: 文本块几何列（编号即下标）
+            cell_size: 网格单元边长，默认按文本块平均尺寸估算
+        """
+        self.count = len(xs)
+        self.xs = list(xs)
+        self.ys = list(ys)
+        self.x2s = [x + w for x, w in zip(xs, widths)]
+        self.y2s = [y + h for y, h in zip(ys, heights)]
+        if self.count == 0:
+            self.cell_size = MIN_CELL_SIZE
+            self.origin_x = self.origin_y = 0
+            self.cols = self.rows = 0
+            self.cells: List[List[int]] = []
+            return
+
+        if cell_size is None:
+            cell_size = self._estimate_cell_size(widths, heights)
+        self.cell_size = max(1, int(cell_size))
+        self.origin_x = min(self.xs)
+        self.origin_y = min(self.ys)
+        size = self.cell_size
+        self.cols = (max(self.x2s) - self.origin_x) // size + 1
+        self.rows = (max(self.y2s) - self.origin_y) // size + 1
+        cols = self.cols
+        cells = [[] for _ in range(self.cols * self.rows)]
+        ox, oy = self.origin_x, self.origin_y
+        for block_id, (x1, y1, x2, y2) in enumerate(zip(self.xs, self.ys, self.x2s, self.y2s)):
+            c1 = (x1 - ox) // size
+            c2 = (x2 - ox) // size
+            for row in range((y1 - oy) // size, (y2 - oy) // size + 1):
+                base = row * cols
+                for col in range(c1, c2 + 1):
+                    cells[base + col].append(block_id)
+        self.cells = cells
+
+    @classmethod
+    def from_store(cls, store, cell_size: Optional[int] = None) -> 'GridIndex':
+        """从 TextBlockStore 构造"""
+        return cls(store.xs, store.ys, store.widths, store.heights, cell_size)
+
+    @staticmethod
+    def _estimate_cell_size(widths: Sequence[int], heights: Sequence[int]) -> int:
+        """单元边长取文本块平均宽高的较大值的两倍，使多数块只落在 1~4 个单元中"""
+        count = len(widths)
+        avg = max(sum(widths) / count, sum(heights) / count)
+        return int(min(max(avg * 2, MIN_CELL_SIZE), MAX_CELL_SIZE))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _cell_range(self, low: int, high: int, origin: int, limit: int):
+        size = self.cell_size
+        first = max((low - origin) // size, 0)
+        last = min((high - origin) // size, limit - 1)
+        return first, last
+
+    def query_rect(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Set[int]:
+        """返回与矩形相交的文本块编号集合"""
+        result = set()
+        if not self.count:
+            return result
+        col1, col2 = self._cell_range(min_x, max_x, self.origin_x, self.cols)
+        row1, row2 = self._cell_range(min_y, max_y, self.origin_y, self.rows)
+        if col1 > col2 or row1 > row2:
+            return result
+        xs, ys, x2s, y2s = self.xs, self.ys, self.x2s, self.y2s
+        cells, cols = self.cells, self.cols
+        inner_col1, inner_col2 = col1 + 1, col2 - 1
+        inner_row1, inner_row2 = row1 + 1, row2 - 1
+        for row in range(row1, row2 + 1):
+            base = row * cols
+            row_inside = inner_row1 <= row <= inner_row2
+            for col in range(col1, col2 + 1):
+                cell = cells[base + col]
+                if not cell:
+                    continue
+                if row_inside and inner_col1 <= col <= inner_col2:
+                    # 完全位于矩形内部的单元，其中的块必然相交
+                    result.update(cell)
+                    continue
+                for block_id in cell:
+                    if not (max_x < xs[block_id] or min_x > x2s[block_id]
+                            or max_y < ys[block_id] or min_y > y2s[block_id]):
+                        result.add(block_id)
+        return result
+
+    def intersects(self, block_id: int, min_x: int, min_y: int, max_x: int, max_y: int) -> bool:
+        """单个文本块是否与矩形相交"""
+        return not (max_x < self.xs[block_id] or min_x > self.x2s[block_id]
+                    or max_y < self.ys[block_id] or min_y > self.y2s[block_id])
+
+    def query_point(self, x: int, y: int) -> List[int]:
+        """返回包含该点的文本块编号列表"""
+        cell = self._point_cell(x, y)
+        if not cell:
+            return []
+        xs, ys, x2s, y2s = self.xs, self.ys, self.x2s, self.y2s
+        return [block_id for block_id in cell
+                if xs[block_id] <= x <= x2s[block_id] and ys[block_id] <= y <= y2s[block_id]]
+
+    def hit_point(self, x: int, y: int) -> bool:
+        """该点是否落在任一文本块上"""
+        cell = self._point_cell(x, y)
+        if not cell:
+            return False
+        xs, ys, x2s, y2s = self.xs, self.ys, self.x2s, self.y2s
+        for block_id in cell:
+            if xs[block_id] <= x <= x2s[block_id] and ys[block_id] <= y <= y2s[block_id]:
+                return True
+        return False
+
+    def _point_cell(self, x: int, y: int) -> Optional[List[int]]:
+        if not self.count:
+            return None
+        col = (x - self.origin_x) // self.cell_size
+        row = (y - self.origin_y) // self.cell_size
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return None
+        return self.cells[row * self.cols + col]
+
+
+class LineSplitIndex:
+    """
+    行优先的延迟拆分索引，查询接口与 GridIndex 相同（query_rect / intersects / query_point / hit_point）
+
+    返回的是子块在 blocks 中的编号；子块在所属行第一次与查询范围相交时才由 split 追加到 blocks，
+    编号一经分配不再改变
+
+    add_lines 追加的每批行各有一个行网格，查询时依次查询各批（批数即渐进识别的条带数，很少）
+    """
+
+    def __init__(self, lines, blocks, split: Callable, cell_size: Optional[int] = None):
+        """
+        Args:
+            lines: OCR 行的 TextBlockStore
+            blocks: 存放拆分结果的 TextBlockStore（通常为空，随查询增长）
+            split: split(text, x, y, width, height, out) 把一行追加为子块
+            cell_size: 行网格单元边长
+        """
+        self.lines = lines
+        self.blocks = blocks
+        self._split = split
+        self._cell_size = cell_size
+        self.line_index = GridIndex.from_store(lines, cell_size)
+        # 追加的行批次：(首行行号, 行网格)，网格内编号加上首行行号即行号
+        self._batches: List[Tuple[int, GridIndex]] = []
+        # 行号 -> (首个子块编号, 结束编号, 子块包围盒)
+        self._spans: Dict[int, Tuple[int, int, Tuple[int, int, int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    @property
+    def split_lines(self) -> int:
+        """已拆分的行数"""
+        return len(self._spans)
+
+    def _line_span(self, line_id: int):
+        span = self._spans.get(line_id)
+        if span is None:
+            blocks = self.blocks
+            start = len(blocks)
+            lines = self.lines
+            self._split(lines.text(line_id), lines.xs[line_id], lines.ys[line_id],
+                        lines.widths[line_id], lines.heights[line_id], blocks)
+            end = len(blocks)
+            if end > start:
+                xs, ys = blocks.xs[start:end], blocks.ys[start:end]
+                bbox = (min(xs), min(ys),
+                        max(x + w for x, w in zip(xs, blocks.widths[start:end])),
+                        max(y + h for y, h in zip(ys, blocks.heights[start:end])))
+            else:
+                bbox = None
+            span = (start, end, bbox)
+            self._spans[line_id] = span
+        return span
+
+    def line_blocks(self, line_id: int) -> range:
+        """行内子块编号（需要时先拆分）"""
+        start, end, _ = self._line_span(line_id)
+        return range(start, end)
+
+    def split_all(self):
+        """拆分全部行（例如需要完整子块列表时）"""
+        for line_id in range(len(self.lines)):
+            self._line_span(line_id)
+
+    def add_lines(self, lines) -> range:
+        """
+        追加一批行（例如渐进识别中新识别的条带），已有的行、子块和网格保持不变
+
+        Args:
+            lines: 新行的 TextBlockStore
+
+        Returns:
+            新行的行号
+        """
+        start = len(self.lines)
+        count = len(lines)
+        if count:
+            self.lines.extend_columns(lines.texts(), lines.xs, lines.ys, lines.widths, lines.heights)
+            self._batches.append((start, GridIndex(
+                lines.xs, lines.ys, lines.widths, lines.heights, self._cell_size)))
+        return range(start, start + count)
+
+    def _query_lines(self, min_x: int, min_y: int, max_x: int, max_y: int) -> Set[int]:
+        line_ids = self.line_index.query_rect(min_x, min_y, max_x, max_y)
+        for offset, grid in self._batches:
+            line_ids.update(offset + i for i in grid.query_rect(min_x, min_y, max_x, max_y))
+        return line_ids
+
+    def _point_lines(self, x: int, y: int) -> List[int]:
+        line_ids = self.line_index.query_point(x, y)
+        for offset, grid in self._batches:
+            line_ids.extend(offset + i for i in grid.query_point(x, y))
+        return line_ids
+
+    def query_rect(self, min_x: int, min_y: int, max_x: int, max_y: int,
+                   lines: Optional[Iterable[int]] = None) -> Set[int]:
+        """
+        返回与矩形相交的子块编号集合
+
+        Args:
+            lines: 可选，只检查这些行（例如刚追加的行）
+        """
+        result = set()
+        blocks = self.blocks
+        xs, ys, widths, heights = blocks.xs, blocks.ys, blocks.widths, blocks.heights
+        if lines is None:
+            lines = self._query_lines(min_x, min_y, max_x, max_y)
+        for line_id in lines:
+            start, end, bbox = self._line_span(line_id)
+            if bbox is None:
+                continue
+            bx1, by1, bx2, by2 = bbox
+            if max_x < bx1 or min_x > bx2 or max_y < by1 or min_y > by2:
+                continue
+            if min_x <= bx1 and bx2 <= max_x and min_y <= by1 and by2 <= max_y:
+                # 整行在矩形内
+                result.update(range(start, end))
+                continue
+            for block_id in range(start, end):
+                x1 = xs[block_id]
+                y1 = ys[block_id]
+                if not (max_x < x1 or min_x > x1 + widths[block_id]
+                        or max_y < y1 or min_y > y1 + heights[block_id]):
+                    result.add(block_id)
+        return result
+
+    def intersects(self, block_id: int, min_x: int, min_y: int, max_x: int, max_y: int) -> bool:
+        """单个子块是否与矩形相交"""
+        blocks = self.blocks
+        x1 = blocks.xs[block_id]
+        y1 = blocks.ys[block_id]
+        return not (max_x < x1 or min_x > x1 + blocks.widths[block_id]
+                    or max_y < y1 or min_y > y1 + blocks.heights[block_id])
+
+    def query_point(self, x: int, y: int) -> List[int]:
+        """返回包含该点的子块编号列表"""
+        blocks = self.blocks
+        xs, ys, widths, heights = blocks.xs, blocks.ys, blocks.widths, blocks.heights
+        result = []
+        for line_id in self._point_lines(x, y):
+            start, end, _ = self._line_span(line_id)
+            result.extend(block_id for block_id in range(start, end)
+                          if xs[block_id] <= x <= xs[block_id] + widths[block_id]
+                          and ys[block_id] <= y <= ys[block_id] + heights[block_id])
+        return result
+
+    def hit_point(self, x: int, y: int) -> bool:
+        """该点是否落在任一子块上"""
+        return bool(self.query_point(x, y))
+
+
+# ---------------------------------------------------------------------------
+# 拖拽轨迹（覆盖层可录制真实拖拽，供基准测试回放）
+# ---------------------------------------------------------------------------
+
+# 设置该环境变量为目录后，覆盖层在每次拖拽结束时保存轨迹
+ENV_DRAG_TRACE_DIR = "SCREEN_OCR_DRAG_TRACE_DIR"
+
+
+def save_drag_trace(directory: str, store, events: Sequence) -> str:
+    """
+    保存拖拽轨迹
+
+    Args:
+        directory: 输出目录
+        store: 当前覆盖层的 TextBlockStore
+        events: [(x, y), ...]，第一个点为按下位置
+
+    Returns:
+        文件路径
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"drag_{time.strftime('%Y%m%d_%H%M%S')}_{len(events)}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'blocks': store.to_dicts(), 'events': [list(e) for e in events]}, f, ensure_ascii=False)
+    return path
+
+
+def load_drag_trace(path: str):
+    """读取拖拽轨迹，返回 (文本块字典列表, [(x, y), ...])"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data['blocks'], [tuple(e) for e in data['events']]
@@ -8,9 +8,9 @@ import tkinter as tk
 from tkinter import ttk
 import ttkbootstrap as ttk_boot
 from ttkbootstrap.constants import *
-import threading
 import time
 from PIL import Image, ImageTk
+from task_executor import POOL_UI_AUX, get_executor
 
 
 class SplashScreen:
@@ -468,7 +468,7 @@ class StartupToast:
                 except:
                     pass
         
-        threading.Thread(target=auto_close, daemon=True).start()
+        get_executor().submit(POOL_UI_AUX, auto_close)
 
 
 if __name__ == "__main__":
@@ -15,6 +15,8 @@ from io import BytesIO
 from datetime import datetime
 import logging
 import sys
+from hook_monitor import get_hook_monitor
+from task_executor import get_executor
 
 
 class GlobalLogBuffer:
@@ -145,6 +147,8 @@ class ConfigDialog:
             "auto_copy": True,
             "show_debug": False,
             "image_preprocess": False,
+            "layout_analysis": False,
+            "progressive_ocr": False,
             "ocr_engine": "wechat",
             "debug_log": "",
             # 翻译配置
@@ -442,6 +446,30 @@ class ConfigDialog:
         )
         preprocess_cb.pack(anchor="w", pady=(0, 8))
         
+        self.layout_analysis_var = tk.BooleanVar(
+            value=self.config.get("layout_analysis", self.default_config["layout_analysis"])
+        )
+        layout_analysis_cb = ttk_boot.Checkbutton(
+            content_frame,
+            text="多栏版面分析 (复制时按栏和段落排序)",
+            variable=self.layout_analysis_var,
+            bootstyle="round-toggle",
+            command=self.update_config
+        )
+        layout_analysis_cb.pack(anchor="w", pady=(0, 8))
+        
+        self.progressive_ocr_var = tk.BooleanVar(
+            value=self.config.get("progressive_ocr", self.default_config["progressive_ocr"])
+        )
+        progressive_ocr_cb = ttk_boot.Checkbutton(
+            content_frame,
+            text="渐进识别 (按区域分块识别，先完成的区域先可选择)",
+            variable=self.progressive_ocr_var,
+            bootstyle="round-toggle",
+            command=self.update_config
+        )
+        progressive_ocr_cb.pack(anchor="w", pady=(0, 8))
+        
         self.show_debug_var = tk.BooleanVar(value=self.config.get("show_debug", self.default_config["show_debug"]))
         show_debug_cb = ttk_boot.Checkbutton(
             content_frame,
@@ -480,6 +508,22 @@ class ConfigDialog:
         )
         clear_log_btn.pack(side=tk.LEFT)
         
+        hook_stats_btn = ttk_boot.Button(
+            button_frame,
+            text="钩子延迟",
+            bootstyle="info-outline",
+            command=self._show_hook_latency
+        )
+        hook_stats_btn.pack(side=tk.LEFT, padx=(8, 0))
+        
+        task_stats_btn = ttk_boot.Button(
+            button_frame,
+            text="后台任务",
+            bootstyle="info-outline",
+            command=self._show_task_stats
+        )
+        task_stats_btn.pack(side=tk.LEFT, padx=(8, 0))
+        
         # 初始化日志处理器
         self.log_handler = None
         self.log_messages = []  # 存储日志消息
@@ -621,6 +665,20 @@ class ConfigDialog:
         except Exception as e:
             print(f"清空日志失败: {e}")
     
+    def _show_hook_latency(self):
+        """在调试日志中输出键盘钩子回调延迟直方图"""
+        try:
+            print(get_hook_monitor().format_report())
+        except Exception as e:
+            print(f"获取钩子延迟统计失败: {e}")
+    
+    def _show_task_stats(self):
+        """在调试日志中输出各后台线程池的队列深度和排队/执行耗时"""
+        try:
+            print(get_executor().format_report())
+        except Exception as e:
+            print(f"获取后台任务统计失败: {e}")
+    
     def update_config(self):
         """实时更新配置"""
         self.config.update({
@@ -628,6 +686,8 @@ class ConfigDialog:
             "hotkey": self.hotkey_var.get(),
             "auto_copy": self.auto_copy_var.get(),
             "image_preprocess": self.image_preprocess_var.get(),
+            "layout_analysis": self.layout_analysis_var.get(),
+            "progressive_ocr": self.progressive_ocr_var.get(),
             "show_debug": self.show_debug_var.get(),
             "ocr_engine": self.ocr_engine_var.get(),
             # 翻译配置
@@ -919,6 +979,8 @@ class SystemTray:
             "auto_copy": True,
             "show_debug": False,
             "image_preprocess": False,
+            "layout_analysis": False,
+            "progressive_ocr": False,
             "debug_log": "",
             # 翻译配置
             "enable_translation": True,
@@ -0,0 +1,191 @@
+"""
+后台任务执行器
+原来 OCR 引擎初始化、每次识别（ocr_worker）、每次翻译（translate_async）、启动通知和引擎预加载
+都各自新建线程，快速连续触发时线程数随之增长，也看不出时间花在哪里。
+这里把后台任务按用途分到固定的线程池:
+    - engine：OCR 引擎初始化、识别、预加载（引擎调用本身串行，1 个线程）
+    - network：翻译等网络请求
+    - ui-aux：启动通知等辅助窗口
+每个线程池的队列有上限，按优先级取任务（数值越小越先执行，同优先级按提交顺序），线程在第一次
+提交任务时创建，之后数量不变；空闲线程阻塞在队列上，不会定时唤醒。
+统计每个线程池的队列深度和任务排队/执行耗时，format_report() 在配置窗口的调试日志中查看。
+
+用法:
+    future = get_executor().submit(POOL_ENGINE, func, arg, priority=PRIORITY_HIGH)
+    print(get_executor().format_report())
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+POOL_ENGINE = 'engine'
+POOL_NETWORK = 'network'
+POOL_UI_AUX = 'ui-aux'
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+# 停止线程的标记排在所有任务之后
+_PRIORITY_STOP = 1 << 30
+
+# 线程池名称 -> (线程数, 队列上限)
+DEFAULT_POOLS: Dict[str, Tuple[int, int]] = {
+    POOL_ENGINE: (1, 8),
+    POOL_NETWORK: (2, 16),
+    POOL_UI_AUX: (1, 16),
+}
+
+
+class TaskPool:
+    """固定线程数、有界优先级队列的线程池"""
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        """
+        Args:
+            name: 线程池名称（也是线程名前缀）
+            workers: 线程数
+            max_queue: 等待中的任务上限，超过时拒绝提交
+        """
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self.stats = {
+            'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+            'max_depth': 0, 'wait_ms': 0.0, 'max_wait_ms': 0.0, 'run_ms': 0.0, 'max_run_ms': 0.0,
+        }
+
+    def submit(self, func: Callable, *args, priority: int = PRIORITY_NORMAL, **kwargs) -> Optional[Future]:
+        """
+        提交任务
+
+        Returns:
+            Future；线程池已关闭或队列已满时返回 None
+        """
+        with self._lock:
+            if self._shutdown:
+                return None
+            depth = self._queue.qsize()
+            if depth >= self.max_queue:
+                self.stats['rejected'] += 1
+                logging.warning(f"后台任务队列 {self.name} 已满（{depth}），丢弃任务 {getattr(func, '__name__', func)}")
+                return None
+            future = Future()
+            self._queue.put((priority, next(self._seq), time.perf_counter(), future, func, args, kwargs))
+            self.stats['submitted'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], depth + 1)
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def _worker(self):
+        while True:
+            priority, _, queued, future, func, args, kwargs = self._queue.get()
+            if priority == _PRIORITY_STOP:
+                return
+            start = time.perf_counter()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                failed = True
+                logging.error(f"后台任务 {getattr(func, '__name__', func)} 失败: {str(e)}")
+                traceback.print_exc()
+                future.set_exception(e)
+            else:
+                failed = False
+                future.set_result(result)
+            done = time.perf_counter()
+            wait_ms, run_ms = (start - queued) * 1000, (done - start) * 1000
+            with self._lock:
+                stats = self.stats
+                stats['failed' if failed else 'completed'] += 1
+                stats['wait_ms'] += wait_ms
+                stats['run_ms'] += run_ms
+                stats['max_wait_ms'] = max(stats['max_wait_ms'], wait_ms)
+                stats['max_run_ms'] = max(stats['max_run_ms'], run_ms)
+
+    @property
+    def depth(self) -> int:
+        """等待中的任务数"""
+        return self._queue.qsize()
+
+    @property
+    def threads(self) -> int:
+        return len(self._threads)
+
+    def shutdown(self, wait: bool = False, timeout: float = 2.0):
+        """不再接受任务；已排队的任务执行完后线程退出"""
+        with self._lock:
+            self._shutdown = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._queue.put((_PRIORITY_STOP, next(self._seq), 0.0, None, None, (), {}))
+        if wait:
+            for thread in threads:
+                if thread is not threading.current_thread():
+                    thread.join(timeout)
+
+
+class TaskExecutor:
+    """按名称管理的线程池集合"""
+
+    def __init__(self, pools: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Args:
+            pools: 线程池名称 -> (线程数, 队列上限)，默认 DEFAULT_POOLS
+        """
+        self.pools: Dict[str, TaskPool] = {
+            name: TaskPool(name, workers, max_queue)
+            for name, (workers, max_queue) in (pools or DEFAULT_POOLS).items()
+        }
+
+    def submit(self, pool: str, func: Callable, *args, priority: int = PRIORITY_NORMAL, **kwargs) -> Optional[Future]:
+        """提交任务到指定线程池（见 TaskPool.submit）"""
+        return self.pools[pool].submit(func, *args, priority=priority, **kwargs)
+
+    def shutdown(self, wait: bool = False):
+        for pool in self.pools.values():
+            pool.shutdown(wait)
+
+    def format_report(self) -> str:
+        """各线程池的统计（用于调试日志）"""
+        lines = ["=== 后台任务 ===",
+                 f"{'线程池':10}{'线程':>5}{'排队':>5}{'最大排队':>8}{'完成':>7}{'失败':>5}{'拒绝':>5}"
+                 f"{'平均排队(ms)':>13}{'最大排队(ms)':>13}{'平均执行(ms)':>13}{'最大执行(ms)':>13}"]
+        for name, pool in self.pools.items():
+            stats = pool.stats
+            finished = stats['completed'] + stats['failed'] or 1
+            lines.append(
+                f"{name:10}{pool.threads:>5}{pool.depth:>5}{stats['max_depth']:>8}{stats['completed']:>7}"
+                f"{stats['failed']:>5}{stats['rejected']:>5}{stats['wait_ms'] / finished:>13.1f}"
+                f"{stats['max_wait_ms']:>13.1f}{stats['run_ms'] / finished:>13.1f}{stats['max_run_ms']:>13.1f}"
+            )
+        return "\n".join(lines)
+
+
+# 全局单例
+_executor: Optional[TaskExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> TaskExecutor:
+    """获取全局后台任务执行器"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = TaskExecutor()
+    return _executor
@@ -0,0 +1,254 @@
+"""
+文本块存储
+OCR 结果和覆盖层的可选单元使用列式存储，代替每个文本块一个字典:
+    xs / ys / widths / heights  - array('i') 几何列
+    selected                    - array('b') 选中标记
+    文本                         - 所有文本拼接在一个字符串缓冲区中，按 (起点, 长度) 引用
+
+拆分出的单字/单词直接引用原文本在缓冲区中的区间，不再复制字符串
+
+兼容旧代码:
+    store[i] 返回 TextBlock 行视图，支持 block['text']、block.get('x') 和属性访问
+    store.items() / store.values() 与原来的 {block_id: dict} 用法一致
+    store.to_dicts() 转换为字典列表（用于 JSON 输出）
+"""
+from array import array
+from itertools import accumulate, chain, compress
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# TextBlock 支持的字段（与原字典的键一致）
+BLOCK_FIELDS = ('text', 'x', 'y', 'width', 'height', 'selected')
+
+
+class TextBlock:
+    """文本块行视图（不复制数据，读写直接作用于所属的 TextBlockStore）"""
+
+    __slots__ = ('_store', 'index')
+
+    def __init__(self, store: 'TextBlockStore', index: int):
+        self._store = store
+        self.index = index
+
+    @property
+    def text(self) -> str:
+        return self._store.text(self.index)
+
+    @property
+    def x(self) -> int:
+        return self._store.xs[self.index]
+
+    @property
+    def y(self) -> int:
+        return self._store.ys[self.index]
+
+    @property
+    def width(self) -> int:
+        return self._store.widths[self.index]
+
+    @property
+    def height(self) -> int:
+        return self._store.heights[self.index]
+
+    @property
+    def selected(self) -> bool:
+        return bool(self._store.selected[self.index])
+
+    @selected.setter
+    def selected(self, value: bool):
+        self._store.selected[self.index] = 1 if value else 0
+
+    def __getitem__(self, key: str):
+        if key not in BLOCK_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key != 'selected':
+            raise KeyError(f"只读字段: {key}")
+        self.selected = value
+
+    def __contains__(self, key) -> bool:
+        return key in BLOCK_FIELDS
+
+    def get(self, key: str, default=None):
+        if key not in BLOCK_FIELDS:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        return BLOCK_FIELDS
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in BLOCK_FIELDS}
+
+    def __repr__(self) -> str:
+        return (f"TextBlock({self.index}, text={self.text!r}, x={self.x}, y={self.y}, "
+                f"width={self.width}, height={self.height})")
+
+
+class TextBlockStore:
+    """列式文本块存储"""
+
+    __slots__ = ('xs', 'ys', 'widths', 'heights', 'selected',
+                 '_starts', '_lengths', '_parts', '_size', '_buffer')
+
+    def __init__(self, blocks: Optional[Iterable] = None):
+        """
+        Args:
+            blocks: 可选，初始文本块（字典或 TextBlock）
+        """
+        self.xs = array('i')
+        self.ys = array('i')
+        self.widths = array('i')
+        self.heights = array('i')
+        self.selected = array('b')
+        self._starts = array('I')
+        self._lengths = array('I')
+        self._parts: List[str] = []
+        self._size = 0
+        self._buffer = ''
+        if blocks:
+            self.extend(blocks)
+
+    @classmethod
+    def from_dicts(cls, blocks: Iterable[Dict]) -> 'TextBlockStore':
+        """从字典列表创建（兼容第三方引擎返回的格式）"""
+        return cls(blocks)
+
+    # ------------------------------------------------------------------
+    # 文本缓冲区
+    # ------------------------------------------------------------------
+
+    @property
+    def buffer(self) -> str:
+        """拼接后的文本缓冲区（按需合并）"""
+        if len(self._parts) > 1 or (self._parts and self._parts[0] is not self._buffer):
+            self._buffer = ''.join(self._parts)
+            self._parts = [self._buffer]
+        return self._buffer
+
+    def intern(self, text: str) -> int:
+        """把文本追加到缓冲区（不创建文本块），返回起始偏移，供 append_span 引用"""
+        offset = self._size
+        if text:
+            self._parts.append(text)
+            self._size += len(text)
+        return offset
+
+    def text(self, index: int) -> str:
+        start = self._starts[index]
+        return self.buffer[start:start + self._lengths[index]]
+
+    # ------------------------------------------------------------------
+    # 追加
+    # ------------------------------------------------------------------
+
+    def append(self, text: str, x: int, y: int, width: int, height: int) -> int:
+        """追加文本块，返回编号"""
+        return self.append_span(self.intern(text), len(text), x, y, width, height)
+
+    def append_span(self, start: int, length: int, x: int, y: int, width: int, height: int) -> int:
+        """追加引用缓冲区 [start, start + length) 的文本块，返回编号"""
+        index = len(self.xs)
+        self._starts.append(start)
+        self._lengths.append(length)
+        self.xs.append(int(x))
+        self.ys.append(int(y))
+        self.widths.append(int(width))
+        self.heights.append(int(height))
+        self.selected.append(0)
+        return index
+
+    def extend(self, blocks: Iterable):
+        """追加多个文本块（字典或 TextBlock）"""
+        for block in blocks:
+            self.append(block['text'], block['x'], block['y'], block['width'], block['height'])
+
+    def extend_columns(self, texts: Iterable[str], xs: Iterable[int], ys: Iterable[int],
+                       widths: Iterable[int], heights: Iterable[int],
+                       keep: Optional[Iterable] = None):
+        """
+        按列批量追加（整数列，长度一致）
+
+        Args:
+            keep: 可选，与各列等长的筛选标记，只追加为真的行
+        """
+        if keep is not None:
+            keep = list(keep)
+            texts, xs, ys, widths, heights = (
+                compress(column, keep) for column in (texts, xs, ys, widths, heights)
+            )
+        texts = list(texts)
+        count = len(texts)
+        lengths = list(map(len, texts))
+        self._starts.extend(accumulate(chain((self._size,), lengths[:-1])) if count else ())
+        self._lengths.extend(lengths)
+        joined = ''.join(texts)
+        if joined:
+            self._parts.append(joined)
+            self._size += len(joined)
+        self.xs.extend(xs)
+        self.ys.extend(ys)
+        self.widths.extend(widths)
+        self.heights.extend(heights)
+        self.selected.frombytes(bytes(count))
+
+    # ------------------------------------------------------------------
+    # 访问
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, index: int) -> TextBlock:
+        if index < 0:
+            index += len(self.xs)
+        if not 0 <= index < len(self.xs):
+            raise IndexError(index)
+        return TextBlock(self, index)
+
+    def __iter__(self) -> Iterator[TextBlock]:
+        for index in range(len(self.xs)):
+            yield TextBlock(self, index)
+
+    def items(self) -> Iterator[Tuple[int, TextBlock]]:
+        """(编号, 行视图)，与原 {block_id: dict} 的 items() 用法一致"""
+        return enumerate(self)
+
+    def values(self) -> Iterator[TextBlock]:
+        return iter(self)
+
+    def texts(self) -> List[str]:
+        buffer = self.buffer
+        return [buffer[start:start + length] for start, length in zip(self._starts, self._lengths)]
+
+    def rect(self, index: int) -> Tuple[int, int, int, int]:
+        """返回 (x1, y1, x2, y2)"""
+        x = self.xs[index]
+        y = self.ys[index]
+        return x, y, x + self.widths[index], y + self.heights[index]
+
+    def clear_selection(self):
+        self.selected[:] = array('b', bytes(len(self.xs)))
+
+    def to_dicts(self) -> List[Dict]:
+        """转换为字典列表 (text, x, y, width, height)，用于 JSON 输出"""
+        return [
+            {'text': text, 'x': x, 'y': y, 'width': width, 'height': height}
+            for text, x, y, width, height in zip(self.texts(), self.xs, self.ys, self.widths, self.heights)
+        ]
+
+    def nbytes(self) -> int:
+        """列数据和文本缓冲区占用的字节数（近似）"""
+        columns = (self.xs, self.ys, self.widths, self.heights, self.selected, self._starts, self._lengths)
+        return sum(column.itemsize * len(column) for column in columns) + len(self.buffer.encode('utf-8'))
+
+    def __repr__(self) -> str:
+        return f"TextBlockStore({len(self)} blocks)"
+
+
+def as_store(blocks) -> TextBlockStore:
+    """把引擎返回的结果统一为 TextBlockStore（已是 TextBlockStore 时原样返回）"""
+    if isinstance(blocks, TextBlockStore):
+        return blocks
+    return TextBlockStore(blocks or ())
@@ -0,0 +1,136 @@
+"""
+字符分类
+按码位预先计算的查找表，一次 str.translate 即可得到整段文本每个字符的类别，代替逐字符的区间比较
+
+类别为位标志:
+    WIDE   全角（East Asian Width 为 W/F）：占 2 个宽度单位，包括汉字、假名、谚文、全角标点和符号
+    CJK    汉字（含扩展 A~G、兼容汉字）、假名、注音：逐字选择，彼此之间不加空格
+    ALNUM  字母或数字（str.isalnum）
+    PUNCT  不加空格的标点（与原 should_add_space 的标点集合一致）
+
+查找表在第一次使用时构建（约几十毫秒），覆盖 U+0000~U+3FFFF；更高平面的字符按无类别处理
+
+用法:
+    classes = classify(text)            # 每个字符一个类别字符，ord(c) 为位标志
+    units = width_units(text)           # 宽度单位总数
+    for start, end, cjk in segments(text): ...
+"""
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+WIDE = 1
+CJK = 2
+ALNUM = 4
+PUNCT = 8
+
+# 不加空格的标点（与原 should_add_space 一致）
+PUNCTUATION = ',.:;?!，。：；？！、（）()[]【】{}""\'\''
+
+# (起点, 终点) 包含边界，按 CJK 处理的区间
+CJK_RANGES = (
+    (0x2E80, 0x2FDF),    # CJK 部首
+    (0x3005, 0x3007),    # 々〆〇
+    (0x3021, 0x3029),    # 苏州码子
+    (0x3040, 0x30FF),    # 平假名、片假名
+    (0x3100, 0x312F),    # 注音
+    (0x31A0, 0x31BF),    # 注音扩展
+    (0x31F0, 0x31FF),    # 片假名语音扩展
+    (0x3400, 0x4DBF),    # 扩展 A
+    (0x4E00, 0x9FFF),    # CJK 统一汉字
+    (0xF900, 0xFAFF),    # 兼容汉字
+    (0xFF66, 0xFF9F),    # 半角片假名
+    (0x1B000, 0x1B16F),  # 假名补充
+    (0x20000, 0x3FFFF),  # 扩展 B~G、兼容汉字补充
+)
+
+TABLE_SIZE = 0x40000
+
+_CLASS_TABLE: Optional[str] = None
+# 类别字符 -> 宽度单位字符（\x01 / \x02）
+_UNITS_TABLE = ''.join(chr(2 if flags & WIDE else 1) for flags in range(16))
+# 类别字符 -> 分段字符：c 逐字单元，w 单词字符，. 分隔符
+_SEGMENT_TABLE = ''.join('c' if flags & CJK else 'w' if flags & ALNUM else '.' for flags in range(16))
+_SEGMENT_RE = re.compile(r'c+|w+')
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+
+def _build_class_table() -> str:
+    """按 unicodedata 计算每个码位的类别"""
+    east_asian_width = unicodedata.east_asian_width
+    # 辅助表意平面及之后全部是汉字，单独整段填充
+    loop_end = 0x20000
+    table = bytearray(
+        (WIDE if east_asian_width(char) in 'WF' else 0) | (ALNUM if char.isalnum() else 0)
+        for char in map(chr, range(loop_end)))
+    table.extend(bytes([WIDE | ALNUM]) * (TABLE_SIZE - loop_end))
+    for start, end in CJK_RANGES:
+        for cp in range(start, min(end, loop_end - 1) + 1):
+            table[cp] |= CJK
+    for start, end in CJK_RANGES:
+        if end >= loop_end:
+            start = max(start, loop_end)
+            table[start:end + 1] = bytes([WIDE | ALNUM | CJK]) * (end - start + 1)
+    for char in PUNCTUATION:
+        table[ord(char)] |= PUNCT
+    return table.decode('latin-1')
+
+
+def class_table() -> str:
+    """码位 -> 类别字符的查找表（可直接用于 str.translate）"""
+    global _CLASS_TABLE
+    if _CLASS_TABLE is None:
+        _CLASS_TABLE = _build_class_table()
+    return _CLASS_TABLE
+
+
+def classify(text: str) -> str:
+    """返回与 text 等长的类别字符串，每个字符的 ord() 为位标志"""
+    classes = text.translate(class_table())
+    if not classes.isascii():
+        # 超出查找表范围的字符保持原样，按无类别处理
+        classes = _NON_ASCII_RE.sub('\x00', classes)
+    return classes
+
+
+def char_flags(char: str) -> int:
+    """单个字符的类别位标志"""
+    cp = ord(char)
+    return ord(class_table()[cp]) if cp < TABLE_SIZE else 0
+
+
+def is_cjk(char: str) -> bool:
+    return bool(char_flags(char) & CJK)
+
+
+def is_fullwidth(char: str) -> bool:
+    return bool(char_flags(char) & WIDE)
+
+
+def is_punctuation(char: str) -> bool:
+    return bool(char_flags(char) & PUNCT)
+
+
+def char_units(text: str, classes: Optional[str] = None) -> bytes:
+    """每个字符的宽度单位（全角 2，其余 1）"""
+    if classes is None:
+        classes = classify(text)
+    return classes.translate(_UNITS_TABLE).encode('latin-1')
+
+
+def width_units(text: str) -> int:
+    """宽度单位总数"""
+    return sum(char_units(text))
+
+
+def segments(text: str, classes: Optional[str] = None) -> List[Tuple[int, int, bool]]:
+    """
+    把文本分成连续的逐字单元段（CJK）和单词段，空格和其他非字母数字字符作为分隔符
+
+    Returns:
+        [(起始下标, 结束下标, 是否 CJK), ...]
+    """
+    if classes is None:
+        classes = classify(text)
+    kinds = classes.translate(_SEGMENT_TABLE)
+    return [(m.start(), m.end(), kinds[m.start()] == 'c') for m in _SEGMENT_RE.finditer(kinds)]
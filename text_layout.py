@@ -0,0 +1,285 @@
+"""
+文本版面分析
+把选中的文本块聚类成行，并按阅读顺序拼接为复制到剪贴板的文本
+
+行聚类（排序 + 扫描，O(n log n)）:
+    1. 计算每个文本块的垂直中心 y + height / 2，按中心排序
+    2. 依次扫描：与当前行中心的距离不超过容差的块加入当前行，否则开始新行
+    3. 容差随文字高度变化：取当前行与该块中较高者高度的一半（至少 MIN_LINE_TOLERANCE），
+       即较矮文本的中心落在较高文本的垂直范围内就视为同一行，混排字号（标题与正文、上下标）也能正确归行
+    4. 每行按 x 排序
+
+版面分析（可选，配置项 layout_analysis）:
+    多栏、侧边栏和表格按 y 分行会把不同栏的行交错在一起，因此先用 XY-cut 把选区切分成栏和段落，
+    再在每个区域内按上面的方法分行:
+    1. 把区域内的文本块分别投影到 x 轴和 y 轴，扫描找出足够宽的空白间隙
+       （竖直间隙 >= COLUMN_GAP_RATIO * 文字高度中位数，水平间隙 >= PARAGRAPH_GAP_RATIO * 文字高度中位数）
+    2. 有竖直间隙时优先按栏切分（从左到右），否则按段落切分（从上到下），对每个子区域递归
+    3. 不足两行高的区域不再按栏切分，避免把一行中间距较大的单词拆开
+    4. 各候选栏的行数相同、行中心逐行对齐时视为表格（网格），不按栏切分，整行按阅读顺序输出，
+       避免把表格的每一行拆散成按列复制
+    每层只做一次排序，整体接近 O(n log n)
+
+空格规则沿用覆盖层原 should_add_space，"中文"的范围扩展到汉字扩展区和假名
+
+可选单元拆分（split_text_block）：中文按单字、英文按单词把一行 OCR 文本拆成覆盖层可选中的子块
+
+字符类别（全角、汉字/假名、字母数字、标点）见 text_classify
+"""
+from itertools import accumulate
+from typing import Callable, Iterable, List, Sequence
+
+from text_blocks import TextBlockStore
+from text_classify import ALNUM, CJK, PUNCT, char_flags, char_units, classify, segments
+
+# 行中心距离容差 = 较高文本块高度 * LINE_TOLERANCE_RATIO（像素）
+LINE_TOLERANCE_RATIO = 0.5
+MIN_LINE_TOLERANCE = 2
+
+# 版面分析：栏间距 / 段落间距阈值 = 文字高度中位数 * 比例
+COLUMN_GAP_RATIO = 1.5
+PARAGRAPH_GAP_RATIO = 1.0
+# 递归切分的最大深度
+MAX_CUT_DEPTH = 32
+
+
+def should_add_space(prev_text: str, next_text: str) -> bool:
+    """判断两段相邻文本之间是否需要添加空格"""
+    prev_text = prev_text.strip()
+    next_text = next_text.strip()
+    if not prev_text or not next_text:
+        return False
+
+    prev_flags = char_flags(prev_text[-1])
+    next_flags = char_flags(next_text[0])
+
+    # 如果任一字符是标点不添加空格
+    if (prev_flags | next_flags) & PUNCT:
+        return False
+
+    # 中文（汉字、假名）与中文之间不加空格，中文与英文/数字之间加空格
+    prev_is_cjk = prev_flags & CJK
+    next_is_cjk = next_flags & CJK
+    if prev_is_cjk or next_is_cjk:
+        return bool(prev_is_cjk) != bool(next_is_cjk)
+
+    # 英文单词之间添加空格
+    return bool(prev_flags & next_flags & ALNUM)
+
+
+def cluster_lines(xs: Sequence[int], ys: Sequence[int], widths: Sequence[int],
+                  heights: Sequence[int], block_ids: Iterable[int]) -> List[List[int]]:
+    """
+    把文本块聚类成行
+
+    Args:
+        xs, ys, widths, heights: 文本块几何列
+        block_ids: 参与聚类的文本块编号
+
+    Returns:
+        行列表（自上而下），每行为按 x 排序的文本块编号
+    """
+    ordered = sorted(block_ids, key=lambda i: (ys[i] + heights[i] / 2, xs[i]))
+    if not ordered:
+        return []
+
+    lines = []
+    first = ordered[0]
+    line = [first]
+    line_center = ys[first] + heights[first] / 2
+    center_sum = line_center
+    line_height = heights[first]
+    for block_id in ordered[1:]:
+        height = heights[block_id]
+        center = ys[block_id] + height / 2
+        tolerance = max(LINE_TOLERANCE_RATIO * max(line_height, height), MIN_LINE_TOLERANCE)
+        if center - line_center <= tolerance:
+            line.append(block_id)
+            # 行中心取成员中心的平均值，轻微倾斜的文本也能归入同一行
+            center_sum += center
+            line_center = center_sum / len(line)
+            if height > line_height:
+                line_height = height
+        else:
+            lines.append(line)
+            line = [block_id]
+            line_center = center_sum = center
+            line_height = height
+    lines.append(line)
+
+    for line in lines:
+        line.sort(key=xs.__getitem__)
+    return lines
+
+
+def _split_projection(block_ids: List[int], starts, ends, min_gap: float):
+    """沿一个轴投影，在空白间隙处切分，返回按坐标排序的分段列表"""
+    ordered = sorted(block_ids, key=starts.__getitem__)
+    segments = []
+    current = [ordered[0]]
+    reach = ends[ordered[0]]
+    for block_id in ordered[1:]:
+        if starts[block_id] - reach >= min_gap:
+            segments.append(current)
+            current = []
+        current.append(block_id)
+        end = ends[block_id]
+        if end > reach:
+            reach = end
+    segments.append(current)
+    return segments
+
+
+def _line_centers(ys: Sequence[int], heights: Sequence[int], lines: List[List[int]]) -> List[float]:
+    return [sum(ys[i] + heights[i] / 2 for i in line) / len(line) for line in lines]
+
+
+def _is_grid(xs: Sequence[int], ys: Sequence[int], widths: Sequence[int], heights: Sequence[int],
+             columns: List[List[int]], tolerance: float) -> bool:
+    """各候选栏的行是否位于相同的 y 带（行数相同且行中心逐行对齐，即表格）"""
+    reference = None
+    for column in columns:
+        centers = _line_centers(ys, heights, cluster_lines(xs, ys, widths, heights, column))
+        if reference is None:
+            reference = centers
+        elif len(centers) != len(reference) or any(
+                abs(a - b) > tolerance for a, b in zip(centers, reference)):
+            return False
+    return len(reference) > 1
+
+
+def reading_order(xs: Sequence[int], ys: Sequence[int], widths: Sequence[int],
+                  heights: Sequence[int], block_ids: Iterable[int]) -> List[List[int]]:
+    """
+    XY-cut 版面分析：按栏、段落、行的阅读顺序返回行列表
+
+    Args:
+        xs, ys, widths, heights: 文本块几何列
+        block_ids: 参与分析的文本块编号
+
+    Returns:
+        行列表（按阅读顺序），每行为按 x 排序的文本块编号
+    """
+    block_ids = list(block_ids)
+    if not block_ids:
+        return []
+
+    # 只为参与分析的块计算右/下边界，选区远小于全部文本块时不必遍历整列
+    x1s = {i: xs[i] for i in block_ids}
+    y1s = {i: ys[i] for i in block_ids}
+    x2s = {i: xs[i] + widths[i] for i in block_ids}
+    y2s = {i: ys[i] + heights[i] for i in block_ids}
+    sorted_heights = sorted(heights[i] for i in block_ids)
+    text_height = max(sorted_heights[len(sorted_heights) // 2], 1)
+    min_column_gap = COLUMN_GAP_RATIO * text_height
+    min_paragraph_gap = PARAGRAPH_GAP_RATIO * text_height
+    min_multiline_height = 2 * text_height
+    row_tolerance = max(LINE_TOLERANCE_RATIO * text_height, MIN_LINE_TOLERANCE)
+
+    lines = []
+    # 显式栈代替递归，子区域逆序入栈以保持阅读顺序
+    stack = [(block_ids, 0)]
+    while stack:
+        region, depth = stack.pop()
+        if len(region) > 1 and depth < MAX_CUT_DEPTH:
+            parts = None
+            top = min(y1s[i] for i in region)
+            bottom = max(y2s[i] for i in region)
+            if bottom - top >= min_multiline_height:
+                columns = _split_projection(region, x1s, x2s, min_column_gap)
+                if len(columns) > 1 and not _is_grid(xs, ys, widths, heights, columns, row_tolerance):
+                    parts = columns
+            if parts is None:
+                bands = _split_projection(region, y1s, y2s, min_paragraph_gap)
+                if len(bands) > 1:
+                    parts = bands
+            if parts is not None:
+                stack.extend((part, depth + 1) for part in reversed(parts))
+                continue
+        lines.extend(cluster_lines(xs, ys, widths, heights, region))
+    return lines
+
+
+def join_line(block_ids: Sequence[int], text_of: Callable[[int], str]) -> str:
+    """按空格规则拼接一行文本块"""
+    parts = []
+    prev_text = None
+    for block_id in block_ids:
+        text = text_of(block_id).strip()
+        if prev_text is not None and should_add_space(prev_text, text):
+            parts.append(' ')
+        parts.append(text)
+        prev_text = text
+    return ''.join(parts)
+
+
+def merge_text(store, block_ids: Iterable[int], layout_analysis: bool = False) -> str:
+    """
+    把选中的文本块合并为文本：行内按空格规则拼接，行间用换行符连接
+
+    Args:
+        store: TextBlockStore
+        block_ids: 选中的文本块编号
+        layout_analysis: 是否先按栏和段落重建阅读顺序
+    """
+    order = reading_order if layout_analysis else cluster_lines
+    lines = order(store.xs, store.ys, store.widths, store.heights, block_ids)
+    text_of = store.text
+    return '\n'.join(join_line(line, text_of) for line in lines)
+
+
+def split_text_block(text: str, x: int, y: int, width: int, height: int,
+                     out: TextBlockStore = None, metrics=None) -> TextBlockStore:
+    """
+    智能拆分长文本块为更小的可选单元
+    - 中文（汉字、假名）：按单个字符
+    - 英文等：按单词
+
+    Args:
+        text: 文本内容
+        x, y: 文本块起始位置
+        width, height: 文本块尺寸
+        out: 追加到的 TextBlockStore（默认新建）
+        metrics: GlyphMetrics 字宽表；为 None 时按全角 2 个单位、半角 1 个单位估计字符位置
+
+    Returns:
+        拆分结果所在的 TextBlockStore（子块文本引用原文本的区间，不复制字符串）
+    """
+    result = out if out is not None else TextBlockStore()
+
+    if len(text) == 0 or width <= 0:
+        return result
+
+    # 一次查表得到每个字符的类别和宽度单位（字宽表，或全角字符算2个单位、半角算1个）
+    classes = classify(text)
+    units = metrics.advances(text) if metrics is not None else char_units(text, classes)
+    total_units = sum(units)
+    unit_width = width / total_units if total_units > 0 else width
+
+    # 每个字符的起始位置（基于加权宽度），最后一项为行尾
+    char_x = list(accumulate([u * unit_width for u in units], initial=0.0))
+
+    # 中文/假名逐字拆分，英文等按单词（空格和标点等非字母数字字符作为分隔符）
+    text_offset = result.intern(text)
+    append_span = result.append_span
+    for start, end, cjk in segments(text, classes):
+        if cjk:
+            for idx in range(start, end):
+                append_span(text_offset + idx, 1,
+                            x + int(char_x[idx]), y, max(int(units[idx] * unit_width), 1), height)
+        else:
+            word_start_x = char_x[start]
+            word_width = char_x[end] - word_start_x
+            append_span(text_offset + start, end - start,
+                        x + int(word_start_x), y, max(int(word_width), 1), height)
+
+    return result
+
+
+def split_selectable(text: str, x: int, y: int, width: int, height: int, out: TextBlockStore,
+                     metrics=None):
+    """按覆盖层的规则把一行 OCR 文本追加为可选单元：多字符文本拆分，单字符或零宽文本原样保留"""
+    if len(text) > 1 and width > 0:
+        split_text_block(text, x, y, width, height, out=out, metrics=metrics)
+    else:
+        out.append(text, x, y, width, height)
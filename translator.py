@@ -7,10 +7,12 @@ import hashlib
 import hmac
 import time
 from datetime import datetime
-import threading
+from concurrent.futures import Future
 import logging
 from typing import Optional, Callable
 
+from task_executor import POOL_NETWORK, get_executor
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
@@ -39,7 +41,7 @@ class TencentTranslator:
         
         # 翻译状态
         self._cancel_flag = False
-        self._current_thread: Optional[threading.Thread] = None
+        self._current_task: Optional[Future] = None
         
     def set_credentials(self, secret_id: str, secret_key: str):
         """设置 API 凭证"""
@@ -261,7 +263,7 @@ class TencentTranslator:
         on_success: Optional[Callable[[str], None]] = None,
         on_error: Optional[Callable[[str], None]] = None,
         on_cancel: Optional[Callable[[], None]] = None
-    ) -> threading.Thread:
+    ) -> Optional[Future]:
         """
         异步翻译文本
         
@@ -274,16 +276,17 @@ class TencentTranslator:
             on_cancel: 取消回调（在后台线程中执行）
             
         Returns:
-            翻译线程
+            翻译任务（network 线程池），队列已满时为 None
         """
         self._cancel_flag = False
         
         def _translate_worker():
             self.translate(text, source, target, on_success, on_error, on_cancel)
         
-        self._current_thread = threading.Thread(target=_translate_worker, daemon=True)
-        self._current_thread.start()
-        return self._current_thread
+        self._current_task = get_executor().submit(POOL_NETWORK, _translate_worker)
+        if self._current_task is None and on_error:
+            on_error("翻译请求过多，请稍后重试")
+        return self._current_task
     
     def cancel(self):
         """取消当前翻译"""
@@ -12,12 +12,23 @@ import re
 import logging
 from pathlib import Path
 
-from typing import List, Dict, Optional
+from typing import List, Optional
+
+from text_blocks import TextBlockStore
 
 try:
+    # 测试环境：使用回放录制结果的替身模块（见 fake_wcocr.py）
+    if os.environ.get('SCREEN_OCR_FAKE_WCOCR'):
+        import fake_wcocr
+        fake_wcocr.install()
+        fake_wcocr.configure_from_env()
     # 尝试导入 wcocr 模块（将 wcocr.dll 重命名为 wcocr.pyd）
     import wcocr
     WECHAT_OCR_AVAILABLE = True
+    # 录制真实识别结果，供替身模块回放
+    if os.environ.get('SCREEN_OCR_WCOCR_RECORD') and not os.environ.get('SCREEN_OCR_FAKE_WCOCR'):
+        import fake_wcocr
+        fake_wcocr.start_recording(wcocr, os.environ['SCREEN_OCR_WCOCR_RECORD'])
 except ImportError:
     WECHAT_OCR_AVAILABLE = False
     logging.warning("wcocr 模块未安装，WeChatOCR 功能将不可用")
@@ -40,9 +51,9 @@ class WeChatOCRWrapper:
             logging.error("   请从 https://github.com/swigger/wechat-ocr 下载 wcocr.pyd")
             return
         
-        # 查找 WeChatOCR.exe 和微信目录路径
-        self.ocr_exe_path = self._find_wechat_ocr_exe()
-        self.wechat_dir = self._find_wechat_dir()
+        # 查找 WeChatOCR.exe 和微信目录路径（可通过环境变量指定）
+        self.ocr_exe_path = os.environ.get('WECHAT_OCR_EXE') or self._find_wechat_ocr_exe()
+        self.wechat_dir = os.environ.get('WECHAT_OCR_DIR') or self._find_wechat_dir()
         
         if self.ocr_exe_path and self.wechat_dir:
             try:
@@ -56,6 +67,9 @@ class WeChatOCRWrapper:
                 max_wait = 3.0  # 最多等待3秒
                 check_interval = 0.1  # 每100ms检查一次
                 waited = 0.0
+                # 同步初始化的实现（如测试替身）无需等待
+                if getattr(wcocr, 'SYNC_INIT', False):
+                    max_wait = 0.0
                 while waited < max_wait:
                     time.sleep(check_interval)
                     waited += check_interval
@@ -384,7 +398,7 @@ class WeChatOCRWrapper:
         
         return result
     
-    def ocr_pil_image(self, pil_image, preprocess=False) -> List[Dict]:
+    def ocr_pil_image(self, pil_image, preprocess=False) -> TextBlockStore:
         """
         对 PIL Image 对象进行 OCR 识别
         
@@ -393,11 +407,11 @@ class WeChatOCRWrapper:
             preprocess: 是否进行预处理（对比度增强+锐化）
         
         返回:
-            识别结果列表，每项包含: text, x, y, width, height
+            识别结果（TextBlockStore），每项包含: text, x, y, width, height
         """
         if not self.is_available():
             logging.error("WeChatOCR 不可用")
-            return []
+            return TextBlockStore()
         
         temp_path = None
         try:
@@ -417,7 +431,7 @@ class WeChatOCRWrapper:
             # 验证结果
             if result is None:
                 logging.error("OCR 识别失败：未能获取结果")
-                return []
+                return TextBlockStore()
             
             return self._parse_ocr_result(result)
             
@@ -425,7 +439,7 @@ class WeChatOCRWrapper:
             logging.error(f"WeChatOCR 识别失败: {str(e)}")
             import traceback
             traceback.print_exc()
-            return []
+            return TextBlockStore()
         finally:
             # 确保删除临时文件
             if temp_path:
@@ -434,17 +448,20 @@ class WeChatOCRWrapper:
                 except:
                     pass
     
-    def _parse_ocr_result(self, result) -> List[Dict]:
+    def _parse_ocr_result(self, result) -> TextBlockStore:
         """
         解析 OCR 结果，转换为统一格式
         
+        逐条判断坐标格式，文本和坐标按列直接写入 TextBlockStore；
+        解析失败和跳过的条目汇总后各输出一条日志
+        
         参数:
             result: WeChatOCR 返回的原始结果
         
         返回:
-            标准化的结果列表
+            标准化的结果（TextBlockStore）
         """
-        parsed_results = []
+        parsed_results = TextBlockStore()
         
         if not result:
             logging.warning("OCR 结果为空")
@@ -466,64 +483,17 @@ class WeChatOCRWrapper:
                 logging.warning(f"未知的 OCR 结果格式: {type(result)}")
                 return parsed_results
             
-            skipped_count = 0
-            for item in ocr_response:
-                try:
-                    # 提取文本
-                    text = item.get('text', '') or item.get('word', '')
-                    if not text:
-                        continue
-                    
-                    # 提取坐标信息（尝试多种可能的字段名）
-                    # 格式1: left, top, right, bottom (WeChatOCR 4.0 格式)
-                    if 'left' in item and 'right' in item:
-                        left = item.get('left', 0)
-                        top = item.get('top', 0)
-                        right = item.get('right', 0)
-                        bottom = item.get('bottom', 0)
-                        x = int(left)
-                        y = int(top)
-                        width = int(right - left)
-                        height = int(bottom - top)
-                    # 格式2: pos 字段
-                    elif 'pos' in item:
-                        pos = item['pos']
-                        x = pos.get('x', 0)
-                        y = pos.get('y', 0)
-                        width = pos.get('width', 0)
-                        height = pos.get('height', 0)
-                    # 格式3: location 字段
-                    elif 'location' in item:
-                        loc = item['location']
-                        x = loc.get('left', 0)
-                        y = loc.get('top', 0)
-                        width = loc.get('width', 0)
-                        height = loc.get('height', 0)
-                    # 格式4: 直接在 item 中使用 x, y, width, height
-                    else:
-                        x = item.get('x', 0)
-                        y = item.get('y', 0)
-                        width = item.get('width', 0) or item.get('w', 0)
-                        height = item.get('height', 0) or item.get('h', 0)
-                    
-                    # 保持单词/词组级别，不再拆分成单字符
-                    if len(text) > 0 and width > 0 and height > 0:
-                        parsed_results.append({
-                            'text': text,
-                            'x': int(x),
-                            'y': int(y),
-                            'width': int(width),
-                            'height': int(height)
-                        })
-                    else:
-                        skipped_count += 1
-                    
-                except Exception as e:
-                    logging.warning(f"解析 OCR 结果项失败: {str(e)}")
-                    continue
+            if not isinstance(ocr_response, list):
+                ocr_response = list(ocr_response)
+            
+            stats = {'skipped': 0, 'failed': 0, 'error': None}
+            _parse_items(ocr_response, parsed_results, stats)
             
-            if skipped_count > 0:
-                logging.warning(f"跳过了 {skipped_count} 个无效的OCR项")
+            # 汇总输出，避免密集屏幕上逐条记录日志
+            if stats['failed'] > 0:
+                logging.warning(f"解析 OCR 结果项失败 {stats['failed']} 个，首个错误: {stats['error']}")
+            if stats['skipped'] > 0:
+                logging.warning(f"跳过了 {stats['skipped']} 个无效的OCR项")
         
         except Exception as e:
             logging.error(f"解析 OCR 结果失败: {str(e)}")
@@ -543,6 +513,67 @@ class WeChatOCRWrapper:
                 pass
 
 
+def _parse_items(items, out, stats):
+    """逐条判断坐标格式，文本和坐标按列收集后追加到 out（失败和跳过的条目计入 stats）"""
+    texts, xs, ys, widths, heights = [], [], [], [], []
+    for item in items:
+        try:
+            # 提取文本
+            text = item.get('text', '') or item.get('word', '')
+            if not text:
+                continue
+            
+            # 提取坐标信息（尝试多种可能的字段名）
+            # 格式1: left, top, right, bottom (WeChatOCR 4.0 格式)
+            if 'left' in item and 'right' in item:
+                left = item.get('left', 0)
+                top = item.get('top', 0)
+                right = item.get('right', 0)
+                bottom = item.get('bottom', 0)
+                x = int(left)
+                y = int(top)
+                width = int(right - left)
+                height = int(bottom - top)
+            # 格式2: pos 字段
+            elif 'pos' in item:
+                pos = item['pos']
+                x = pos.get('x', 0)
+                y = pos.get('y', 0)
+                width = pos.get('width', 0)
+                height = pos.get('height', 0)
+            # 格式3: location 字段
+            elif 'location' in item:
+                loc = item['location']
+                x = loc.get('left', 0)
+                y = loc.get('top', 0)
+                width = loc.get('width', 0)
+                height = loc.get('height', 0)
+            # 格式4: 直接在 item 中使用 x, y, width, height
+            else:
+                x = item.get('x', 0)
+                y = item.get('y', 0)
+                width = item.get('width', 0) or item.get('w', 0)
+                height = item.get('height', 0) or item.get('h', 0)
+            
+            # 保持单词/词组级别，不再拆分成单字符
+            if len(text) > 0 and width > 0 and height > 0:
+                x, y, width, height = int(x), int(y), int(width), int(height)
+                texts.append(text)
+                xs.append(x)
+                ys.append(y)
+                widths.append(width)
+                heights.append(height)
+            else:
+                stats['skipped'] += 1
+        
+        except Exception as e:
+            stats['failed'] += 1
+            if stats['error'] is None:
+                stats['error'] = str(e)
+    
+    out.extend_columns(texts, xs, ys, widths, heights)
+
+
 # 全局实例（单例模式）
 _wechat_ocr_instance = None
 
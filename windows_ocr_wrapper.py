@@ -7,12 +7,13 @@ pip install winrt-Windows.Media.Ocr winrt-Windows.Graphics.Imaging winrt-Windows
 """
 import asyncio
 import logging
-from typing import List, Dict, Optional
 from PIL import Image
 import io
 import os
 import tempfile
 
+from text_blocks import TextBlockStore
+
 try:
     # 导入 Windows Runtime API
     from winrt.windows.media.ocr import OcrEngine
@@ -80,7 +81,7 @@ class WindowsOCRWrapper:
         """检查 OCR 是否可用"""
         return self.initialized and self.engine is not None
     
-    async def _ocr_image_async(self, image: Image.Image) -> List[Dict]:
+    async def _ocr_image_async(self, image: Image.Image) -> TextBlockStore:
         """异步 OCR 识别"""
         try:
             # 保存图片到临时文件
@@ -101,7 +102,7 @@ class WindowsOCRWrapper:
                 result = await self.engine.recognize_async(bitmap)
                 
                 # 解析结果 - 按单词级别返回
-                text_blocks = []
+                text_blocks = TextBlockStore()
                 for line in result.lines:
                     words = list(line.words)
                     if not words:
@@ -109,13 +110,8 @@ class WindowsOCRWrapper:
                     
                     for word in words:
                         rect = word.bounding_rect
-                        text_blocks.append({
-                            'text': word.text,
-                            'x': int(rect.x),
-                            'y': int(rect.y),
-                            'width': int(rect.width),
-                            'height': int(rect.height)
-                        })
+                        text_blocks.append(word.text, int(rect.x), int(rect.y),
+                                           int(rect.width), int(rect.height))
                 
                 return text_blocks
             finally:
@@ -127,9 +123,9 @@ class WindowsOCRWrapper:
         
         except Exception as e:
             logging.error(f"Windows OCR 识别失败: {e}")
-            return []
+            return TextBlockStore()
     
-    def ocr_pil_image(self, image: Image.Image, preprocess: bool = False) -> List[Dict]:
+    def ocr_pil_image(self, image: Image.Image, preprocess: bool = False) -> TextBlockStore:
         """
         对 PIL Image 进行 OCR 识别
         
@@ -138,11 +134,11 @@ class WindowsOCRWrapper:
             preprocess: 是否进行图像预处理（Windows OCR 通常不需要）
         
         Returns:
-            文本块列表，每个块包含 text, x, y, width, height
+            文本块（TextBlockStore），每个块包含 text, x, y, width, height
         """
         if not self.is_available():
             logging.error("Windows OCR 不可用")
-            return []
+            return TextBlockStore()
         
         try:
             # 如果需要预处理
@@ -164,7 +160,7 @@ class WindowsOCRWrapper:
         
         except Exception as e:
             logging.error(f"Windows OCR 处理失败: {e}")
-            return []
+            return TextBlockStore()
 
 
 # 测试代码